@@ -7,15 +7,19 @@ This library is made for manipulating wifi device on varient platforms.
 
 from pywifi import const
 from pywifi.const import AkmType, AuthAlgorithm, CipherType, IfaceStatus, KeyType
+from pywifi.ie import BssDetails
+from pywifi.link import LinkInfo
 from pywifi.profile import Profile
 from pywifi.wifi import PyWiFi
 
 __all__ = [
     "AkmType",
     "AuthAlgorithm",
+    "BssDetails",
     "CipherType",
     "IfaceStatus",
     "KeyType",
+    "LinkInfo",
     "Profile",
     "PyWiFi",
     "const",
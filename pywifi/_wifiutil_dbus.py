@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+
+"""Implementations of wifi functions on the D-Bus API of wpa_supplicant.
+
+The interfaces, BSSes and networks of wpa_supplicant are objects under
+fi.w1.wpa_supplicant1 whose properties are read in bulk with GetAll.
+Subscribers of an interface are told about its property changes by a
+thread listening for PropertiesChanged signals, which also keeps the
+state of the interface up to date without polling. jeepney is required.
+"""
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+
+from pywifi import psk
+from pywifi.const import AkmType, AuthAlgorithm, IfaceStatus
+from pywifi.ie import BssDetails
+from pywifi.link import LinkInfo
+from pywifi.profile import Profile, diff_profiles
+from pywifi.wpactrl import akm_of, parse_ciphers, status_dict
+
+try:
+    from jeepney import (
+        DBusAddress,
+        HeaderFields,
+        MatchRule,
+        MessageType,
+        Properties,
+        message_bus,
+        new_method_call,
+    )
+    from jeepney.io.blocking import open_dbus_connection
+    from jeepney.wrappers import unwrap_msg
+except ImportError as err:
+    raise ImportError("The D-Bus backend requires jeepney: pip install pywifi[dbus]") from err
+
+WPAS_SERVICE = "fi.w1.wpa_supplicant1"
+WPAS_PATH = "/fi/w1/wpa_supplicant1"
+WPAS_INTERFACE = "fi.w1.wpa_supplicant1"
+IFACE_INTERFACE = "fi.w1.wpa_supplicant1.Interface"
+BSS_INTERFACE = "fi.w1.wpa_supplicant1.BSS"
+NETWORK_INTERFACE = "fi.w1.wpa_supplicant1.Network"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+SIGNAL_TIMEOUT = 0.5
+SCAN_CHANNEL_WIDTH = 20
+
+_PSK_AKMS = (AkmType.WPAPSK, AkmType.WPA2PSK)
+
+
+def _unwrap(props: dict[str, tuple[str, object]]) -> dict[str, object]:
+    """Strip the signatures of a dict of D-Bus variants."""
+    return {name: value for name, (_, value) in props.items()}
+
+
+def _network_id(path: str) -> int:
+    """Get the network id of a network object path."""
+    return int(path.rsplit("/", 1)[1])
+
+
+def _bss_akm(props: dict[str, object]) -> list[int]:
+    """Get the akm of a BSS from its WPA and RSN properties."""
+    wpa = _unwrap(props.get("WPA", {})).get("KeyMgmt", [])
+    rsn = _unwrap(props.get("RSN", {})).get("KeyMgmt", [])
+    akm = []
+    if any("psk" in key_mgmt for key_mgmt in wpa):
+        akm.append(AkmType.WPAPSK)
+    if any("psk" in key_mgmt for key_mgmt in rsn):
+        akm.append(AkmType.WPA2PSK)
+    if any("eap" in key_mgmt for key_mgmt in wpa):
+        akm.append(AkmType.WPA)
+    if any("eap" in key_mgmt for key_mgmt in rsn):
+        akm.append(AkmType.WPA2)
+    return akm
+
+
+def _parse_bss(props: dict[str, object]) -> Profile:
+    """Build a BSS profile from the properties of a BSS object."""
+    bss = Profile()
+    bss.bssid = bytes(props["BSSID"]).hex(":")
+    bss.ssid = bytes(props["SSID"]).decode("utf-8", errors="replace")
+    bss.freq = props["Frequency"]
+    bss.signal = props["Signal"]
+    bss.akm = _bss_akm(props)
+    bss.auth = AuthAlgorithm.OPEN
+    return bss
+
+
+def _bss_fields(props: dict[str, object]) -> dict[str, str]:
+    """Get the fields of a BSS reply of the control interface from the properties of a BSS."""
+    fields = {
+        "bssid": bytes(props["BSSID"]).hex(":"),
+        "ssid": bytes(props["SSID"]).decode("utf-8", errors="replace"),
+        "freq": str(props["Frequency"]),
+        "level": str(props["Signal"]),
+        "ie": bytes(props.get("IEs", b"")).hex(),
+    }
+    if "Age" in props:
+        fields["age"] = str(props["Age"])
+    return fields
+
+
+def _psk_arg(params: Profile, *, derive_psk: bool = False) -> tuple[str, object]:
+    """Get the psk variant of a network; a raw PSK is sent as bytes, a passphrase as text."""
+    if derive_psk or (params.key and psk.is_raw_psk(params.key)):
+        return ("ay", bytes.fromhex(psk.default_cache.get(params.ssid, params.key)))
+    return ("s", params.key)
+
+
+def _network_args(params: Profile, *, derive_psk: bool = False) -> dict[str, tuple[str, object]]:
+    """Get the AddNetwork arguments configuring a network from a profile."""
+    args = {"ssid": ("s", params.ssid)}
+
+    akm = params.akm[-1]
+    if akm in _PSK_AKMS:
+        args["key_mgmt"] = ("s", "WPA-PSK")
+    elif akm in [AkmType.WPA, AkmType.WPA2]:
+        args["key_mgmt"] = ("s", "WPA-EAP")
+    else:
+        args["key_mgmt"] = ("s", "NONE")
+
+    if akm in [AkmType.WPAPSK, AkmType.WPA]:
+        args["proto"] = ("s", "WPA")
+    elif akm in [AkmType.WPA2PSK, AkmType.WPA2]:
+        args["proto"] = ("s", "RSN")
+
+    if akm in _PSK_AKMS:
+        args["psk"] = _psk_arg(params, derive_psk=derive_psk)
+
+    return args
+
+
+class _PropertyWatcher:
+    """Listen for the PropertiesChanged signals of one interface object."""
+
+    def __init__(self, bus: str, path: str) -> None:
+        self.path = path
+        self.props: dict[str, object] = {}
+        self._callbacks: list[Callable[[dict[str, object]], None]] = []
+        self._callbacks_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._logger = logging.getLogger("pywifi")
+
+        self._conn = open_dbus_connection(bus)
+        rule = MatchRule(
+            type="signal",
+            interface=PROPERTIES_INTERFACE,
+            member="PropertiesChanged",
+            path=path,
+        )
+        rule.add_arg_condition(0, IFACE_INTERFACE)
+        unwrap_msg(self._conn.send_and_get_reply(message_bus.AddMatch(rule)))
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def subscribe(self, callback: Callable[[dict[str, object]], None]) -> None:
+        with self._callbacks_lock:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: Callable[[dict[str, object]], None]) -> bool:
+        """Remove a callback, return whether any are left."""
+        with self._callbacks_lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+            return bool(self._callbacks)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._conn.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                msg = self._conn.receive(timeout=SIGNAL_TIMEOUT)
+            except TimeoutError:
+                continue
+            except OSError:
+                self._logger.exception("Signal connection of '%s' lost", self.path)
+                return
+
+            fields = msg.header.fields
+            if (
+                msg.header.message_type != MessageType.signal
+                or fields.get(HeaderFields.path) != self.path
+                or fields.get(HeaderFields.member) != "PropertiesChanged"
+                or msg.body[0] != IFACE_INTERFACE
+            ):
+                continue
+
+            changed = _unwrap(msg.body[1])
+            self.props.update(changed)
+            with self._callbacks_lock:
+                callbacks = list(self._callbacks)
+            for callback in callbacks:
+                try:
+                    callback(changed)
+                except Exception:
+                    self._logger.exception("Property callback failed for '%s'", self.path)
+
+
+class WifiUtil:
+    """WifiUtil implements the wifi functions on the D-Bus API of wpa_supplicant."""
+
+    _connections = {}
+    _watchers = {}
+    _lock = threading.Lock()
+    _watchers_lock = threading.Lock()
+    _logger = logging.getLogger("pywifi")
+
+    def __init__(self, bus: str = "SYSTEM") -> None:
+        """Use the ``"SYSTEM"`` or ``"SESSION"`` bus, or the bus at an address."""
+        self._bus = bus
+
+    def scan(
+        self,
+        obj: dict[str, str],
+        freqs: list[int] | None = None,
+        ssids: list[str] | None = None,
+        *,
+        passive: bool = False,
+        only_new: bool = False,
+    ) -> None:
+        """Trigger the wifi interface to scan.
+
+        The D-Bus API cannot drop the cached BSSes, so ``only_new`` is ignored.
+        """
+        args = {"Type": ("s", "passive" if passive else "active")}
+        if ssids:
+            args["SSIDs"] = ("aay", [ssid.encode("utf-8") for ssid in ssids])
+        if freqs:
+            args["Channels"] = ("a(uu)", [(freq, SCAN_CHANNEL_WIDTH) for freq in freqs])
+        if only_new:
+            self._logger.debug("only_new is not supported over D-Bus")
+        self._call(obj["path"], IFACE_INTERFACE, "Scan", "a{sv}", (args,))
+
+    def scan_results(self, obj: dict[str, str]) -> list[Profile]:
+        """Get the AP list after scanning."""
+        return [
+            _parse_bss(self._get_all(path, BSS_INTERFACE))
+            for path in self._get(obj["path"], IFACE_INTERFACE, "BSSs")
+        ]
+
+    def connect(self, obj: dict[str, str], network: Profile) -> None:
+        """Connect to the specified AP."""
+        if network.id is not None:
+            self._select(obj, f"{obj['path']}/Networks/{network.id}")
+            return
+
+        for path, props in self._networks(obj):
+            if props.get("ssid", "")[1:-1] == network.ssid:
+                self._select(obj, path)
+
+    def reassociate(
+        self,
+        obj: dict[str, str],
+        network_id: int,
+        bssid: str | None = None,
+        freq: int | None = None,
+    ) -> None:
+        """Select a saved network again; the BSS and frequency cannot be pinned over D-Bus."""
+        self._select(obj, f"{obj['path']}/Networks/{network_id}")
+
+    def disconnect(self, obj: dict[str, str]) -> None:
+        """Disconnect to the specified AP."""
+        self._call(obj["path"], IFACE_INTERFACE, "Disconnect")
+
+    def add_network_profile(
+        self,
+        obj: dict[str, str],
+        params: Profile,
+        *,
+        derive_psk: bool = False,
+    ) -> Profile:
+        """Add an AP profile for connecting to afterward."""
+        params.process_akm()
+        args = _network_args(params, derive_psk=derive_psk)
+        (path,) = self._call(obj["path"], IFACE_INTERFACE, "AddNetwork", "a{sv}", (args,))
+        params.id = _network_id(path)
+        return params
+
+    def update_network_key(
+        self,
+        obj: dict[str, str],
+        params: Profile,
+        *,
+        derive_psk: bool = False,
+    ) -> None:
+        """Set the PSK of the saved network ``params.id`` to ``params.key``."""
+        if params.key and params.akm and params.akm[-1] in _PSK_AKMS:
+            path = f"{obj['path']}/Networks/{params.id}"
+            key = {"psk": _psk_arg(params, derive_psk=derive_psk)}
+            self._set(path, NETWORK_INTERFACE, "Properties", "a{sv}", key)
+
+    def apply_profiles(
+        self,
+        obj: dict[str, str],
+        desired: list[Profile],
+        *,
+        update_keys: bool = False,
+        derive_psk: bool = False,
+    ) -> list[Profile]:
+        """Make the saved AP profiles match the desired ones.
+
+        Saved networks matching a desired profile are kept with their
+        network id, the missing ones are added and the others are removed.
+        """
+        matched, to_add, to_remove = diff_profiles(self.network_profiles(obj), desired)
+
+        for saved in to_remove:
+            self._remove_network(obj, saved.id)
+
+        for profile, saved in matched:
+            profile.process_akm()
+            profile.id = saved.id
+            if update_keys:
+                self.update_network_key(obj, profile, derive_psk=derive_psk)
+
+        for profile in to_add:
+            self.add_network_profile(obj, profile, derive_psk=derive_psk)
+
+        return desired
+
+    def network_profiles(self, obj: dict[str, str], ssid: str | None = None) -> list[Profile]:
+        """Get AP profiles, or only the ones of ``ssid``."""
+        networks = []
+        for path, props in self._networks(obj):
+            if "ssid" not in props or "key_mgmt" not in props:
+                continue
+            if ssid is not None and props["ssid"][1:-1] != ssid:
+                continue
+
+            network = Profile()
+            network.id = _network_id(path)
+            network.ssid = props["ssid"][1:-1]
+            network.akm = akm_of(props["key_mgmt"], props.get("proto", ""))
+            cipher = parse_ciphers(props.get("pairwise", ""))
+            if cipher is not None:
+                network.cipher = cipher
+            networks.append(network)
+
+        return networks
+
+    def remove_network_profile(self, obj: dict[str, str], params: Profile) -> None:
+        """Remove the specified AP profiles"""
+        network_id = None
+        for profile in self.network_profiles(obj):
+            if profile == params:
+                network_id = profile.id
+
+        if network_id is not None:
+            self._remove_network(obj, network_id)
+
+    def remove_all_network_profiles(self, obj: dict[str, str]) -> None:
+        """Remove all the AP profiles."""
+        self._call(obj["path"], IFACE_INTERFACE, "RemoveAllNetworks")
+
+    def status(self, obj: dict[str, str]) -> int:
+        """Get the wifi interface status, from the signals while subscribed."""
+        watcher = WifiUtil._watchers.get((self._bus, obj["path"]))
+        if watcher is not None and "State" in watcher.props:
+            state = watcher.props["State"]
+        else:
+            state = self._get(obj["path"], IFACE_INTERFACE, "State")
+        return status_dict.get(state, IfaceStatus.DISCONNECTED)
+
+    def status_fields(self, obj: dict[str, str]) -> dict[str, str]:
+        """Get the status fields of the wifi interface, named as by the control interface."""
+        props = self._iface_props(obj)
+        fields = {"wpa_state": props["State"].upper()}
+        if props.get("CurrentBSS", "/") != "/":
+            bss = _parse_bss(self._get_all(props["CurrentBSS"], BSS_INTERFACE))
+            fields.update(bssid=bss.bssid, freq=str(bss.freq), ssid=bss.ssid)
+        if props.get("CurrentNetwork", "/") != "/":
+            fields["id"] = str(_network_id(props["CurrentNetwork"]))
+        return fields
+
+    def link_info(self, obj: dict[str, str]) -> LinkInfo:
+        """Get the status of the wifi interface with all its fields."""
+        fields = self.status_fields(obj)
+        status = status_dict.get(fields["wpa_state"].lower(), IfaceStatus.DISCONNECTED)
+        return LinkInfo.from_status_fields(fields, status)
+
+    def signal_poll(self, obj: dict[str, str]) -> dict[str, int]:
+        """Get the signal parameters (e.g. RSSI, LINKSPEED) of the current link."""
+        (props,) = self._call(obj["path"], IFACE_INTERFACE, "SignalPoll")
+        return {
+            name.upper().replace("-", "_"): value
+            for name, value in _unwrap(props).items()
+            if isinstance(value, int)
+        }
+
+    def packet_counts(self, obj: dict[str, str]) -> dict[str, int]:
+        """Get the TXGOOD, TXBAD and RXGOOD packet counters of the current link."""
+        raise NotImplementedError("Packet counters are not supported over D-Bus")
+
+    def bss_details(self, obj: dict[str, str], bssid: str) -> BssDetails | None:
+        """Get all the fields and IEs of a BSS, None if it is unknown."""
+        # Only the BSSID of each BSS is read until the one to fetch is found.
+        for path in self._get(obj["path"], IFACE_INTERFACE, "BSSs"):
+            if bytes(self._get(path, BSS_INTERFACE, "BSSID")).hex(":") == bssid.lower():
+                return BssDetails(_bss_fields(self._get_all(path, BSS_INTERFACE)))
+        return None
+
+    def bss_details_all(self, obj: dict[str, str]) -> list[BssDetails]:
+        """Get all the fields and IEs of every BSS seen by the scans."""
+        return [
+            BssDetails(_bss_fields(self._get_all(path, BSS_INTERFACE)))
+            for path in self._get(obj["path"], IFACE_INTERFACE, "BSSs")
+        ]
+
+    def roam(self, obj: dict[str, str], bssid: str) -> None:
+        """Roam to the specified BSS of the current network."""
+        self._call(obj["path"], IFACE_INTERFACE, "Roam", "s", (bssid,))
+
+    def attach(self, obj: dict[str, str]) -> None:
+        """Open a socket receiving the unsolicited events of the wifi interface."""
+        raise NotImplementedError("Event monitoring is not supported over D-Bus")
+
+    def detach(self, obj: dict[str, str], sock: object) -> None:
+        """Close a socket opened by attach()."""
+        raise NotImplementedError("Event monitoring is not supported over D-Bus")
+
+    def subscribe_properties(
+        self,
+        obj: dict[str, str],
+        callback: Callable[[dict[str, object]], None],
+    ) -> None:
+        """Call ``callback`` with the changed properties of the wifi interface."""
+        key = (self._bus, obj["path"])
+        with WifiUtil._watchers_lock:
+            watcher = WifiUtil._watchers.get(key)
+            if watcher is None:
+                watcher = _PropertyWatcher(self._bus, obj["path"])
+                # Read the properties once the signals are matched so no change is missed.
+                for name, value in self._get_all(obj["path"], IFACE_INTERFACE).items():
+                    watcher.props.setdefault(name, value)
+                WifiUtil._watchers[key] = watcher
+            watcher.subscribe(callback)
+
+    def unsubscribe_properties(
+        self,
+        obj: dict[str, str],
+        callback: Callable[[dict[str, object]], None],
+    ) -> None:
+        """Stop calling ``callback``; the signals are unmatched after the last one."""
+        key = (self._bus, obj["path"])
+        with WifiUtil._watchers_lock:
+            watcher = WifiUtil._watchers.get(key)
+            if watcher is None or watcher.unsubscribe(callback):
+                return
+            del WifiUtil._watchers[key]
+        watcher.stop()
+
+    def interfaces(self, names: list[str] | None = None) -> list[dict[str, str]]:
+        """Get the wifi interface lists, optionally only the named interfaces."""
+        ifaces = []
+        try:
+            for path in self._get(WPAS_PATH, WPAS_INTERFACE, "Interfaces"):
+                name = self._get(path, IFACE_INTERFACE, "Ifname")
+                if names is None or name in names:
+                    ifaces.append({"name": name, "path": path})
+        except Exception:
+            self._logger.exception("Can't list the interfaces of wpa_supplicant on D-Bus")
+        return ifaces
+
+    def _iface_props(self, obj: dict[str, str]) -> dict[str, object]:
+        """Get the interface properties, from the signals while subscribed."""
+        watcher = WifiUtil._watchers.get((self._bus, obj["path"]))
+        if watcher is not None:
+            return dict(watcher.props)
+        return self._get_all(obj["path"], IFACE_INTERFACE)
+
+    def _networks(self, obj: dict[str, str]) -> list[tuple[str, dict[str, str]]]:
+        return [
+            (path, _unwrap(self._get(path, NETWORK_INTERFACE, "Properties")))
+            for path in self._get(obj["path"], IFACE_INTERFACE, "Networks")
+        ]
+
+    def _select(self, obj: dict[str, str], path: str) -> None:
+        self._call(obj["path"], IFACE_INTERFACE, "SelectNetwork", "o", (path,))
+
+    def _remove_network(self, obj: dict[str, str], network_id: int) -> None:
+        path = f"{obj['path']}/Networks/{network_id}"
+        self._call(obj["path"], IFACE_INTERFACE, "RemoveNetwork", "o", (path,))
+
+    def _get(self, path: str, interface: str, name: str) -> object:
+        addr = DBusAddress(path, bus_name=WPAS_SERVICE, interface=interface)
+        ((_, value),) = self._send(Properties(addr).get(name))
+        return value
+
+    def _get_all(self, path: str, interface: str) -> dict[str, object]:
+        addr = DBusAddress(path, bus_name=WPAS_SERVICE, interface=interface)
+        (props,) = self._send(Properties(addr).get_all())
+        return _unwrap(props)
+
+    def _set(self, path: str, interface: str, name: str, signature: str, value: object) -> None:
+        addr = DBusAddress(path, bus_name=WPAS_SERVICE, interface=interface)
+        self._send(Properties(addr).set(name, signature, value))
+
+    def _call(
+        self,
+        path: str,
+        interface: str,
+        method: str,
+        signature: str | None = None,
+        body: tuple = (),
+    ) -> tuple:
+        if method != "AddNetwork":
+            self._logger.info("Call '%s' on '%s'", method, path)
+        addr = DBusAddress(path, bus_name=WPAS_SERVICE, interface=interface)
+        return self._send(new_method_call(addr, method, signature, body))
+
+    def _send(self, msg: object) -> tuple:
+        conn = self._connection()
+        with conn["lock"]:
+            return unwrap_msg(conn["conn"].send_and_get_reply(msg))
+
+    def _connection(self) -> dict[str, object]:
+        with WifiUtil._lock:
+            conn = WifiUtil._connections.get(self._bus)
+            # A forked process must not share the connection of its parent.
+            if conn is None or conn["pid"] != os.getpid():
+                conn = {
+                    "conn": open_dbus_connection(self._bus),
+                    "lock": threading.Lock(),
+                    "pid": os.getpid(),
+                }
+                WifiUtil._connections[self._bus] = conn
+            return conn
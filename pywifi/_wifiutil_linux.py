@@ -2,275 +2,244 @@
 
 """Implementations of wifi functions of Linux."""
 
+import atexit
+import functools
+import itertools
 import logging
 import os
+import re
 import socket
 import stat
+import threading
+from collections.abc import Callable
+from typing import TypeVar
 
-from pywifi.const import (
-    AkmType,
-    AuthAlgorithm,
-    CipherType,
-    IfaceStatus,
-)
+from pywifi import wpactrl
+from pywifi.ie import BssDetails
+from pywifi.link import LinkInfo
 from pywifi.profile import Profile
 
 CTRL_IFACE_DIR = "/var/run/wpa_supplicant"
+CLIENT_SOCK_DIR = "/tmp"
 CTRL_IFACE_RETRY = 3
 REPLY_SIZE = 4096
 
-status_dict = {
-    "completed": IfaceStatus.CONNECTED,
-    "inactive": IfaceStatus.INACTIVE,
-    "authenticating": IfaceStatus.CONNECTING,
-    "associating": IfaceStatus.CONNECTING,
-    "associated": IfaceStatus.CONNECTING,
-    "4way_handshake": IfaceStatus.CONNECTING,
-    "group_handshake": IfaceStatus.CONNECTING,
-    "interface_disabled": IfaceStatus.INACTIVE,
-    "disconnected": IfaceStatus.DISCONNECTED,
-    "scanning": IfaceStatus.SCANNING,
-}
-
-key_mgmt_to_str = {
-    AkmType.WPA: "WPA-EAP",
-    AkmType.WPAPSK: "WPA-PSK",
-    AkmType.WPA2: "WPA-EAP",
-    AkmType.WPA2PSK: "WPA-PSK",
-}
-
-key_mgmt_to_proto_str = {
-    AkmType.WPA: "WPA",
-    AkmType.WPAPSK: "WPA",
-    AkmType.WPA2: "RSN",
-    AkmType.WPA2PSK: "RSN",
-}
-
-proto_to_key_mgmt_id = {"WPA": AkmType.WPAPSK, "RSN": AkmType.WPA2PSK}
-
-cipher_str_to_value = {
-    "TKIP": CipherType.TKIP,
-    "CCMP": CipherType.CCMP,
-}
+_CLIENT_SOCK_RE = re.compile(r"pywifi_.+\.(\d+)")
+
+T = TypeVar("T")
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
 
 
 class WifiUtil:
     """WifiUtil implements the wifi functions in Linux."""
 
     _connections = {}
+    _sock_files = {}
+    _sock_ids = itertools.count()
+    _cleaned_pid = None
+    # The network ids of each interface pinned to a BSS by reassociate().
+    _bssid_hints = {}
     _logger = logging.getLogger("pywifi")
 
-    def scan(self, obj: dict[str, str]) -> None:
+    def scan(
+        self,
+        obj: dict[str, str],
+        freqs: list[int] | None = None,
+        ssids: list[str] | None = None,
+        *,
+        passive: bool = False,
+        only_new: bool = False,
+    ) -> None:
         """Trigger the wifi interface to scan."""
-        self._send_cmd_to_wpas(obj["name"], "SCAN")
+        self._send_cmd_to_wpas(
+            obj["name"],
+            wpactrl.scan_cmd(freqs, ssids, passive=passive, only_new=only_new),
+        )
 
     def scan_results(self, obj: dict[str, str]) -> list[Profile]:
         """Get the AP list after scanning."""
-        bsses = []
-        bsses_summary: list[str] = self._send_cmd_to_wpas(
-            obj["name"], "SCAN_RESULTS", get_reply=True
-        )
-        bsses_summary = bsses_summary[:-1].split("\n")
-        if len(bsses_summary) == 1:
-            return bsses
-
-        for item in bsses_summary[1:]:
-            values = item.split("\t")
-            bss = Profile()
-            bss.bssid = values[0]
-            bss.freq = int(values[1])
-            bss.signal = int(values[2])
-            bss.ssid = values[4]
-            bss.akm = []
-            if "WPA-PSK" in values[3]:
-                bss.akm.append(AkmType.WPAPSK)
-            if "WPA2-PSK" in values[3]:
-                bss.akm.append(AkmType.WPA2PSK)
-            if "WPA-EAP" in values[3]:
-                bss.akm.append(AkmType.WPA)
-            if "WPA2-EAP" in values[3]:
-                bss.akm.append(AkmType.WPA2)
-
-            bss.auth = AuthAlgorithm.OPEN
-
-            bsses.append(bss)
-
-        return bsses
+        reply = self._send_cmd_to_wpas(obj["name"], "SCAN_RESULTS", get_reply=True)
+        return wpactrl.parse_scan_results(reply)
 
     def connect(self, obj: dict[str, str], network: Profile) -> None:
         """Connect to the specified AP."""
-        network_summary = self._send_cmd_to_wpas(obj["name"], "LIST_NETWORKS", get_reply=True)
-        network_summary = network_summary[:-1].split("\n")
-        if len(network_summary) == 1:
-            return
-
-        for item in network_summary[1:]:
-            values = item.split("\t")
-            if values[1] == network.ssid:
-                network_summary = self._send_cmd_to_wpas(
-                    obj["name"],
-                    f"SELECT_NETWORK {values[0]}",
-                    get_reply=True,
-                )
+        self._run(obj["name"], wpactrl.select_network(network, self.pinned_networks(obj["name"])))
+
+    def reassociate(
+        self,
+        obj: dict[str, str],
+        network_id: int,
+        bssid: str | None = None,
+        freq: int | None = None,
+    ) -> None:
+        """Select a saved network again, preferring a BSS and scanning only its frequency.
+
+        The BSS hint stays on the saved network until the network is selected
+        again by connect() or by reassociate() without ``bssid``.
+        """
+        pinned = self.pinned_networks(obj["name"])
+        if bssid:
+            self._send_cmd_to_wpas(obj["name"], f"SET_NETWORK {network_id} bssid_hint {bssid}")
+            pinned.add(network_id)
+        elif network_id in pinned:
+            self._send_cmd_to_wpas(obj["name"], f"SET_NETWORK {network_id} bssid_hint any")
+            pinned.discard(network_id)
+        cmd = f"SELECT_NETWORK {network_id}"
+        if freq:
+            cmd += f" freq={freq}"
+        self._send_cmd_to_wpas(obj["name"], cmd)
 
     def disconnect(self, obj: dict[str, str]) -> None:
         """Disconnect to the specified AP."""
         self._send_cmd_to_wpas(obj["name"], "DISCONNECT")
 
-    def add_network_profile(self, obj: dict[str, str], params: Profile) -> Profile:
+    def add_network_profile(
+        self,
+        obj: dict[str, str],
+        params: Profile,
+        *,
+        derive_psk: bool = False,
+    ) -> Profile:
         """Add an AP profile for connecting to afterward."""
-        network_id = self._send_cmd_to_wpas(obj["name"], "ADD_NETWORK", get_reply=True)
-        network_id = network_id.strip()
-
-        params.process_akm()
-
-        self._send_cmd_to_wpas(
-            obj["name"],
-            f'SET_NETWORK {network_id} ssid "{params.ssid}"',
+        return self._run(obj["name"], wpactrl.add_network(params, derive_psk=derive_psk))
+
+    def update_network_key(
+        self,
+        obj: dict[str, str],
+        params: Profile,
+        *,
+        derive_psk: bool = False,
+    ) -> None:
+        """Set the PSK of the saved network ``params.id`` to ``params.key``."""
+        self._run(obj["name"], wpactrl.update_network_key(params, derive_psk=derive_psk))
+
+    def apply_profiles(
+        self,
+        obj: dict[str, str],
+        desired: list[Profile],
+        *,
+        update_keys: bool = False,
+        derive_psk: bool = False,
+    ) -> list[Profile]:
+        """Make the saved AP profiles match the desired ones.
+
+        Saved networks matching a desired profile are kept with their
+        network id, the missing ones are added and the others are removed.
+        """
+        request = wpactrl.apply_profiles(
+            desired,
+            self.pinned_networks(obj["name"]),
+            update_keys=update_keys,
+            derive_psk=derive_psk,
         )
+        return self._run(obj["name"], request)
 
-        key_mgmt = ""
-        if params.akm[-1] in [AkmType.WPAPSK, AkmType.WPA2PSK]:
-            key_mgmt = "WPA-PSK"
-        elif params.akm[-1] in [AkmType.WPA, AkmType.WPA2]:
-            key_mgmt = "WPA-EAP"
-        else:
-            key_mgmt = "NONE"
-
-        if key_mgmt:
-            self._send_cmd_to_wpas(
-                obj["name"],
-                f"SET_NETWORK {network_id} key_mgmt {key_mgmt}",
-            )
-
-        proto = ""
-        if params.akm[-1] in [AkmType.WPAPSK, AkmType.WPA]:
-            proto = "WPA"
-        elif params.akm[-1] in [AkmType.WPA2PSK, AkmType.WPA2]:
-            proto = "RSN"
-
-        if proto:
-            self._send_cmd_to_wpas(
-                obj["name"],
-                f"SET_NETWORK {network_id} proto {proto}",
-            )
-
-        if params.akm[-1] in [AkmType.WPAPSK, AkmType.WPA2PSK]:
-            self._send_cmd_to_wpas(
-                obj["name"],
-                f'SET_NETWORK {network_id} psk "{params.key}"',
-            )
-
-        return params
-
-    def network_profiles(self, obj: dict[str, str]) -> list[Profile]:
-        """Get AP profiles."""
-        networks = []
-        network_ids = []
-        network_summary = self._send_cmd_to_wpas(obj["name"], "LIST_NETWORKS", get_reply=True)
-        network_summary = network_summary[:-1].split("\n")
-        if len(network_summary) == 1:
-            return networks
-
-        for item in network_summary[1:]:
-            network_ids.append(item.split()[0])
-
-        for network_id in network_ids:
-            network = Profile()
-
-            network.id = network_id
-
-            ssid = self._send_cmd_to_wpas(
-                obj["name"],
-                f"GET_NETWORK {network_id} ssid",
-                get_reply=True,
-            )
-            if ssid.upper().startswith("FAIL"):
-                continue
-            network.ssid = ssid[1:-1]
-
-            key_mgmt = self._send_cmd_to_wpas(
-                obj["name"],
-                f"GET_NETWORK {network_id} key_mgmt",
-                get_reply=True,
-            )
-
-            network.akm = []
-            if key_mgmt.upper().startswith("FAIL"):
-                continue
-            if key_mgmt.upper() in ["WPA-PSK"]:
-                proto = self._send_cmd_to_wpas(
-                    obj["name"],
-                    f"GET_NETWORK {network_id} proto",
-                    get_reply=True,
-                )
-
-                if proto.upper() == "RSN":
-                    network.akm.append(AkmType.WPA2PSK)
-                else:
-                    network.akm.append(AkmType.WPAPSK)
-            elif key_mgmt.upper() in ["WPA-EAP"]:
-                proto = self._send_cmd_to_wpas(
-                    obj["name"],
-                    f"GET_NETWORK {network_id} proto",
-                    get_reply=True,
-                )
-
-                if proto.upper() == "RSN":
-                    network.akm.append(AkmType.WPA2)
-                else:
-                    network.akm.append(AkmType.WPA)
-
-            ciphers = self._send_cmd_to_wpas(
-                obj["name"],
-                f"GET_NETWORK {network_id} pairwise",
-                get_reply=True,
-            ).split(" ")
-
-            if ciphers[0].upper().startswith("FAIL"):
-                continue
-            # Assume the possible ciphers TKIP and CCMP
-            if len(ciphers) == 1:
-                network.cipher = cipher_str_to_value(ciphers[0].upper())
-            elif "CCMP" in ciphers:
-                network.cipher = CipherType.CCMP
-
-            networks.append(network)
-
-        return networks
+    def network_profiles(self, obj: dict[str, str], ssid: str | None = None) -> list[Profile]:
+        """Get AP profiles, or only the ones of ``ssid``."""
+        return self._run(obj["name"], wpactrl.network_profiles(ssid))
 
     def remove_network_profile(self, obj: dict[str, str], params: Profile) -> None:
         """Remove the specified AP profiles"""
-        network_id = -1
-        profiles = self.network_profiles(obj)
-
-        for profile in profiles:
-            if profile == params:
-                network_id = profile.id
-
-        if network_id != -1:
-            self._send_cmd_to_wpas(obj["name"], f"REMOVE_NETWORK {network_id}")
+        self._run(obj["name"], wpactrl.remove_network(params, self.pinned_networks(obj["name"])))
 
     def remove_all_network_profiles(self, obj: dict[str, str]) -> None:
         """Remove all the AP profiles."""
         self._send_cmd_to_wpas(obj["name"], "REMOVE_NETWORK all")
+        self.pinned_networks(obj["name"]).clear()
 
     def status(self, obj: dict[str, str]) -> int:
         """Get the wifi interface status."""
         reply = self._send_cmd_to_wpas(obj["name"], "STATUS", get_reply=True)
-        result = reply.split("\n")
+        return wpactrl.parse_status(reply)
 
-        status = ""
-        for item in result:
-            if item.startswith("wpa_state="):
-                status = item[10:]
-                return status_dict[status.lower()]
-        return IfaceStatus.DISCONNECTED
+    def status_fields(self, obj: dict[str, str]) -> dict[str, str]:
+        """Get all the fields of the wifi interface status."""
+        reply = self._send_cmd_to_wpas(obj["name"], "STATUS", get_reply=True)
+        return wpactrl.parse_key_values(reply)
+
+    def link_info(self, obj: dict[str, str]) -> LinkInfo:
+        """Get the status of the wifi interface with all its fields."""
+        reply = self._send_cmd_to_wpas(obj["name"], "STATUS", get_reply=True)
+        return wpactrl.parse_link_info(reply)
+
+    def signal_poll(self, obj: dict[str, str]) -> dict[str, int]:
+        """Get the signal parameters (e.g. RSSI, LINKSPEED) of the current link."""
+        reply = self._send_cmd_to_wpas(obj["name"], "SIGNAL_POLL", get_reply=True)
+        return wpactrl.parse_int_values(reply)
+
+    def packet_counts(self, obj: dict[str, str]) -> dict[str, int]:
+        """Get the TXGOOD, TXBAD and RXGOOD packet counters of the current link."""
+        reply = self._send_cmd_to_wpas(obj["name"], "PKTCNT_POLL", get_reply=True)
+        return wpactrl.parse_int_values(reply)
+
+    def bss_details(self, obj: dict[str, str], bssid: str) -> BssDetails | None:
+        """Get all the fields and IEs of a BSS, None if it is unknown."""
+        reply = self._send_cmd_to_wpas(obj["name"], f"BSS {bssid}", get_reply=True)
+        return wpactrl.parse_bss(reply)
+
+    def bss_details_all(self, obj: dict[str, str]) -> list[BssDetails]:
+        """Get all the fields and IEs of every BSS seen by the scans."""
+        # A reply holds the entries fitting in REPLY_SIZE; ask for the rest
+        # from the id following the last received one.
+        details = []
+        first = 0
+        while True:
+            cmd = f"BSS RANGE={first}- MASK=0x{wpactrl.BSS_MASK:x}"
+            page = wpactrl.parse_bss_range(self._send_cmd_to_wpas(obj["name"], cmd, get_reply=True))
+            if not page or page[-1].id is None or page[-1].id < first:
+                return details
+            details.extend(page)
+            first = page[-1].id + 1
+
+    def roam(self, obj: dict[str, str], bssid: str) -> None:
+        """Roam to the specified BSS of the current network."""
+        self._send_cmd_to_wpas(obj["name"], f"ROAM {bssid}")
+
+    def attach(self, obj: dict[str, str]) -> socket.socket:
+        """Open a socket receiving the unsolicited events of the wifi interface."""
+        sock = self.open_ctrl_sock(obj["name"], "events")
+        sock.send(b"ATTACH")
+        reply = sock.recv(REPLY_SIZE)
+        if reply != b"OK\n":
+            self._logger.error("Attach to iface '%s' failed: '%s'", obj["name"], reply)
+        return sock
+
+    def detach(self, obj: dict[str, str], sock: socket.socket) -> None:
+        """Close a socket opened by attach()."""
+        try:
+            sock.send(b"DETACH")
+        except OSError:
+            self._logger.debug("Detach from iface '%s' failed", obj["name"])
+        self.close_ctrl_sock(sock)
+
+    def subscribe_properties(self, obj: dict[str, str], callback: Callable) -> None:
+        """Call ``callback`` with the changed properties of the wifi interface."""
+        raise NotImplementedError("Property signals are only supported by the D-Bus backend")
+
+    def unsubscribe_properties(self, obj: dict[str, str], callback: Callable) -> None:
+        """Stop calling a callback passed to subscribe_properties()."""
+        raise NotImplementedError("Property signals are only supported by the D-Bus backend")
+
+    def interfaces(self, names: list[str] | None = None) -> list[dict[str, str]]:
+        """Get the wifi interface lists, optionally only the named interfaces."""
+        if WifiUtil._cleaned_pid != os.getpid():
+            WifiUtil._cleaned_pid = os.getpid()
+            self._remove_stale_socks()
 
-    def interfaces(self) -> list[dict[str, str]]:
-        """Get the wifi interface lists."""
         ifaces = []
         for f in sorted(os.listdir(CTRL_IFACE_DIR)):
+            if names is not None and f not in names:
+                continue
             sock_file = f"{CTRL_IFACE_DIR}/{f}"
             mode = os.stat(sock_file).st_mode
             if stat.S_ISSOCK(mode):
@@ -281,18 +250,44 @@ class WifiUtil:
 
         return ifaces
 
-    def _connect_to_wpa_s(self, iface: str) -> None:
-        ctrl_iface = "/".join([CTRL_IFACE_DIR, iface])
-        if ctrl_iface in self._connections:
-            self._logger.info("Connection for iface '%s' aleady existed!", iface)
+    def pinned_networks(self, iface: str) -> set[int]:
+        """Get the ids of the saved networks reassociate() pinned to a BSS.
+
+        The BSS hint of a network is reset when it is selected again without
+        a BSSID.
+        """
+        return self._bssid_hints.setdefault(iface, set())
 
-        sock_file = "{}/{}_{}".format("/tmp", "pywifi", iface)
+    def open_ctrl_sock(self, iface: str, suffix: str = "") -> socket.socket:
+        """Open a control socket of its own to the wifi interface."""
+        ctrl_iface = "/".join([CTRL_IFACE_DIR, iface])
+        sock_file = self._client_sock_file(iface, suffix)
         self._remove_existed_sock(sock_file)
         sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
         sock.bind(sock_file)
+        self._sock_files[sock] = sock_file
         sock.connect(ctrl_iface)
+        return sock
+
+    def close_ctrl_sock(self, sock: socket.socket) -> None:
+        """Close a socket opened by open_ctrl_sock() and remove its file."""
+        sock.close()
+        sock_file = self._sock_files.pop(sock, None)
+        if sock_file is not None:
+            self._remove_existed_sock(sock_file)
 
-        send_len = sock.send(b"PING")
+    def _run(self, iface: str, request: wpactrl.Request[T]) -> T:
+        return wpactrl.run(request, functools.partial(self._send_cmd_to_wpas, iface))
+
+    def _connect_to_wpa_s(self, iface: str) -> None:
+        ctrl_iface = "/".join([CTRL_IFACE_DIR, iface])
+        old_conn = self._connections.get(iface)
+        if old_conn is not None:
+            self._logger.info("Connection for iface '%s' aleady existed!", iface)
+
+        sock = self.open_ctrl_sock(iface)
+
+        sock.send(b"PING")
         retry = CTRL_IFACE_RETRY
         while retry >= 0:
             reply = sock.recv(REPLY_SIZE)
@@ -304,25 +299,64 @@ class WifiUtil:
                 self._logger.info("Connect to sock '%s' successfully!", ctrl_iface)
                 self._connections[iface] = {
                     "sock": sock,
-                    "sock_file": sock_file,
+                    "sock_file": self._sock_files.get(sock),
                     "ctrl_iface": ctrl_iface,
+                    "lock": threading.Lock(),
+                    "pid": os.getpid(),
                 }
                 break
             retry -= 1
 
+        # A connection inherited from the parent process shares its socket,
+        # so only a connection of this process is closed.
+        if old_conn is not None and old_conn.get("pid") == os.getpid():
+            self.close_ctrl_sock(old_conn["sock"])
+
+    def _client_sock_file(self, iface: str, suffix: str = "") -> str:
+        # Every socket of every process gets its own address, so processes
+        # and threads talking to the same interface never steal the replies
+        # of each other. The trailing pid lets stale files be cleaned up.
+        sock_file = "{}/{}_{}".format(CLIENT_SOCK_DIR, "pywifi", iface)
+        if suffix:
+            sock_file = f"{sock_file}_{suffix}"
+        return f"{sock_file}_{next(self._sock_ids)}.{os.getpid()}"
+
     def _remove_existed_sock(self, sock_file: str) -> None:
         if os.path.exists(sock_file):
             mode = os.stat(sock_file).st_mode
             if stat.S_ISSOCK(mode):
                 os.remove(sock_file)
 
+    def _remove_stale_socks(self) -> None:
+        """Remove the client sockets left behind by processes which are gone."""
+        try:
+            files = os.listdir(CLIENT_SOCK_DIR)
+        except OSError:
+            return
+
+        for f in files:
+            match = _CLIENT_SOCK_RE.fullmatch(f)
+            if match is None or _pid_alive(int(match.group(1))):
+                continue
+            try:
+                self._remove_existed_sock(f"{CLIENT_SOCK_DIR}/{f}")
+            except OSError:
+                self._logger.debug("Cannot remove stale socket '%s'", f)
+
     def _send_cmd_to_wpas(self, iface: str, cmd: str, *, get_reply: bool = False) -> str | None:
         if "psk" not in cmd:
             self._logger.info("Send cmd '%s' to wpa_s", cmd)
-        sock = self._connections[iface]["sock"]
-
-        sock.send(bytearray(cmd, "utf-8"))
-        reply = sock.recv(REPLY_SIZE)
+        conn = self._connections[iface]
+        if conn.get("pid") != os.getpid():
+            # A forked child must not read the replies meant for its parent.
+            self._connect_to_wpa_s(iface)
+            conn = self._connections[iface]
+
+        # Interfaces may be driven from background threads (e.g. roaming),
+        # so a request and its reply must not interleave with another one.
+        with conn["lock"]:
+            conn["sock"].send(bytearray(cmd, "utf-8"))
+            reply = conn["sock"].recv(REPLY_SIZE)
         if get_reply:
             return reply.decode("utf-8")
 
@@ -333,3 +367,15 @@ class WifiUtil:
                 cmd,
             )
         return None
+
+
+@atexit.register
+def _remove_client_socks() -> None:
+    """Remove the client sockets of this process at exit."""
+    suffix = f".{os.getpid()}"
+    for sock_file in list(WifiUtil._sock_files.values()):  # noqa: SLF001
+        if sock_file.endswith(suffix):
+            try:
+                os.remove(sock_file)
+            except OSError:
+                continue
@@ -1,43 +1,36 @@
 #!/usr/bin/env python3
 
-"""Implementations of wifi functions of Linux."""
+"""Implementations of wifi functions of Windows."""
 
+import copy
 import logging
 import platform
-import re
-from ctypes import (
-    POINTER,
-    Structure,
-    _Pointer,
-    byref,
-    c_bool,
-    c_byte,
-    c_char,
-    c_long,
-    c_ubyte,
-    c_uint,
-    c_ulong,
-    c_ulonglong,
-    c_ushort,
-    c_void_p,
-    c_wchar,
-    c_wchar_p,
-    cast,
-    create_unicode_buffer,
-    pointer,
-    windll,
+from collections.abc import Callable
+from ctypes import create_unicode_buffer
+from xml.etree import ElementTree
+
+from pywifi import psk
+from pywifi._wlanapi import (
+    DOT11_SSID,
+    ERROR_SUCCESS,
+    WLAN_AVAILABLE_NETWORK_LIST,
+    WLAN_BSS_LIST,
+    WLAN_BSS_TYPE_INFRASTRUCTURE,
+    WLAN_CONNECTION_PARAMETERS,
+    WlanApi,
+    WlanApiError,
+    entries_of,
+    ssid_bytes,
 )
-from ctypes.wintypes import DWORD, HANDLE, LPWSTR, WCHAR
-
-from comtypes import GUID
-
 from pywifi.const import (
     AkmType,
     AuthAlgorithm,
     CipherType,
     IfaceStatus,
+    KeyType,
 )
-from pywifi.profile import Profile
+from pywifi.link import LinkInfo
+from pywifi.profile import Profile, diff_profiles
 
 if platform.release().lower() == "xp":
     if platform.win32_ver()[2].lower() in ["sp2", "sp3"]:
@@ -45,23 +38,6 @@ if platform.release().lower() == "xp":
 else:
     CLIENT_VERSION = 2
 
-"""
-Some types does not exist in python2 ctypes.wintypes so we fake them
-using how its defined in python3 ctypes.wintypes.
-"""
-if "PDWORD" not in dir():
-    PDWORD = POINTER(DWORD)
-
-if "PWCHAR" not in dir():
-    PWCHAR = POINTER(WCHAR)
-
-ERROR_SUCCESS = 0
-WLAN_MAX_PHY_TYPE_NUMBER = 8
-DOT11_MAC_ADDRESS = c_ubyte * 6
-
-
-native_wifi = windll.wlanapi
-
 status_dict = [
     IfaceStatus.INACTIVE,
     IfaceStatus.CONNECTED,
@@ -111,197 +87,169 @@ cipher_value_to_str_dict = {
     CipherType.UNKNOWN: "UNKNOWN",
 }
 
+key_type_str_to_value_dict = {
+    "networkKey": KeyType.NETWORKKEY,
+    "passPhrase": KeyType.PASSPHRASE,
+}
 
-class WLAN_INTERFACE_INFO(Structure):  # noqa: N801
-    _fields_ = [
-        ("InterfaceGuid", GUID),
-        ("strInterfaceDescription", c_wchar * 256),
-        ("isState", c_uint),
-    ]
-
-
-class WLAN_INTERFACE_INFO_LIST(Structure):  # noqa: N801
-    _fields_ = [
-        ("dwNumberOfItems", DWORD),
-        ("dwIndex", DWORD),
-        ("InterfaceInfo", WLAN_INTERFACE_INFO * 1),
-    ]
-
-
-class DOT11_SSID(Structure):  # noqa: N801
-    _fields_ = [("uSSIDLength", c_ulong), ("ucSSID", c_char * 32)]
-
-
-class WLAN_RATE_SET(Structure):  # noqa: N801
-    _fields_ = [("uRateSetLength", c_ulong), ("usRateSet", c_ushort * 126)]
-
-
-class WLAN_RAW_DATA(Structure):  # noqa: N801
-    _fields_ = [("dwDataSize", DWORD), ("DataBlob", c_byte * 1)]
-
-
-class WLAN_AVAILABLE_NETWORK(Structure):  # noqa: N801
-    _fields_ = [
-        ("strProfileName", c_wchar * 256),
-        ("dot11Ssid", DOT11_SSID),
-        ("dot11BssType", c_uint),
-        ("uNumberOfBssids", c_ulong),
-        ("bNetworkConnectable", c_bool),
-        ("wlanNotConnectableReason", c_uint),
-        ("uNumberOfPhyTypes", c_ulong * WLAN_MAX_PHY_TYPE_NUMBER),
-        ("dot11PhyTypes", c_uint),
-        ("bMorePhyTypes", c_bool),
-        ("wlanSignalQuality", c_ulong),
-        ("bSecurityEnabled", c_bool),
-        ("dot11DefaultAuthAlgorithm", c_uint),
-        ("dot11DefaultCipherAlgorithm", c_uint),
-        ("dwFlags", DWORD),
-        ("dwReserved", DWORD),
-    ]
-
-
-class WLAN_AVAILABLE_NETWORK_LIST(Structure):  # noqa: N801
-    _fields_ = [
-        ("dwNumberOfItems", DWORD),
-        ("dwIndex", DWORD),
-        ("Network", WLAN_AVAILABLE_NETWORK * 1),
-    ]
 
+def _find_text(root: ElementTree.Element, path: str) -> str | None:
+    """Find the text of an element of a profile, whatever its namespace."""
+    element = root.find("/".join(f"{{*}}{tag}" for tag in path.split("/")))
+    return None if element is None or element.text is None else element.text.strip()
 
-class WLAN_BSS_ENTRY(Structure):  # noqa: N801
-    _fields_ = [
-        ("dot11Ssid", DOT11_SSID),
-        ("uPhyId", c_ulong),
-        ("dot11Bssid", DOT11_MAC_ADDRESS),
-        ("dot11BssType", c_uint),
-        ("dot11BssPhyType", c_uint),
-        ("lRssi", c_long),
-        ("uLinkQuality", c_ulong),
-        ("bInRegDomain", c_bool),
-        ("usBeaconPeriod", c_ushort),
-        ("ullTimestamp", c_ulonglong),
-        ("ullHostTimestamp", c_ulonglong),
-        ("usCapabilityInformation", c_ushort),
-        ("ulChCenterFrequency", c_ulong),
-        ("wlanRateSet", WLAN_RATE_SET),
-        ("ulIeOffset", c_ulong),
-        ("ulIeSize", c_ulong),
-    ]
 
+def parse_profile_xml(xml: str) -> Profile:
+    """Parse the XML of a WLAN profile into a Profile."""
+    root = ElementTree.fromstring(xml)
+    profile = Profile()
 
-class WLAN_BSS_LIST(Structure):  # noqa: N801
-    _fields_ = [
-        ("dwTotalSize", DWORD),
-        ("dwNumberOfItems", DWORD),
-        ("wlanBssEntries", WLAN_BSS_ENTRY * 1),
-    ]
+    profile.ssid = _find_text(root, "SSIDConfig/SSID/name")
+    if profile.ssid is None:
+        hex_ssid = _find_text(root, "SSIDConfig/SSID/hex")
+        if hex_ssid is not None:
+            profile.ssid = bytes.fromhex(hex_ssid).decode("utf-8", errors="replace")
 
+    security = "MSM/security/"
+    auth = (_find_text(root, security + "authEncryption/authentication") or "open").upper()
+    profile.akm = []
+    if auth in akm_str_to_value_dict:
+        profile.auth = AuthAlgorithm.OPEN
+        profile.akm.append(akm_str_to_value_dict[auth])
+    elif auth.lower() in auth_str_to_value_dict:
+        profile.auth = auth_str_to_value_dict[auth.lower()]
+        profile.akm.append(AkmType.NONE)
+    else:
+        profile.auth = AuthAlgorithm.OPEN
 
-class NDIS_OBJECT_HEADER(Structure):  # noqa: N801
-    _fields_ = [("Type", c_ubyte), ("Revision", c_ubyte), ("Size", c_ushort)]
+    encryption = (_find_text(root, security + "authEncryption/encryption") or "none").upper()
+    profile.cipher = cipher_str_to_value_dict.get(encryption, CipherType.UNKNOWN)
 
+    key_type = _find_text(root, security + "sharedKey/keyType")
+    profile.key_type = key_type_str_to_value_dict.get(key_type)
+    # A protected key is encrypted for the machine; only a plain one is usable.
+    if _find_text(root, security + "sharedKey/protected") != "true":
+        profile.key = _find_text(root, security + "sharedKey/keyMaterial")
 
-class DOT11_BSSID_LIST(Structure):  # noqa: N801
-    _fields_ = [
-        ("Header", NDIS_OBJECT_HEADER),
-        ("uNumOfEntries", c_ulong),
-        ("uTotalNumOfEntries", c_ulong),
-        ("BSSIDs", DOT11_MAC_ADDRESS * 1),
-    ]
+    return profile
 
 
-class WLAN_CONNECTION_PARAMETERS(Structure):  # noqa: N801
-    _fields_ = [
-        ("wlanConnectionMode", c_uint),
-        ("strProfile", c_wchar_p),
-        ("pDot11Ssid", POINTER(DOT11_SSID)),
-        ("pDesiredBssidList", POINTER(DOT11_BSSID_LIST)),
-        ("dot11BssType", c_uint),
-        ("dwFlags", DWORD),
-    ]
-
-
-class WLAN_PROFILE_INFO(Structure):  # noqa: N801
-    _fields_ = [("strProfileName", c_wchar * 256), ("dwFlags", DWORD)]
-
-
-class WLAN_PROFILE_INFO_LIST(Structure):  # noqa: N801
-    _fields_ = [
-        ("dwNumberOfItems", DWORD),
-        ("dwIndex", DWORD),
-        ("ProfileInfo", WLAN_PROFILE_INFO * 1),
-    ]
+def _copy_profile(profile: Profile) -> Profile:
+    new_profile = copy.copy(profile)
+    new_profile.akm = list(profile.akm)
+    return new_profile
 
 
 class WifiUtil:
     """WifiUtil implements the wifi functions in Windows."""
 
-    _nego_version = DWORD()
-    _handle = HANDLE()
-    _ifaces = pointer(WLAN_INTERFACE_INFO_LIST())
+    _api = None
+    _handle = None
+    _profile_stores: dict[bytes, dict[str, Profile]] = {}
     _logger = logging.getLogger("pywifi")
 
-    def scan(self, obj: dict[str, str]) -> None:
-        """Trigger the wifi interface to scan."""
-        self._wlan_scan(self._handle, byref(obj["guid"]))
+    def __init__(self, api: WlanApi | None = None) -> None:
+        """Create the Windows backend, calling wlanapi through ``api``."""
+        if api is not None:
+            self._api = api
+        elif WifiUtil._api is None:
+            WifiUtil._api = WlanApi()
 
-    def scan_results(self, obj: dict[str, str]) -> list[Profile]:
-        """Get the AP list after scanning."""
-        avail_network_list = pointer(WLAN_AVAILABLE_NETWORK_LIST())
-        self._wlan_get_available_network_list(
-            self._handle,
-            byref(obj["guid"]),
-            byref(avail_network_list),
-        )
-        networks = cast(
-            avail_network_list.contents.Network,
-            POINTER(WLAN_AVAILABLE_NETWORK),
-        )
+    def scan(
+        self,
+        obj: dict[str, str],
+        freqs: list[int] | None = None,
+        ssids: list[str] | None = None,
+        *,
+        passive: bool = False,
+        only_new: bool = False,
+    ) -> None:
+        """Trigger the wifi interface to scan.
+
+        WlanScan can only probe a single SSID and cannot restrict the
+        channels or the scan type, so those options are ignored.
+        """
+        if freqs or passive or only_new:
+            self._logger.debug("Scan options other than a single SSID are ignored")
 
-        self._logger.debug(
-            "Scan found %d networks.",
-            avail_network_list.contents.dwNumberOfItems,
-        )
+        ssid = None
+        if ssids:
+            if len(ssids) > 1:
+                self._logger.debug("Only the first SSID is probed: '%s'", ssids[0])
+            raw_ssid = ssids[0].encode("utf-8")
+            ssid = DOT11_SSID(len(raw_ssid), raw_ssid)
 
-        network_list = []
-        for i in range(avail_network_list.contents.dwNumberOfItems):
-            if networks[i].dot11BssType == 1 and networks[i].bNetworkConnectable:
-                ssid = ""
-                for j in range(networks[i].dot11Ssid.uSSIDLength):
-                    if networks[i].dot11Ssid.ucSSID != b"":
-                        ssid += f"{networks[i].dot11Ssid.ucSSID[j]:c}"
-
-                bss_list = pointer(WLAN_BSS_LIST())
-                self._wlan_get_network_bss_list(
-                    self._handle,
-                    byref(obj["guid"]),
-                    byref(bss_list),
-                    networks[i].dot11Ssid,
-                    networks[i].bSecurityEnabled,
-                )
-                bsses = cast(bss_list.contents.wlanBssEntries, POINTER(WLAN_BSS_ENTRY))
+        self._api.scan(self._handle, obj["guid"], ssid)
 
-                if networks[i].bSecurityEnabled:
-                    akm = self._get_akm(networks[i].dot11DefaultCipherAlgorithm)
-                    auth_alg = self._get_auth_alg(networks[i].dot11DefaultAuthAlgorithm)
-                else:
-                    akm = [AkmType.NONE]
-                    auth_alg = [AuthAlgorithm.OPEN]
+    def scan_results(self, obj: dict[str, str]) -> list[Profile]:
+        """Get the AP list after scanning.
 
-                for j in range(bss_list.contents.dwNumberOfItems):
-                    network = Profile()
+        The BSSes of all the networks come from a single BSS list query and
+        get the security settings of their network from the available
+        network list. Only the BSSes of connectable networks are returned.
+        """
+        networks = self._api.get_available_network_list(self._handle, obj["guid"])
+        try:
+            security = self._network_security(networks.contents)
+        finally:
+            self._api.free_memory(networks)
 
-                    network.ssid = ssid
+        bss_list = self._api.get_network_bss_list(
+            self._handle,
+            obj["guid"],
+            bss_type=WLAN_BSS_TYPE_INFRASTRUCTURE,
+        )
+        try:
+            return self._bss_profiles(bss_list.contents, security)
+        finally:
+            self._api.free_memory(bss_list)
 
-                    network.bssid = ""
-                    for k in range(6):
-                        network.bssid += f"{bsses[j].dot11Bssid[k]:02x}:"
+    def _network_security(
+        self,
+        network_list: WLAN_AVAILABLE_NETWORK_LIST,
+    ) -> dict[bytes, tuple[list[int], list[int]]]:
+        """Get the (akm, auth) of the connectable networks keyed by raw SSID."""
+        self._logger.debug("Scan found %d networks.", network_list.dwNumberOfItems)
+
+        security = {}
+        for network in entries_of(network_list.Network, network_list.dwNumberOfItems):
+            if network.dot11BssType != WLAN_BSS_TYPE_INFRASTRUCTURE:
+                continue
+            if not network.bNetworkConnectable:
+                continue
+
+            if network.bSecurityEnabled:
+                akm = self._get_akm(network.dot11DefaultCipherAlgorithm)
+                auth_alg = self._get_auth_alg(network.dot11DefaultAuthAlgorithm)
+            else:
+                akm = [AkmType.NONE]
+                auth_alg = [AuthAlgorithm.OPEN]
+            # A network with a saved profile is also listed without it.
+            security.setdefault(ssid_bytes(network.dot11Ssid), (akm, auth_alg))
+
+        return security
 
-                    network.signal = bsses[j].lRssi
-                    network.freq = bsses[j].ulChCenterFrequency
-                    network.auth = auth_alg
-                    network.akm = akm
-                    network_list.append(network)
+    def _bss_profiles(
+        self,
+        bss_list: WLAN_BSS_LIST,
+        security: dict[bytes, tuple[list[int], list[int]]],
+    ) -> list[Profile]:
+        network_list = []
+        for bss in entries_of(bss_list.wlanBssEntries, bss_list.dwNumberOfItems):
+            raw_ssid = ssid_bytes(bss.dot11Ssid)
+            if raw_ssid not in security:
+                continue
+
+            akm, auth_alg = security[raw_ssid]
+            network = Profile()
+            network.ssid = raw_ssid.decode("utf-8", errors="replace")
+            network.bssid = bytes(bss.dot11Bssid).hex(":")
+            network.signal = bss.lRssi
+            # wlanapi reports the center frequency in kHz.
+            network.freq = bss.ulChCenterFrequency // 1000
+            network.auth = list(auth_alg)
+            network.akm = list(akm)
+            network_list.append(network)
 
         return network_list
 
@@ -313,17 +261,31 @@ class WifiUtil:
         profile_name = create_unicode_buffer(params.ssid)
 
         connect_params.strProfile = profile_name.value
-        ret = self._wlan_connect(self._handle, obj["guid"], byref(connect_params))
+        ret = self._api.connect(self._handle, obj["guid"], connect_params)
         self._logger.debug("connect result: %d", ret)
 
+    def reassociate(
+        self,
+        obj: dict[str, str],
+        network_id: int,
+        bssid: str | None = None,
+        freq: int | None = None,
+    ) -> None:
+        """Select a saved network again, preferring a BSS and scanning only its frequency."""
+        raise NotImplementedError("Reassociation by network id is not supported on Windows")
+
     def disconnect(self, obj: dict[str, str]) -> None:
         """Disconnect to the specified AP."""
-        self._wlan_disconnect(self._handle, obj["guid"])
+        self._api.disconnect(self._handle, obj["guid"])
 
-    def add_network_profile(self, obj: dict[str, str], params: Profile) -> Profile:
+    def add_network_profile(
+        self,
+        obj: dict[str, str],
+        params: Profile,
+        *,
+        derive_psk: bool = False,
+    ) -> Profile:
         """Add an AP profile for connecting to afterward."""
-        reason_code = DWORD()
-
         params.process_akm()
         profile_data = {}
         profile_data["ssid"] = params.ssid
@@ -336,6 +298,10 @@ class WifiUtil:
             profile_data["encrypt"] = cipher_value_to_str_dict[params.cipher]
 
         profile_data["key"] = params.key
+        profile_data["key_type"] = "passPhrase"
+        if params.key and (derive_psk or psk.is_raw_psk(params.key)):
+            profile_data["key"] = psk.default_cache.get(params.ssid, params.key)
+            profile_data["key_type"] = "networkKey"
 
         profile_data["protected"] = "false"
         profile_data["profile_name"] = params.ssid
@@ -361,7 +327,7 @@ class WifiUtil:
 
         if AkmType.NONE not in params.akm:
             xml += """<sharedKey>
-                        <keyType>passPhrase</keyType>
+                        <keyType>{key_type}</keyType>
                         <protected>{protected}</protected>
                         <keyMaterial>{key}</keyMaterial>
                     </sharedKey>"""
@@ -378,350 +344,215 @@ class WifiUtil:
 
         xml = xml.format(**profile_data)
 
-        status = self._wlan_set_profile(
-            self._handle,
-            obj["guid"],
-            xml,
-            True,  # noqa: FBT003
-            byref(reason_code),
-        )
+        status, reason_code = self._api.set_profile(self._handle, obj["guid"], xml)
         if status != ERROR_SUCCESS:
-            self._logger.debug("Status %d: Add profile failed", status)
+            self._logger.debug(
+                "Status %d: Add profile failed: %s",
+                status,
+                self._api.reason_code_to_str(reason_code),
+            )
 
-        buf_size = DWORD(64)
-        buf = create_unicode_buffer(64)
-        self._wlan_reason_code_to_str(reason_code, buf_size, buf)
+        store = self._profile_stores.get(bytes(obj["guid"]))
+        if store is not None:
+            store.pop(params.ssid, None)
+            profile = self._read_profile(obj, params.ssid) if status == ERROR_SUCCESS else None
+            if profile is not None:
+                store[params.ssid] = profile
 
         return params
 
+    def update_network_key(
+        self,
+        obj: dict[str, str],
+        params: Profile,
+        *,
+        derive_psk: bool = False,
+    ) -> None:
+        """Set the key of the saved profile of ``params.ssid`` to ``params.key``."""
+        if params.key:
+            # Setting a profile of the same name replaces it.
+            self.add_network_profile(obj, params, derive_psk=derive_psk)
+
+    def apply_profiles(
+        self,
+        obj: dict[str, str],
+        desired: list[Profile],
+        *,
+        update_keys: bool = False,
+        derive_psk: bool = False,
+    ) -> list[Profile]:
+        """Make the saved AP profiles match the desired ones.
+
+        Saved profiles matching a desired profile are kept, the missing ones
+        are added and the others are deleted.
+        """
+        matched, to_add, to_remove = diff_profiles(self.network_profiles(obj), desired)
+
+        for saved in to_remove:
+            self.remove_network_profile(obj, saved)
+
+        if update_keys:
+            to_add += [profile for profile, _ in matched if profile.key]
+
+        for profile in to_add:
+            self.add_network_profile(obj, profile, derive_psk=derive_psk)
+
+        return desired
+
     def network_profile_name_list(self, obj: dict[str, str]) -> list[str]:
         """Get AP profile names."""
-        profile_list = pointer(WLAN_PROFILE_INFO_LIST())
-        self._wlan_get_profile_list(
-            self._handle,
-            byref(obj["guid"]),
-            byref(profile_list),
-        )
-        profiles = cast(profile_list.contents.ProfileInfo, POINTER(WLAN_PROFILE_INFO))
-
-        profile_name_list = []
-        for i in range(profile_list.contents.dwNumberOfItems):
-            profile_name = ""
-            for j in range(len(profiles[i].strProfileName)):
-                profile_name += profiles[i].strProfileName[j]
-            profile_name_list.append(profile_name)
-
-        return profile_name_list
-
-    def network_profiles(self, obj: dict[str, str]) -> list[Profile]:
-        """Get AP profiles."""
-        profile_name_list = self.network_profile_name_list(obj)
-
-        profile_list = []
-        for profile_name in profile_name_list:
-            profile = Profile()
-            flags = DWORD()
-            access = DWORD()
-            xml = LPWSTR()
-            self._wlan_get_profile(
-                self._handle,
-                obj["guid"],
-                profile_name,
-                byref(xml),
-                byref(flags),
-                byref(access),
-            )
-            # fill profile info
-            profile.ssid = re.search(r"<name>(.*)</name>", xml.value).group(1)
-            auth = re.search(r"<authentication>(.*)</authentication>", xml.value).group(1).upper()
-
-            profile.akm = []
-            if auth not in akm_str_to_value_dict:
-                if auth not in auth_str_to_value_dict:
-                    profile.auth = AuthAlgorithm.OPEN
-                else:
-                    profile.auth = auth_str_to_value_dict[auth]
-                    profile.akm.append(AkmType.NONE)
-            else:
-                profile.auth = AuthAlgorithm.OPEN
-                profile.akm.append(akm_str_to_value_dict[auth])
-
-            profile_list.append(profile)
+        return list(self._profile_store(obj))
+
+    def network_profiles(self, obj: dict[str, str], ssid: str | None = None) -> list[Profile]:
+        """Get AP profiles, or only the ones of ``ssid``."""
+        return [
+            _copy_profile(profile)
+            for profile in self._profile_store(obj).values()
+            if ssid is None or profile.ssid == ssid
+        ]
 
-        return profile_list
+    def invalidate_profiles(self, obj: dict[str, str]) -> None:
+        """Forget the cached AP profiles, e.g. after they were changed outside pywifi."""
+        self._profile_stores.pop(bytes(obj["guid"]), None)
 
     def remove_network_profile(self, obj: dict[str, str], params: Profile) -> None:
         """Remove the specified AP profile."""
         self._logger.debug("delete profile: %s", params.ssid)
-        str_buf = create_unicode_buffer(params.ssid)
-        ret = self._wlan_delete_profile(self._handle, obj["guid"], str_buf)
+        ret = self._api.delete_profile(self._handle, obj["guid"], params.ssid)
         self._logger.debug("delete result %d", ret)
+        self._profile_stores.get(bytes(obj["guid"]), {}).pop(params.ssid, None)
 
     def remove_all_network_profiles(self, obj: dict[str, str]) -> None:
         """Remove all the AP profiles."""
-        profile_name_list = self.network_profile_name_list(obj)
+        store = self._profile_store(obj)
 
-        for profile_name in profile_name_list:
+        for profile_name in list(store):
             self._logger.debug("delete profile: %s", profile_name)
-            str_buf = create_unicode_buffer(profile_name)
-            ret = self._wlan_delete_profile(self._handle, obj["guid"], str_buf)
+            ret = self._api.delete_profile(self._handle, obj["guid"], profile_name)
             self._logger.debug("delete result %d", ret)
+            del store[profile_name]
+
+    def _profile_store(self, obj: dict[str, str]) -> dict[str, Profile]:
+        """Get the saved profiles keyed by name, parsed once and then cached."""
+        key = bytes(obj["guid"])
+        store = self._profile_stores.get(key)
+        if store is not None:
+            return store
+
+        store = {}
+        for profile_name in self._list_profile_names(obj):
+            profile = self._read_profile(obj, profile_name)
+            if profile is not None:
+                store[profile_name] = profile
+
+        self._profile_stores[key] = store
+        return store
+
+    def _list_profile_names(self, obj: dict[str, str]) -> list[str]:
+        profile_list = self._api.get_profile_list(self._handle, obj["guid"])
+        try:
+            profiles = entries_of(
+                profile_list.contents.ProfileInfo,
+                profile_list.contents.dwNumberOfItems,
+            )
+            return [profile.strProfileName for profile in profiles]
+        finally:
+            self._api.free_memory(profile_list)
+
+    def _read_profile(self, obj: dict[str, str], profile_name: str) -> Profile | None:
+        try:
+            xml = self._api.get_profile(self._handle, obj["guid"], profile_name)
+        except WlanApiError:
+            self._logger.debug("Get profile '%s' failed", profile_name)
+            return None
+        return parse_profile_xml(xml)
 
     def status(self, obj: dict[str, str]) -> int:
         """Get the wifi interface status."""
-        data_size = DWORD()
-        data = PDWORD()
-        opcode_value_type = DWORD()
-        self._wlan_query_interface(
-            self._handle,
-            obj["guid"],
-            6,
-            byref(data_size),
-            byref(data),
-            byref(opcode_value_type),
-        )
+        state = self._api.query_interface_state(self._handle, obj["guid"])
+        if not 0 <= state < len(status_dict):
+            return IfaceStatus.DISCONNECTED
+        return status_dict[state]
 
-        return status_dict[data.contents.value]
+    def link_info(self, obj: dict[str, str]) -> LinkInfo:
+        """Get the status of the wifi interface; only the status is known."""
+        return LinkInfo(status=self.status(obj))
 
-    def interfaces(self) -> list[dict[str, str]]:
-        """Get the wifi interface lists."""
-        ifaces = []
+    def status_fields(self, obj: dict[str, str]) -> dict[str, str]:
+        """Get all the fields of the wifi interface status."""
+        raise NotImplementedError("Status fields are not supported on Windows")
 
-        if (
-            self._wlan_open_handle(
-                CLIENT_VERSION,
-                byref(self._nego_version),
-                byref(self._handle),
-            )
-            is not ERROR_SUCCESS
-        ):
-            self._logger.error("Open handle failed!")
+    def signal_poll(self, obj: dict[str, str]) -> dict[str, int]:
+        """Get the signal parameters (e.g. RSSI, LINKSPEED) of the current link."""
+        raise NotImplementedError("Signal polling is not supported on Windows")
 
-        if self._wlan_enum_interfaces(self._handle, byref(self._ifaces)) is not ERROR_SUCCESS:
-            self._logger.error("Enum interface failed!")
+    def packet_counts(self, obj: dict[str, str]) -> dict[str, int]:
+        """Get the TXGOOD, TXBAD and RXGOOD packet counters of the current link."""
+        raise NotImplementedError("Packet counters are not supported on Windows")
 
-        interfaces = cast(
-            self._ifaces.contents.InterfaceInfo,
-            POINTER(WLAN_INTERFACE_INFO),
-        )
-        for i in range(self._ifaces.contents.dwNumberOfItems):
-            iface: dict[str, str] = {}
-            iface["guid"] = interfaces[i].InterfaceGuid
-            iface["name"] = interfaces[i].strInterfaceDescription
-            ifaces.append(iface)
+    def bss_details(self, obj: dict[str, str], bssid: str) -> None:
+        """Get all the fields and IEs of a BSS, None if it is unknown."""
+        raise NotImplementedError("BSS details are not supported on Windows")
 
-        return ifaces
+    def bss_details_all(self, obj: dict[str, str]) -> list:
+        """Get all the fields and IEs of every BSS seen by the scans."""
+        raise NotImplementedError("BSS details are not supported on Windows")
 
-    def _wlan_open_handle(
-        self,
-        client_version: DWORD,
-        _nego_version: "POINTER[DWORD]",
-        handle: "POINTER[HANDLE]",
-    ) -> DWORD:
-        func = native_wifi.WlanOpenHandle
-        func.argtypes = [DWORD, c_void_p, POINTER(DWORD), POINTER(HANDLE)]
-        func.restypes = [DWORD]
-        return func(client_version, None, _nego_version, handle)
-
-    def _wlan_close_handle(self, handle: HANDLE) -> DWORD:
-        func = native_wifi.WlanCloseHandle
-        func.argtypes = [HANDLE, c_void_p]
-        func.restypes = [DWORD]
-        return func(handle, None)
-
-    def _wlan_enum_interfaces(
-        self,
-        handle: HANDLE,
-        ifaces: "POINTER[POINTER[WLAN_INTERFACE_INFO_LIST]]",
-    ) -> DWORD:
-        func = native_wifi.WlanEnumInterfaces
-        func.argtypes = [HANDLE, c_void_p, POINTER(POINTER(WLAN_INTERFACE_INFO_LIST))]
-        func.restypes = [DWORD]
-        return func(handle, None, ifaces)
-
-    def _wlan_get_available_network_list(
-        self,
-        handle: HANDLE,
-        iface_guid: "POINTER[GUID]",
-        network_list: "POINTER[POINTER[WLAN_AVAILABLE_NETWORK_LIST]]",
-    ) -> DWORD:
-        func = native_wifi.WlanGetAvailableNetworkList
-        func.argtypes = [
-            HANDLE,
-            POINTER(GUID),
-            DWORD,
-            c_void_p,
-            POINTER(POINTER(WLAN_AVAILABLE_NETWORK_LIST)),
-        ]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, 2, None, network_list)
+    def roam(self, obj: dict[str, str], bssid: str) -> None:
+        """Roam to the specified BSS of the current network."""
+        raise NotImplementedError("Roaming is not supported on Windows")
 
-    def _wlan_get_network_bss_list(
-        self,
-        handle: HANDLE,
-        iface_guid: "POINTER[GUID]",
-        bss_list: "POINTER[POINTER[WLAN_BSS_LIST]]",
-        ssid: "POINTER[DOT11_SSID] | None" = None,
-        security: c_bool = False,  # noqa: FBT002
-    ) -> DWORD:
-        func = native_wifi.WlanGetNetworkBssList
-        func.argtypes = [
-            HANDLE,
-            POINTER(GUID),
-            POINTER(DOT11_SSID),
-            c_uint,
-            c_bool,
-            c_void_p,
-            POINTER(POINTER(WLAN_BSS_LIST)),
-        ]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, ssid, 1, security, None, bss_list)
-
-    def _wlan_scan(self, handle: HANDLE, iface_guid: "POINTER[GUID]") -> DWORD:
-        func = native_wifi.WlanScan
-        func.argtypes = [
-            HANDLE,
-            POINTER(GUID),
-            POINTER(DOT11_SSID),
-            POINTER(WLAN_RAW_DATA),
-            c_void_p,
-        ]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, None, None, None)
+    def attach(self, obj: dict[str, str]) -> None:
+        """Open a socket receiving the unsolicited events of the wifi interface."""
+        raise NotImplementedError("Event monitoring is not supported on Windows")
 
-    def _wlan_connect(
-        self,
-        handle: HANDLE,
-        iface_guid: "POINTER[GUID]",
-        params: "POINTER[WLAN_CONNECTION_PARAMETERS]",
-    ) -> DWORD:
-        func = native_wifi.WlanConnect
-        func.argtypes = [
-            HANDLE,
-            POINTER(GUID),
-            POINTER(WLAN_CONNECTION_PARAMETERS),
-            c_void_p,
-        ]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, params, None)
+    def detach(self, obj: dict[str, str], sock: object) -> None:
+        """Close a socket opened by attach()."""
+        raise NotImplementedError("Event monitoring is not supported on Windows")
 
-    def _wlan_set_profile(
-        self,
-        handle: HANDLE,
-        iface_guid: "POINTER[GUID]",
-        xml: c_wchar_p,
-        overwrite: c_bool,
-        reason_code: "POINTER[DWORD]",
-    ) -> DWORD:
-        func = native_wifi.WlanSetProfile
-        func.argtypes = [
-            HANDLE,
-            POINTER(GUID),
-            DWORD,
-            c_wchar_p,
-            c_wchar_p,
-            c_bool,
-            c_void_p,
-            POINTER(DWORD),
-        ]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, 2, xml, None, overwrite, None, reason_code)
+    def subscribe_properties(self, obj: dict[str, str], callback: Callable) -> None:
+        """Call ``callback`` with the changed properties of the wifi interface."""
+        raise NotImplementedError("Property signals are not supported on Windows")
 
-    def _wlan_reason_code_to_str(
-        self,
-        reason_code: DWORD,
-        buf_size: DWORD,
-        buf: "POINTER[c_wchar]",
-    ) -> DWORD:
-        func = native_wifi.WlanReasonCodeToString
-        func.argtypes = [DWORD, DWORD, PWCHAR, c_void_p]
-        func.restypes = [DWORD]
-        return func(reason_code, buf_size, buf, None)
-
-    def _wlan_get_profile_list(
-        self,
-        handle: HANDLE,
-        iface_guid: "POINTER[GUID]",
-        profile_list: "POINTER[POINTER[WLAN_PROFILE_INFO_LIST]]",
-    ) -> DWORD:
-        func = native_wifi.WlanGetProfileList
-        func.argtypes = [
-            HANDLE,
-            POINTER(GUID),
-            c_void_p,
-            POINTER(POINTER(WLAN_PROFILE_INFO_LIST)),
-        ]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, None, profile_list)
+    def unsubscribe_properties(self, obj: dict[str, str], callback: Callable) -> None:
+        """Stop calling a callback passed to subscribe_properties()."""
+        raise NotImplementedError("Property signals are not supported on Windows")
 
-    def _wlan_get_profile(  # noqa: PLR0913
-        self,
-        handle: HANDLE,
-        iface_guid: "POINTER[GUID]",
-        profile_name: c_wchar_p,
-        xml: "POINTER[c_wchar_p]",
-        flags: "POINTER[DWORD]",
-        access: "POINTER[DWORD]",
-    ) -> DWORD:
-        func = native_wifi.WlanGetProfile
-        func.argtypes = [
-            HANDLE,
-            POINTER(GUID),
-            c_wchar_p,
-            c_void_p,
-            POINTER(c_wchar_p),
-            POINTER(DWORD),
-            POINTER(DWORD),
-        ]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, profile_name, None, xml, flags, access)
+    def interfaces(self, names: list[str] | None = None) -> list[dict[str, str]]:
+        """Get the wifi interface lists, optionally only the named interfaces."""
+        ifaces = []
 
-    def _wlan_delete_profile(
-        self,
-        handle: HANDLE,
-        iface_guid: POINTER,
-        profile_name: c_wchar_p,
-    ) -> DWORD:
-        func = native_wifi.WlanDeleteProfile
-        func.argtypes = [HANDLE, POINTER(GUID), c_wchar_p, c_void_p]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, profile_name, None)
-
-    def _wlan_query_interface(  # noqa: PLR0913
-        self,
-        handle: HANDLE,
-        iface_guid: "POINTER[GUID]",
-        opcode: DWORD,
-        data_size: "POINTER[DWORD]",
-        data: "POINTER[POINTER[DWORD]]",
-        opcode_value_type: "POINTER[DWORD]",
-    ) -> DWORD:
-        func = native_wifi.WlanQueryInterface
-        func.argtypes = [
-            HANDLE,
-            POINTER(GUID),
-            DWORD,
-            c_void_p,
-            POINTER(DWORD),
-            POINTER(POINTER(DWORD)),
-            POINTER(DWORD),
-        ]
-        func.restypes = [DWORD]
-        return func(
-            handle,
-            iface_guid,
-            opcode,
-            None,
-            data_size,
-            data,
-            opcode_value_type,
-        )
+        try:
+            if WifiUtil._handle is None:
+                WifiUtil._handle = self._api.open_handle(CLIENT_VERSION)
+        except WlanApiError:
+            self._logger.exception("Open handle failed!")
+            return ifaces
+
+        try:
+            iface_list = self._api.enum_interfaces(self._handle)
+        except WlanApiError:
+            self._logger.exception("Enum interface failed!")
+            return ifaces
+
+        try:
+            interfaces = entries_of(
+                iface_list.contents.InterfaceInfo,
+                iface_list.contents.dwNumberOfItems,
+            )
+            for interface in interfaces:
+                iface: dict[str, str] = {}
+                # Copied, as the interface list is freed below.
+                iface["guid"] = type(interface.InterfaceGuid).from_buffer_copy(
+                    interface.InterfaceGuid,
+                )
+                iface["name"] = interface.strInterfaceDescription
+                if names is None or iface["name"] in names:
+                    ifaces.append(iface)
+        finally:
+            self._api.free_memory(iface_list)
 
-    def _wlan_disconnect(self, handle: HANDLE, iface_guid: "POINTER[GUID]") -> DWORD:
-        func = native_wifi.WlanDisconnect
-        func.argtypes = [HANDLE, POINTER(GUID), c_void_p]
-        func.restypes = [DWORD]
-        return func(handle, iface_guid, None)
+        return ifaces
 
     def _get_auth_alg(self, auth_val: int) -> list[int]:
         auth_alg = []
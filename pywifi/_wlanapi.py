@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+
+"""ctypes bindings of the Windows Native Wifi API (wlanapi.dll).
+
+WlanApi wraps the wlanapi functions used by the Windows backend and returns
+their out parameters. The backend only talks to wlanapi through it, so a
+fake WlanApi serving synthetic ctypes buffers lets the backend be tested and
+benchmarked on any platform. This module itself imports everywhere; only
+creating a WlanApi loads wlanapi.dll.
+"""
+
+import ctypes
+from ctypes import (
+    POINTER,
+    Structure,
+    byref,
+    c_bool,
+    c_byte,
+    c_char,
+    c_long,
+    c_ubyte,
+    c_uint,
+    c_ulong,
+    c_ulonglong,
+    c_ushort,
+    c_void_p,
+    c_wchar,
+    c_wchar_p,
+)
+from ctypes.wintypes import DWORD, HANDLE, LPWSTR, WCHAR
+
+try:
+    from comtypes import GUID
+except ImportError:
+
+    class GUID(Structure):
+        """GUID stand-in for the platforms comtypes does not support."""
+
+        _fields_ = [
+            ("Data1", DWORD),
+            ("Data2", c_ushort),
+            ("Data3", c_ushort),
+            ("Data4", c_ubyte * 8),
+        ]
+
+
+ERROR_SUCCESS = 0
+WLAN_MAX_PHY_TYPE_NUMBER = 8
+DOT11_MAC_ADDRESS = c_ubyte * 6
+
+PDWORD = POINTER(DWORD)
+PWCHAR = POINTER(WCHAR)
+
+
+class WLAN_INTERFACE_INFO(Structure):
+    _fields_ = [
+        ("InterfaceGuid", GUID),
+        ("strInterfaceDescription", c_wchar * 256),
+        ("isState", c_uint),
+    ]
+
+
+class WLAN_INTERFACE_INFO_LIST(Structure):
+    _fields_ = [
+        ("dwNumberOfItems", DWORD),
+        ("dwIndex", DWORD),
+        ("InterfaceInfo", WLAN_INTERFACE_INFO * 1),
+    ]
+
+
+class DOT11_SSID(Structure):
+    _fields_ = [("uSSIDLength", c_ulong), ("ucSSID", c_char * 32)]
+
+
+class WLAN_RATE_SET(Structure):
+    _fields_ = [("uRateSetLength", c_ulong), ("usRateSet", c_ushort * 126)]
+
+
+class WLAN_RAW_DATA(Structure):
+    _fields_ = [("dwDataSize", DWORD), ("DataBlob", c_byte * 1)]
+
+
+class WLAN_AVAILABLE_NETWORK(Structure):
+    _fields_ = [
+        ("strProfileName", c_wchar * 256),
+        ("dot11Ssid", DOT11_SSID),
+        ("dot11BssType", c_uint),
+        ("uNumberOfBssids", c_ulong),
+        ("bNetworkConnectable", c_bool),
+        ("wlanNotConnectableReason", c_uint),
+        ("uNumberOfPhyTypes", c_ulong * WLAN_MAX_PHY_TYPE_NUMBER),
+        ("dot11PhyTypes", c_uint),
+        ("bMorePhyTypes", c_bool),
+        ("wlanSignalQuality", c_ulong),
+        ("bSecurityEnabled", c_bool),
+        ("dot11DefaultAuthAlgorithm", c_uint),
+        ("dot11DefaultCipherAlgorithm", c_uint),
+        ("dwFlags", DWORD),
+        ("dwReserved", DWORD),
+    ]
+
+
+class WLAN_AVAILABLE_NETWORK_LIST(Structure):
+    _fields_ = [
+        ("dwNumberOfItems", DWORD),
+        ("dwIndex", DWORD),
+        ("Network", WLAN_AVAILABLE_NETWORK * 1),
+    ]
+
+
+class WLAN_BSS_ENTRY(Structure):
+    _fields_ = [
+        ("dot11Ssid", DOT11_SSID),
+        ("uPhyId", c_ulong),
+        ("dot11Bssid", DOT11_MAC_ADDRESS),
+        ("dot11BssType", c_uint),
+        ("dot11BssPhyType", c_uint),
+        ("lRssi", c_long),
+        ("uLinkQuality", c_ulong),
+        ("bInRegDomain", c_bool),
+        ("usBeaconPeriod", c_ushort),
+        ("ullTimestamp", c_ulonglong),
+        ("ullHostTimestamp", c_ulonglong),
+        ("usCapabilityInformation", c_ushort),
+        ("ulChCenterFrequency", c_ulong),
+        ("wlanRateSet", WLAN_RATE_SET),
+        ("ulIeOffset", c_ulong),
+        ("ulIeSize", c_ulong),
+    ]
+
+
+class WLAN_BSS_LIST(Structure):
+    _fields_ = [
+        ("dwTotalSize", DWORD),
+        ("dwNumberOfItems", DWORD),
+        ("wlanBssEntries", WLAN_BSS_ENTRY * 1),
+    ]
+
+
+class NDIS_OBJECT_HEADER(Structure):
+    _fields_ = [("Type", c_ubyte), ("Revision", c_ubyte), ("Size", c_ushort)]
+
+
+class DOT11_BSSID_LIST(Structure):
+    _fields_ = [
+        ("Header", NDIS_OBJECT_HEADER),
+        ("uNumOfEntries", c_ulong),
+        ("uTotalNumOfEntries", c_ulong),
+        ("BSSIDs", DOT11_MAC_ADDRESS * 1),
+    ]
+
+
+class WLAN_CONNECTION_PARAMETERS(Structure):
+    _fields_ = [
+        ("wlanConnectionMode", c_uint),
+        ("strProfile", c_wchar_p),
+        ("pDot11Ssid", POINTER(DOT11_SSID)),
+        ("pDesiredBssidList", POINTER(DOT11_BSSID_LIST)),
+        ("dot11BssType", c_uint),
+        ("dwFlags", DWORD),
+    ]
+
+
+class WLAN_PROFILE_INFO(Structure):
+    _fields_ = [("strProfileName", c_wchar * 256), ("dwFlags", DWORD)]
+
+
+class WLAN_PROFILE_INFO_LIST(Structure):
+    _fields_ = [
+        ("dwNumberOfItems", DWORD),
+        ("dwIndex", DWORD),
+        ("ProfileInfo", WLAN_PROFILE_INFO * 1),
+    ]
+
+
+def entries_of(array: ctypes.Array, count: int) -> ctypes.Array:
+    """View the variable length array ending a wlanapi list structure."""
+    return (array._type_ * count).from_address(ctypes.addressof(array))
+
+
+def ssid_bytes(ssid: DOT11_SSID) -> bytes:
+    """Get the raw bytes of a DOT11_SSID, which may contain NUL bytes."""
+    length = min(ssid.uSSIDLength, DOT11_SSID.ucSSID.size)
+    return ctypes.string_at(ctypes.addressof(ssid) + DOT11_SSID.ucSSID.offset, length)
+
+
+class WlanApiError(OSError):
+    """A wlanapi function returned an error code."""
+
+    def __init__(self, func: str, status: int) -> None:
+        """Create the error of a failed wlanapi call."""
+        super().__init__(status, f"{func} failed with error {status}")
+        self.func = func
+        self.status = status
+
+
+# (name, argtypes) of the wlanapi functions; all of them return a DWORD.
+_PROTOTYPES = {
+    "WlanOpenHandle": [DWORD, c_void_p, POINTER(DWORD), POINTER(HANDLE)],
+    "WlanCloseHandle": [HANDLE, c_void_p],
+    "WlanFreeMemory": [c_void_p],
+    "WlanEnumInterfaces": [HANDLE, c_void_p, POINTER(POINTER(WLAN_INTERFACE_INFO_LIST))],
+    "WlanGetAvailableNetworkList": [
+        HANDLE,
+        POINTER(GUID),
+        DWORD,
+        c_void_p,
+        POINTER(POINTER(WLAN_AVAILABLE_NETWORK_LIST)),
+    ],
+    "WlanGetNetworkBssList": [
+        HANDLE,
+        POINTER(GUID),
+        POINTER(DOT11_SSID),
+        c_uint,
+        c_bool,
+        c_void_p,
+        POINTER(POINTER(WLAN_BSS_LIST)),
+    ],
+    "WlanScan": [HANDLE, POINTER(GUID), POINTER(DOT11_SSID), POINTER(WLAN_RAW_DATA), c_void_p],
+    "WlanConnect": [HANDLE, POINTER(GUID), POINTER(WLAN_CONNECTION_PARAMETERS), c_void_p],
+    "WlanDisconnect": [HANDLE, POINTER(GUID), c_void_p],
+    "WlanSetProfile": [
+        HANDLE,
+        POINTER(GUID),
+        DWORD,
+        c_wchar_p,
+        c_wchar_p,
+        c_bool,
+        c_void_p,
+        POINTER(DWORD),
+    ],
+    "WlanReasonCodeToString": [DWORD, DWORD, PWCHAR, c_void_p],
+    "WlanGetProfileList": [
+        HANDLE,
+        POINTER(GUID),
+        c_void_p,
+        POINTER(POINTER(WLAN_PROFILE_INFO_LIST)),
+    ],
+    "WlanGetProfile": [
+        HANDLE,
+        POINTER(GUID),
+        c_wchar_p,
+        c_void_p,
+        POINTER(LPWSTR),
+        POINTER(DWORD),
+        POINTER(DWORD),
+    ],
+    "WlanDeleteProfile": [HANDLE, POINTER(GUID), c_wchar_p, c_void_p],
+    "WlanQueryInterface": [
+        HANDLE,
+        POINTER(GUID),
+        DWORD,
+        c_void_p,
+        POINTER(DWORD),
+        POINTER(c_void_p),
+        POINTER(DWORD),
+    ],
+}
+
+WLAN_BSS_TYPE_INFRASTRUCTURE = 1
+WLAN_BSS_TYPE_ANY = 3
+WLAN_INTF_OPCODE_INTERFACE_STATE = 6
+WLAN_PROFILE_GET_PLAINTEXT_KEY = 4
+
+
+class WlanApi:
+    """WlanApi calls the functions of wlanapi.dll.
+
+    The functions returning lists return a pointer to memory owned by
+    wlanapi, which the caller must release with free_memory().
+    """
+
+    def __init__(self, dll: ctypes.CDLL | None = None) -> None:
+        """Bind the functions of ``dll``, by default wlanapi.dll."""
+        self._dll = ctypes.WinDLL("wlanapi") if dll is None else dll
+        for name, argtypes in _PROTOTYPES.items():
+            func = getattr(self._dll, name)
+            func.argtypes = argtypes
+            func.restype = DWORD
+
+    def _check(self, name: str, status: int) -> None:
+        if status != ERROR_SUCCESS:
+            raise WlanApiError(name, status)
+
+    def open_handle(self, client_version: int) -> HANDLE:
+        """Open a client handle, see WlanOpenHandle."""
+        nego_version = DWORD()
+        handle = HANDLE()
+        self._check(
+            "WlanOpenHandle",
+            self._dll.WlanOpenHandle(client_version, None, byref(nego_version), byref(handle)),
+        )
+        return handle
+
+    def close_handle(self, handle: HANDLE) -> int:
+        """Close a client handle."""
+        return self._dll.WlanCloseHandle(handle, None)
+
+    def free_memory(self, memory: object) -> None:
+        """Release memory returned by wlanapi."""
+        if memory:
+            self._dll.WlanFreeMemory(memory)
+
+    def enum_interfaces(self, handle: HANDLE) -> "POINTER[WLAN_INTERFACE_INFO_LIST]":
+        """Get the wireless interfaces."""
+        ifaces = POINTER(WLAN_INTERFACE_INFO_LIST)()
+        self._check("WlanEnumInterfaces", self._dll.WlanEnumInterfaces(handle, None, byref(ifaces)))
+        return ifaces
+
+    def get_available_network_list(
+        self,
+        handle: HANDLE,
+        guid: GUID,
+        flags: int = 2,
+    ) -> "POINTER[WLAN_AVAILABLE_NETWORK_LIST]":
+        """Get the available networks of an interface."""
+        networks = POINTER(WLAN_AVAILABLE_NETWORK_LIST)()
+        self._check(
+            "WlanGetAvailableNetworkList",
+            self._dll.WlanGetAvailableNetworkList(
+                handle,
+                byref(guid),
+                flags,
+                None,
+                byref(networks),
+            ),
+        )
+        return networks
+
+    def get_network_bss_list(
+        self,
+        handle: HANDLE,
+        guid: GUID,
+        ssid: DOT11_SSID | None = None,
+        bss_type: int = WLAN_BSS_TYPE_ANY,
+        *,
+        security: bool = False,
+    ) -> "POINTER[WLAN_BSS_LIST]":
+        """Get the BSSes of a network, or of all networks if ``ssid`` is None."""
+        bss_list = POINTER(WLAN_BSS_LIST)()
+        self._check(
+            "WlanGetNetworkBssList",
+            self._dll.WlanGetNetworkBssList(
+                handle,
+                byref(guid),
+                byref(ssid) if ssid is not None else None,
+                bss_type,
+                security,
+                None,
+                byref(bss_list),
+            ),
+        )
+        return bss_list
+
+    def scan(self, handle: HANDLE, guid: GUID, ssid: DOT11_SSID | None = None) -> int:
+        """Request a scan, optionally probing a SSID."""
+        return self._dll.WlanScan(handle, byref(guid), byref(ssid) if ssid else None, None, None)
+
+    def connect(self, handle: HANDLE, guid: GUID, params: WLAN_CONNECTION_PARAMETERS) -> int:
+        """Connect an interface."""
+        return self._dll.WlanConnect(handle, byref(guid), byref(params), None)
+
+    def disconnect(self, handle: HANDLE, guid: GUID) -> int:
+        """Disconnect an interface."""
+        return self._dll.WlanDisconnect(handle, byref(guid), None)
+
+    def set_profile(
+        self,
+        handle: HANDLE,
+        guid: GUID,
+        xml: str,
+        *,
+        overwrite: bool = True,
+    ) -> tuple[int, int]:
+        """Save a profile; get the status and the reason code of a rejection."""
+        reason_code = DWORD()
+        status = self._dll.WlanSetProfile(
+            handle,
+            byref(guid),
+            2,
+            xml,
+            None,
+            overwrite,
+            None,
+            byref(reason_code),
+        )
+        return status, reason_code.value
+
+    def reason_code_to_str(self, reason_code: int) -> str:
+        """Get the description of a reason code."""
+        buf = ctypes.create_unicode_buffer(256)
+        self._dll.WlanReasonCodeToString(reason_code, len(buf), buf, None)
+        return buf.value
+
+    def get_profile_list(self, handle: HANDLE, guid: GUID) -> "POINTER[WLAN_PROFILE_INFO_LIST]":
+        """Get the saved profiles of an interface."""
+        profiles = POINTER(WLAN_PROFILE_INFO_LIST)()
+        self._check(
+            "WlanGetProfileList",
+            self._dll.WlanGetProfileList(handle, byref(guid), None, byref(profiles)),
+        )
+        return profiles
+
+    def get_profile(self, handle: HANDLE, guid: GUID, name: str) -> str:
+        """Get the XML of a saved profile, with its key in plain text if allowed."""
+        xml = LPWSTR()
+        flags = DWORD(WLAN_PROFILE_GET_PLAINTEXT_KEY)
+        access = DWORD()
+        self._check(
+            "WlanGetProfile",
+            self._dll.WlanGetProfile(
+                handle,
+                byref(guid),
+                name,
+                None,
+                byref(xml),
+                byref(flags),
+                byref(access),
+            ),
+        )
+        try:
+            return xml.value
+        finally:
+            self.free_memory(xml)
+
+    def delete_profile(self, handle: HANDLE, guid: GUID, name: str) -> int:
+        """Delete a saved profile."""
+        return self._dll.WlanDeleteProfile(handle, byref(guid), name, None)
+
+    def query_interface_state(self, handle: HANDLE, guid: GUID) -> int:
+        """Get the WLAN_INTERFACE_STATE of an interface."""
+        data_size = DWORD()
+        data = c_void_p()
+        value_type = DWORD()
+        self._check(
+            "WlanQueryInterface",
+            self._dll.WlanQueryInterface(
+                handle,
+                byref(guid),
+                WLAN_INTF_OPCODE_INTERFACE_STATE,
+                None,
+                byref(data_size),
+                byref(data),
+                byref(value_type),
+            ),
+        )
+        try:
+            return ctypes.cast(data, PDWORD).contents.value
+        finally:
+            self.free_memory(data)
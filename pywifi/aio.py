@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+"""Manipulate wifi devices from an asyncio event loop.
+
+AsyncPyWiFi and AsyncInterface mirror PyWiFi and Interface with awaitable
+methods. Each interface talks to wpa_supplicant over its own non-blocking
+control socket driven by the event loop, so one loop drives many
+interfaces concurrently without a thread per call. Only Linux is supported.
+"""
+
+import asyncio
+import logging
+import os
+import platform
+import stat
+from collections.abc import AsyncIterator
+
+from pywifi import psk, wpactrl
+from pywifi.const import AkmType
+from pywifi.events import EVENT_RECV_SIZE, Event, parse_event
+from pywifi.link import LinkInfo
+from pywifi.profile import Profile
+
+if platform.system().lower() == "linux":
+    from pywifi import _wifiutil_linux as wifiutil
+else:
+    wifiutil = None
+
+REQUEST_TIMEOUT = 10.0
+
+_PSK_AKMS = (AkmType.WPAPSK, AkmType.WPA2PSK)
+
+
+class AsyncPyWiFi:
+    """AsyncPyWiFi provides awaitable operations to manipulate wifi devices."""
+
+    def __init__(self, timeout: float = REQUEST_TIMEOUT) -> None:
+        """Create AsyncPyWiFi instance; requests time out after ``timeout`` seconds."""
+        if wifiutil is None:
+            raise NotImplementedError("The asyncio API is only supported on Linux")
+
+        self.timeout = timeout
+        self._ifaces: list[AsyncInterface] = []
+        self._logger = logging.getLogger("pywifi")
+
+    async def __aenter__(self) -> "AsyncPyWiFi":
+        """Use the instance as an async context manager closing the interfaces."""
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        """Close the interfaces."""
+        self.close()
+
+    async def interfaces(self, names: list[str] | None = None) -> list["AsyncInterface"]:
+        """Collect the available wlan interfaces, optionally only the named ones."""
+        candidates = []
+        for f in sorted(os.listdir(wifiutil.CTRL_IFACE_DIR)):
+            if names is not None and f not in names:
+                continue
+            if stat.S_ISSOCK(os.stat(f"{wifiutil.CTRL_IFACE_DIR}/{f}").st_mode):
+                candidates.append(AsyncInterface(f, timeout=self.timeout))
+
+        opened = await asyncio.gather(
+            *(iface.open() for iface in candidates),
+            return_exceptions=True,
+        )
+        self._ifaces = []
+        for iface, result in zip(candidates, opened, strict=True):
+            if result is True:
+                self._ifaces.append(iface)
+                self._logger.info("Get interface: %s", iface.name())
+            else:
+                iface.close()
+
+        if not self._ifaces:
+            self._logger.error("Can't get wifi interface")
+
+        return self._ifaces
+
+    def close(self) -> None:
+        """Close the control sockets of the collected interfaces."""
+        for iface in self._ifaces:
+            iface.close()
+        self._ifaces = []
+
+
+class AsyncInterface:
+    """AsyncInterface provides awaitable methods for manipulating wifi devices.
+
+    Requests to the same interface are serialized; requests to different
+    interfaces run concurrently.
+    """
+
+    def __init__(self, name: str, timeout: float = REQUEST_TIMEOUT) -> None:
+        """Create wifi interface instance; call open() before using it."""
+        self._name = name
+        self.timeout = timeout
+        self._wifi_ctrl = wifiutil.WifiUtil()
+        self._sock = None
+        self._lock = asyncio.Lock()
+        self._logger = logging.getLogger("pywifi")
+
+    async def __aenter__(self) -> "AsyncInterface":
+        """Open the interface as an async context manager."""
+        if self._sock is None:
+            await self.open()
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        """Close the interface."""
+        self.close()
+
+    def name(self) -> str:
+        """Get the name of the wifi interface."""
+        return self._name
+
+    async def open(self) -> bool:
+        """Open the control socket and check that wpa_supplicant answers."""
+        self._sock = self._wifi_ctrl.open_ctrl_sock(self._name, "aio")
+        self._sock.setblocking(False)
+
+        reply = await self._request("PING", get_reply=True)
+        if not reply.startswith("PONG"):
+            self._logger.error("Connection to iface '%s' is broken!", self._name)
+            return False
+
+        self._logger.info("Connect to iface '%s' successfully!", self._name)
+        return True
+
+    def close(self) -> None:
+        """Close the control socket."""
+        if self._sock is None:
+            return
+
+        self._wifi_ctrl.close_ctrl_sock(self._sock)
+        self._sock = None
+
+    async def scan(
+        self,
+        freqs: list[int] | None = None,
+        ssids: list[str] | None = None,
+        *,
+        passive: bool = False,
+        only_new: bool = False,
+    ) -> None:
+        """Trigger the wifi interface to scan, see Interface.scan()."""
+        if passive and ssids:
+            raise ValueError("A passive scan cannot probe for SSIDs")
+
+        self._logger.info("iface '%s' scans", self._name)
+        cmd = wpactrl.scan_cmd(freqs, ssids, passive=passive, only_new=only_new)
+        await self._request(cmd)
+
+    async def scan_results(self) -> list[Profile]:
+        """Return the scan result."""
+        reply = await self._request("SCAN_RESULTS", get_reply=True)
+        return wpactrl.parse_scan_results(reply)
+
+    async def status(self) -> int:
+        """Get the status of the wifi interface."""
+        reply = await self._request("STATUS", get_reply=True)
+        return wpactrl.parse_status(reply)
+
+    async def link_info(self) -> LinkInfo:
+        """Get the status of the wifi interface with the network it is on."""
+        reply = await self._request("STATUS", get_reply=True)
+        return wpactrl.parse_link_info(reply)
+
+    async def status_fields(self) -> dict[str, str]:
+        """Get all the fields of the wifi interface status."""
+        reply = await self._request("STATUS", get_reply=True)
+        return wpactrl.parse_key_values(reply)
+
+    async def signal_poll(self) -> dict[str, int]:
+        """Get the signal parameters of the current link."""
+        reply = await self._request("SIGNAL_POLL", get_reply=True)
+        return wpactrl.parse_int_values(reply)
+
+    async def packet_counts(self) -> dict[str, int]:
+        """Get the TXGOOD, TXBAD and RXGOOD packet counters of the current link."""
+        reply = await self._request("PKTCNT_POLL", get_reply=True)
+        return wpactrl.parse_int_values(reply)
+
+    async def connect(self, params: Profile) -> None:
+        """Connect to the specified AP."""
+        self._logger.info("iface '%s' connects to AP: '%s'", self._name, params.ssid)
+        pinned = self._wifi_ctrl.pinned_networks(self._name)
+        await wpactrl.run_async(wpactrl.select_network(params, pinned), self._request)
+
+    async def disconnect(self) -> None:
+        """Disconnect from the specified AP."""
+        self._logger.info("iface '%s' disconnects", self._name)
+        await self._request("DISCONNECT")
+
+    async def roam(self, bssid: str) -> None:
+        """Roam to the specified BSS of the current network."""
+        await self._request(f"ROAM {bssid}")
+
+    async def add_network_profile(self, params: Profile, *, derive_psk: bool = False) -> Profile:
+        """Add the info of the AP for connecting afterward.
+
+        With ``derive_psk``, the PSK is derived in the default executor so the
+        event loop is not blocked by PBKDF2.
+        """
+        params.process_akm()
+        if derive_psk:
+            await self._derive_psks([params])
+
+        request = wpactrl.add_network(params, derive_psk=derive_psk)
+        return await wpactrl.run_async(request, self._request)
+
+    async def remove_network_profile(self, params: Profile) -> None:
+        """Remove the specified AP settings."""
+        pinned = self._wifi_ctrl.pinned_networks(self._name)
+        await wpactrl.run_async(wpactrl.remove_network(params, pinned), self._request)
+
+    async def remove_all_network_profiles(self) -> None:
+        """Remove all the AP settings."""
+        await self._request("REMOVE_NETWORK all")
+        self._wifi_ctrl.pinned_networks(self._name).clear()
+
+    async def network_profiles(self, ssid: str | None = None) -> list[Profile]:
+        """Get all the AP profiles, or only the ones of ``ssid``."""
+        return await wpactrl.run_async(wpactrl.network_profiles(ssid), self._request)
+
+    async def apply_profiles(
+        self,
+        desired: list[Profile],
+        *,
+        update_keys: bool = False,
+        derive_psk: bool = False,
+    ) -> list[Profile]:
+        """Make the saved AP profiles match the desired ones, see Interface.apply_profiles()."""
+        if derive_psk:
+            await self._derive_psks(desired)
+
+        request = wpactrl.apply_profiles(
+            desired,
+            self._wifi_ctrl.pinned_networks(self._name),
+            update_keys=update_keys,
+            derive_psk=derive_psk,
+        )
+        return await wpactrl.run_async(request, self._request)
+
+    async def events(self) -> AsyncIterator[Event]:
+        """Iterate over the unsolicited events of the interface.
+
+        Each iterator attaches its own control socket, which is detached when
+        the iteration stops.
+        """
+        loop = asyncio.get_running_loop()
+        sock = self._wifi_ctrl.open_ctrl_sock(self._name, "aio_events")
+        sock.setblocking(False)
+        try:
+            await loop.sock_sendall(sock, b"ATTACH")
+            reply = await asyncio.wait_for(loop.sock_recv(sock, EVENT_RECV_SIZE), self.timeout)
+            if reply != b"OK\n":
+                self._logger.error("Attach to iface '%s' failed: '%s'", self._name, reply)
+
+            while True:
+                data = await loop.sock_recv(sock, EVENT_RECV_SIZE)
+                yield parse_event(data.decode("utf-8", errors="replace"))
+        finally:
+            try:
+                sock.send(b"DETACH")
+            except OSError:
+                self._logger.debug("Detach from iface '%s' failed", self._name)
+            self._wifi_ctrl.close_ctrl_sock(sock)
+
+    async def _derive_psks(self, profiles: list[Profile]) -> None:
+        loop = asyncio.get_running_loop()
+        for profile in profiles:
+            if profile.key and profile.akm and profile.akm[-1] in _PSK_AKMS:
+                await loop.run_in_executor(None, psk.default_cache.get, profile.ssid, profile.key)
+
+    async def _request(self, cmd: str, *, get_reply: bool = False) -> str | None:
+        if self._sock is None:
+            raise RuntimeError(f"Interface '{self._name}' is not open")
+        if "psk" not in cmd:
+            self._logger.info("Send cmd '%s' to wpa_s", cmd)
+
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            # Drop a late reply to a request that was cancelled or timed out.
+            while True:
+                try:
+                    self._sock.recv(wifiutil.REPLY_SIZE)
+                except (BlockingIOError, InterruptedError):
+                    break
+
+            await loop.sock_sendall(self._sock, cmd.encode("utf-8"))
+            reply = await asyncio.wait_for(
+                loop.sock_recv(self._sock, wifiutil.REPLY_SIZE),
+                self.timeout,
+            )
+
+        if get_reply:
+            return reply.decode("utf-8")
+
+        if reply != b"OK\n":
+            self._logger.error(
+                "Unexpected resp '%s' for Command '%s'",
+                reply.decode("utf-8"),
+                cmd,
+            )
+        return None
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+
+"""Join the best of the saved networks found by a scan.
+
+AutoJoin indexes the saved profiles by SSID and security once, so matching
+a scan table costs a lookup per BSS, however many profiles are saved. Each
+matching BSS is scored on its signal, band, the priority of its profile and
+the past connect success of the network, and the best network is joined.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from pywifi.channels import band_of
+from pywifi.const import AkmType, IfaceStatus
+from pywifi.iface import Interface
+from pywifi.profile import Profile
+from pywifi.roaming import DEFAULT_BAND_BONUS
+
+_SECURITY = {
+    AkmType.WPA: "eap",
+    AkmType.WPA2: "eap",
+    AkmType.WPAPSK: "psk",
+    AkmType.WPA2PSK: "psk",
+}
+
+
+def security_of(akm: list[int]) -> frozenset[str]:
+    """Get the kinds of security ("open", "psk", "eap") of a list of akm."""
+    kinds = frozenset(_SECURITY.get(value, "unknown") for value in akm if value != AkmType.NONE)
+    return kinds or frozenset(("open",))
+
+
+@dataclass
+class JoinCandidate:
+    """A saved network and its best BSS in the scan results."""
+
+    profile: Profile
+    bss: Profile
+    score: float
+
+
+class AutoJoin:
+    """AutoJoin connects an interface to the best known network in range."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        iface: Interface,
+        profiles: list[Profile] | None = None,
+        *,
+        band_bonus: dict[int, float] | None = None,
+        priority_weight: float = 5.0,
+        success_weight: float = 20.0,
+        min_signal: int = -85,
+        max_attempts: int = 3,
+        connect_timeout: float = 10.0,
+        poll_interval: float = 0.1,
+    ) -> None:
+        """Create an auto-join engine for ``profiles``, the saved networks by default.
+
+        A BSS scores its signal in dBm, plus the band bonus of its band,
+        ``priority_weight`` per priority point of its profile and up to
+        ``success_weight`` for the connect success rate of its network. BSSes
+        below ``min_signal`` are ignored. Up to ``max_attempts`` networks are
+        tried, each for ``connect_timeout`` seconds.
+        """
+        self._iface = iface
+        self.band_bonus = DEFAULT_BAND_BONUS if band_bonus is None else band_bonus
+        self.priority_weight = priority_weight
+        self.success_weight = success_weight
+        self.min_signal = min_signal
+        self.max_attempts = max_attempts
+        self.connect_timeout = connect_timeout
+        self.poll_interval = poll_interval
+
+        self._index: dict[tuple[str, str], list[Profile]] | None = None
+        self._results: dict[tuple[str, frozenset[str]], list[int]] = {}
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger("pywifi")
+        if profiles is not None:
+            self.set_profiles(profiles)
+
+    def set_profiles(self, profiles: list[Profile]) -> None:
+        """Index the networks which may be joined."""
+        index = {}
+        for profile in profiles:
+            for kind in security_of(profile.akm[-1:]):
+                index.setdefault((profile.ssid, kind), []).append(profile)
+        with self._lock:
+            self._index = index
+
+    def refresh_profiles(self) -> None:
+        """Index the networks saved on the interface."""
+        self.set_profiles(self._iface.network_profiles())
+
+    def success_rate(self, profile: Profile) -> float:
+        """Get the smoothed share of the successful connects to a network."""
+        successes, attempts = self._results.get(_network_key(profile), (0, 0))
+        # One success and one failure are assumed, so unknown networks get 0.5.
+        return (successes + 1) / (attempts + 2)
+
+    def record(self, profile: Profile, *, success: bool) -> None:
+        """Record the result of a connect to a network."""
+        with self._lock:
+            result = self._results.setdefault(_network_key(profile), [0, 0])
+            result[0] += int(success)
+            result[1] += 1
+
+    def score(self, profile: Profile, bss: Profile) -> float:
+        """Score a BSS of a saved network."""
+        return (
+            bss.signal
+            + self.band_bonus.get(band_of(bss.freq), 0.0)
+            + self.priority_weight * profile.priority
+            + self.success_weight * self.success_rate(profile)
+        )
+
+    def candidates(self, bsses: list[Profile] | None = None) -> list[JoinCandidate]:
+        """Get the saved networks in ``bsses``, the scan results by default, best first."""
+        if self._index is None:
+            self.refresh_profiles()
+        if bsses is None:
+            bsses = self._iface.scan_results()
+
+        best: dict[int, JoinCandidate] = {}
+        with self._lock:
+            index = self._index
+        for bss in bsses:
+            if bss.signal is None or bss.signal < self.min_signal:
+                continue
+            for kind in security_of(bss.akm):
+                for profile in index.get((bss.ssid, kind), ()):
+                    score = self.score(profile, bss)
+                    candidate = best.get(id(profile))
+                    if candidate is None or score > candidate.score:
+                        best[id(profile)] = JoinCandidate(profile, bss, score)
+
+        return sorted(best.values(), key=lambda candidate: candidate.score, reverse=True)
+
+    def join(
+        self,
+        bsses: list[Profile] | None = None,
+        *,
+        wait: bool = True,
+    ) -> JoinCandidate | None:
+        """Connect to the best saved network in range.
+
+        The next networks are tried if it does not connect within
+        ``connect_timeout``. Get the joined candidate, None if none joined;
+        without ``wait`` the best one is only selected.
+        """
+        candidates = self.candidates(bsses)
+        if candidates:
+            info = self._iface.link_info()
+            best = candidates[0].profile
+            if info.connected and best.id is not None and info.network_id == best.id:
+                return candidates[0]
+
+        for candidate in candidates[: self.max_attempts]:
+            self._logger.info(
+                "Auto-join '%s' on '%s' (score %.1f)",
+                candidate.profile.ssid,
+                candidate.bss.bssid,
+                candidate.score,
+            )
+            self._iface.connect(candidate.profile)
+            if not wait:
+                return candidate
+
+            success = self._wait_for_connection()
+            self.record(candidate.profile, success=success)
+            if success:
+                return candidate
+        return None
+
+    def _wait_for_connection(self) -> bool:
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            self._iface.invalidate_status()
+            if self._iface.status() == IfaceStatus.CONNECTED:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+
+def _network_key(profile: Profile) -> tuple[str, frozenset[str]]:
+    return profile.ssid, security_of(profile.akm[-1:])
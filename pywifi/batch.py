@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+
+"""Run the operations of the batch format over shared interfaces.
+
+A batch step is a script line such as ``connect ap password=secret`` or a
+JSON object such as ``{"op": "connect", "ssid": "ap"}``. The batch command
+of the CLI runs a file of steps, and the pywifid daemon runs the steps it
+receives, so both parse and report them here.
+"""
+
+import json
+import shlex
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from pywifi.const import AkmType, IfaceStatus
+from pywifi.iface import Interface
+from pywifi.profile import Profile
+
+
+def status_name(status: int) -> str:
+    """Get human-readable status name."""
+    status_names = {
+        IfaceStatus.DISCONNECTED: "DISCONNECTED",
+        IfaceStatus.SCANNING: "SCANNING",
+        IfaceStatus.INACTIVE: "INACTIVE",
+        IfaceStatus.CONNECTING: "CONNECTING",
+        IfaceStatus.CONNECTED: "CONNECTED",
+    }
+    return status_names.get(status, "UNKNOWN")
+
+
+def akm_name(akm: int) -> str:
+    """Get human-readable AKM name."""
+    akm_names = {
+        AkmType.NONE: "NONE",
+        AkmType.WPA: "WPA",
+        AkmType.WPAPSK: "WPA-PSK",
+        AkmType.WPA2: "WPA2",
+        AkmType.WPA2PSK: "WPA2-PSK",
+        AkmType.UNKNOWN: "UNKNOWN",
+    }
+    return akm_names.get(akm, "UNKNOWN")
+
+
+def network_dict(bss: Profile) -> dict[str, Any]:
+    """Describe a scanned BSS with JSON types."""
+    return {
+        "ssid": bss.ssid,
+        "bssid": bss.bssid,
+        "freq": getattr(bss, "freq", None),
+        "signal": getattr(bss, "signal", None),
+        "akm": [akm_name(akm) for akm in bss.akm],
+    }
+
+
+def join_network(iface: Interface, profile: Profile, *, update_key: bool = False) -> Profile:
+    """Connect the interface to a network, reusing a matching saved network.
+
+    Only the saved networks of ``profile.ssid`` are read. Saved keys cannot
+    be read back, so the key of a reused network is only sent again with
+    ``update_key``; otherwise the profile is added. The saved network
+    selected is returned.
+    """
+    saved = next(
+        (p for p in iface.network_profiles(profile.ssid) if profile.same_network(p)),
+        None,
+    )
+    if saved is None:
+        saved = iface.add_network_profile(profile)
+    elif update_key and profile.key:
+        profile.id = saved.id
+        iface.update_network_key(profile)
+    iface.connect(saved)
+    return saved
+
+
+def start_connect(
+    iface: Interface,
+    ssid: str,
+    password: str | None,
+    *,
+    fresh: bool = False,
+    update_key: bool = False,
+) -> None:
+    """Connect the interface to ``ssid``, reusing a matching saved network.
+
+    See join_network(). With ``fresh``, all the saved networks are removed
+    and the network is added again instead.
+    """
+    # Create profile
+    profile = Profile()
+    profile.ssid = ssid
+
+    if password:
+        # Assume WPA2-PSK for networks with password
+        profile.akm = [AkmType.WPA2PSK]
+        profile.key = password
+    else:
+        # Open network
+        profile.akm = [AkmType.NONE]
+
+    if fresh:
+        iface.remove_all_network_profiles()
+        iface.connect(iface.add_network_profile(profile))
+    else:
+        join_network(iface, profile, update_key=update_key)
+
+
+def wait_for_connection(iface: Interface, timeout: float) -> bool:
+    """Poll the interface status until it is connected or ``timeout`` expires."""
+    start_time = time.time()
+
+    while time.time() - start_time < timeout:
+        if iface.status() == IfaceStatus.CONNECTED:
+            return True
+        time.sleep(1)
+
+    return False
+
+
+class BatchStepError(Exception):
+    """Raised when a batch step cannot be parsed or fails to execute."""
+
+
+# Positional arguments accepted by each batch operation in the script format.
+_BATCH_POSITIONALS = {
+    "connect": ["ssid"],
+    "sleep": ["seconds"],
+}
+
+
+def _to_int(value: object) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise TypeError
+    return int(value)
+
+
+def _to_float(value: object) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError
+    return float(value)
+
+
+def _to_bool(value: object) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    if not isinstance(value, (bool, int)):
+        raise TypeError
+    return bool(value)
+
+
+def _to_str(value: object) -> str:
+    if not isinstance(value, str):
+        raise TypeError
+    return value
+
+
+def _to_list(item_type: Callable[[object], object]) -> Callable[[object], list[object]]:
+    # Comma separated in a script line, a list in a JSON step.
+    def convert(value: object) -> list[object]:
+        if isinstance(value, str):
+            value = [item for item in value.split(",") if item]
+        if not isinstance(value, list):
+            raise TypeError
+        return [item_type(item) for item in value]
+
+    return convert
+
+
+# The conversion of each field, from a script line or a JSON step.
+_BATCH_FIELDS: dict[str, Callable[[object], object]] = {
+    "interface": _to_int,
+    "wait": _to_int,
+    "timeout": _to_int,
+    "seconds": _to_float,
+    "fresh": _to_bool,
+    "update_key": _to_bool,
+    "passive": _to_bool,
+    "ssid": _to_str,
+    "password": _to_str,
+    "freqs": _to_list(_to_int),
+    "ssids": _to_list(_to_str),
+}
+
+
+def _convert_fields(step: dict[str, Any]) -> dict[str, Any]:
+    for key in _BATCH_FIELDS.keys() & step.keys():
+        if key == "password" and step[key] is None:
+            continue
+        try:
+            step[key] = _BATCH_FIELDS[key](step[key])
+        except (TypeError, ValueError) as err:
+            raise BatchStepError(f"Invalid value for '{key}': {step[key]!r}") from err
+    return step
+
+
+def parse_step(line: str) -> dict[str, Any] | None:
+    """Parse one batch line into a step dict.
+
+    A line is either a JSON object such as ``{"op": "connect", "ssid": "ap"}``
+    or a script line such as ``connect ap password=secret interface=1``.
+    Blank lines and ``#`` comments are ignored. The known fields of both
+    formats are converted to their types, and BatchStepError is raised if
+    one cannot be.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+
+    if line.startswith("{"):
+        try:
+            step = json.loads(line)
+        except json.JSONDecodeError as err:
+            raise BatchStepError(f"Invalid JSON step: {err}") from err
+        if not isinstance(step, dict) or not isinstance(step.get("op"), str):
+            raise BatchStepError("JSON step must be an object with an 'op' field")
+        return _convert_fields(step)
+
+    tokens = shlex.split(line)
+    step: dict[str, Any] = {"op": tokens[0]}
+    positionals = list(_BATCH_POSITIONALS.get(tokens[0], []))
+    for token in tokens[1:]:
+        if "=" in token:
+            key, value = token.split("=", 1)
+            step[key.lstrip("-").replace("-", "_")] = value
+        elif positionals:
+            step[positionals.pop(0)] = token
+        else:
+            raise BatchStepError(f"Unexpected argument '{token}' for '{tokens[0]}'")
+
+    return _convert_fields(step)
+
+
+def _batch_scan(iface: Interface, step: dict[str, Any]) -> dict[str, Any]:
+    options = {key: step[key] for key in ("freqs", "ssids", "passive") if step.get(key)}
+    iface.scan(**options)
+    time.sleep(step.get("wait", 5))
+    return {"networks": [network_dict(bss) for bss in iface.scan_results()]}
+
+
+def _batch_connect(iface: Interface, step: dict[str, Any]) -> dict[str, Any]:
+    if not step.get("ssid"):
+        raise BatchStepError("connect requires an ssid")
+
+    start_connect(
+        iface,
+        step["ssid"],
+        step.get("password"),
+        fresh=step.get("fresh", False),
+        update_key=step.get("update_key", False),
+    )
+    if not wait_for_connection(iface, step.get("timeout", 10)):
+        status = status_name(iface.status())
+        raise BatchStepError(f"Failed to connect to '{step['ssid']}'. Status: {status}")
+
+    return {"ssid": step["ssid"], "status": "CONNECTED"}
+
+
+def _batch_disconnect(iface: Interface, step: dict[str, Any]) -> dict[str, Any]:
+    iface.disconnect()
+    time.sleep(step.get("wait", 1))
+    return {"status": status_name(iface.status())}
+
+
+def _batch_status(iface: Interface, _step: dict[str, Any]) -> dict[str, Any]:
+    return {"status": status_name(iface.status())}
+
+
+def _batch_sleep(_iface: Interface | None, step: dict[str, Any]) -> dict[str, Any]:
+    time.sleep(step.get("seconds", 1))
+    return {}
+
+
+_BATCH_OPS: dict[str, Callable[[Interface | None, dict[str, Any]], dict[str, Any]]] = {
+    "scan": _batch_scan,
+    "connect": _batch_connect,
+    "disconnect": _batch_disconnect,
+    "status": _batch_status,
+    "sleep": _batch_sleep,
+}
+
+
+def run_step(step: dict[str, Any], interfaces: list[Interface]) -> dict[str, Any]:
+    """Run a parsed batch step over shared interfaces and return its result.
+
+    The result holds the operation, the interface name, whether it
+    succeeded, the elapsed seconds and either the operation's result or an
+    error message.
+    """
+    started = time.perf_counter()
+    result: dict[str, Any] = {"op": step.get("op"), "interface": None, "ok": False}
+    try:
+        handler = _BATCH_OPS.get(step["op"])
+        if handler is None:
+            raise BatchStepError(f"Unknown operation '{step['op']}'")
+
+        iface = None
+        if step["op"] != "sleep":
+            index = step.get("interface", 0)
+            if not 0 <= index < len(interfaces):
+                raise BatchStepError(f"Interface index {index} not found")
+            iface = interfaces[index]
+            result["interface"] = iface.name()
+
+        result["result"] = handler(iface, step)
+        result["ok"] = True
+    except (BatchStepError, ValueError, OSError) as err:
+        # OSError: the control socket of the interface failed.
+        result["error"] = str(err) or type(err).__name__
+
+    result["elapsed"] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def run_batch(
+    lines: Iterable[str],
+    interfaces: list[Interface],
+    *,
+    stop_on_error: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Run batch lines over shared interfaces and yield a result per step.
+
+    Each result is the one of run_step() with the line number of the step;
+    a line which cannot be parsed fails without an operation.
+    """
+    for lineno, line in enumerate(lines, 1):
+        started = time.perf_counter()
+        try:
+            step = parse_step(line)
+        except (BatchStepError, ValueError) as err:
+            result = {"op": None, "interface": None, "ok": False, "error": str(err)}
+            result["elapsed"] = round(time.perf_counter() - started, 6)
+        else:
+            if step is None:
+                continue
+            result = run_step(step, interfaces)
+        result = {"line": lineno, **result}
+        yield result
+
+        if stop_on_error and not result["ok"]:
+            return
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+"""Analyze the channel congestion seen in scan results.
+
+Frequencies are converted to channels with lookup tables built once at
+import. ChannelAnalyzer accumulates the BSS count and received power of
+every channel over one or many scans into preallocated per-channel arrays,
+applies the overlap between adjacent 2.4 GHz channels and recommends the
+least congested channel of each band.
+"""
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from pywifi.profile import Profile
+
+BAND_2GHZ = 2
+BAND_5GHZ = 5
+BAND_6GHZ = 6
+
+# Power in dBm assumed on a channel where no BSS is seen.
+NOISE_FLOOR_DBM = -100.0
+
+# Width of a 2.4 GHz DSSS channel in MHz; channels are 5 MHz apart, so a BSS
+# also overlaps the four channels on each side of its own.
+_CHANNEL_WIDTH_2GHZ = 22
+
+DEFAULT_CANDIDATES = {
+    BAND_2GHZ: (1, 6, 11),
+    BAND_5GHZ: (
+        36,
+        40,
+        44,
+        48,
+        52,
+        56,
+        60,
+        64,
+        100,
+        104,
+        108,
+        112,
+        116,
+        120,
+        124,
+        128,
+        132,
+        136,
+        140,
+        144,
+        149,
+        153,
+        157,
+        161,
+        165,
+    ),
+    # Preferred scanning channels of the 6 GHz band.
+    BAND_6GHZ: tuple(range(5, 234, 16)),
+}
+
+
+def _build_channels() -> list[tuple[int, int, int]]:
+    channels = [(BAND_2GHZ, ch, 2407 + 5 * ch) for ch in range(1, 14)]
+    channels.append((BAND_2GHZ, 14, 2484))
+    channels += [(BAND_5GHZ, ch, 5000 + 5 * ch) for ch in range(32, 178)]
+    channels.append((BAND_6GHZ, 2, 5935))
+    channels += [(BAND_6GHZ, ch, 5950 + 5 * ch) for ch in range(1, 234, 4)]
+    return channels
+
+
+# (band, channel, center frequency) of every known channel, and the index of
+# each channel in the per-channel arrays by frequency and by (band, channel).
+CHANNELS = _build_channels()
+_FREQ_INDEX = {freq: idx for idx, (_, _, freq) in enumerate(CHANNELS)}
+_CHANNEL_INDEX = {(band, ch): idx for idx, (band, ch, _) in enumerate(CHANNELS)}
+
+
+def _build_overlap() -> list[list[tuple[int, float]]]:
+    """Get the (index, weight) of the channels overlapped by each channel."""
+    overlap = []
+    for band, _, freq in CHANNELS:
+        if band != BAND_2GHZ:
+            overlap.append([(_FREQ_INDEX[freq], 1.0)])
+            continue
+
+        weights = []
+        for other_band, other_ch, other_freq in CHANNELS:
+            distance = abs(other_freq - freq)
+            if other_band == BAND_2GHZ and distance < _CHANNEL_WIDTH_2GHZ:
+                weight = (_CHANNEL_WIDTH_2GHZ - distance) / _CHANNEL_WIDTH_2GHZ
+                weights.append((_CHANNEL_INDEX[(other_band, other_ch)], weight))
+        overlap.append(weights)
+    return overlap
+
+
+_OVERLAP = _build_overlap()
+
+
+def freq_to_channel(freq: int) -> int | None:
+    """Get the channel number of a center frequency in MHz."""
+    idx = _FREQ_INDEX.get(freq)
+    return None if idx is None else CHANNELS[idx][1]
+
+
+def band_of(freq: int) -> int | None:
+    """Get the band (2, 5 or 6 GHz) of a center frequency in MHz."""
+    idx = _FREQ_INDEX.get(freq)
+    return None if idx is None else CHANNELS[idx][0]
+
+
+def channel_to_freq(band: int, channel: int) -> int | None:
+    """Get the center frequency in MHz of a channel of a band."""
+    idx = _CHANNEL_INDEX.get((band, channel))
+    return None if idx is None else CHANNELS[idx][2]
+
+
+def _dbm_to_mw(dbm: float) -> float:
+    return 10 ** (dbm / 10)
+
+
+def _mw_to_dbm(mw: float) -> float:
+    return 10 * math.log10(mw)
+
+
+@dataclass
+class ChannelUsage:
+    """Congestion of a channel, averaged over the analyzed scans."""
+
+    band: int
+    channel: int
+    freq: int
+    bss_count: float
+    strongest: float | None
+    power_dbm: float
+    overlap_count: float
+    overlap_dbm: float
+    score: float
+
+
+class ChannelAnalyzer:
+    """ChannelAnalyzer accumulates per-channel congestion over scans.
+
+    The congestion score of a channel is the overlap weighted power received
+    on it in dBm plus ``count_penalty`` dB per overlapping BSS; the lower the
+    score, the better the channel.
+    """
+
+    def __init__(self, count_penalty: float = 1.0) -> None:
+        """Create an analyzer with no scans."""
+        self.count_penalty = count_penalty
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all the scans added so far."""
+        size = len(CHANNELS)
+        self.scans = 0
+        self.skipped = 0
+        self._count = [0] * size
+        self._power = [0.0] * size
+        self._strongest = [-math.inf] * size
+
+    def add_scan(self, bsses: Iterable[Profile]) -> None:
+        """Add the results of one scan."""
+        count = self._count
+        power = self._power
+        strongest = self._strongest
+        freq_index = _FREQ_INDEX
+        for bss in bsses:
+            idx = freq_index.get(bss.freq)
+            if idx is None:
+                self.skipped += 1
+                continue
+
+            count[idx] += 1
+            power[idx] += 10 ** (bss.signal / 10)
+            strongest[idx] = max(strongest[idx], bss.signal)
+        self.scans += 1
+
+    def add_scans(self, scans: Iterable[Iterable[Profile]]) -> None:
+        """Add the results of many scans, e.g. a window of snapshots."""
+        for bsses in scans:
+            self.add_scan(bsses)
+
+    def usage(self, band: int | None = None) -> list[ChannelUsage]:
+        """Get the congestion of every channel, optionally of a band only."""
+        scans = max(self.scans, 1)
+        floor = _dbm_to_mw(NOISE_FLOOR_DBM)
+        result = []
+        for idx, (ch_band, ch, freq) in enumerate(CHANNELS):
+            if band is not None and ch_band != band:
+                continue
+
+            overlap_count = 0.0
+            overlap_power = 0.0
+            for other, weight in _OVERLAP[idx]:
+                overlap_count += weight * self._count[other]
+                overlap_power += weight * self._power[other]
+            overlap_count /= scans
+            overlap_dbm = _mw_to_dbm(floor + overlap_power / scans)
+
+            result.append(
+                ChannelUsage(
+                    band=ch_band,
+                    channel=ch,
+                    freq=freq,
+                    bss_count=self._count[idx] / scans,
+                    strongest=self._strongest[idx] if self._count[idx] else None,
+                    power_dbm=_mw_to_dbm(floor + self._power[idx] / scans),
+                    overlap_count=overlap_count,
+                    overlap_dbm=overlap_dbm,
+                    score=overlap_dbm + self.count_penalty * overlap_count,
+                ),
+            )
+        return result
+
+    def recommend(self, band: int, candidates: Iterable[int] | None = None) -> ChannelUsage:
+        """Get the least congested channel of a band.
+
+        Only the ``candidates`` channels are considered, by default the
+        non-overlapping 2.4 GHz channels, the 20 MHz 5 GHz channels and the
+        preferred scanning channels of 6 GHz.
+        """
+        allowed = set(DEFAULT_CANDIDATES[band] if candidates is None else candidates)
+        usages = [usage for usage in self.usage(band) if usage.channel in allowed]
+        if not usages:
+            raise ValueError(f"No candidate channel in the {band} GHz band")
+
+        return min(usages, key=lambda usage: (usage.score, usage.channel))
+
+    def recommend_all(self) -> dict[int, ChannelUsage]:
+        """Get the least congested channel of every band."""
+        return {band: self.recommend(band) for band in DEFAULT_CANDIDATES}
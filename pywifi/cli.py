@@ -2,14 +2,25 @@
 
 """CLI interface for pywifi using typer."""
 
+import json
+import sys
 import time
-from typing import Annotated
+from pathlib import Path
+from typing import Annotated, Any
 
 import typer
 
-from pywifi import AkmType, IfaceStatus
+from pywifi import IfaceStatus
+from pywifi.batch import (
+    network_dict,
+    run_batch,
+    start_connect,
+    status_name,
+    wait_for_connection,
+)
 from pywifi.iface import Interface
-from pywifi.profile import Profile
+from pywifi.rpc import connect_daemon
+from pywifi.tracing import ConnectTrace, ConnectTracer
 from pywifi.wifi import PyWiFi
 
 app = typer.Typer(help="pywifi - A cross-platform WiFi management tool")
@@ -32,29 +43,65 @@ def _get_interface(interface_index: int = 0) -> Interface:
     return interfaces[interface_index]
 
 
-def _get_status_name(status: int) -> str:
-    """Get human-readable status name."""
-    status_names = {
-        IfaceStatus.DISCONNECTED: "DISCONNECTED",
-        IfaceStatus.SCANNING: "SCANNING",
-        IfaceStatus.INACTIVE: "INACTIVE",
-        IfaceStatus.CONNECTING: "CONNECTING",
-        IfaceStatus.CONNECTED: "CONNECTED",
-    }
-    return status_names.get(status, "UNKNOWN")
-
-
-def _get_akm_name(akm: int) -> str:
-    """Get human-readable AKM name."""
-    akm_names = {
-        AkmType.NONE: "NONE",
-        AkmType.WPA: "WPA",
-        AkmType.WPAPSK: "WPA-PSK",
-        AkmType.WPA2: "WPA2",
-        AkmType.WPA2PSK: "WPA2-PSK",
-        AkmType.UNKNOWN: "UNKNOWN",
-    }
-    return akm_names.get(akm, "UNKNOWN")
+def _forward(step: dict[str, Any]) -> dict[str, Any] | None:
+    """Run a batch step in the pywifid daemon, None if no daemon is running.
+
+    A step failing in the daemon is reported and exits the command.
+    """
+    client = connect_daemon()
+    if client is None:
+        return None
+
+    try:
+        with client:
+            result = client.request(step)
+    except (OSError, ValueError) as err:
+        typer.echo(f"Error: pywifid failed: {err}", err=True)
+        raise typer.Exit(code=1) from err
+
+    if not result["ok"]:
+        typer.echo(f"Error: {result['error']}", err=True)
+        raise typer.Exit(code=1)
+    return result
+
+
+def _echo_networks(networks: list[dict[str, Any]]) -> None:
+    """Print the scanned networks as a table."""
+    if not networks:
+        typer.echo("No networks found")
+        return
+
+    typer.echo(f"\nFound {len(networks)} network(s):\n")
+    typer.echo(f"{'SSID':<32} {'BSSID':<18} {'Signal':<8} {'Security'}")
+    typer.echo("-" * 80)
+
+    for network in networks:
+        ssid = network["ssid"] if network["ssid"] else "(Hidden)"
+        bssid = network["bssid"] if network["bssid"] else "N/A"
+        signal = str(network["signal"]) if network["signal"] is not None else "N/A"
+        security = ", ".join(network["akm"]) if network["akm"] else "Open"
+
+        typer.echo(f"{ssid:<32} {bssid:<18} {signal:<8} {security}")
+
+
+def _echo_trace(trace: ConnectTrace) -> None:
+    """Print the time spent in each phase of a traced connection."""
+    typer.echo(f"Connection phases (from {trace.source}):")
+    for phase, seconds in trace.phases().items():
+        typer.echo(f"  {phase:<16} {seconds * 1000:9.1f} ms")
+    if trace.connected:
+        typer.echo(f"  {'total':<16} {trace.duration * 1000:9.1f} ms")
+
+
+def _disconnect_and_wait(iface: Interface, timeout: float) -> None:
+    """Disconnect the interface and wait until it is or ``timeout`` expires."""
+    iface.disconnect()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        iface.invalidate_status()
+        if iface.status() in (IfaceStatus.DISCONNECTED, IfaceStatus.INACTIVE):
+            return
+        time.sleep(0.05)
 
 
 @app.command()
@@ -65,38 +112,43 @@ def scan(
     wait: Annotated[
         int, typer.Option("--wait", "-w", help="Seconds to wait for scan results"),
     ] = 5,
+    freq: Annotated[
+        list[int] | None,
+        typer.Option("--freq", "-f", help="Only scan this frequency in MHz (repeatable)"),
+    ] = None,
+    ssid: Annotated[
+        list[str] | None,
+        typer.Option("--ssid", "-s", help="Actively probe for this SSID (repeatable)"),
+    ] = None,
+    passive: Annotated[
+        bool, typer.Option("--passive", help="Only listen for beacons"),
+    ] = False,
 ) -> None:
     """Scan for available WiFi networks."""
+    step = {"op": "scan", "interface": interface, "wait": wait, "passive": passive}
+    if freq:
+        step["freqs"] = freq
+    if ssid:
+        step["ssids"] = ssid
+    result = _forward(step)
+    if result is not None:
+        typer.echo(f"Scanned on interface: {result['interface']}")
+        _echo_networks(result["result"]["networks"])
+        return
+
     iface = _get_interface(interface)
 
     typer.echo(f"Scanning on interface: {iface.name()}")
-    iface.scan()
+    try:
+        iface.scan(freq, ssid, passive=passive)
+    except ValueError as err:
+        typer.echo(f"Error: {err}", err=True)
+        raise typer.Exit(code=1) from err
 
     typer.echo(f"Waiting {wait} seconds for scan results...")
     time.sleep(wait)
 
-    results = iface.scan_results()
-
-    if not results:
-        typer.echo("No networks found")
-        return
-
-    typer.echo(f"\nFound {len(results)} network(s):\n")
-    typer.echo(f"{'SSID':<32} {'BSSID':<18} {'Signal':<8} {'Security'}")
-    typer.echo("-" * 80)
-
-    for bss in results:
-        ssid = bss.ssid if bss.ssid else "(Hidden)"
-        bssid = bss.bssid if bss.bssid else "N/A"
-        signal = str(bss.signal) if hasattr(bss, "signal") else "N/A"
-
-        # Format security info
-        security_parts = []
-        if bss.akm:
-            security_parts.extend([_get_akm_name(akm) for akm in bss.akm])
-        security = ", ".join(security_parts) if security_parts else "Open"
-
-        typer.echo(f"{ssid:<32} {bssid:<18} {signal:<8} {security}")
+    _echo_networks([network_dict(bss) for bss in iface.scan_results()])
 
 
 @app.command()
@@ -111,51 +163,62 @@ def connect(
     timeout: Annotated[
         int, typer.Option("--timeout", "-t", help="Connection timeout in seconds"),
     ] = 10,
+    fresh: Annotated[
+        bool,
+        typer.Option("--fresh", help="Remove all saved networks and add this one again"),
+    ] = False,
+    update_key: Annotated[
+        bool,
+        typer.Option("--update-key", help="Send the password again to a saved network"),
+    ] = False,
+    trace: Annotated[
+        bool,
+        typer.Option("--trace", help="Show the time spent in each connection phase"),
+    ] = False,
 ) -> None:
     """Connect to a WiFi network."""
+    step = {
+        "op": "connect",
+        "ssid": ssid,
+        "password": password,
+        "interface": interface,
+        "timeout": timeout,
+        "fresh": fresh,
+        "update_key": update_key,
+    }
+    # The phases are traced from the events of this process, not the daemon.
+    if not trace and _forward(step) is not None:
+        typer.echo(f"Successfully connected to '{ssid}'")
+        return
+
     iface = _get_interface(interface)
 
     typer.echo(f"Connecting to '{ssid}' on interface: {iface.name()}")
 
-    # Disconnect from current network
-    iface.disconnect()
-    time.sleep(1)
-
-    # Create profile
-    profile = Profile()
-    profile.ssid = ssid
-
-    if password:
-        # Assume WPA2-PSK for networks with password
-        profile.akm = [AkmType.WPA2PSK]
-        profile.key = password
+    if trace:
+        if iface.status() == IfaceStatus.CONNECTED:
+            # Selecting the network it is on again changes no state to trace.
+            typer.echo("Disconnecting first to trace a full connection...")
+            _disconnect_and_wait(iface, timeout)
+        connect_trace = ConnectTracer(iface).trace(
+            lambda: start_connect(iface, ssid, password, fresh=fresh, update_key=update_key),
+            timeout,
+        )
+        _echo_trace(connect_trace)
+        iface.invalidate_status()
+        connected = connect_trace.connected or iface.status() == IfaceStatus.CONNECTED
     else:
-        # Open network
-        profile.akm = [AkmType.NONE]
+        start_connect(iface, ssid, password, fresh=fresh, update_key=update_key)
 
-    # Add and connect to network
-    iface.remove_all_network_profiles()
-    tmp_profile = iface.add_network_profile(profile)
-    iface.connect(tmp_profile)
-
-    # Wait for connection
-    typer.echo(f"Waiting for connection (timeout: {timeout}s)...")
-    start_time = time.time()
-    connected = False
-
-    while time.time() - start_time < timeout:
-        status = iface.status()
-        if status == IfaceStatus.CONNECTED:
-            connected = True
-            break
-        time.sleep(1)
+        # Wait for connection
+        typer.echo(f"Waiting for connection (timeout: {timeout}s)...")
+        connected = wait_for_connection(iface, timeout)
 
     if connected:
         typer.echo(f"Successfully connected to '{ssid}'")
     else:
         status = iface.status()
-        status_name = _get_status_name(status)
-        typer.echo(f"Failed to connect to '{ssid}'. Status: {status_name}", err=True)
+        typer.echo(f"Failed to connect to '{ssid}'. Status: {status_name(status)}", err=True)
         raise typer.Exit(code=1)
 
 
@@ -166,6 +229,12 @@ def disconnect(
     ] = 0,
 ) -> None:
     """Disconnect from the current WiFi network."""
+    result = _forward({"op": "disconnect", "interface": interface})
+    if result is not None:
+        typer.echo(f"Disconnected interface: {result['interface']}")
+        typer.echo(f"Status: {result['result']['status']}")
+        return
+
     iface = _get_interface(interface)
 
     typer.echo(f"Disconnecting interface: {iface.name()}")
@@ -176,8 +245,7 @@ def disconnect(
     if status in [IfaceStatus.DISCONNECTED, IfaceStatus.INACTIVE]:
         typer.echo("Successfully disconnected")
     else:
-        status_name = _get_status_name(status)
-        typer.echo(f"Disconnect may have failed. Status: {status_name}", err=True)
+        typer.echo(f"Disconnect may have failed. Status: {status_name(status)}", err=True)
 
 
 @app.command()
@@ -187,17 +255,30 @@ def status(
     ] = 0,
 ) -> None:
     """Show the status of the WiFi interface."""
+    result = _forward({"op": "status", "interface": interface})
+    if result is not None:
+        typer.echo(f"Interface: {result['interface']}")
+        typer.echo(f"Status: {result['result']['status']}")
+        return
+
     iface = _get_interface(interface)
 
     typer.echo(f"Interface: {iface.name()}")
     status = iface.status()
-    status_name = _get_status_name(status)
-    typer.echo(f"Status: {status_name}")
+    typer.echo(f"Status: {status_name(status)}")
 
 
 @app.command()
 def list_interfaces() -> None:
     """List all available WiFi interfaces."""
+    result = _forward({"op": "interfaces"})
+    if result is not None:
+        interfaces = result["result"]["interfaces"]
+        typer.echo(f"Found {len(interfaces)} interface(s):\n")
+        for idx, iface in enumerate(interfaces):
+            typer.echo(f"  [{idx}] {iface['name']} - {iface['status']}")
+        return
+
     wifi = PyWiFi()
     interfaces = wifi.interfaces()
 
@@ -208,8 +289,52 @@ def list_interfaces() -> None:
     typer.echo(f"Found {len(interfaces)} interface(s):\n")
     for idx, iface in enumerate(interfaces):
         status = iface.status()
-        status_name = _get_status_name(status)
-        typer.echo(f"  [{idx}] {iface.name()} - {status_name}")
+        typer.echo(f"  [{idx}] {iface.name()} - {status_name(status)}")
+
+
+@app.command()
+def batch(
+    script: Annotated[
+        str, typer.Argument(help="Batch file with one step per line, or '-' for stdin"),
+    ],
+    stop_on_error: Annotated[
+        bool, typer.Option("--stop-on-error", help="Stop at the first failing step"),
+    ] = False,
+) -> None:
+    """Run many operations in one process over shared interfaces."""
+    if script == "-":
+        lines = sys.stdin
+    else:
+        try:
+            lines = Path(script).read_text().splitlines()
+        except OSError as err:
+            typer.echo(f"Error: Cannot read {script}: {err.strerror or err}", err=True)
+            raise typer.Exit(code=1) from err
+
+    wifi = PyWiFi()
+    interfaces = wifi.interfaces()
+
+    if not interfaces:
+        typer.echo("Error: No WiFi interfaces found", err=True)
+        raise typer.Exit(code=1)
+
+    started = time.perf_counter()
+    steps = 0
+    failed = 0
+    for result in run_batch(lines, interfaces, stop_on_error=stop_on_error):
+        steps += 1
+        failed += not result["ok"]
+        typer.echo(json.dumps(result))
+
+    summary = {
+        "steps": steps,
+        "failed": failed,
+        "elapsed": round(time.perf_counter() - started, 6),
+    }
+    typer.echo(json.dumps({"summary": summary}))
+
+    if failed:
+        raise typer.Exit(code=1)
 
 
 if __name__ == "__main__":
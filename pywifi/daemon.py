@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+"""pywifid - keep the wifi interfaces open and serve pywifi calls.
+
+Every pywifi command pays for the interpreter start, the discovery of the
+interfaces and the connection to wpa_supplicant. The daemon does this once,
+keeps an event monitor per interface and answers the RPC of pywifi.rpc
+over a Unix socket, so that the CLI forwards its commands and returns
+quickly. The status of an interface is cached until a state change event
+arrives or STATUS_TTL expires.
+"""
+
+import json
+import logging
+import os
+import signal
+import socketserver
+import threading
+from typing import Annotated, Any
+
+import typer
+
+from pywifi.batch import BatchStepError, parse_step, run_step, status_name
+from pywifi.iface import Interface
+from pywifi.rpc import SOCKET_PATH, connect_daemon, ensure_runtime_dir, peer_uid, runtime_dir
+from pywifi.wifi import PyWiFi
+
+STATUS_TTL = 5.0
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        uid = peer_uid(self.request) if hasattr(os, "getuid") else None
+        if uid is not None and uid != os.getuid():
+            logging.getLogger("pywifi").warning("pywifid refused a client of uid %d", uid)
+            return
+        for line in self.rfile:
+            reply = self.server.daemon.handle(line.decode("utf-8", errors="replace"))
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class Daemon:
+    """Daemon owns the wifi interfaces and serves requests for them."""
+
+    def __init__(
+        self,
+        path: str = SOCKET_PATH,
+        *,
+        interfaces: list[Interface] | None = None,
+        status_ttl: float = STATUS_TTL,
+    ) -> None:
+        """Serve ``interfaces``, all the available ones by default, on ``path``."""
+        self.path = path
+        if interfaces is None:
+            interfaces = PyWiFi().interfaces()
+        self._ifaces = interfaces
+        self._server = None
+        self._thread = None
+        self._logger = logging.getLogger("pywifi")
+
+        for iface in self._ifaces:
+            iface.status_ttl = status_ttl
+            try:
+                iface.event_monitor().start()
+            except NotImplementedError:
+                # Without events a cached status could not be refreshed.
+                iface.status_ttl = 0.0
+
+    def handle(self, line: str) -> dict[str, Any]:
+        """Run one request, a step of the batch format, and return its result.
+
+        Any error is returned as a failed result, so the client learns why
+        the request failed and the connection stays open.
+        """
+        try:
+            step = parse_step(line)
+        except (BatchStepError, ValueError) as err:
+            return {"ok": False, "error": str(err)}
+        if step is None:
+            return {"ok": False, "error": "Empty request"}
+
+        try:
+            if step["op"] == "interfaces":
+                interfaces = [
+                    {"name": iface.name(), "status": status_name(iface.status())}
+                    for iface in self._ifaces
+                ]
+                return {"op": "interfaces", "ok": True, "result": {"interfaces": interfaces}}
+            return run_step(step, self._ifaces)
+        except Exception as err:
+            self._logger.exception("pywifid failed to run '%s'", step.get("op"))
+            return {"op": step.get("op"), "ok": False, "error": f"{type(err).__name__}: {err}"}
+
+    def bind(self) -> None:
+        """Listen on the socket, replacing the one left by a dead daemon."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if directory == os.path.abspath(runtime_dir()):
+            ensure_runtime_dir(directory)
+        if os.path.exists(self.path):
+            client = connect_daemon(self.path)
+            if client is not None:
+                client.close()
+                raise RuntimeError(f"pywifid is already running on '{self.path}'")
+            os.remove(self.path)
+
+        # Only the user running the daemon may connect to it.
+        umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.path, _Handler)
+        finally:
+            os.umask(umask)
+        self._server.daemon = self
+        self._logger.info("pywifid serves %d interfaces on '%s'", len(self._ifaces), self.path)
+
+    def serve_forever(self) -> None:
+        """Serve the requests until close() is called."""
+        if self._server is None:
+            self.bind()
+        self._server.serve_forever()
+
+    def start(self) -> None:
+        """Serve the requests on a background thread."""
+        if self.is_running():
+            return
+        self.bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def is_running(self) -> bool:
+        """Check if the requests are served on a background thread."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def close(self) -> None:
+        """Stop serving, remove the socket and stop monitoring the interfaces."""
+        if self._server is not None:
+            if self._thread is not None:
+                self._server.shutdown()
+                self._thread.join()
+                self._thread = None
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+        for iface in self._ifaces:
+            iface.event_monitor().stop()
+        self._ifaces = []
+
+
+app = typer.Typer(help="pywifid - Keep the WiFi interfaces open for fast pywifi commands")
+
+
+@app.command()
+def serve(
+    socket_path: Annotated[
+        str,
+        typer.Option("--socket", "-s", help="Unix socket to serve on"),
+    ] = SOCKET_PATH,
+    status_ttl: Annotated[
+        float,
+        typer.Option("--status-ttl", help="Seconds a status is cached without events"),
+    ] = STATUS_TTL,
+) -> None:
+    """Serve the pywifi commands until interrupted."""
+    daemon = Daemon(socket_path, status_ttl=status_ttl)
+    try:
+        daemon.bind()
+    except (RuntimeError, OSError) as err:
+        typer.echo(f"Error: {err}", err=True)
+        raise typer.Exit(code=1) from err
+
+    def terminate(_signum: int, _frame: object) -> None:
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    typer.echo(f"pywifid listening on {socket_path}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+
+
+if __name__ == "__main__":
+    app()
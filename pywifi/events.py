@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+"""Monitor the unsolicited events of a wifi interface.
+
+wpa_supplicant sends events (e.g. CTRL-EVENT-CONNECTED) to every control
+socket attached to the interface. EventMonitor owns such a socket, reads
+the events on a background thread and dispatches them to the subscribers.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pywifi.iface import Interface
+
+EVENT_RECV_TIMEOUT = 0.5
+EVENT_RECV_SIZE = 4096
+
+_EVENT_RE = re.compile(r"<(\d+)>(\S+)\s*(.*)", re.DOTALL)
+_PARAM_RE = re.compile(r"([\w-]+)=([^\s\]]*)")
+_BSSID_RE = re.compile(r"(?:[0-9a-fA-F]{2}:){5}[0-9a-fA-F]{2}")
+
+EVENT_CONNECTED = "CTRL-EVENT-CONNECTED"
+EVENT_DISCONNECTED = "CTRL-EVENT-DISCONNECTED"
+EVENT_SCAN_RESULTS = "CTRL-EVENT-SCAN-RESULTS"
+EVENT_STATE_CHANGE = "CTRL-EVENT-STATE-CHANGE"
+
+
+@dataclass
+class Event:
+    """An unsolicited event of a wifi interface."""
+
+    name: str
+    text: str = ""
+    level: int = 2
+    timestamp: float = field(default_factory=time.monotonic)
+
+    @property
+    def params(self) -> dict[str, str]:
+        """Get the "key=value" parameters of the event text."""
+        return dict(_PARAM_RE.findall(self.text))
+
+    @property
+    def bssid(self) -> str | None:
+        """Get the first BSSID mentioned in the event text."""
+        match = _BSSID_RE.search(self.text)
+        return match.group(0).lower() if match else None
+
+
+def parse_event(raw: str) -> Event:
+    """Parse an event message like '<3>CTRL-EVENT-CONNECTED - Connection...'."""
+    match = _EVENT_RE.fullmatch(raw.strip())
+    if match is None:
+        return Event(name=raw.strip())
+
+    level, name, text = match.groups()
+    return Event(name=name, text=text, level=int(level))
+
+
+class EventMonitor:
+    """EventMonitor dispatches the events of an interface to subscribers."""
+
+    def __init__(self, iface: "Interface") -> None:
+        """Create an event monitor for the wifi interface."""
+        self._iface = iface
+        self._subscribers: list[Callable[[Event], None]] = []
+        self._sock = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._logger = logging.getLogger("pywifi")
+
+    def subscribe(self, callback: Callable[[Event], None]) -> None:
+        """Call ``callback`` with every event received from now on."""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Event], None]) -> None:
+        """Stop calling ``callback`` with events."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def is_running(self) -> bool:
+        """Check if the monitor thread is receiving events."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Attach to the interface and receive events on a background thread."""
+        if self.is_running():
+            return
+
+        self._stop.clear()
+        self._sock = self._iface.attach()
+        self._sock.settimeout(EVENT_RECV_TIMEOUT)
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"pywifi-events-{self._iface.name()}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop receiving events and detach from the interface."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._sock is not None:
+            self._iface.detach(self._sock)
+            self._sock = None
+
+    def dispatch(self, event: Event) -> None:
+        """Deliver an event to all the subscribers."""
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception:
+                self._logger.exception("Event subscriber failed on '%s'", event.name)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                raw = self._sock.recv(EVENT_RECV_SIZE)
+            except TimeoutError:
+                continue
+            except OSError:
+                self._logger.exception("Event socket of '%s' is broken", self._iface.name())
+                break
+
+            if raw:
+                self.dispatch(parse_event(raw.decode("utf-8", errors="replace")))
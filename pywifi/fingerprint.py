@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+
+"""Locate a device from a scan with a database of reference scans.
+
+FingerprintDB keeps the RSSI of every reference scan over a vocabulary of
+BSSIDs in a dense int8 matrix, one row per BSSID, where unseen BSSIDs read
+MISSING_RSSI. The squared distance of every reference point to a live scan
+is one matrix-vector product over the rows of the BSSIDs in the scan, plus
+a per-point norm kept at insertion, so a lookup does not touch the BSSIDs
+the scan does not see. A database stored in a directory is memory mapped.
+numpy is required.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+
+from pywifi.profile import Profile
+
+try:
+    import numpy as np
+    from numpy.lib.format import open_memmap
+except ImportError as err:
+    raise ImportError("Fingerprinting requires numpy: pip install pywifi[fingerprint]") from err
+
+FORMAT_VERSION = 1
+MISSING_RSSI = -100
+INITIAL_POINTS = 1024
+INITIAL_BSSIDS = 64
+
+_META_FILE = "meta.json"
+
+
+@dataclass
+class Location:
+    """The estimated position of a scan and its nearest reference points."""
+
+    position: tuple[float, ...]
+    indices: list[int]
+    distances: list[float]
+
+
+def _signals(bsses: list[Profile]) -> dict[str, int]:
+    return {bss.bssid.lower(): max(int(bss.signal), MISSING_RSSI) for bss in bsses if bss.bssid}
+
+
+class FingerprintDB:
+    """FingerprintDB stores reference scans and matches live scans by k-NN."""
+
+    def __init__(self, path: str | None = None, *, dims: int = 2) -> None:
+        """Open the database in the directory ``path``, or keep one in memory.
+
+        A new database with positions of ``dims`` coordinates is created if
+        ``path`` holds none; an existing one keeps its own dims.
+        """
+        self.path = path
+        self.dims = dims
+        self.bssids: list[str] = []
+        self.count = 0
+        self._columns: dict[str, int] = {}
+
+        if path is not None and os.path.exists(os.path.join(path, _META_FILE)):
+            self._load()
+            return
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self._rssi = self._new_array(
+            "rssi",
+            (INITIAL_BSSIDS, INITIAL_POINTS),
+            np.int8,
+            MISSING_RSSI,
+        )
+        self._positions = self._new_array("positions", (INITIAL_POINTS, dims), np.float64)
+        self._norms = self._new_array("norms", (INITIAL_POINTS,), np.float64)
+        self.flush()
+
+    def __len__(self) -> int:
+        """Get the number of reference points."""
+        return self.count
+
+    def __enter__(self) -> "FingerprintDB":
+        """Use the database as a context manager flushing it on exit."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Flush the database."""
+        self.flush()
+
+    def add(self, bsses: list[Profile], position: tuple[float, ...]) -> int:
+        """Add the scan ``bsses`` taken at ``position`` and get its index."""
+        if len(position) != self.dims:
+            raise ValueError(f"position must have {self.dims} coordinates")
+
+        signals = _signals(bsses)
+        new = [bssid for bssid in signals if bssid not in self._columns]
+        self._reserve(len(self.bssids) + len(new), self.count + 1)
+        for bssid in new:
+            self._columns[bssid] = len(self.bssids)
+            self.bssids.append(bssid)
+
+        index = self.count
+        if signals:
+            columns = np.fromiter((self._columns[bssid] for bssid in signals), np.intp)
+            values = np.fromiter(signals.values(), np.float64)
+            self._rssi[columns, index] = values
+            self._norms[index] = np.square(values - MISSING_RSSI).sum()
+        else:
+            self._norms[index] = 0.0
+        self._positions[index] = position
+        self.count += 1
+        return index
+
+    def locate(self, bsses: list[Profile], k: int = 3) -> Location | None:
+        """Estimate the position of a scan from its ``k`` nearest reference points.
+
+        The position is the mean of the neighbours weighted by their inverse
+        distance; None is returned while the database is empty.
+        """
+        if k <= 0:
+            raise ValueError("k must be positive")
+        if not self.count:
+            return None
+
+        dist2 = self.distances2(bsses)
+        k = min(k, self.count)
+        nearest = np.argpartition(dist2, k - 1)[:k] if k < self.count else np.arange(k)
+        nearest = nearest[np.argsort(dist2[nearest])]
+        distances = np.sqrt(np.maximum(dist2[nearest], 0.0))
+
+        weights = 1.0 / (distances + 1.0)
+        position = weights @ self._positions[nearest] / weights.sum()
+        return Location(
+            position=tuple(position.tolist()),
+            indices=nearest.tolist(),
+            distances=distances.tolist(),
+        )
+
+    def distances2(self, bsses: list[Profile]) -> "np.ndarray":
+        """Get the squared RSSI distance of a scan to every reference point."""
+        n = self.count
+        dist2 = self._norms[:n].copy()
+        columns = []
+        values = []
+        for bssid, signal in _signals(bsses).items():
+            column = self._columns.get(bssid)
+            if column is None:
+                # Missing from every reference point: the same for all of them.
+                dist2 += (signal - MISSING_RSSI) ** 2
+            else:
+                columns.append(column)
+                values.append(signal)
+        if not columns:
+            return dist2
+
+        # sum((r - q)² - (r - M)²) over the scanned BSSIDs is linear in r.
+        query = np.array(values, np.float32)
+        ref = self._rssi[np.array(columns, np.intp), :n].astype(np.float32)
+        dist2 += float(np.dot(query - MISSING_RSSI, query + MISSING_RSSI))
+        dist2 -= (2 * (query - MISSING_RSSI)) @ ref
+        return dist2
+
+    def position(self, index: int) -> tuple[float, ...]:
+        """Get the position of a reference point."""
+        if not 0 <= index < self.count:
+            raise IndexError(f"Reference point {index} not found")
+        return tuple(self._positions[index].tolist())
+
+    def flush(self) -> None:
+        """Write the database to its directory, if it has one."""
+        if self.path is None:
+            return
+
+        for array in (self._rssi, self._positions, self._norms):
+            array.flush()
+        meta = {
+            "version": FORMAT_VERSION,
+            "count": self.count,
+            "dims": self.dims,
+            "bssids": self.bssids,
+        }
+        tmp = os.path.join(self.path, f"{_META_FILE}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, _META_FILE))
+
+    def _load(self) -> None:
+        with open(os.path.join(self.path, _META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported fingerprint database version: {meta.get('version')}")
+
+        self.count = meta["count"]
+        self.dims = meta["dims"]
+        self.bssids = meta["bssids"]
+        self._columns = {bssid: column for column, bssid in enumerate(self.bssids)}
+        self._rssi = np.load(self._file("rssi"), mmap_mode="r+")
+        self._positions = np.load(self._file("positions"), mmap_mode="r+")
+        self._norms = np.load(self._file("norms"), mmap_mode="r+")
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.npy")
+
+    def _new_array(
+        self,
+        name: str,
+        shape: tuple[int, ...],
+        dtype: type,
+        fill: float = 0,
+        *,
+        suffix: str = "",
+    ) -> "np.ndarray":
+        if self.path is None:
+            return np.full(shape, fill, dtype)
+        array = open_memmap(self._file(name) + suffix, mode="w+", dtype=dtype, shape=shape)
+        array[...] = fill
+        return array
+
+    def _reserve(self, bssids: int, points: int) -> None:
+        """Grow the arrays, doubling them, to hold ``bssids`` and ``points``."""
+        rows, capacity = self._rssi.shape
+        if bssids <= rows and points <= capacity:
+            return
+
+        while rows < bssids:
+            rows *= 2
+        while capacity < points:
+            capacity *= 2
+        shapes = {
+            "rssi": (rows, capacity),
+            "positions": (capacity, self.dims),
+            "norms": (capacity,),
+        }
+        grown = {}
+        for name, shape in shapes.items():
+            array = getattr(self, f"_{name}")
+            if array.shape != shape:
+                fill = MISSING_RSSI if name == "rssi" else 0
+                grown[name] = self._grown(name, array, shape, fill)
+        del array
+        if self.path is None:
+            for name, array in grown.items():
+                setattr(self, f"_{name}", array)
+            return
+
+        # A mapped file cannot be renamed on Windows: close the old and the
+        # new maps by dropping them, replace the files and map them again.
+        names = list(grown)
+        del grown
+        for name in names:
+            setattr(self, f"_{name}", None)
+        for name in names:
+            os.replace(self._file(name) + ".tmp", self._file(name))
+            setattr(self, f"_{name}", np.load(self._file(name), mmap_mode="r+"))
+
+    def _grown(
+        self,
+        name: str,
+        array: "np.ndarray",
+        shape: tuple[int, ...],
+        fill: float = 0,
+    ) -> "np.ndarray":
+        grown = self._new_array(name, shape, array.dtype, fill, suffix=".tmp")
+        grown[tuple(slice(0, size) for size in array.shape)] = array
+        if self.path is not None:
+            grown.flush()
+        return grown
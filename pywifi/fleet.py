@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+
+"""Drive many wifi interfaces from a pool of worker processes.
+
+FleetController shards the interfaces across worker processes. Each worker
+opens and owns the control connections of its shard, so the interfaces of
+different shards are driven in parallel. Operations fan out from a single
+parent API and their results are collected per interface. A worker which
+dies or stops answering only fails the operations of its own shard, and it
+is restarted before the next operation.
+"""
+
+import logging
+import multiprocessing
+import time
+import traceback
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import Any
+
+from pywifi.batch import join_network
+from pywifi.iface import Interface
+from pywifi.profile import Profile
+from pywifi.wifi import PyWiFi
+
+# Interface methods the workers run on request.
+FLEET_OPS = {
+    "scan",
+    "scan_results",
+    "status",
+    "link_info",
+    "status_fields",
+    "signal_poll",
+    "packet_counts",
+    "connect",
+    "disconnect",
+    "add_network_profile",
+    "apply_profiles",
+    "update_network_key",
+    "network_profiles",
+    "remove_all_network_profiles",
+    "join",
+}
+
+
+@dataclass
+class FleetResult:
+    """The result of an operation on one interface of the fleet."""
+
+    name: str
+    ok: bool
+    value: Any = None
+    error: str | None = None
+    elapsed: float = 0.0
+
+
+def open_interfaces(names: list[str]) -> dict[str, Interface]:
+    """Open the named interfaces; the default interface factory of workers."""
+    return {iface.name(): iface for iface in PyWiFi().interfaces(names)}
+
+
+def _worker_main(
+    conn: Connection,
+    names: list[str],
+    factory: Callable[[list[str]], dict[str, Interface]],
+) -> None:
+    ifaces = factory(names)
+    while True:
+        try:
+            requests = conn.recv()
+        except EOFError:
+            break
+        if requests is None:
+            break
+
+        replies = []
+        for name, op, args, kwargs in requests:
+            started = time.perf_counter()
+            try:
+                iface = ifaces[name]
+                if op == "join":
+                    value = join_network(iface, *args, **kwargs)
+                else:
+                    value = getattr(iface, op)(*args, **kwargs)
+                reply = FleetResult(name, ok=True, value=value)
+            except Exception as err:  # noqa: BLE001 - reported to the parent
+                error = "".join(traceback.format_exception_only(err)).strip()
+                reply = FleetResult(name, ok=False, error=error)
+            reply.elapsed = time.perf_counter() - started
+            replies.append(reply)
+
+        conn.send(replies)
+
+
+class _Worker:
+    def __init__(self, names: list[str]) -> None:
+        self.names = names
+        self.process = None
+        self.conn = None
+        self.restarts = 0
+
+
+class FleetController:
+    """FleetController fans operations out to interfaces sharded over processes."""
+
+    def __init__(
+        self,
+        names: list[str] | None = None,
+        workers: int = 4,
+        *,
+        interface_factory: Callable[[list[str]], dict[str, Interface]] = open_interfaces,
+        timeout: float = 30.0,
+        start_method: str | None = None,
+    ) -> None:
+        """Create a controller sharding the named interfaces over workers.
+
+        All the available interfaces are used if ``names`` is None. The
+        ``interface_factory`` runs in each worker to open the interfaces of
+        its shard and must be picklable. An operation not answered within
+        ``timeout`` seconds fails and its worker is restarted. Workers are
+        started with ``start_method``, by default "forkserver" where it is
+        available since forking a process running threads is unsafe.
+        """
+        if names is None:
+            names = [iface.name() for iface in PyWiFi().interfaces()]
+
+        self.names = list(names)
+        self.timeout = timeout
+        self._factory = interface_factory
+        if start_method is None and "forkserver" in multiprocessing.get_all_start_methods():
+            start_method = "forkserver"
+        self._ctx = multiprocessing.get_context(start_method)
+        self._logger = logging.getLogger("pywifi")
+
+        count = max(1, min(workers, len(self.names)))
+        self._workers = [_Worker(self.names[i::count]) for i in range(count)]
+        self._shard = {name: worker for worker in self._workers for name in worker.names}
+        for worker in self._workers:
+            self._start(worker)
+
+    def __enter__(self) -> "FleetController":
+        """Use the controller as a context manager closing it on exit."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close the controller."""
+        self.close()
+
+    def restarts(self) -> dict[int, int]:
+        """Get the number of restarts of each worker."""
+        return {idx: worker.restarts for idx, worker in enumerate(self._workers)}
+
+    def call(
+        self,
+        op: str,
+        *args: Any,  # noqa: ANN401
+        names: list[str] | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> dict[str, FleetResult]:
+        """Run the same operation on the named interfaces, by default all of them."""
+        names = self.names if names is None else names
+        return self.dispatch(dict.fromkeys(names, (op, args, kwargs)))
+
+    def dispatch(
+        self,
+        requests: dict[str, tuple[str, tuple, dict]],
+    ) -> dict[str, FleetResult]:
+        """Run an (op, args, kwargs) operation per interface name in parallel."""
+        results: dict[str, FleetResult] = {}
+        batches: dict[_Worker, list] = {}
+        for name, (op, args, kwargs) in requests.items():
+            if op not in FLEET_OPS:
+                raise ValueError(f"Unsupported fleet operation '{op}'")
+            worker = self._shard.get(name)
+            if worker is None:
+                results[name] = FleetResult(name, ok=False, error="Unknown interface")
+                continue
+            batches.setdefault(worker, []).append((name, op, args, kwargs))
+
+        pending = {}
+        for worker, batch in batches.items():
+            if not worker.process.is_alive():
+                self._restart(worker)
+            try:
+                worker.conn.send(batch)
+                pending[worker.conn] = (worker, batch)
+            except OSError:
+                self._fail(worker, batch, "Worker is not reachable", results)
+
+        deadline = time.monotonic() + self.timeout
+        while pending:
+            ready = wait(list(pending), max(0.0, deadline - time.monotonic()))
+            if not ready:
+                for worker, batch in pending.values():
+                    self._fail(worker, batch, "Worker timed out", results)
+                break
+
+            for conn in ready:
+                worker, batch = pending.pop(conn)
+                try:
+                    for reply in conn.recv():
+                        results[reply.name] = reply
+                except (EOFError, OSError):
+                    self._fail(worker, batch, "Worker died", results)
+
+        return results
+
+    def scan_all(self, names: list[str] | None = None, **kwargs: Any) -> dict[str, FleetResult]:  # noqa: ANN401
+        """Trigger a scan on the interfaces."""
+        return self.call("scan", names=names, **kwargs)
+
+    def scan_results_all(self, names: list[str] | None = None) -> dict[str, FleetResult]:
+        """Get the scan results of the interfaces."""
+        return self.call("scan_results", names=names)
+
+    def status_all(self, names: list[str] | None = None) -> dict[str, FleetResult]:
+        """Get the status of the interfaces."""
+        return self.call("status", names=names)
+
+    def connect_many(
+        self,
+        assignments: dict[str, Profile],
+        *,
+        update_key: bool = False,
+    ) -> dict[str, FleetResult]:
+        """Connect each named interface to its network profile.
+
+        A saved network matching the profile is reused, otherwise the
+        profile is added first; see batch.join_network(). The value of each
+        result is the saved network selected.
+        """
+        join = {"update_key": update_key}
+        return self.dispatch(
+            {name: ("join", (profile,), join) for name, profile in assignments.items()},
+        )
+
+    def close(self) -> None:
+        """Stop all the worker processes."""
+        for worker in self._workers:
+            self._stop(worker)
+
+    def _start(self, worker: _Worker) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        worker.process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, worker.names, self._factory),
+            name=f"pywifi-fleet-{worker.names[0]}",
+            daemon=True,
+        )
+        worker.process.start()
+        child_conn.close()
+        worker.conn = parent_conn
+
+    def _stop(self, worker: _Worker) -> None:
+        if worker.process is None:
+            return
+
+        try:
+            worker.conn.send(None)
+        except OSError:
+            pass
+        worker.process.join(1)
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join()
+        worker.conn.close()
+        worker.process = None
+
+    def _restart(self, worker: _Worker) -> None:
+        self._logger.warning("Restart fleet worker of %s", ", ".join(worker.names))
+        if worker.process is not None and worker.process.is_alive():
+            worker.process.terminate()
+        self._stop(worker)
+        worker.restarts += 1
+        self._start(worker)
+
+    def _fail(
+        self,
+        worker: _Worker,
+        batch: list,
+        error: str,
+        results: dict[str, FleetResult],
+    ) -> None:
+        for name, *_ in batch:
+            results[name] = FleetResult(name, ok=False, error=error)
+        self._restart(worker)
+
+
+def assign_round_robin(names: list[str], profiles: list[Profile]) -> dict[str, Profile]:
+    """Assign the networks to the interfaces in turn, e.g. for connect_many()."""
+    return {name: profiles[idx % len(profiles)] for idx, name in enumerate(names)}
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+
+"""Keep a compact log of the scan results on disk.
+
+HistoryWriter appends every BSS of a scan as a fixed-size binary record to
+segment files in a directory, buffered in memory and written in batches,
+and starts a new segment once one reaches ``segment_size``. SSIDs and
+interface names are interned in a strings file and recorded by id.
+HistoryReader memory maps the segments: a time range is found by a binary
+search on the timestamps, and BSSID or SSID filters search the mapped bytes,
+so only the matching records are turned into Python objects.
+"""
+
+import bisect
+import io
+import json
+import math
+import mmap
+import os
+import struct
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from pywifi.profile import Profile
+
+FORMAT_VERSION = 1
+
+# timestamp, interface id, SSID id, freq, BSSID, RSSI, security bits
+RECORD = struct.Struct("<dIIH6sbB")
+RECORD_SIZE = RECORD.size
+HEADER = struct.Struct("<4sHH")
+MAGIC = b"PWHL"
+
+_TIMESTAMP = struct.Struct("<d")
+_SSID_OFFSET = 12
+_BSSID_OFFSET = 18
+_SEGMENT_PREFIX = "scans-"
+_SEGMENT_SUFFIX = ".log"
+_STRINGS_FILE = "strings.txt"
+
+
+@dataclass
+class ScanRecord:
+    """A BSS seen by a scan, as recorded in the history."""
+
+    timestamp: float
+    iface: str
+    ssid: str
+    bssid: str
+    freq: int
+    signal: int
+    akm: list[int]
+
+
+def security_bits(akm: list[int]) -> int:
+    """Pack a list of akm into the security bits of a record, one bit per akm."""
+    bits = 0
+    for value in akm:
+        bits |= 1 << value
+    return bits & 0xFF
+
+
+def _akm_of(bits: int) -> list[int]:
+    return [value for value in range(8) if bits & (1 << value)]
+
+
+def _pack_bssid(bssid: str) -> bytes:
+    return bytes.fromhex(bssid.replace(":", "").replace("-", ""))
+
+
+def _unpack_bssid(data: bytes) -> str:
+    return data.hex(":")
+
+
+def _segments(path: str) -> list[str]:
+    names = sorted(
+        name
+        for name in os.listdir(path)
+        if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+    )
+    return [os.path.join(path, name) for name in names]
+
+
+def _sequence_of(segment: str) -> int:
+    return int(os.path.basename(segment)[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)])
+
+
+def _recover(segment: str) -> float:
+    """Drop a record torn by a crash from a segment and get its last timestamp."""
+    size = os.path.getsize(segment)
+    torn = (size - HEADER.size) % RECORD_SIZE if size >= HEADER.size else size
+    if torn:
+        os.truncate(segment, size - torn)
+        size -= torn
+    if size < HEADER.size + RECORD_SIZE:
+        return -math.inf
+
+    with open(segment, "rb") as f:
+        f.seek(size - RECORD_SIZE)
+        return _TIMESTAMP.unpack(f.read(_TIMESTAMP.size))[0]
+
+
+def _load_strings(path: str) -> list[str]:
+    try:
+        with open(os.path.join(path, _STRINGS_FILE), encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.endswith("\n")]
+    except FileNotFoundError:
+        return []
+
+
+class HistoryWriter:
+    """HistoryWriter appends scan results to the history in a directory."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        segment_size: int = 16 * 1024 * 1024,
+        max_segments: int | None = None,
+        buffer_records: int = 512,
+        flush_interval: float = 30.0,
+    ) -> None:
+        """Open the history in the directory ``path`` for appending.
+
+        Records are written once ``buffer_records`` are buffered or the
+        oldest of them is ``flush_interval`` seconds old. A new segment is
+        started once the current one holds ``segment_size`` bytes, and the
+        oldest segments are deleted beyond ``max_segments``.
+        """
+        self.path = path
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.buffer_records = buffer_records
+        self.flush_interval = flush_interval
+
+        os.makedirs(path, exist_ok=True)
+        self._strings = _load_strings(path)
+        self._ids = {string: index for index, string in enumerate(self._strings)}
+        self._new_strings: list[str] = []
+        self._buffer = bytearray()
+        self._buffered_since: float | None = None
+        self._last_timestamp = -math.inf
+        self._segment = None
+
+        segments = _segments(path)
+        self._sequence = _sequence_of(segments[-1]) if segments else 0
+        if segments:
+            self._last_timestamp = _recover(segments[-1])
+
+    def __enter__(self) -> "HistoryWriter":
+        """Use the writer as a context manager closing it on exit."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close the writer."""
+        self.close()
+
+    def append(self, bsses: list[Profile], iface: str = "", now: float | None = None) -> int:
+        """Add the scan results ``bsses`` of ``iface`` seen at ``now`` (epoch seconds).
+
+        The timestamps are kept non-decreasing, as the reader relies on it to
+        search the time ranges. Get the number of records added.
+        """
+        now = time.time() if now is None else now
+        now = self._last_timestamp = max(now, self._last_timestamp)
+        iface_id = self._intern(iface)
+        added = 0
+        for bss in bsses:
+            if not bss.bssid:
+                continue
+            self._buffer += RECORD.pack(
+                now,
+                iface_id,
+                self._intern(bss.ssid or ""),
+                bss.freq or 0,
+                _pack_bssid(bss.bssid),
+                min(max(int(bss.signal), -128), 127),
+                security_bits(bss.akm),
+            )
+            added += 1
+
+        if self._buffered_since is None:
+            self._buffered_since = time.monotonic()
+        if (
+            len(self._buffer) >= self.buffer_records * RECORD_SIZE
+            or time.monotonic() - self._buffered_since >= self.flush_interval
+        ):
+            self.flush()
+        return added
+
+    def flush(self) -> None:
+        """Write the buffered records."""
+        if self._new_strings:
+            # The strings first, so that every written record resolves.
+            with open(os.path.join(self.path, _STRINGS_FILE), "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(string) + "\n" for string in self._new_strings)
+            self._new_strings.clear()
+
+        with memoryview(self._buffer) as data:
+            written = 0
+            while written < len(data):
+                segment = self._open_segment()
+                room = max(self.segment_size - segment.tell(), RECORD_SIZE)
+                size = min(room - room % RECORD_SIZE, len(data) - written)
+                segment.write(data[written : written + size])
+                written += size
+                if segment.tell() >= self.segment_size:
+                    self._rotate()
+        if self._segment is not None:
+            self._segment.flush()
+        self._buffer.clear()
+        self._buffered_since = None
+
+    def close(self) -> None:
+        """Write the buffered records and close the current segment."""
+        self.flush()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _intern(self, string: str) -> int:
+        index = self._ids.get(string)
+        if index is None:
+            index = self._ids[string] = len(self._strings)
+            self._strings.append(string)
+            self._new_strings.append(string)
+        return index
+
+    def _open_segment(self) -> io.BufferedWriter:
+        if self._segment is None:
+            name = f"{_SEGMENT_PREFIX}{self._sequence:08d}{_SEGMENT_SUFFIX}"
+            self._segment = open(os.path.join(self.path, name), "ab")  # noqa: SIM115
+            if self._segment.tell() >= self.segment_size:
+                self._rotate()
+                return self._open_segment()
+            if not self._segment.tell():
+                self._segment.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE))
+                self._prune()
+        return self._segment
+
+    def _rotate(self) -> None:
+        self._segment.close()
+        self._segment = None
+        self._sequence += 1
+
+    def _prune(self) -> None:
+        if self.max_segments is not None:
+            for segment in _segments(self.path)[: -self.max_segments]:
+                os.remove(segment)
+
+
+class HistoryReader:
+    """HistoryReader searches the scan history in a directory."""
+
+    def __init__(self, path: str) -> None:
+        """Map the segments of the history in the directory ``path``.
+
+        The records appended after the reader was created are not seen;
+        create a new reader to see them.
+        """
+        self.path = path
+        self.strings = _load_strings(path)
+        self._ids = {string: index for index, string in enumerate(self.strings)}
+        self._maps: list[tuple[mmap.mmap, int]] = []
+        for segment in _segments(path):
+            with open(segment, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < HEADER.size + RECORD_SIZE:
+                    continue
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, record_size = HEADER.unpack_from(data)
+            if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD_SIZE:
+                data.close()
+                raise ValueError(f"Unsupported scan history segment: {segment}")
+            self._maps.append((data, (size - HEADER.size) // RECORD_SIZE))
+
+    def __enter__(self) -> "HistoryReader":
+        """Use the reader as a context manager closing it on exit."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close the reader."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Get the number of records."""
+        return sum(count for _, count in self._maps)
+
+    def close(self) -> None:
+        """Unmap the segments."""
+        for data, _ in self._maps:
+            data.close()
+        self._maps = []
+
+    def records(  # noqa: PLR0913
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        *,
+        bssid: str | None = None,
+        ssid: str | None = None,
+        iface: str | None = None,
+        freq: int | None = None,
+        min_signal: int | None = None,
+    ) -> Iterator[ScanRecord]:
+        """Get the records seen from ``start`` to before ``end`` matching every filter."""
+        ssid_id = self._id(ssid)
+        iface_id = self._id(iface)
+        if -1 in (ssid_id, iface_id):
+            return
+
+        for data, count in self._maps:
+            first, last = self._bounds(data, count, start, end)
+            for offset in self._candidates(data, first, last, bssid, ssid_id):
+                timestamp, iface_index, ssid_index, bss_freq, raw, signal, bits = (
+                    RECORD.unpack_from(data, offset)
+                )
+                if (
+                    (ssid_id is not None and ssid_index != ssid_id)
+                    or (iface_id is not None and iface_index != iface_id)
+                    or (freq is not None and bss_freq != freq)
+                    or (min_signal is not None and signal < min_signal)
+                ):
+                    continue
+                yield ScanRecord(
+                    timestamp=timestamp,
+                    iface=self.strings[iface_index],
+                    ssid=self.strings[ssid_index],
+                    bssid=_unpack_bssid(raw),
+                    freq=bss_freq,
+                    signal=signal,
+                    akm=_akm_of(bits),
+                )
+
+    def _id(self, string: str | None) -> int | None:
+        if string is None:
+            return None
+        return self._ids.get(string, -1)
+
+    @staticmethod
+    def _bounds(
+        data: mmap.mmap,
+        count: int,
+        start: float | None,
+        end: float | None,
+    ) -> tuple[int, int]:
+        def timestamp(index: int) -> float:
+            return _TIMESTAMP.unpack_from(data, HEADER.size + index * RECORD_SIZE)[0]
+
+        first = 0 if start is None else bisect.bisect_left(range(count), start, key=timestamp)
+        last = count if end is None else bisect.bisect_left(range(count), end, key=timestamp)
+        return first, last
+
+    @staticmethod
+    def _candidates(
+        data: mmap.mmap,
+        first: int,
+        last: int,
+        bssid: str | None,
+        ssid_id: int | None,
+    ) -> Iterator[int]:
+        """Get the offsets of the records in [first, last) which may match."""
+        begin = HEADER.size + first * RECORD_SIZE
+        stop = HEADER.size + last * RECORD_SIZE
+        if bssid is not None:
+            pattern, field = _pack_bssid(bssid), _BSSID_OFFSET
+        elif ssid_id is not None:
+            pattern, field = struct.pack("<I", ssid_id), _SSID_OFFSET
+        else:
+            yield from range(begin, stop, RECORD_SIZE)
+            return
+
+        # Search the mapped bytes for the field and keep the aligned hits.
+        position = data.find(pattern, begin + field, stop)
+        while position != -1:
+            offset = position - field
+            if (offset - HEADER.size) % RECORD_SIZE:
+                position = data.find(pattern, position + 1, stop)
+                continue
+            yield offset
+            position = data.find(pattern, offset + RECORD_SIZE + field, stop)
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+
+"""Decode the information elements advertised by a BSS.
+
+The IEs of a beacon or probe response are a sequence of (id, length, data)
+elements. InformationElements indexes them with memoryview slices, without
+copying, on first access, and each decoded field (e.g. rsn, bss_load) is
+computed on first access and kept. parse_ies() caches the decoded IEs by
+their raw bytes, so a BSS seen again with the same IEs is not decoded twice.
+"""
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+
+from pywifi.link import _int_or_none
+
+IE_CACHE_SIZE = 4096
+
+EID_SSID = 0
+EID_DS_PARAMS = 3
+EID_COUNTRY = 7
+EID_BSS_LOAD = 11
+EID_HT_CAPABILITIES = 45
+EID_RSN = 48
+EID_MOBILITY_DOMAIN = 54
+EID_HT_OPERATION = 61
+EID_RM_ENABLED_CAPABILITIES = 70
+EID_EXT_CAPABILITIES = 127
+EID_VHT_CAPABILITIES = 191
+EID_VHT_OPERATION = 192
+EID_EXTENSION = 255
+
+# Element ID extensions of the elements with id EID_EXTENSION.
+EXT_HE_CAPABILITIES = 35
+EXT_HE_OPERATION = 36
+
+# Bit of the BSS Transition (802.11v) capability in the extended capabilities.
+EXT_CAP_BSS_TRANSITION = 19
+
+CIPHER_SUITES = {
+    1: "WEP-40",
+    2: "TKIP",
+    4: "CCMP",
+    5: "WEP-104",
+    6: "BIP-CMAC-128",
+    8: "GCMP",
+    9: "GCMP-256",
+    10: "CCMP-256",
+    11: "BIP-GMAC-128",
+    12: "BIP-GMAC-256",
+    13: "BIP-CMAC-256",
+}
+
+AKM_SUITES = {
+    1: "802.1X",
+    2: "PSK",
+    3: "FT-802.1X",
+    4: "FT-PSK",
+    5: "802.1X-SHA256",
+    6: "PSK-SHA256",
+    8: "SAE",
+    9: "FT-SAE",
+    11: "802.1X-SUITE-B",
+    12: "802.1X-SUITE-B-192",
+    18: "OWE",
+    24: "SAE-EXT-KEY",
+}
+
+_IEEE_OUI = b"\x00\x0f\xac"
+
+
+def iter_ies(data: bytes | memoryview) -> Iterator[tuple[int, memoryview]]:
+    """Iterate over the (id, data) elements of an IE blob, stopping at a truncated one."""
+    view = memoryview(data)
+    end = len(view)
+    pos = 0
+    while pos + 2 <= end:
+        eid = view[pos]
+        length = view[pos + 1]
+        pos += 2
+        if pos + length > end:
+            return
+        yield eid, view[pos : pos + length]
+        pos += length
+
+
+def _suite_name(suite: memoryview, names: dict[int, str]) -> str:
+    if bytes(suite[:3]) == _IEEE_OUI:
+        return names.get(suite[3], f"UNKNOWN-{suite[3]}")
+    return f"VENDOR-{bytes(suite).hex()}"
+
+
+@dataclass
+class BssLoad:
+    """The BSS Load element: associated stations and channel utilization."""
+
+    station_count: int
+    channel_utilization: int
+    admission_capacity: int
+
+    @property
+    def utilization(self) -> float:
+        """Get the channel utilization as a fraction of the time."""
+        return self.channel_utilization / 255
+
+
+@dataclass
+class RsnInfo:
+    """The RSN element: the ciphers, key management and protection of management frames."""
+
+    version: int
+    group_cipher: str | None = None
+    pairwise_ciphers: list[str] = field(default_factory=list)
+    akm_suites: list[str] = field(default_factory=list)
+    capabilities: int = 0
+
+    @property
+    def mfp_required(self) -> bool:
+        """Check if the protection of management frames is required."""
+        return bool(self.capabilities & 0x40)
+
+    @property
+    def mfp_capable(self) -> bool:
+        """Check if the protection of management frames is supported."""
+        return bool(self.capabilities & 0x80)
+
+
+def _parse_rsn(data: memoryview) -> RsnInfo | None:
+    if len(data) < 2:
+        return None
+    rsn = RsnInfo(version=int.from_bytes(data[0:2], "little"))
+    pos = 2
+    if pos + 4 > len(data):
+        return rsn
+    rsn.group_cipher = _suite_name(data[pos : pos + 4], CIPHER_SUITES)
+    pos += 4
+
+    for names, suites in ((CIPHER_SUITES, rsn.pairwise_ciphers), (AKM_SUITES, rsn.akm_suites)):
+        if pos + 2 > len(data):
+            return rsn
+        count = int.from_bytes(data[pos : pos + 2], "little")
+        pos += 2
+        if pos + 4 * count > len(data):
+            return None
+        suites.extend(_suite_name(data[p : p + 4], names) for p in range(pos, pos + 4 * count, 4))
+        pos += 4 * count
+
+    if pos + 2 <= len(data):
+        rsn.capabilities = int.from_bytes(data[pos : pos + 2], "little")
+    return rsn
+
+
+class InformationElements:
+    """The information elements of a BSS, decoded on attribute access."""
+
+    def __init__(self, data: bytes) -> None:
+        """Wrap the raw IE bytes; nothing is parsed until an attribute is read."""
+        self.data = data
+
+    def __iter__(self) -> Iterator[tuple[int, memoryview]]:
+        """Iterate over the (id, data) elements."""
+        return iter_ies(self.data)
+
+    def __contains__(self, eid: int) -> bool:
+        """Check if an element with the id is present."""
+        return eid in self._index
+
+    @cached_property
+    def _index(self) -> dict[int, memoryview]:
+        # The first element of each id; extensions are keyed (255, ext id).
+        index = {}
+        for eid, data in iter_ies(self.data):
+            key = (eid, data[0]) if eid == EID_EXTENSION and data else eid
+            index.setdefault(key, data)
+        return index
+
+    def get(self, eid: int, ext: int | None = None) -> memoryview | None:
+        """Get the data of the first element with the id (and extension id)."""
+        if ext is not None:
+            data = self._index.get((eid, ext))
+            return None if data is None else data[1:]
+        return self._index.get(eid)
+
+    @cached_property
+    def ssid(self) -> bytes | None:
+        """Get the raw SSID."""
+        data = self.get(EID_SSID)
+        return None if data is None else bytes(data)
+
+    @cached_property
+    def channel(self) -> int | None:
+        """Get the channel of the DS Parameter Set, or the primary channel of HT."""
+        data = self.get(EID_DS_PARAMS) or self.get(EID_HT_OPERATION)
+        return data[0] if data else None
+
+    @cached_property
+    def country(self) -> str | None:
+        """Get the country code, e.g. "US"."""
+        data = self.get(EID_COUNTRY)
+        if data is None or len(data) < 2:
+            return None
+        return bytes(data[:2]).decode("ascii", errors="replace")
+
+    @cached_property
+    def bss_load(self) -> BssLoad | None:
+        """Get the station count and channel utilization of the BSS Load element."""
+        data = self.get(EID_BSS_LOAD)
+        if data is None or len(data) < 5:
+            return None
+        return BssLoad(
+            station_count=int.from_bytes(data[0:2], "little"),
+            channel_utilization=data[2],
+            admission_capacity=int.from_bytes(data[3:5], "little"),
+        )
+
+    @cached_property
+    def rsn(self) -> RsnInfo | None:
+        """Get the ciphers and AKM suites of the RSN element."""
+        data = self.get(EID_RSN)
+        return None if data is None else _parse_rsn(data)
+
+    @property
+    def ht(self) -> bool:
+        """Check if the BSS supports HT (802.11n)."""
+        return EID_HT_CAPABILITIES in self
+
+    @property
+    def vht(self) -> bool:
+        """Check if the BSS supports VHT (802.11ac)."""
+        return EID_VHT_CAPABILITIES in self
+
+    @property
+    def he(self) -> bool:
+        """Check if the BSS supports HE (802.11ax)."""
+        return (EID_EXTENSION, EXT_HE_CAPABILITIES) in self._index
+
+    @cached_property
+    def channel_width(self) -> int:
+        """Get the channel width in MHz from the VHT and HT operation elements."""
+        vht = self.get(EID_VHT_OPERATION)
+        if vht is not None and len(vht) >= 3 and vht[0] > 0:
+            # Width 1 is 80 MHz, or 160 MHz when a second segment is given.
+            if vht[0] >= 2 or (vht[2] and abs(vht[2] - vht[1]) >= 8):
+                return 160
+            return 80
+
+        ht = self.get(EID_HT_OPERATION)
+        if ht is not None and len(ht) >= 2 and ht[1] & 0x03 in (1, 3):
+            return 40
+        return 20
+
+    @property
+    def rrm(self) -> bool:
+        """Check if the BSS supports radio measurements (802.11k)."""
+        return EID_RM_ENABLED_CAPABILITIES in self
+
+    @cached_property
+    def bss_transition(self) -> bool:
+        """Check if the BSS supports BSS transition management (802.11v)."""
+        data = self.get(EID_EXT_CAPABILITIES)
+        octet, bit = divmod(EXT_CAP_BSS_TRANSITION, 8)
+        return data is not None and len(data) > octet and bool(data[octet] & (1 << bit))
+
+    @cached_property
+    def mobility_domain(self) -> int | None:
+        """Get the mobility domain of fast BSS transition (802.11r)."""
+        data = self.get(EID_MOBILITY_DOMAIN)
+        if data is None or len(data) < 2:
+            return None
+        return int.from_bytes(data[0:2], "little")
+
+    @property
+    def fast_transition(self) -> bool:
+        """Check if the BSS supports fast BSS transition (802.11r)."""
+        return self.mobility_domain is not None
+
+
+@lru_cache(maxsize=IE_CACHE_SIZE)
+def parse_ies(data: bytes) -> InformationElements:
+    """Get the decoded IEs of a blob, shared by the BSSes advertising the same bytes."""
+    return InformationElements(data)
+
+
+class BssDetails:
+    """The full details of a BSS as reported by wpa_supplicant.
+
+    ``fields`` holds all the reported "key=value" fields; the IEs are
+    decoded from the hex ``ie`` field on first access.
+    """
+
+    def __init__(self, fields: dict[str, str]) -> None:
+        """Create the details of a BSS from the fields of a BSS reply."""
+        self.fields = fields
+        self.id = _int_or_none(fields.get("id"))
+        self.bssid = fields.get("bssid")
+        self.ssid = fields.get("ssid")
+        self.freq = _int_or_none(fields.get("freq"))
+        self.level = _int_or_none(fields.get("level"))
+        self.noise = _int_or_none(fields.get("noise"))
+        self.age = _int_or_none(fields.get("age"))
+        self.flags = fields.get("flags", "")
+
+    def __repr__(self) -> str:
+        """Describe the BSS."""
+        return f"BssDetails(bssid={self.bssid!r}, ssid={self.ssid!r}, freq={self.freq})"
+
+    @cached_property
+    def ies(self) -> InformationElements:
+        """Get the decoded information elements of the BSS."""
+        try:
+            data = bytes.fromhex(self.fields.get("ie", ""))
+        except ValueError:
+            data = b""
+        return parse_ies(data)
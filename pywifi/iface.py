@@ -4,7 +4,20 @@
 
 import logging
 import platform
+import socket
+import time
+from collections.abc import Callable
 
+from pywifi.events import (
+    EVENT_CONNECTED,
+    EVENT_DISCONNECTED,
+    EVENT_STATE_CHANGE,
+    Event,
+    EventMonitor,
+)
+from pywifi.ie import BssDetails
+from pywifi.link import LinkInfo
+from pywifi.netstats import KernelLinkStats, LinkStatsReader
 from pywifi.profile import Profile
 
 if platform.system().lower() == "windows":
@@ -14,6 +27,11 @@ elif platform.system().lower() == "linux":
 else:
     raise NotImplementedError
 
+STATUS_TTL = 0.5
+
+_LINK_EVENTS = (EVENT_CONNECTED, EVENT_DISCONNECTED, EVENT_STATE_CHANGE)
+_LINK_PROPERTIES = ("State", "CurrentBSS", "CurrentNetwork")
+
 
 class Interface:
     """Interface provides methods for manipulating wifi devices."""
@@ -25,22 +43,60 @@ class Interface:
     """
     _raw_obj = {}
     _wifi_ctrl = {}
+    _event_monitor = None
+    _link_info = None
+    _link_expires = 0.0
+    _link_stats_reader = None
     _logger = None
 
-    def __init__(self, raw_obj: dict[str]) -> None:
-        """Create wifi interface instance"""
+    def __init__(
+        self,
+        raw_obj: dict[str],
+        wifi_ctrl: object = None,
+        *,
+        status_ttl: float = STATUS_TTL,
+    ) -> None:
+        """Create wifi interface instance, on the platform backend by default.
+
+        The status is cached for ``status_ttl`` seconds, see link_info().
+        """
         self._raw_obj = raw_obj
-        self._wifi_ctrl = wifiutil.WifiUtil()
+        self._wifi_ctrl = wifi_ctrl if wifi_ctrl is not None else wifiutil.WifiUtil()
+        self.status_ttl = status_ttl
+        self._property_callbacks = []
         self._logger = logging.getLogger("pywifi")
 
     def name(self) -> str:
         """Get the name of the wifi interface."""
         return self._raw_obj["name"]
 
-    def scan(self) -> None:
-        """Trigger the wifi interface to scan."""
+    def scan(
+        self,
+        freqs: list[int] | None = None,
+        ssids: list[str] | None = None,
+        *,
+        passive: bool = False,
+        only_new: bool = False,
+    ) -> None:
+        """Trigger the wifi interface to scan.
+
+        The scan can be limited to the channels in ``freqs`` (MHz) and can
+        actively probe for the hidden networks in ``ssids``. ``passive`` only
+        listens for beacons and ``only_new`` drops the cached BSSes which are
+        not found again by this scan.
+        """
+        if passive and ssids:
+            raise ValueError("A passive scan cannot probe for SSIDs")
+
         self._logger.info("iface '%s' scans", self.name())
-        self._wifi_ctrl.scan(self._raw_obj)
+        self.invalidate_status()
+        self._wifi_ctrl.scan(
+            self._raw_obj,
+            freqs,
+            ssids,
+            passive=passive,
+            only_new=only_new,
+        )
 
     def scan_results(self) -> list[Profile]:
         """Return the scan result."""
@@ -58,21 +114,65 @@ class Interface:
 
         return bsses
 
-    def add_network_profile(self, params: Profile) -> Profile:
-        """Add the info of the AP for connecting afterward."""
-        return self._wifi_ctrl.add_network_profile(self._raw_obj, params)
+    def add_network_profile(self, params: Profile, *, derive_psk: bool = False) -> Profile:
+        """Add the info of the AP for connecting afterward.
+
+        With ``derive_psk``, the PSK of a WPA passphrase is derived and cached
+        on the client and sent instead of the passphrase.
+        """
+        return self._wifi_ctrl.add_network_profile(self._raw_obj, params, derive_psk=derive_psk)
 
     def remove_network_profile(self, params: Profile) -> None:
         """Remove the specified AP settings."""
+        self.invalidate_status()
         self._wifi_ctrl.remove_network_profile(self._raw_obj, params)
 
     def remove_all_network_profiles(self) -> None:
         """Remove all the AP settings."""
+        self.invalidate_status()
         self._wifi_ctrl.remove_all_network_profiles(self._raw_obj)
 
-    def network_profiles(self) -> list[Profile]:
-        """Get all the AP profiles."""
-        profiles = self._wifi_ctrl.network_profiles(self._raw_obj)
+    def update_network_key(self, params: Profile, *, derive_psk: bool = False) -> None:
+        """Re-send the key of the saved network ``params`` (its id) as ``params.key``.
+
+        Saved keys cannot be read back, so a changed password is set this
+        way; ``derive_psk`` works as in add_network_profile().
+        """
+        self._logger.info("iface '%s' updates the key of '%s'", self.name(), params.ssid)
+        self.invalidate_status()
+        self._wifi_ctrl.update_network_key(self._raw_obj, params, derive_psk=derive_psk)
+
+    def apply_profiles(
+        self,
+        desired: list[Profile],
+        *,
+        update_keys: bool = False,
+        derive_psk: bool = False,
+    ) -> list[Profile]:
+        """Make the saved AP profiles match the desired list with minimal changes.
+
+        Saved profiles of the same network (SSID and key management) are
+        kept as they are, missing ones are added and all the others are
+        removed. Saved keys cannot be read back, so they are only re-sent for
+        kept profiles when ``update_keys`` is set. The desired profiles are
+        returned ready to be passed to connect(). ``derive_psk`` works as in
+        add_network_profile().
+        """
+        self._logger.info("iface '%s' applies %d profiles", self.name(), len(desired))
+        return self._wifi_ctrl.apply_profiles(
+            self._raw_obj,
+            desired,
+            update_keys=update_keys,
+            derive_psk=derive_psk,
+        )
+
+    def network_profiles(self, ssid: str | None = None) -> list[Profile]:
+        """Get all the AP profiles, or only the ones of ``ssid``.
+
+        On Linux, only the saved networks of ``ssid`` are then read from
+        wpa_supplicant.
+        """
+        profiles = self._wifi_ctrl.network_profiles(self._raw_obj, ssid)
 
         if self._logger.isEnabledFor(logging.INFO):
             for profile in profiles:
@@ -87,13 +187,152 @@ class Interface:
     def connect(self, params: Profile) -> None:
         """Connect to the specified AP."""
         self._logger.info("iface '%s' connects to AP: '%s'", self.name(), params.ssid)
+        self.invalidate_status()
         self._wifi_ctrl.connect(self._raw_obj, params)
 
+    def reassociate(
+        self,
+        network_id: int,
+        bssid: str | None = None,
+        freq: int | None = None,
+    ) -> None:
+        """Reconnect to the saved network ``network_id`` without reconfiguring it.
+
+        ``bssid`` is preferred and only ``freq`` (MHz) is scanned, so that a
+        link which just dropped comes back without a full scan. Linux only;
+        the D-Bus backend selects the network but ignores ``bssid`` and ``freq``.
+        """
+        self._logger.info(
+            "iface '%s' reassociates to network %d (bssid: %s, freq: %s)",
+            self.name(),
+            network_id,
+            bssid,
+            freq,
+        )
+        self.invalidate_status()
+        self._wifi_ctrl.reassociate(self._raw_obj, network_id, bssid, freq)
+
     def disconnect(self) -> None:
         """Disconnect from the specified AP."""
         self._logger.info("iface '%s' disconnects", self.name())
+        self.invalidate_status()
         self._wifi_ctrl.disconnect(self._raw_obj)
 
     def status(self) -> int:
-        """Get the status of the wifi interface."""
-        return self._wifi_ctrl.status(self._raw_obj)
+        """Get the status of the wifi interface, see link_info()."""
+        return self.link_info().status
+
+    def link_info(self) -> LinkInfo:
+        """Get the status of the wifi interface with the network it is on.
+
+        The state, SSID, BSSID, frequency, network id, key management,
+        cipher and IP address come from a single request. The result is
+        cached for ``status_ttl`` seconds, shared with status(), and dropped
+        when the interface is changed through this object or when the event
+        monitor receives a state change.
+        """
+        now = time.monotonic()
+        info = self._link_info
+        if info is None or now >= self._link_expires:
+            info = self._wifi_ctrl.link_info(self._raw_obj)
+            self._link_info = info
+            self._link_expires = now + self.status_ttl
+        return info
+
+    def invalidate_status(self) -> None:
+        """Drop the cached status so the next call requests it again."""
+        self._link_info = None
+
+    def status_fields(self) -> dict[str, str]:
+        """Get all the fields reported for the status of the wifi interface."""
+        return self._wifi_ctrl.status_fields(self._raw_obj)
+
+    def signal_poll(self) -> dict[str, int]:
+        """Get the signal parameters (RSSI, LINKSPEED, NOISE, FREQUENCY) of the link."""
+        return self._wifi_ctrl.signal_poll(self._raw_obj)
+
+    def packet_counts(self) -> dict[str, int]:
+        """Get the TXGOOD, TXBAD and RXGOOD packet counters of the link."""
+        return self._wifi_ctrl.packet_counts(self._raw_obj)
+
+    def link_stats(self) -> KernelLinkStats:
+        """Get the link quality and traffic counters kept by the kernel.
+
+        They are read from /proc and /sys without asking wpa_supplicant,
+        which makes high sampling rates cheap. Linux only.
+        """
+        if platform.system().lower() != "linux":
+            raise NotImplementedError("Kernel link statistics are only available on Linux")
+        if self._link_stats_reader is None:
+            self._link_stats_reader = LinkStatsReader(self.name())
+        return self._link_stats_reader.read()
+
+    def bss_details(self, bssid: str) -> BssDetails | None:
+        """Get all the fields and the information elements of a BSS.
+
+        The IEs (channel width, HT/VHT/HE, BSS load, country, RSN,
+        802.11k/v/r support) are decoded on attribute access of
+        ``details.ies``. None is returned if the BSS is unknown.
+        """
+        return self._wifi_ctrl.bss_details(self._raw_obj, bssid)
+
+    def bss_details_all(self) -> list[BssDetails]:
+        """Get all the fields and the information elements of every scanned BSS."""
+        return self._wifi_ctrl.bss_details_all(self._raw_obj)
+
+    def roam(self, bssid: str) -> None:
+        """Roam to another BSS of the currently connected network."""
+        self._logger.info("iface '%s' roams to BSS: '%s'", self.name(), bssid)
+        self.invalidate_status()
+        self._wifi_ctrl.roam(self._raw_obj, bssid)
+
+    def attach(self) -> socket.socket:
+        """Open a socket receiving the events of the wifi interface."""
+        return self._wifi_ctrl.attach(self._raw_obj)
+
+    def detach(self, sock: socket.socket) -> None:
+        """Close a socket returned by attach()."""
+        self._wifi_ctrl.detach(self._raw_obj, sock)
+
+    def subscribe_properties(self, callback: Callable[[dict[str, object]], None]) -> None:
+        """Call ``callback`` with the properties changed by wpa_supplicant.
+
+        Only the D-Bus backend supports this; it is called from a listener
+        thread with a dict such as ``{"State": "completed"}``.
+        """
+        if not self._property_callbacks:
+            self._wifi_ctrl.subscribe_properties(self._raw_obj, self._on_properties)
+        if callback not in self._property_callbacks:
+            self._property_callbacks.append(callback)
+
+    def unsubscribe_properties(self, callback: Callable[[dict[str, object]], None]) -> None:
+        """Stop calling a callback passed to subscribe_properties()."""
+        if callback not in self._property_callbacks:
+            return
+        self._property_callbacks.remove(callback)
+        if not self._property_callbacks:
+            self._wifi_ctrl.unsubscribe_properties(self._raw_obj, self._on_properties)
+
+    def event_monitor(self) -> EventMonitor:
+        """Get the event monitor shared by the users of this interface.
+
+        The monitor is created on first use and must be started before
+        events are delivered to its subscribers.
+        """
+        if self._event_monitor is None:
+            self._event_monitor = EventMonitor(self)
+            self._event_monitor.subscribe(self._on_event)
+        return self._event_monitor
+
+    def _on_event(self, event: Event) -> None:
+        if event.name in _LINK_EVENTS:
+            self.invalidate_status()
+
+    def _on_properties(self, changed: dict[str, object]) -> None:
+        if any(name in changed for name in _LINK_PROPERTIES):
+            self.invalidate_status()
+        for callback in list(self._property_callbacks):
+            try:
+                callback(changed)
+            except Exception:
+                self._logger.exception("Property subscriber of '%s' failed", self.name())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""Structured status of the link of a wifi interface.
+
+LinkInfo keeps every field of one status reply, so that a single request
+answers the state, the network and the address of an interface.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from pywifi.const import IfaceStatus
+
+
+def _int_or_none(value: str | None) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class LinkInfo:
+    """The status of a wifi interface and the network it is on."""
+
+    status: IfaceStatus
+    wpa_state: str = ""
+    ssid: str | None = None
+    bssid: str | None = None
+    freq: int | None = None
+    network_id: int | None = None
+    key_mgmt: str | None = None
+    pairwise_cipher: str | None = None
+    ip_address: str | None = None
+    fields: dict[str, str] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_status_fields(cls, fields: dict[str, str], status: IfaceStatus) -> "LinkInfo":
+        """Build the link info from the "key=value" fields of a STATUS reply."""
+        return cls(
+            status=status,
+            wpa_state=fields.get("wpa_state", ""),
+            ssid=fields.get("ssid"),
+            bssid=fields.get("bssid"),
+            freq=_int_or_none(fields.get("freq")),
+            network_id=_int_or_none(fields.get("id")),
+            key_mgmt=fields.get("key_mgmt"),
+            pairwise_cipher=fields.get("pairwise_cipher"),
+            ip_address=fields.get("ip_address"),
+            fields=fields,
+        )
+
+    @property
+    def connected(self) -> bool:
+        """Check if the interface is connected."""
+        return self.status == IfaceStatus.CONNECTED
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""Read the link statistics of a wifi interface from the kernel.
+
+The link quality, signal level and noise of /proc/net/wireless and the
+counters of /sys/class/net/<iface>/statistics are read without asking
+wpa_supplicant. The files are opened once and re-read with os.pread, so a
+sample costs a few system calls and no socket round trip. Linux only.
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+
+PROC_ROOT = "/proc"
+SYS_ROOT = "/sys"
+READ_SIZE = 4096
+
+COUNTERS = (
+    "rx_bytes",
+    "tx_bytes",
+    "rx_packets",
+    "tx_packets",
+    "rx_errors",
+    "tx_errors",
+    "rx_dropped",
+    "tx_dropped",
+)
+
+# Drivers report this noise level when they do not know it.
+NOISE_UNKNOWN = -256
+
+
+@dataclass
+class KernelLinkStats:
+    """Link quality and traffic counters of a wifi interface.
+
+    Values the kernel does not report (e.g. the signal while disconnected)
+    are None.
+    """
+
+    quality: float | None = None
+    level: float | None = None
+    noise: float | None = None
+    rx_bytes: int | None = None
+    tx_bytes: int | None = None
+    rx_packets: int | None = None
+    tx_packets: int | None = None
+    rx_errors: int | None = None
+    tx_errors: int | None = None
+    rx_dropped: int | None = None
+    tx_dropped: int | None = None
+    timestamp: float = field(default_factory=time.monotonic)
+
+
+def parse_wireless(text: str, name: str) -> tuple[float | None, float | None, float | None]:
+    """Get the link quality, level and noise of ``name`` from /proc/net/wireless."""
+    for line in text.splitlines()[2:]:
+        iface, sep, values = line.partition(":")
+        if not sep or iface.strip() != name:
+            continue
+        # status, link, level, noise, ...; a trailing "." marks an updated value.
+        fields = values.split()
+        try:
+            quality, level, noise = (float(value.rstrip(".")) for value in fields[1:4])
+        except ValueError:
+            return None, None, None
+        return quality, level, None if noise == NOISE_UNKNOWN else noise
+    return None, None, None
+
+
+class LinkStatsReader:
+    """LinkStatsReader samples the kernel statistics of one interface.
+
+    ``proc_root`` and ``sys_root`` default to PROC_ROOT and SYS_ROOT and can
+    point to other trees, e.g. of fake files.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        proc_root: str | None = None,
+        sys_root: str | None = None,
+    ) -> None:
+        """Create a reader for the interface ``name``; files are opened on first read."""
+        self._fds: dict[str, int] = {}
+        self.name = name
+        proc_root = PROC_ROOT if proc_root is None else proc_root
+        sys_root = SYS_ROOT if sys_root is None else sys_root
+        self._wireless_path = os.path.join(proc_root, "net", "wireless")
+        stats_dir = os.path.join(sys_root, "class", "net", name, "statistics")
+        self._counter_paths = {counter: os.path.join(stats_dir, counter) for counter in COUNTERS}
+
+    def __enter__(self) -> "LinkStatsReader":
+        """Use the reader as a context manager closing the files."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close the files."""
+        self.close()
+
+    def __del__(self) -> None:
+        """Close the files of a dropped reader."""
+        self.close()
+
+    def read(self) -> KernelLinkStats:
+        """Read the current statistics."""
+        stats = KernelLinkStats()
+        wireless = self._read(self._wireless_path)
+        if wireless is not None:
+            stats.quality, stats.level, stats.noise = parse_wireless(wireless, self.name)
+
+        for counter, path in self._counter_paths.items():
+            value = self._read(path)
+            if value is not None and value.strip().isdigit():
+                setattr(stats, counter, int(value))
+        return stats
+
+    def close(self) -> None:
+        """Close the files."""
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+    def _read(self, path: str) -> str | None:
+        fd = self._fds.get(path)
+        try:
+            if fd is None:
+                fd = os.open(path, os.O_RDONLY)
+                self._fds[path] = fd
+            chunks = []
+            while True:
+                chunk = os.pread(fd, READ_SIZE, len(chunks) * READ_SIZE)
+                chunks.append(chunk)
+                if len(chunk) < READ_SIZE:
+                    break
+        except OSError:
+            # The interface may be gone; reopen the file on the next read.
+            if path in self._fds:
+                os.close(self._fds.pop(path))
+            return None
+        return b"".join(chunks).decode("ascii", errors="replace")
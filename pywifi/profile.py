@@ -10,18 +10,31 @@ class Profile:
 
     def __init__(self) -> None:
         """Create instance of a wifi profile"""
-        self.id = 0
+        self.id: int | None = None
         self.auth: int = AuthAlgorithm.OPEN
         self.akm: list[int] = [AkmType.NONE]
         self.cipher: int = CipherType.NONE
         self.ssid: str = None
         self.bssid: str = None
         self.key: str = None
+        self.key_type: int | None = None
+        self.priority: int = 0
 
     def process_akm(self) -> None:
         if len(self.akm) > 1:
             self.akm = self.akm[-1:]
 
+    def same_network(self, profile: "Profile") -> bool:
+        """Check if two Profile instances configure the same network.
+
+        The SSID and the key management must be equal. ``[AkmType.NONE]``
+        means an open network, while an empty akm list means a key management
+        which could not be parsed, so it matches no network.
+        """
+        if not self.akm or not profile.akm:
+            return False
+        return self.ssid == profile.ssid and _akm_set(self) == _akm_set(profile)
+
     def __eq__(self, profile: "Profile") -> bool:
         """Check if two Profile instances are the same"""
         if profile.ssid and profile.ssid != self.ssid:
@@ -37,3 +50,39 @@ class Profile:
             return False
 
         return not (profile.akm and set(profile.akm).isdisjoint(set(self.akm)))
+
+
+def _akm_set(profile: Profile) -> set[int]:
+    # process_akm() keeps the last akm, so compare the same one here.
+    return set(profile.akm[-1:]) - {AkmType.NONE}
+
+
+def diff_profiles(
+    current: list[Profile],
+    desired: list[Profile],
+) -> tuple[list[tuple[Profile, Profile]], list[Profile], list[Profile]]:
+    """Compare the saved profiles against the desired ones.
+
+    Return the (desired, current) pairs configuring the same network, the
+    desired profiles to add and the current profiles to remove.
+    """
+    saved_by_ssid: dict[str, list[Profile]] = {}
+    for saved in current:
+        saved_by_ssid.setdefault(saved.ssid, []).append(saved)
+
+    matched = []
+    to_add = []
+    for profile in desired:
+        candidates = saved_by_ssid.get(profile.ssid, [])
+        for saved in candidates:
+            if profile.same_network(saved):
+                matched.append((profile, saved))
+                candidates.remove(saved)
+                break
+        else:
+            to_add.append(profile)
+
+    kept = {id(saved) for _, saved in matched}
+    to_remove = [saved for saved in current if id(saved) not in kept]
+
+    return matched, to_add, to_remove
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+"""Derive WPA pre-shared keys on the client.
+
+wpa_supplicant runs 4096 iterations of PBKDF2-SHA1 whenever a network is
+configured with a passphrase. Deriving the 256-bit PSK here once, caching it
+and sending the hex key instead saves that work every time a profile is
+added again, and keeps the passphrase itself off the control socket.
+"""
+
+import hashlib
+import json
+import os
+import string
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+
+PSK_ITERATIONS = 4096
+PSK_LENGTH = 32
+PASSPHRASE_MIN_LENGTH = 8
+PASSPHRASE_MAX_LENGTH = 63
+SSID_MAX_LENGTH = 32
+
+
+def is_raw_psk(key: str) -> bool:
+    """Check if a key is a PSK given as 64 hex digits rather than a passphrase."""
+    return len(key) == PSK_LENGTH * 2 and all(c in string.hexdigits for c in key)
+
+
+def derive_psk(ssid: str, passphrase: str) -> str:
+    """Derive the hex encoded 256-bit PSK of a WPA passphrase.
+
+    A passphrase of 64 hex digits already is a PSK and is returned as is.
+    """
+    if is_raw_psk(passphrase):
+        return passphrase.lower()
+
+    raw_ssid = ssid.encode("utf-8")
+    if not 0 < len(raw_ssid) <= SSID_MAX_LENGTH:
+        raise ValueError("SSID must be 1 to 32 bytes long")
+    if not PASSPHRASE_MIN_LENGTH <= len(passphrase) <= PASSPHRASE_MAX_LENGTH:
+        raise ValueError("Passphrase must be 8 to 63 characters long")
+    if not passphrase.isascii() or not passphrase.isprintable():
+        raise ValueError("Passphrase must only contain printable ASCII characters")
+
+    return hashlib.pbkdf2_hmac(
+        "sha1",
+        passphrase.encode("ascii"),
+        raw_ssid,
+        PSK_ITERATIONS,
+        PSK_LENGTH,
+    ).hex()
+
+
+def _derive_pair(pair: tuple[str, str]) -> str:
+    return derive_psk(*pair)
+
+
+def derive_psks(pairs: Iterable[tuple[str, str]], processes: int | None = None) -> list[str]:
+    """Derive the PSKs of many (ssid, passphrase) pairs in a process pool."""
+    pairs = list(pairs)
+    if len(pairs) <= 1 or processes == 1:
+        return [_derive_pair(pair) for pair in pairs]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        chunksize = max(1, len(pairs) // ((processes or os.cpu_count() or 1) * 4))
+        return list(pool.map(_derive_pair, pairs, chunksize=chunksize))
+
+
+def _cache_key(ssid: str, passphrase: str) -> tuple[str, str]:
+    return ssid, hashlib.sha256(passphrase.encode("utf-8")).hexdigest()
+
+
+class PskCache:
+    """PskCache keeps the latest derived PSKs keyed by SSID and passphrase digest.
+
+    When ``path`` is set, the cache is loaded from and saved to that file.
+    A PSK grants access to its network like the passphrase does, so the
+    file is only readable by its owner.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: str | None = None) -> None:
+        """Create a cache holding up to ``maxsize`` PSKs."""
+        self.maxsize = maxsize
+        self.path = path
+        self._entries: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        """Get the number of cached PSKs."""
+        return len(self._entries)
+
+    def get(self, ssid: str, passphrase: str) -> str:
+        """Get the PSK of a passphrase, deriving and caching it on a miss."""
+        if is_raw_psk(passphrase):
+            return passphrase.lower()
+
+        key = _cache_key(ssid, passphrase)
+        with self._lock:
+            psk = self._entries.get(key)
+            if psk is not None:
+                self._entries.move_to_end(key)
+                return psk
+
+        psk = derive_psk(ssid, passphrase)
+        with self._lock:
+            self._store(key, psk)
+        self._save_if_persistent()
+        return psk
+
+    def derive_many(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        processes: int | None = None,
+    ) -> list[str]:
+        """Get the PSKs of many (ssid, passphrase) pairs.
+
+        The cache misses are derived in a process pool and the cache file, if
+        any, is saved once at the end.
+        """
+        pairs = list(pairs)
+        keys = [_cache_key(*pair) for pair in pairs]
+        with self._lock:
+            cached = {key: self._entries[key] for key in keys if key in self._entries}
+        missing = {key: pair for key, pair in zip(keys, pairs, strict=True) if key not in cached}
+
+        derived = dict(zip(missing, derive_psks(missing.values(), processes), strict=True))
+        with self._lock:
+            for key, psk in derived.items():
+                self._store(key, psk)
+        if derived:
+            self._save_if_persistent()
+
+        return [cached.get(key) or derived[key] for key in keys]
+
+    def clear(self) -> None:
+        """Forget all the cached PSKs."""
+        with self._lock:
+            self._entries.clear()
+        self._save_if_persistent()
+
+    def load(self) -> None:
+        """Load the cached PSKs from the cache file."""
+        with open(self.path) as f:
+            entries = json.load(f)
+        with self._lock:
+            for ssid, digest, psk in entries:
+                self._store((ssid, digest), psk)
+
+    def save(self) -> None:
+        """Save the cached PSKs to the cache file.
+
+        The file is written to a unique temporary file and renamed over the
+        cache file, so concurrent writers never leave a partial file.
+        """
+        with self._lock:
+            entries = [[ssid, digest, psk] for (ssid, digest), psk in self._entries.items()]
+            # mkstemp creates the file readable by its owner only.
+            fd, tmp_path = tempfile.mkstemp(
+                prefix=f".{os.path.basename(self.path)}.",
+                dir=os.path.dirname(os.path.abspath(self.path)),
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+    def _store(self, key: tuple[str, str], psk: str) -> None:
+        self._entries[key] = psk
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _save_if_persistent(self) -> None:
+        if self.path is not None:
+            self.save()
+
+
+# The cache used when profiles are added with derive_psk=True.
+default_cache = PskCache()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+"""Roam between the BSSes of the connected network.
+
+RoamingEngine tracks the BSSes of the current SSID seen in scan results and
+events, scores them on signal and band, and asks wpa_supplicant to roam when
+a candidate stays better than the current BSS by a hysteresis margin for a
+dwell time. Roams are rate limited so the engine never thrashes between BSSes.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from pywifi.channels import band_of
+from pywifi.events import EVENT_CONNECTED, EVENT_DISCONNECTED, EVENT_SCAN_RESULTS, Event
+from pywifi.iface import Interface
+from pywifi.profile import Profile
+
+# Score bonus in dB for the wider and less crowded bands, keyed by band in GHz.
+DEFAULT_BAND_BONUS = {2: 0.0, 5: 5.0, 6: 8.0}
+
+
+@dataclass
+class RoamCandidate:
+    """A BSS of the current network seen in the scan results."""
+
+    bssid: str
+    freq: int
+    signal: int
+    last_seen: float
+    better_since: float | None = None
+
+
+@dataclass
+class RoamDecision:
+    """A roam triggered by the engine."""
+
+    from_bssid: str
+    to_bssid: str
+    gain: float
+    timestamp: float
+
+
+class RoamingEngine:
+    """RoamingEngine roams an interface to the best BSS of its network."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        iface: Interface,
+        *,
+        hysteresis: float = 8.0,
+        dwell: float = 5.0,
+        min_interval: float = 30.0,
+        max_roams: int = 3,
+        window: float = 600.0,
+        stale_after: float = 30.0,
+        band_bonus: dict[int, float] | None = None,
+    ) -> None:
+        """Create a roaming engine for the wifi interface.
+
+        A candidate must score at least ``hysteresis`` dB above the current
+        BSS for ``dwell`` seconds before the engine roams to it. Two roams are
+        at least ``min_interval`` seconds apart and no more than ``max_roams``
+        roams happen within ``window`` seconds.
+        """
+        self._iface = iface
+        self.hysteresis = hysteresis
+        self.dwell = dwell
+        self.min_interval = min_interval
+        self.max_roams = max_roams
+        self.window = window
+        self.stale_after = stale_after
+        self.band_bonus = DEFAULT_BAND_BONUS if band_bonus is None else band_bonus
+
+        self.current_ssid: str | None = None
+        self.current_bssid: str | None = None
+        self.history: deque[RoamDecision] = deque(maxlen=100)
+        self._candidates: dict[str, RoamCandidate] = {}
+        self._roam_times: deque[float] = deque()
+        self._lock = threading.RLock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._logger = logging.getLogger("pywifi")
+
+    def score(self, freq: int, signal: int) -> float:
+        """Score a BSS on its signal and band."""
+        return signal + self.band_bonus.get(band_of(freq), 0.0)
+
+    def candidates(self) -> list[RoamCandidate]:
+        """Get the tracked BSSes of the current network."""
+        with self._lock:
+            return list(self._candidates.values())
+
+    def refresh_link(self) -> None:
+        """Read the currently connected BSS from the interface status."""
+        fields = self._iface.status_fields()
+        self.set_current(fields.get("ssid"), fields.get("bssid"))
+
+    def set_current(self, ssid: str | None, bssid: str | None) -> None:
+        """Set the currently connected network and BSS."""
+        with self._lock:
+            if ssid != self.current_ssid:
+                self._candidates.clear()
+            self.current_ssid = ssid
+            self.current_bssid = bssid.lower() if bssid else None
+
+    def update(self, bsses: list[Profile], now: float | None = None) -> None:
+        """Track the BSSes of the current network found in scan results."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.current_ssid is None:
+                return
+
+            for bss in bsses:
+                if bss.ssid != self.current_ssid or not bss.bssid:
+                    continue
+
+                bssid = bss.bssid.lower()
+                candidate = self._candidates.get(bssid)
+                if candidate is None:
+                    self._candidates[bssid] = RoamCandidate(bssid, bss.freq, bss.signal, now)
+                else:
+                    candidate.freq = bss.freq
+                    candidate.signal = bss.signal
+                    candidate.last_seen = now
+
+    def handle_event(self, event: Event) -> None:
+        """Update the engine from an event of the interface."""
+        if event.name == EVENT_SCAN_RESULTS:
+            self.update(self._iface.scan_results())
+            self.step()
+        elif event.name == EVENT_CONNECTED:
+            self.refresh_link()
+        elif event.name == EVENT_DISCONNECTED:
+            self.set_current(self.current_ssid, None)
+
+    def evaluate(self, now: float | None = None) -> RoamCandidate | None:
+        """Get the candidate to roam to, if a roam is due now."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for bssid in [
+                bssid
+                for bssid, candidate in self._candidates.items()
+                if now - candidate.last_seen > self.stale_after
+            ]:
+                del self._candidates[bssid]
+
+            current = self._candidates.get(self.current_bssid)
+            if current is None:
+                return None
+
+            current_score = self.score(current.freq, current.signal)
+            best = None
+            best_score = current_score + self.hysteresis
+            for candidate in self._candidates.values():
+                if candidate is current:
+                    continue
+
+                candidate_score = self.score(candidate.freq, candidate.signal)
+                if candidate_score < current_score + self.hysteresis:
+                    candidate.better_since = None
+                    continue
+
+                if candidate.better_since is None:
+                    candidate.better_since = now
+                if now - candidate.better_since >= self.dwell and candidate_score >= best_score:
+                    best = candidate
+                    best_score = candidate_score
+
+            if best is None or not self._roam_allowed(now):
+                return None
+
+            return best
+
+    def step(self, now: float | None = None) -> RoamDecision | None:
+        """Roam to the best candidate if a roam is due now."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            target = self.evaluate(now)
+            if target is None:
+                return None
+
+            current = self._candidates[self.current_bssid]
+            decision = RoamDecision(
+                from_bssid=current.bssid,
+                to_bssid=target.bssid,
+                gain=self.score(target.freq, target.signal)
+                - self.score(current.freq, current.signal),
+                timestamp=now,
+            )
+            self._iface.roam(target.bssid)
+            self._roam_times.append(now)
+            self.history.append(decision)
+            for candidate in self._candidates.values():
+                candidate.better_since = None
+            self.current_bssid = target.bssid
+
+        self._logger.info(
+            "Roam from '%s' to '%s' (+%.1f dB)",
+            decision.from_bssid,
+            decision.to_bssid,
+            decision.gain,
+        )
+        return decision
+
+    def start(self, scan_interval: float = 10.0, scan_wait: float = 3.0) -> None:
+        """Scan and roam periodically on a background thread.
+
+        Events delivered by the interface's event monitor, if it is running,
+        also update the engine between the periodic scans.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._iface.event_monitor().subscribe(self.handle_event)
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(scan_interval, scan_wait),
+            name=f"pywifi-roaming-{self._iface.name()}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread started by start()."""
+        self._stop.set()
+        self._iface.event_monitor().unsubscribe(self.handle_event)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _roam_allowed(self, now: float) -> bool:
+        while self._roam_times and now - self._roam_times[0] > self.window:
+            self._roam_times.popleft()
+
+        if self._roam_times and now - self._roam_times[-1] < self.min_interval:
+            return False
+
+        return len(self._roam_times) < self.max_roams
+
+    def _run(self, scan_interval: float, scan_wait: float) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh_link()
+                if self.current_bssid is not None:
+                    self._iface.scan()
+                    if self._stop.wait(scan_wait):
+                        break
+                    self.update(self._iface.scan_results())
+                    self.step()
+            except Exception:
+                self._logger.exception("Roaming step of '%s' failed", self._iface.name())
+
+            self._stop.wait(scan_interval)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+"""Client side of the RPC served by the pywifid daemon.
+
+Requests are the steps of the batch format, sent as one JSON object per
+line over a Unix stream socket; each is answered by one JSON line holding
+the batch result of the step (ok, interface, result or error). The socket
+lives in a directory only its user can enter, and the client checks that
+the daemon it reaches is run by the same user.
+"""
+
+import getpass
+import json
+import logging
+import os
+import socket
+import stat
+import struct
+import tempfile
+
+CONNECT_TIMEOUT = 0.5
+
+# struct ucred of SO_PEERCRED (Linux) and the head of struct xucred of
+# LOCAL_PEERCRED (BSD, macOS), whose level is SOL_LOCAL.
+_UCRED = struct.Struct("3i")
+_XUCRED = struct.Struct("2I")
+_SOL_LOCAL = 0
+
+
+def runtime_dir() -> str:
+    """Get the directory of the socket: $XDG_RUNTIME_DIR, else a per-user temporary one."""
+    directory = os.environ.get("XDG_RUNTIME_DIR")
+    if directory:
+        return directory
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    return os.path.join(tempfile.gettempdir(), f"pywifi-{user}")
+
+
+def ensure_runtime_dir(directory: str) -> None:
+    """Create ``directory`` with mode 0700 and check only the current user can enter it."""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not hasattr(os, "getuid"):
+        return
+
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"'{directory}' is not a private directory of the current user")
+
+
+def peer_uid(sock: socket.socket) -> int | None:
+    """Get the user id of the process at the other end of a Unix socket, None if unknown."""
+    if hasattr(socket, "SO_PEERCRED"):
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, _UCRED.size)
+        return _UCRED.unpack(creds)[1]
+    if hasattr(socket, "LOCAL_PEERCRED"):
+        creds = sock.getsockopt(_SOL_LOCAL, socket.LOCAL_PEERCRED, _XUCRED.size)
+        return _XUCRED.unpack_from(creds)[1]
+    return None
+
+
+SOCKET_PATH = os.environ.get("PYWIFID_SOCKET", os.path.join(runtime_dir(), "pywifid.sock"))
+
+
+class DaemonClient:
+    """DaemonClient sends requests to a running pywifid daemon."""
+
+    def __init__(self, path: str | None = None) -> None:
+        """Connect to the daemon on ``path`` (SOCKET_PATH); raise OSError if there is none.
+
+        PermissionError is raised if the daemon is run by another user, as
+        the requests may hold passwords.
+        """
+        if path is None:
+            path = SOCKET_PATH
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(CONNECT_TIMEOUT)
+            self._sock.connect(path)
+            _check_peer(self._sock, path)
+            # Steps such as connect take as long as their own timeout.
+            self._sock.settimeout(None)
+        except OSError:
+            self._sock.close()
+            raise
+        self._reader = self._sock.makefile("rb")
+
+    def __enter__(self) -> "DaemonClient":
+        """Use the client as a context manager closing the connection."""
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        """Close the connection."""
+        self.close()
+
+    def request(self, step: dict[str, object]) -> dict[str, object]:
+        """Run a batch step in the daemon and return its result."""
+        self._sock.sendall(json.dumps(step).encode("utf-8") + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("pywifid closed the connection")
+        return json.loads(line)
+
+    def close(self) -> None:
+        """Close the connection to the daemon."""
+        self._reader.close()
+        self._sock.close()
+
+
+def connect_daemon(path: str | None = None) -> DaemonClient | None:
+    """Connect to the daemon if one is running, else return None."""
+    if path is None:
+        path = SOCKET_PATH
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        return DaemonClient(path)
+    except PermissionError as err:
+        logging.getLogger("pywifi").warning("Not using pywifid: %s", err)
+        return None
+    except OSError:
+        return None
+
+
+def _check_peer(sock: socket.socket, path: str) -> None:
+    if not hasattr(os, "getuid"):
+        return
+
+    uid = peer_uid(sock)
+    if uid is None:
+        # Without peer credentials, trust the owner of the socket file.
+        uid = os.stat(path).st_uid
+    if uid != os.getuid():
+        raise PermissionError(f"pywifid on '{path}' is run by another user (uid {uid})")
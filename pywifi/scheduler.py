@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+"""Scan at a rate adapted to how much the radio environment changes.
+
+ScanScheduler compares each scan with the previous one. While the scan
+results stay the same and the signals are stable the scan interval backs
+off towards ``max_interval``; new or lost BSSes and moving signals bring it
+back towards ``min_interval``. While connected, the channels where something
+changed are rescanned alone instead of all of them, and the time spent
+scanning off the channel of the link is kept within an airtime budget.
+Every decision records why it was taken.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from pywifi.const import IfaceStatus
+from pywifi.iface import Interface
+from pywifi.profile import Profile
+from pywifi.telemetry import RingBuffer
+
+# Estimated number of channels and dwell time in seconds per channel of a
+# full scan, to account for the time spent off channel.
+FULL_SCAN_CHANNELS = 38
+CHANNEL_DWELL = 0.04
+
+
+@dataclass
+class ScanDecision:
+    """When and what the scheduler scans next, and why."""
+
+    timestamp: float
+    interval: float
+    freqs: list[int] | None
+    reason: str
+    connected: bool
+    changes: int
+    rssi_variance: float
+    airtime: float
+
+
+class ScanScheduler:
+    """ScanScheduler scans an interface at an adaptive interval."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        iface: Interface,
+        *,
+        min_interval: float = 5.0,
+        max_interval: float = 120.0,
+        backoff: float = 2.0,
+        airtime_budget: float = 0.05,
+        budget_window: float = 60.0,
+        quiet_variance: float = 4.0,
+        busy_variance: float = 25.0,
+        rescan_threshold: float = 6.0,
+        full_every: int = 4,
+        scan_wait: float = 3.0,
+    ) -> None:
+        """Create a scan scheduler for the wifi interface.
+
+        The interval stays within [``min_interval``, ``max_interval``] and is
+        multiplied or divided by ``backoff``. The mean squared signal change
+        of the BSSes between scans (dB²) is quiet below ``quiet_variance`` and
+        resets the interval above ``busy_variance``. While connected, the
+        channels with a BSS found, lost or changed by ``rescan_threshold`` dB
+        are rescanned alone, with a full scan at least every ``full_every``
+        scans, and at most ``airtime_budget`` of ``budget_window`` is spent
+        scanning; ``max_interval`` takes precedence over the budget.
+        """
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("min_interval must be positive and at most max_interval")
+        if not 0 < airtime_budget <= 1:
+            raise ValueError("airtime_budget must be in (0, 1]")
+
+        self._iface = iface
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.airtime_budget = airtime_budget
+        self.budget_window = budget_window
+        self.quiet_variance = quiet_variance
+        self.busy_variance = busy_variance
+        self.rescan_threshold = rescan_threshold
+        self.full_every = full_every
+        self.scan_wait = scan_wait
+
+        self.interval = min_interval
+        self.decision: ScanDecision | None = None
+        self.history: deque[ScanDecision] = deque(maxlen=100)
+        self._variance = RingBuffer(16, alpha=0.3)
+        self._bsses: dict[str, tuple[int, int]] = {}
+        self._changes = 0
+        self._hot_freqs: set[int] = set()
+        self._scans_since_full = 0
+        self._scan_costs: deque[tuple[float, float]] = deque()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._logger = logging.getLogger("pywifi")
+
+    def scan(self, freqs: list[int] | None = None, now: float | None = None) -> None:
+        """Trigger a scan of ``freqs`` (all the channels if None) and account its airtime."""
+        now = time.monotonic() if now is None else now
+        self._iface.scan(freqs)
+        with self._lock:
+            channels = FULL_SCAN_CHANNELS if freqs is None else len(freqs)
+            self._scan_costs.append((now, channels * CHANNEL_DWELL))
+            self._scans_since_full = 0 if freqs is None else self._scans_since_full + 1
+
+    def airtime(self, now: float | None = None) -> float:
+        """Get the estimated share of the budget window spent scanning."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._scan_costs and now - self._scan_costs[0][0] > self.budget_window:
+                self._scan_costs.popleft()
+            return sum(cost for _, cost in self._scan_costs) / self.budget_window
+
+    def observe(self, bsses: list[Profile], freqs: list[int] | None = None) -> int:
+        """Compare scan results with the previous ones and get the number of changes.
+
+        Only the BSSes on ``freqs`` are compared after a targeted scan.
+        """
+        seen = {bss.bssid.lower(): (bss.freq, bss.signal) for bss in bsses if bss.bssid}
+        scanned = None if freqs is None else set(freqs)
+        with self._lock:
+            previous = self._bsses
+            if scanned is not None:
+                seen = {bssid: bss for bssid, bss in seen.items() if bss[0] in scanned}
+                previous = {bssid: bss for bssid, bss in previous.items() if bss[0] in scanned}
+
+            hot = set()
+            deltas = []
+            for bssid, (freq, signal) in seen.items():
+                if bssid not in previous:
+                    hot.add(freq)
+                    continue
+                delta = signal - previous[bssid][1]
+                deltas.append(delta * delta)
+                if abs(delta) >= self.rescan_threshold:
+                    hot.add(freq)
+            hot.update(freq for bssid, (freq, _) in previous.items() if bssid not in seen)
+
+            if self._bsses:
+                # Changes against an empty baseline (the first scan) do not count.
+                self._changes = len(seen.keys() ^ previous.keys())
+                self._hot_freqs = hot
+                if deltas:
+                    self._variance.append(sum(deltas) / len(deltas))
+            if scanned is None:
+                self._bsses = seen
+            else:
+                self._bsses = {
+                    bssid: bss for bssid, bss in self._bsses.items() if bss[0] not in scanned
+                } | seen
+            return self._changes
+
+    @property
+    def rssi_variance(self) -> float:
+        """Get the smoothed mean squared signal change between scans in dB²."""
+        variance = self._variance.ewma
+        return 0.0 if math.isnan(variance) else variance
+
+    def decide(self, now: float | None = None) -> ScanDecision:
+        """Decide the interval and the channels of the next scan."""
+        now = time.monotonic() if now is None else now
+        connected = self._iface.status() == IfaceStatus.CONNECTED
+        variance = self.rssi_variance
+        with self._lock:
+            changes = self._changes
+            hot = sorted(self._hot_freqs)
+            scans_since_full = self._scans_since_full
+
+        if not connected:
+            interval, reason = self.min_interval, "disconnected"
+        elif variance >= self.busy_variance:
+            interval, reason = self.min_interval, f"signal unstable ({variance:.1f} dB²)"
+        elif changes:
+            interval, reason = self.interval / self.backoff, f"{changes} BSSes found or lost"
+        elif variance > self.quiet_variance:
+            interval, reason = self.interval / self.backoff, f"signal moving ({variance:.1f} dB²)"
+        else:
+            interval, reason = self.interval * self.backoff, "no change"
+        interval = min(max(interval, self.min_interval), self.max_interval)
+
+        freqs = None
+        if connected and hot and scans_since_full + 1 < self.full_every:
+            freqs = hot
+            reason += f", rescan {len(hot)} channels"
+
+        airtime = self.airtime(now)
+        if connected:
+            cost = (FULL_SCAN_CHANNELS if freqs is None else len(freqs)) * CHANNEL_DWELL
+            budgeted = min(cost / self.airtime_budget, self.max_interval)
+            if interval < budgeted:
+                interval = budgeted
+                reason += f", airtime budget ({airtime:.1%} used)"
+
+        self.interval = interval
+        decision = ScanDecision(
+            timestamp=now,
+            interval=interval,
+            freqs=freqs,
+            reason=reason,
+            connected=connected,
+            changes=changes,
+            rssi_variance=variance,
+            airtime=airtime,
+        )
+        self.decision = decision
+        self.history.append(decision)
+        self._logger.debug("Next scan of '%s' in %.1f s: %s", self._iface.name(), interval, reason)
+        return decision
+
+    def is_running(self) -> bool:
+        """Check if the scheduler thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Scan on a background thread until stop() is called."""
+        if self.is_running():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"pywifi-scheduler-{self._iface.name()}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the scheduler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        freqs = None
+        while not self._stop.is_set():
+            interval = self.min_interval
+            try:
+                self.scan(freqs)
+                if self._stop.wait(self.scan_wait):
+                    break
+                self.observe(self._iface.scan_results(), freqs)
+                decision = self.decide()
+                freqs, interval = decision.freqs, decision.interval
+            except Exception:
+                freqs = None
+                self._logger.exception("Scheduled scan of '%s' failed", self._iface.name())
+
+            self._stop.wait(max(interval - self.scan_wait, 0.0))
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+
+"""Aggregate the signal of every BSS over hours of scans in bounded memory.
+
+BssAggregator keeps, per BSSID, the count, mean and variance of the signal
+updated with Welford's algorithm, its min and max, a histogram of the
+integer dBm values for the percentiles, and when it was first and last
+seen. The BSSes are kept in least recently seen order and the oldest are
+evicted beyond ``capacity``. Aggregators of several radios or devices are
+merged, and their state is exported as a JSON-compatible snapshot.
+"""
+
+import math
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from pywifi.profile import Profile
+
+SNAPSHOT_VERSION = 1
+
+# The signal range in dBm of the histograms; signals outside are clamped.
+MIN_SIGNAL = -120
+MAX_SIGNAL = 0
+
+# The fields of BssStats which are infinite until the first sample.
+_BOUNDS = ("min", "max", "first_seen", "last_seen")
+
+
+class SignalHistogram:
+    """SignalHistogram counts the signal samples per dBm.
+
+    Signals are integer dBm, so the percentiles are exact and merging two
+    histograms adds their counts.
+    """
+
+    __slots__ = ("_counts",)
+
+    def __init__(self) -> None:
+        """Create an empty histogram."""
+        self._counts = array("I", bytes(4 * (MAX_SIGNAL - MIN_SIGNAL + 1)))
+
+    def add(self, signal: float, count: int = 1) -> None:
+        """Count a signal sample."""
+        self._counts[min(max(round(signal), MIN_SIGNAL), MAX_SIGNAL) - MIN_SIGNAL] += count
+
+    def merge(self, other: "SignalHistogram") -> None:
+        """Add the counts of another histogram."""
+        for index, count in enumerate(other._counts):
+            if count:
+                self._counts[index] += count
+
+    def quantile(self, q: float) -> float:
+        """Get the q-quantile (0 <= q <= 1) of the samples, NaN if there are none."""
+        total = sum(self._counts)
+        if not total:
+            return math.nan
+
+        rank = max(math.ceil(q * total), 1)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return float(index + MIN_SIGNAL)
+        return float(MAX_SIGNAL)
+
+    def items(self) -> list[list[int]]:
+        """Get the [signal, count] pairs of the counted signals."""
+        return [[index + MIN_SIGNAL, count] for index, count in enumerate(self._counts) if count]
+
+
+@dataclass
+class BssSummary:
+    """The signal statistics of a BSS."""
+
+    bssid: str
+    ssid: str | None
+    freq: int | None
+    count: int
+    mean: float
+    variance: float
+    min: float
+    max: float
+    p50: float
+    p95: float
+    first_seen: float
+    last_seen: float
+
+
+class BssStats:
+    """BssStats accumulates the signal samples of one BSS."""
+
+    __slots__ = (
+        "bssid",
+        "count",
+        "first_seen",
+        "freq",
+        "histogram",
+        "last_seen",
+        "m2",
+        "max",
+        "mean",
+        "min",
+        "ssid",
+    )
+
+    def __init__(self, bssid: str, ssid: str | None = None, freq: int | None = None) -> None:
+        """Create the empty statistics of a BSS."""
+        self.bssid = bssid
+        self.ssid = ssid
+        self.freq = freq
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.first_seen = math.inf
+        self.last_seen = -math.inf
+        self.histogram = SignalHistogram()
+
+    def update(self, signal: float, now: float) -> None:
+        """Add a signal sample seen at ``now`` (seconds since the epoch)."""
+        self.count += 1
+        delta = signal - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (signal - self.mean)
+        self.min = min(self.min, signal)
+        self.max = max(self.max, signal)
+        self.first_seen = min(self.first_seen, now)
+        self.last_seen = max(self.last_seen, now)
+        self.histogram.add(signal)
+
+    def merge(self, other: "BssStats") -> None:
+        """Add the samples of the statistics of the same BSS seen elsewhere."""
+        if not other.count:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.first_seen = min(self.first_seen, other.first_seen)
+        if other.last_seen > self.last_seen:
+            self.last_seen = other.last_seen
+            self.ssid = other.ssid or self.ssid
+            self.freq = other.freq or self.freq
+        self.histogram.merge(other.histogram)
+
+    @property
+    def variance(self) -> float:
+        """Get the sample variance of the signal, 0 below two samples."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def summary(self) -> BssSummary:
+        """Get the statistics of the BSS."""
+        return BssSummary(
+            bssid=self.bssid,
+            ssid=self.ssid,
+            freq=self.freq,
+            count=self.count,
+            mean=self.mean,
+            variance=self.variance,
+            min=self.min,
+            max=self.max,
+            p50=self.histogram.quantile(0.5),
+            p95=self.histogram.quantile(0.95),
+            first_seen=self.first_seen,
+            last_seen=self.last_seen,
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        """Get the state of the statistics as a JSON-compatible dict.
+
+        Without samples, the min, max and seen times are None instead of
+        infinities, which strict JSON cannot hold.
+        """
+        state = {
+            "bssid": self.bssid,
+            "ssid": self.ssid,
+            "freq": self.freq,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+        }
+        for name in _BOUNDS:
+            state[name] = getattr(self, name) if self.count else None
+        state["histogram"] = self.histogram.items()
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict[str, object]) -> "BssStats":
+        """Restore the statistics from a dict of to_dict()."""
+        stats = cls(state["bssid"], state.get("ssid"), state.get("freq"))
+        for name in ("count", "mean", "m2"):
+            setattr(stats, name, state[name])
+        for name in _BOUNDS:
+            if state[name] is not None:
+                setattr(stats, name, state[name])
+        for signal, count in state["histogram"]:
+            stats.histogram.add(signal, count)
+        return stats
+
+
+class BssAggregator:
+    """BssAggregator keeps the signal statistics of the BSSes seen in scans."""
+
+    def __init__(self, capacity: int = 10000, *, stale_after: float | None = None) -> None:
+        """Create an aggregator of at most ``capacity`` BSSes.
+
+        The least recently seen BSSes are evicted beyond ``capacity``, and
+        those not seen for ``stale_after`` seconds are dropped on update().
+        Times are seconds since the epoch, so that the aggregators of
+        several devices merge.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.stale_after = stale_after
+        self.evicted = 0
+        self._bsses: OrderedDict[str, BssStats] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get the number of BSSes kept."""
+        return len(self._bsses)
+
+    def __contains__(self, bssid: str) -> bool:
+        """Check if a BSS is kept."""
+        return bssid.lower() in self._bsses
+
+    def get(self, bssid: str) -> BssStats | None:
+        """Get the statistics of a BSS."""
+        return self._bsses.get(bssid.lower())
+
+    def update(self, bsses: list[Profile], now: float | None = None) -> None:
+        """Add the signal of every BSS of scan results seen at ``now`` (epoch seconds)."""
+        now = time.time() if now is None else now
+        # The BSSes of a scan older than the latest sighting are sorted in
+        # place instead of being moved to the end.
+        late = bool(self._bsses) and now < next(reversed(self._bsses.values())).last_seen
+        for bss in bsses:
+            if not bss.bssid:
+                continue
+
+            bssid = bss.bssid.lower()
+            stats = self._bsses.get(bssid)
+            if stats is None:
+                stats = self._bsses[bssid] = BssStats(bssid)
+            if now >= stats.last_seen:
+                # An older scan keeps the latest names.
+                if not late:
+                    self._bsses.move_to_end(bssid)
+                stats.ssid = bss.ssid
+                stats.freq = bss.freq
+            stats.update(bss.signal, now)
+        if late:
+            self._sort()
+        self.expire(now)
+        self._evict()
+
+    def merge(self, other: "BssAggregator") -> None:
+        """Add the statistics of another aggregator, e.g. of another radio."""
+        self._merge_all(list(other._bsses.values()))
+
+    def expire(self, now: float | None = None) -> int:
+        """Drop the BSSes not seen for ``stale_after`` seconds and get their number."""
+        if self.stale_after is None:
+            return 0
+
+        now = time.time() if now is None else now
+        expired = 0
+        while self._bsses:
+            bssid, stats = next(iter(self._bsses.items()))
+            if now - stats.last_seen <= self.stale_after:
+                break
+            del self._bsses[bssid]
+            expired += 1
+        self.evicted += expired
+        return expired
+
+    def summaries(self) -> list[BssSummary]:
+        """Get the statistics of every BSS, the least recently seen first."""
+        return [stats.summary() for stats in self._bsses.values()]
+
+    def snapshot(self) -> dict[str, object]:
+        """Get the state of the aggregator as a JSON-compatible dict."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "bsses": [stats.to_dict() for stats in self._bsses.values()],
+        }
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: dict[str, object],
+        capacity: int = 10000,
+        *,
+        stale_after: float | None = None,
+    ) -> "BssAggregator":
+        """Restore an aggregator from a snapshot()."""
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {snapshot.get('version')}")
+
+        aggregator = cls(capacity, stale_after=stale_after)
+        aggregator._merge_all([BssStats.from_dict(state) for state in snapshot["bsses"]])
+        return aggregator
+
+    def _merge_all(self, others: list[BssStats]) -> None:
+        for other in others:
+            stats = self._bsses.get(other.bssid)
+            if stats is None:
+                stats = self._bsses[other.bssid] = BssStats(other.bssid)
+            stats.merge(other)
+        # Restore the order of the last sightings across both sides.
+        self._sort()
+        self._evict()
+
+    def _sort(self) -> None:
+        ordered = sorted(self._bsses.values(), key=lambda stats: stats.last_seen)
+        self._bsses = OrderedDict((stats.bssid, stats) for stats in ordered)
+
+    def _evict(self) -> None:
+        while len(self._bsses) > self.capacity:
+            self._bsses.popitem(last=False)
+            self.evicted += 1
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+"""Sample the link quality of a wifi interface at a high rate.
+
+LinkSampler polls the signal parameters and packet counters of the link on a
+background thread and stores every sample in fixed-size ring buffers which
+are allocated once, so the memory stays bounded however long it runs.
+"""
+
+import logging
+import math
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+from pywifi.iface import Interface
+
+# Sample fields and the SIGNAL_POLL / PKTCNT_POLL keys they are read from.
+SIGNAL_FIELDS = {
+    "rssi": "RSSI",
+    "link_speed": "LINKSPEED",
+    "noise": "NOISE",
+    "freq": "FREQUENCY",
+}
+PACKET_FIELDS = {
+    "tx_good": "TXGOOD",
+    "tx_bad": "TXBAD",
+    "rx_good": "RXGOOD",
+}
+
+# Sample fields read from the kernel with Interface.link_stats().
+KERNEL_FIELDS = (
+    "quality",
+    "level",
+    "noise",
+    "rx_bytes",
+    "tx_bytes",
+    "rx_packets",
+    "tx_packets",
+)
+
+# wpa_supplicant reports this noise value when the driver does not know it.
+NOISE_UNKNOWN = 9999
+
+
+@dataclass
+class RollingStats:
+    """Statistics over the samples held by a ring buffer."""
+
+    count: int
+    last: float
+    ewma: float
+    min: float
+    max: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+
+
+class RingBuffer:
+    """RingBuffer keeps the latest ``capacity`` float samples.
+
+    Missing samples are stored as NaN and skipped by the statistics. The
+    exponentially weighted moving average is updated with every sample.
+    """
+
+    __slots__ = ("_count", "_data", "_ewma", "_index", "alpha", "capacity")
+
+    def __init__(self, capacity: int, alpha: float = 0.2) -> None:
+        """Create a ring buffer preallocated for ``capacity`` samples."""
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.alpha = alpha
+        self._data = array("d", [math.nan]) * capacity
+        self._index = 0
+        self._count = 0
+        self._ewma = math.nan
+
+    def __len__(self) -> int:
+        """Get the number of samples held, up to the capacity."""
+        return self._count
+
+    def append(self, value: float) -> None:
+        """Store a sample, overwriting the oldest one when full."""
+        self._data[self._index] = value
+        self._index = (self._index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+        if not math.isnan(value):
+            if math.isnan(self._ewma):
+                self._ewma = value
+            else:
+                self._ewma += self.alpha * (value - self._ewma)
+
+    @property
+    def ewma(self) -> float:
+        """Get the exponentially weighted moving average of the samples."""
+        return self._ewma
+
+    def last(self) -> float:
+        """Get the latest sample, NaN if there is none."""
+        if not self._count:
+            return math.nan
+        return self._data[self._index - 1]
+
+    def values(self) -> list[float]:
+        """Get the samples from the oldest to the latest."""
+        if self._count < self.capacity:
+            return self._data[: self._count].tolist()
+        return self._data[self._index :].tolist() + self._data[: self._index].tolist()
+
+    def stats(self) -> RollingStats | None:
+        """Get the statistics of the samples, None if there are no valid ones."""
+        values = sorted(value for value in self.values() if not math.isnan(value))
+        if not values:
+            return None
+
+        return RollingStats(
+            count=len(values),
+            last=self.last(),
+            ewma=self._ewma,
+            min=values[0],
+            max=values[-1],
+            mean=math.fsum(values) / len(values),
+            p50=_percentile(values, 50),
+            p90=_percentile(values, 90),
+            p99=_percentile(values, 99),
+        )
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Get the q-th percentile of sorted values by linear interpolation."""
+    pos = (len(values) - 1) * q / 100
+    low = math.floor(pos)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+class LinkSampler:
+    """LinkSampler polls the link quality of an interface periodically."""
+
+    def __init__(
+        self,
+        iface: Interface,
+        rate: float = 10.0,
+        capacity: int = 600,
+        *,
+        alpha: float = 0.2,
+        packet_counts: bool = True,
+        kernel_stats: bool = False,
+    ) -> None:
+        """Create a sampler polling ``rate`` times per second.
+
+        The latest ``capacity`` samples of each field are kept, e.g. one
+        minute at the default 10 Hz. With ``kernel_stats`` the KERNEL_FIELDS
+        are sampled from Interface.link_stats() instead of wpa_supplicant.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self._iface = iface
+        self.rate = rate
+        self.packet_counts = packet_counts
+        self.kernel_stats = kernel_stats
+        if kernel_stats:
+            fields = list(KERNEL_FIELDS)
+        else:
+            fields = list(SIGNAL_FIELDS) + (list(PACKET_FIELDS) if packet_counts else [])
+        self.buffers = {field: RingBuffer(capacity, alpha) for field in fields}
+        self.timestamps = RingBuffer(capacity, alpha)
+        self.errors = 0
+        self._thread = None
+        self._stop = threading.Event()
+        self._logger = logging.getLogger("pywifi")
+
+    def sample(self, now: float | None = None) -> None:
+        """Poll the interface once and store the sample."""
+        if self.kernel_stats:
+            stats = self._iface.link_stats()
+            self.timestamps.append(stats.timestamp if now is None else now)
+            for field in KERNEL_FIELDS:
+                value = getattr(stats, field)
+                self.buffers[field].append(math.nan if value is None else value)
+            return
+
+        signal = self._iface.signal_poll()
+        if signal.get("NOISE") == NOISE_UNKNOWN:
+            del signal["NOISE"]
+        self.timestamps.append(time.monotonic() if now is None else now)
+        for field, key in SIGNAL_FIELDS.items():
+            self.buffers[field].append(signal.get(key, math.nan))
+
+        if self.packet_counts:
+            counts = self._iface.packet_counts()
+            for field, key in PACKET_FIELDS.items():
+                self.buffers[field].append(counts.get(key, math.nan))
+
+    def stats(self, field: str) -> RollingStats | None:
+        """Get the rolling statistics of a sample field, e.g. "rssi"."""
+        return self.buffers[field].stats()
+
+    def latest(self) -> dict[str, float]:
+        """Get the latest value of every sample field."""
+        return {field: buffer.last() for field, buffer in self.buffers.items()}
+
+    def is_running(self) -> bool:
+        """Check if the sampler thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Sample on a background thread until stop() is called."""
+        if self.is_running():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"pywifi-sampler-{self._iface.name()}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        period = 1 / self.rate
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception:
+                self.errors += 1
+                self._logger.exception("Sampling iface '%s' failed", self._iface.name())
+
+            # Schedule on a fixed grid so slow polls do not accumulate drift.
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                deadline = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
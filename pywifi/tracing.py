@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+"""Profile where the time of a connection attempt goes.
+
+ConnectTracer timestamps every wpa_state an interface goes through while it
+connects (scanning, authenticating, associating, the 4-way and the group
+handshake), from the state change events or, where events are not
+supported, by sampling the status. Each attempt gives a ConnectTrace with
+the time spent per phase, and the phases of the successful attempts are
+kept in ring buffers for their percentiles.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from pywifi.events import EVENT_STATE_CHANGE, Event, EventMonitor
+from pywifi.iface import Interface
+from pywifi.telemetry import RingBuffer, RollingStats
+
+TRACE_TIMEOUT = 10.0
+SAMPLE_INTERVAL = 0.02
+TRACE_CAPACITY = 1000
+
+# The wpa_states by their number in CTRL-EVENT-STATE-CHANGE.
+WPA_STATES = (
+    "disconnected",
+    "interface_disabled",
+    "inactive",
+    "scanning",
+    "authenticating",
+    "associating",
+    "associated",
+    "4way_handshake",
+    "group_handshake",
+    "completed",
+)
+
+# "request" is the time until wpa_supplicant leaves the state it was in.
+PHASES = ("request", *WPA_STATES[3:9])
+
+
+@dataclass
+class Transition:
+    """The interface entered ``state`` at ``timestamp`` (time.monotonic())."""
+
+    state: str
+    timestamp: float
+
+
+@dataclass
+class ConnectTrace:
+    """The state transitions of one connection attempt."""
+
+    start: float
+    transitions: list[Transition] = field(default_factory=list)
+    end: float | None = None
+    source: str = "events"
+
+    @property
+    def connected(self) -> bool:
+        """Check if the attempt completed."""
+        return self.end is not None
+
+    @property
+    def duration(self) -> float | None:
+        """Get the seconds until the connection completed, None if it did not."""
+        return None if self.end is None else self.end - self.start
+
+    def phases(self) -> dict[str, float]:
+        """Get the seconds spent in each state, in the order they were entered.
+
+        The time before the first transition is the "request" phase; a
+        state entered more than once sums up its durations.
+        """
+        phases = {}
+        state, since = "request", self.start
+        for transition in self.transitions:
+            phases[state] = phases.get(state, 0.0) + transition.timestamp - since
+            state, since = transition.state, transition.timestamp
+        return phases
+
+
+def _event_state(event: Event) -> str | None:
+    """Get the wpa_state entered according to a CTRL-EVENT-STATE-CHANGE."""
+    try:
+        return WPA_STATES[int(event.params.get("state", ""))]
+    except (IndexError, ValueError):
+        return None
+
+
+class ConnectTracer:
+    """ConnectTracer profiles the connection attempts of an interface."""
+
+    def __init__(
+        self,
+        iface: Interface,
+        capacity: int = TRACE_CAPACITY,
+        *,
+        sample_interval: float = SAMPLE_INTERVAL,
+    ) -> None:
+        """Create a tracer keeping the phases of the latest ``capacity`` connections."""
+        self._iface = iface
+        self.sample_interval = sample_interval
+        self.buffers = {phase: RingBuffer(capacity) for phase in (*PHASES, "total")}
+        self.attempts = 0
+        self.failures = 0
+        self._logger = logging.getLogger("pywifi")
+
+    def trace(self, connect: Callable[[], None], timeout: float = TRACE_TIMEOUT) -> ConnectTrace:
+        """Call ``connect`` and record the states until connected or ``timeout``."""
+        monitor = self._iface.event_monitor()
+        started = not monitor.is_running()
+        try:
+            monitor.start()
+        except NotImplementedError:
+            trace = self._trace_sampled(connect, timeout)
+        else:
+            try:
+                trace = self._trace_events(monitor, connect, timeout)
+            finally:
+                if started:
+                    monitor.stop()
+        self._record(trace)
+        return trace
+
+    def stats(self, phase: str) -> RollingStats | None:
+        """Get the statistics of a phase (or "total") over the connections."""
+        return self.buffers[phase].stats()
+
+    def summary(self) -> dict[str, RollingStats]:
+        """Get the statistics of every phase seen in the connections."""
+        summary = {}
+        for phase, buffer in self.buffers.items():
+            stats = buffer.stats()
+            if stats is not None:
+                summary[phase] = stats
+        return summary
+
+    def _trace_events(
+        self,
+        monitor: EventMonitor,
+        connect: Callable[[], None],
+        timeout: float,
+    ) -> ConnectTrace:
+        trace = ConnectTrace(start=time.monotonic())
+        done = threading.Event()
+
+        def on_event(event: Event) -> None:
+            state = _event_state(event) if event.name == EVENT_STATE_CHANGE else None
+            if state is None or done.is_set():
+                return
+            trace.transitions.append(Transition(state, event.timestamp))
+            if state == "completed":
+                trace.end = event.timestamp
+                done.set()
+
+        monitor.subscribe(on_event)
+        try:
+            connect()
+            done.wait(timeout)
+        finally:
+            monitor.unsubscribe(on_event)
+        return trace
+
+    def _trace_sampled(self, connect: Callable[[], None], timeout: float) -> ConnectTrace:
+        trace = ConnectTrace(start=time.monotonic(), source="status")
+        connect()
+        state = None
+        while time.monotonic() - trace.start < timeout:
+            self._iface.invalidate_status()
+            info = self._iface.link_info()
+            if info.wpa_state and info.wpa_state.lower() != state:
+                state = info.wpa_state.lower()
+                trace.transitions.append(Transition(state, info.timestamp))
+            if info.connected:
+                trace.end = info.timestamp
+                break
+            time.sleep(self.sample_interval)
+        return trace
+
+    def _record(self, trace: ConnectTrace) -> None:
+        self.attempts += 1
+        if not trace.connected:
+            self.failures += 1
+            self._logger.info("Traced connect of iface '%s' did not complete", self._iface.name())
+            return
+
+        phases = trace.phases()
+        for phase in PHASES:
+            self.buffers[phase].append(phases.get(phase, 0.0))
+        self.buffers["total"].append(trace.duration)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+"""Reconnect an interface as soon as its link drops.
+
+ReconnectWatchdog remembers the network id, BSSID and frequency of the last
+good link. When the link drops, noticed from the disconnect events or by
+polling the status, it immediately selects the same saved network again,
+pinned to that BSS and scanning only its frequency, which brings a link
+back after a transient drop without a full scan. Further attempts select
+the network on every channel with an exponential backoff and jitter.
+Pause the watchdog around a disconnect() of your own, or it is undone.
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from pywifi.const import IfaceStatus
+from pywifi.events import EVENT_CONNECTED, EVENT_DISCONNECTED, Event
+from pywifi.iface import Interface
+from pywifi.link import LinkInfo
+from pywifi.telemetry import RingBuffer, RollingStats
+
+# While the link is down the status is checked this often (seconds) to
+# measure the outage even without events.
+DOWN_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class ReconnectStats:
+    """Counters of the link drops and the reconnect attempts."""
+
+    disconnects: int = 0
+    reconnects: int = 0
+    fast_reconnects: int = 0
+    attempts: int = 0
+    errors: int = 0
+    last_outage: float | None = None
+
+
+class ReconnectWatchdog:
+    """ReconnectWatchdog brings back the link of an interface after a drop."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        iface: Interface,
+        *,
+        check_interval: float = 1.0,
+        backoff_initial: float = 1.0,
+        backoff_max: float = 30.0,
+        jitter: float = 0.2,
+        connect_timeout: float = 5.0,
+        capacity: int = 100,
+    ) -> None:
+        """Create a watchdog for the wifi interface.
+
+        The link is checked every ``check_interval`` seconds besides the
+        events. After the immediate pinned attempt, the n-th attempt waits
+        ``backoff_initial * 2**(n - 2)`` seconds, at most ``backoff_max``,
+        varied by ±``jitter`` of it. An attempt still scanning or connecting
+        is given ``connect_timeout`` seconds. The latest ``capacity`` outage
+        durations are kept.
+        """
+        self._iface = iface
+        self.check_interval = check_interval
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.connect_timeout = connect_timeout
+
+        self.stats = ReconnectStats()
+        self.outages = RingBuffer(capacity)
+        self.last_link: LinkInfo | None = None
+        self._down_since: float | None = None
+        self._attempt = 0
+        self._last_attempt: float | None = None
+        self._next_attempt = 0.0
+        self._paused = False
+        self._lock = threading.Lock()
+        self._thread = None
+        self._monitor_started = False
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._logger = logging.getLogger("pywifi")
+
+    @property
+    def down(self) -> bool:
+        """Check if the link is down and being reconnected."""
+        return self._down_since is not None
+
+    @property
+    def paused(self) -> bool:
+        """Check if the watchdog is paused by pause()."""
+        return self._paused
+
+    def pause(self) -> None:
+        """Stop reconnecting the link, e.g. before disconnecting on purpose.
+
+        The link being reconnected, if any, is given up. After resume(),
+        only a link seen connected again is reconnected.
+        """
+        with self._lock:
+            self._paused = True
+            self.last_link = None
+            self._down_since = None
+            self._attempt = 0
+            self._last_attempt = None
+
+    def resume(self) -> None:
+        """Watch the link again after pause()."""
+        with self._lock:
+            self._paused = False
+        self._wake.set()
+
+    def outage_stats(self) -> RollingStats | None:
+        """Get the statistics of the outage durations in seconds."""
+        return self.outages.stats()
+
+    def backoff(self, attempt: int) -> float:
+        """Get the delay in seconds after the ``attempt``-th attempt, without jitter."""
+        if attempt <= 1:
+            return 0.0
+        return min(self.backoff_initial * 2 ** (attempt - 2), self.backoff_max)
+
+    def handle_event(self, event: Event) -> None:
+        """Check the link at once on a connect or disconnect event."""
+        if event.name in (EVENT_CONNECTED, EVENT_DISCONNECTED):
+            self._wake.set()
+
+    def step(self, now: float | None = None) -> None:
+        """Check the link and reconnect it if it is down and an attempt is due."""
+        now = time.monotonic() if now is None else now
+        self._iface.invalidate_status()
+        info = self._iface.link_info()
+        with self._lock:
+            if self._paused:
+                return
+            if info.connected:
+                self._link_up(info, now)
+            elif self.last_link is not None:
+                self._link_down(info, now)
+
+    def is_running(self) -> bool:
+        """Check if the watchdog thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Watch the link on a background thread until stop() is called.
+
+        The events of the interface are received if its backend supports
+        them; otherwise the link is only polled.
+        """
+        if self.is_running():
+            return
+
+        monitor = self._iface.event_monitor()
+        if not monitor.is_running():
+            try:
+                monitor.start()
+                self._monitor_started = True
+            except NotImplementedError:
+                self._logger.debug("No events for '%s', polling its link", self._iface.name())
+        monitor.subscribe(self.handle_event)
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"pywifi-watchdog-{self._iface.name()}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        monitor = self._iface.event_monitor()
+        monitor.unsubscribe(self.handle_event)
+        if self._monitor_started:
+            monitor.stop()
+            self._monitor_started = False
+
+    def _link_up(self, info: LinkInfo, now: float) -> None:
+        if self._down_since is not None:
+            outage = now - self._down_since
+            self.stats.reconnects += 1
+            if self._attempt <= 1:
+                self.stats.fast_reconnects += 1
+            self.stats.last_outage = outage
+            self.outages.append(outage)
+            self._down_since = None
+            self._logger.info(
+                "Link of '%s' is back after %.3f s and %d attempts",
+                self._iface.name(),
+                outage,
+                self._attempt,
+            )
+
+        self._attempt = 0
+        self._last_attempt = None
+        if info.network_id is not None:
+            self.last_link = info
+
+    def _link_down(self, info: LinkInfo, now: float) -> None:
+        if self._down_since is None:
+            self._down_since = now
+            self._next_attempt = now
+            self.stats.disconnects += 1
+            self._logger.info("Link of '%s' is down", self._iface.name())
+
+        in_progress = info.status in (IfaceStatus.SCANNING, IfaceStatus.CONNECTING)
+        if now < self._next_attempt or (
+            in_progress
+            and self._last_attempt is not None
+            and now - self._last_attempt < self.connect_timeout
+        ):
+            return
+
+        self._attempt += 1
+        self._last_attempt = now
+        self.stats.attempts += 1
+        link = self.last_link
+        try:
+            if self._attempt == 1:
+                # Pinned to the last BSS and its channel: no full scan.
+                self._iface.reassociate(link.network_id, link.bssid, link.freq)
+            else:
+                self._iface.reassociate(link.network_id)
+        except Exception:
+            self.stats.errors += 1
+            self._logger.exception("Reconnect of '%s' failed", self._iface.name())
+
+        delay = self.backoff(self._attempt + 1)
+        delay *= 1 + random.uniform(-self.jitter, self.jitter)  # noqa: S311
+        self._next_attempt = now + delay
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.step()
+            except Exception:
+                self._logger.exception("Checking the link of '%s' failed", self._iface.name())
+
+            timeout = DOWN_POLL_INTERVAL if self.down else self.check_interval
+            self._wake.wait(timeout)
+            self._wake.clear()
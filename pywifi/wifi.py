@@ -24,19 +24,32 @@ class PyWiFi:
     """PyWiFi provides operations to manipulate wifi devices."""
 
     _ifaces = []
+    _wifi_ctrl = None
     _logger = None
 
-    def __init__(self) -> None:
-        """Create PyWiFi instance"""
+    def __init__(self, backend: str | None = None, *, bus: str = "SYSTEM") -> None:
+        """Create PyWiFi instance.
+
+        On Linux, ``backend`` selects how wpa_supplicant is driven: "ctrl"
+        (the default) uses its control sockets and "dbus" its D-Bus API on
+        ``bus``, which requires jeepney.
+        """
         self._logger = logging.getLogger("pywifi")
 
-    def interfaces(self) -> list[Interface]:
-        """Collect the available wlan interfaces."""
-        self._ifaces = []
-        wifi_ctrl = wifiutil.WifiUtil()
+        if backend == "dbus":
+            from pywifi import _wifiutil_dbus  # noqa: PLC0415
 
-        for interface in wifi_ctrl.interfaces():
-            iface = Interface(interface)
+            self._wifi_ctrl = _wifiutil_dbus.WifiUtil(bus)
+        elif backend is None or (backend == "ctrl" and platform.system().lower() == "linux"):
+            self._wifi_ctrl = wifiutil.WifiUtil()
+        else:
+            raise ValueError(f"Unsupported backend: '{backend}'")
+
+    def interfaces(self, names: list[str] | None = None) -> list[Interface]:
+        """Collect the available wlan interfaces, optionally only the named ones."""
+        self._ifaces = []
+        for interface in self._wifi_ctrl.interfaces(names):
+            iface = Interface(interface, self._wifi_ctrl)
             self._ifaces.append(iface)
             self._logger.info("Get interface: %s", iface.name())
 
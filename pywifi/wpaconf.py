@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+"""Read and write the networks of wpa_supplicant.conf files.
+
+The saved networks can be read straight from the configuration file instead
+of querying them field by field over the control interface. The parser
+streams the file line by line, so it handles large files and many files at
+disk speed, and the writer emits network blocks the parser reads back.
+"""
+
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from pywifi.const import AkmType, CipherType
+from pywifi.profile import Profile
+from pywifi.psk import is_raw_psk
+from pywifi.wpactrl import cipher_str_to_value, key_mgmt_to_proto_str, key_mgmt_to_str
+
+# (key_mgmt, proto) of a network block to the akm of a profile.
+_AKM_BY_KEY_MGMT = {
+    ("WPA-PSK", "WPA"): AkmType.WPAPSK,
+    ("WPA-PSK", "RSN"): AkmType.WPA2PSK,
+    ("WPA-EAP", "WPA"): AkmType.WPA,
+    ("WPA-EAP", "RSN"): AkmType.WPA2,
+}
+
+_PROTO_ALIASES = {"WPA2": "RSN"}
+
+# The key_mgmt values a profile models; a network block with any other one
+# (e.g. SAE or FT-PSK) keeps its key_mgmt and proto as read.
+_KNOWN_KEY_MGMTS = {"WPA-PSK", "WPA-EAP", "NONE"}
+
+# wpa_supplicant defaults of the fields a network block may leave out.
+_DEFAULT_KEY_MGMT = "WPA-PSK WPA-EAP"
+_DEFAULT_PROTO = "WPA RSN"
+
+
+def _unquote(value: str) -> str:
+    """Decode a quoted, printf-escaped (P"...") or hex encoded string value."""
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':  # noqa: PLR2004
+        return value[1:-1]
+    if value.startswith('P"') and value.endswith('"'):
+        return value[2:-1].encode("latin-1", "backslashreplace").decode("unicode_escape")
+    try:
+        return bytes.fromhex(value).decode("utf-8")
+    except ValueError:
+        return value
+
+
+def _quote(value: str) -> str:
+    """Encode a string value, hex encoded if it cannot be quoted."""
+    if value.isprintable() and '"' not in value:
+        return f'"{value}"'
+    return value.encode("utf-8").hex()
+
+
+def _build_profile(fields: dict[str, str]) -> Profile:
+    profile = Profile()
+    profile.ssid = _unquote(fields["ssid"]) if "ssid" in fields else None
+
+    psk = fields.get("psk")
+    if psk is not None:
+        profile.key = psk[1:-1] if psk.startswith('"') else psk
+
+    key_mgmts = fields.get("key_mgmt", _DEFAULT_KEY_MGMT).upper().split()
+    if "key_mgmt" not in fields and psk is not None:
+        key_mgmts = ["WPA-PSK"]
+    protos = [
+        _PROTO_ALIASES.get(proto, proto)
+        for proto in fields.get("proto", _DEFAULT_PROTO).upper().split()
+    ]
+
+    # The strongest akm comes last, as process_akm() keeps the last one.
+    akm = [
+        _AKM_BY_KEY_MGMT[key_mgmt, proto]
+        for key_mgmt in ("WPA-EAP", "WPA-PSK")
+        for proto in ("WPA", "RSN")
+        if key_mgmt in key_mgmts and proto in protos
+    ]
+    if not akm and key_mgmts == ["NONE"]:
+        akm = [AkmType.NONE]
+    # An empty akm: a key management pywifi does not know, as in akm_of().
+    profile.akm = akm
+    if not _KNOWN_KEY_MGMTS.issuperset(key_mgmts):
+        profile.key_mgmt = fields["key_mgmt"]
+        profile.proto = fields.get("proto")
+
+    ciphers = fields.get("pairwise", "").upper().split()
+    if "CCMP" in ciphers:
+        profile.cipher = CipherType.CCMP
+    elif ciphers:
+        profile.cipher = cipher_str_to_value.get(ciphers[0], CipherType.UNKNOWN)
+
+    if "priority" in fields:
+        try:
+            profile.priority = int(fields["priority"])
+        except ValueError as err:
+            raise ValueError(f"Invalid priority {fields['priority']!r}") from err
+    if "bssid" in fields:
+        profile.bssid = fields["bssid"].lower()
+
+    return profile
+
+
+def iter_profiles(lines: Iterable[str]) -> Iterator[Profile]:
+    """Parse the network blocks of wpa_supplicant.conf lines into profiles.
+
+    A network block with a malformed value is skipped with a warning.
+    """
+    fields = None
+    start = 0
+    for lineno, raw_line in enumerate(lines, 1):
+        line = raw_line.strip()
+        if not line or line[0] == "#":
+            continue
+
+        if fields is None:
+            if line.startswith("network={"):
+                fields = {}
+                start = lineno
+            continue
+
+        if line == "}":
+            try:
+                profile = _build_profile(fields)
+            except ValueError as err:
+                logger = logging.getLogger("pywifi")
+                logger.warning("Skip the network block of line %d: %s", start, err)
+            else:
+                yield profile
+            fields = None
+            continue
+
+        key, sep, value = line.partition("=")
+        if sep:
+            fields[key.strip()] = value.strip()
+
+
+def read_profiles(path: str | os.PathLike) -> Iterator[Profile]:
+    """Parse the network blocks of a wpa_supplicant.conf file into profiles."""
+    with open(path, encoding="utf-8", errors="surrogateescape") as f:
+        yield from iter_profiles(f)
+
+
+def _key_mgmt_lines(profile: Profile, akm: int | None, key_mgmt: str | None) -> list[str]:
+    if key_mgmt:
+        proto = getattr(profile, "proto", None)
+        return [f"\tkey_mgmt={key_mgmt}"] + ([f"\tproto={proto}"] if proto else [])
+    if akm in key_mgmt_to_str:
+        return [f"\tkey_mgmt={key_mgmt_to_str[akm]}", f"\tproto={key_mgmt_to_proto_str[akm]}"]
+    if akm == AkmType.NONE:
+        return ["\tkey_mgmt=NONE"]
+    raise ValueError(f"Unknown key management of the profile of {profile.ssid!r}")
+
+
+def format_profile(profile: Profile) -> str:
+    """Format a profile as a wpa_supplicant.conf network block.
+
+    The key_mgmt and proto a profile was read with are written back when
+    pywifi does not model its key management; a profile whose key management
+    is otherwise unknown raises ValueError rather than being written open.
+    """
+    if profile.ssid is None:
+        raise ValueError("A network block needs the SSID of the profile")
+
+    lines = ["network={", f"\tssid={_quote(profile.ssid)}"]
+    if profile.bssid:
+        lines.append(f"\tbssid={profile.bssid}")
+
+    akm = profile.akm[-1] if profile.akm else None
+    key_mgmt = getattr(profile, "key_mgmt", None)
+    lines += _key_mgmt_lines(profile, akm, key_mgmt)
+
+    if profile.cipher == CipherType.CCMP:
+        lines.append("\tpairwise=CCMP")
+    elif profile.cipher == CipherType.TKIP:
+        lines.append("\tpairwise=TKIP")
+
+    if profile.key and (key_mgmt or akm in (AkmType.WPAPSK, AkmType.WPA2PSK)):
+        raw = is_raw_psk(profile.key)
+        lines.append(f"\tpsk={profile.key}" if raw else f'\tpsk="{profile.key}"')
+
+    if profile.priority:
+        lines.append(f"\tpriority={profile.priority}")
+
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def write_profiles(
+    profiles: Iterable[Profile],
+    f: TextIO,
+    header: str | None = None,
+) -> None:
+    """Write profiles as wpa_supplicant.conf network blocks.
+
+    ``header`` holds the global settings written before the networks, e.g.
+    "ctrl_interface=/var/run/wpa_supplicant".
+    """
+    if header:
+        f.write(header.rstrip("\n") + "\n\n")
+
+    for profile in profiles:
+        f.write(format_profile(profile))
+        f.write("\n")
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+
+"""Build the commands and parse the replies of the wpa_supplicant control interface.
+
+The blocking Linux backend and the asyncio API talk the same protocol over
+different sockets. The commands and parsers live here, and the operations
+taking several commands (e.g. network_profiles) are written once as request
+generators: a request yields ``(command, get_reply)`` pairs, is sent back
+each reply, and is driven by run() or run_async() over either socket.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable, Generator
+from typing import TypeVar
+
+from pywifi import psk
+from pywifi.const import AkmType, AuthAlgorithm, CipherType, IfaceStatus
+from pywifi.ie import BssDetails
+from pywifi.link import LinkInfo
+from pywifi.profile import Profile, diff_profiles
+
+# All the fields of BSS, with a "====" line closing each entry of a range.
+BSS_MASK = 0xFFFFFFFF
+BSS_DELIM = "===="
+
+status_dict = {
+    "completed": IfaceStatus.CONNECTED,
+    "inactive": IfaceStatus.INACTIVE,
+    "authenticating": IfaceStatus.CONNECTING,
+    "associating": IfaceStatus.CONNECTING,
+    "associated": IfaceStatus.CONNECTING,
+    "4way_handshake": IfaceStatus.CONNECTING,
+    "group_handshake": IfaceStatus.CONNECTING,
+    "interface_disabled": IfaceStatus.INACTIVE,
+    "disconnected": IfaceStatus.DISCONNECTED,
+    "scanning": IfaceStatus.SCANNING,
+}
+
+key_mgmt_to_str = {
+    AkmType.WPA: "WPA-EAP",
+    AkmType.WPAPSK: "WPA-PSK",
+    AkmType.WPA2: "WPA-EAP",
+    AkmType.WPA2PSK: "WPA-PSK",
+}
+
+key_mgmt_to_proto_str = {
+    AkmType.WPA: "WPA",
+    AkmType.WPAPSK: "WPA",
+    AkmType.WPA2: "RSN",
+    AkmType.WPA2PSK: "RSN",
+}
+
+proto_to_key_mgmt_id = {"WPA": AkmType.WPAPSK, "RSN": AkmType.WPA2PSK}
+
+cipher_str_to_value = {
+    "TKIP": CipherType.TKIP,
+    "CCMP": CipherType.CCMP,
+}
+
+_PSK_AKMS = (AkmType.WPAPSK, AkmType.WPA2PSK)
+
+T = TypeVar("T")
+
+# Yields (command, get_reply) pairs and is sent the replies.
+Request = Generator[tuple[str, bool], str | None, T]
+
+
+def parse_key_values(reply: str) -> dict[str, str]:
+    """Parse a "key=value" per line reply of wpa_supplicant."""
+    fields = {}
+    for line in reply.splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            fields[key] = value
+    return fields
+
+
+def parse_int_values(reply: str) -> dict[str, int]:
+    """Parse the integer fields of a "key=value" per line reply."""
+    fields = {}
+    for key, value in parse_key_values(reply).items():
+        try:
+            fields[key] = int(value)
+        except ValueError:
+            continue
+    return fields
+
+
+def scan_cmd(
+    freqs: list[int] | None,
+    ssids: list[str] | None,
+    *,
+    passive: bool = False,
+    only_new: bool = False,
+) -> str:
+    """Get the SCAN command of a scan."""
+    params = ["SCAN"]
+    if freqs:
+        params.append("freq=" + ",".join(str(freq) for freq in freqs))
+    if passive:
+        params.append("passive=1")
+    if only_new:
+        params.append("only_new=1")
+    # SSIDs are sent hex encoded so that spaces and quotes survive.
+    params.extend(f"ssid {ssid.encode('utf-8').hex()}" for ssid in ssids or [])
+    return " ".join(params)
+
+
+def parse_scan_results(reply: str) -> list[Profile]:
+    """Parse the reply of SCAN_RESULTS into BSS profiles."""
+    bsses = []
+    for item in reply[:-1].split("\n")[1:]:
+        values = item.split("\t")
+        bss = Profile()
+        bss.bssid = values[0]
+        bss.freq = int(values[1])
+        bss.signal = int(values[2])
+        bss.ssid = values[4]
+        bss.akm = []
+        if "WPA-PSK" in values[3]:
+            bss.akm.append(AkmType.WPAPSK)
+        if "WPA2-PSK" in values[3]:
+            bss.akm.append(AkmType.WPA2PSK)
+        if "WPA-EAP" in values[3]:
+            bss.akm.append(AkmType.WPA)
+        if "WPA2-EAP" in values[3]:
+            bss.akm.append(AkmType.WPA2)
+
+        bss.auth = AuthAlgorithm.OPEN
+
+        bsses.append(bss)
+
+    return bsses
+
+
+def parse_network_list(reply: str) -> list[tuple[int, str]]:
+    """Parse the reply of LIST_NETWORKS into (network id, ssid) pairs."""
+    networks = []
+    for item in reply[:-1].split("\n")[1:]:
+        values = item.split("\t")
+        networks.append((int(values[0]), values[1] if len(values) > 1 else ""))
+    return networks
+
+
+def state_status(wpa_state: str) -> int:
+    """Map a wpa_state to an IfaceStatus, DISCONNECTED if it is unknown."""
+    status = status_dict.get(wpa_state.lower())
+    if status is None:
+        logging.getLogger("pywifi").debug("Unknown wpa_state '%s'", wpa_state)
+        return IfaceStatus.DISCONNECTED
+    return status
+
+
+def parse_status(reply: str) -> int:
+    """Parse the wpa_state of the reply of STATUS into an IfaceStatus."""
+    for item in reply.split("\n"):
+        if item.startswith("wpa_state="):
+            return state_status(item[10:])
+    return IfaceStatus.DISCONNECTED
+
+
+def parse_link_info(reply: str) -> LinkInfo:
+    """Parse the reply of STATUS into a LinkInfo."""
+    fields = parse_key_values(reply)
+    return LinkInfo.from_status_fields(fields, state_status(fields.get("wpa_state", "")))
+
+
+def parse_bss(reply: str) -> BssDetails | None:
+    """Parse the reply of BSS into a BssDetails, None if the BSS is unknown."""
+    fields = parse_key_values(reply)
+    return BssDetails(fields) if "bssid" in fields else None
+
+
+def parse_bss_range(reply: str) -> list[BssDetails]:
+    """Parse the entries of the reply of BSS RANGE=..."""
+    entries = (parse_bss(entry) for entry in reply.split(f"{BSS_DELIM}\n"))
+    return [details for details in entries if details is not None]
+
+
+def akm_of(key_mgmt: str, proto: str) -> list[int]:
+    """Get the akm of a saved network from its key_mgmt and proto."""
+    if key_mgmt.upper() == "WPA-PSK":
+        return [AkmType.WPA2PSK if proto.upper() == "RSN" else AkmType.WPAPSK]
+    if key_mgmt.upper() == "WPA-EAP":
+        return [AkmType.WPA2 if proto.upper() == "RSN" else AkmType.WPA]
+    if key_mgmt.upper() == "NONE":
+        return [AkmType.NONE]
+    # An empty list: a key management pywifi does not know (e.g. SAE).
+    return []
+
+
+def parse_ciphers(reply: str) -> int | None:
+    """Parse the pairwise ciphers of a saved network, None if unknown."""
+    ciphers = reply.split(" ")
+    # Assume the possible ciphers TKIP and CCMP
+    if len(ciphers) == 1:
+        return cipher_str_to_value.get(ciphers[0].upper(), CipherType.NONE)
+    if "CCMP" in ciphers:
+        return CipherType.CCMP
+    return None
+
+
+def psk_cmd(network_id: int, params: Profile, *, derive_psk: bool = False) -> str:
+    """Get the command setting the PSK of a saved network."""
+    if derive_psk or (params.key and psk.is_raw_psk(params.key)):
+        # A hex PSK is sent unquoted, a passphrase quoted.
+        key = psk.default_cache.get(params.ssid, params.key)
+    else:
+        key = f'"{params.key}"'
+    return f"SET_NETWORK {network_id} psk {key}"
+
+
+def network_cmds(network_id: int, params: Profile, *, derive_psk: bool = False) -> list[str]:
+    """Get the commands configuring a newly added network from a profile."""
+    cmds = [f'SET_NETWORK {network_id} ssid "{params.ssid}"']
+
+    akm = params.akm[-1]
+    if akm in [AkmType.WPAPSK, AkmType.WPA2PSK]:
+        key_mgmt = "WPA-PSK"
+    elif akm in [AkmType.WPA, AkmType.WPA2]:
+        key_mgmt = "WPA-EAP"
+    else:
+        key_mgmt = "NONE"
+    cmds.append(f"SET_NETWORK {network_id} key_mgmt {key_mgmt}")
+
+    proto = ""
+    if akm in [AkmType.WPAPSK, AkmType.WPA]:
+        proto = "WPA"
+    elif akm in [AkmType.WPA2PSK, AkmType.WPA2]:
+        proto = "RSN"
+    if proto:
+        cmds.append(f"SET_NETWORK {network_id} proto {proto}")
+
+    if akm in [AkmType.WPAPSK, AkmType.WPA2PSK]:
+        cmds.append(psk_cmd(network_id, params, derive_psk=derive_psk))
+
+    return cmds
+
+
+def run(request: Request[T], send: Callable[..., str | None]) -> T:
+    """Run a request, sending its commands with ``send(cmd, get_reply=...)``."""
+    try:
+        cmd, get_reply = next(request)
+        while True:
+            cmd, get_reply = request.send(send(cmd, get_reply=get_reply))
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_async(request: Request[T], send: Callable[..., Awaitable[str | None]]) -> T:
+    """Run a request, awaiting ``send(cmd, get_reply=...)`` for each command."""
+    try:
+        cmd, get_reply = next(request)
+        while True:
+            cmd, get_reply = request.send(await send(cmd, get_reply=get_reply))
+    except StopIteration as stop:
+        return stop.value
+
+
+def select_network(network: Profile, pinned: set[int]) -> Request[None]:
+    """Select a saved network, by its id or else by its SSID.
+
+    ``pinned`` holds the ids of the networks with a BSS hint; the hint of a
+    selected network is reset first.
+    """
+    if network.id is not None:
+        network_ids = [network.id]
+    else:
+        reply = yield "LIST_NETWORKS", True
+        network_ids = [nid for nid, ssid in parse_network_list(reply) if ssid == network.ssid]
+
+    for network_id in network_ids:
+        if network_id in pinned:
+            yield f"SET_NETWORK {network_id} bssid_hint any", False
+            pinned.discard(network_id)
+        yield f"SELECT_NETWORK {network_id}", False
+
+
+def add_network(params: Profile, *, derive_psk: bool = False) -> Request[Profile]:
+    """Add a network configured from a profile, whose id is set."""
+    params.process_akm()
+    if derive_psk and params.akm[-1] in _PSK_AKMS:
+        # An invalid passphrase raises before the network is added; the
+        # derived PSK is cached for network_cmds().
+        psk.default_cache.get(params.ssid, params.key)
+
+    reply = yield "ADD_NETWORK", True
+    params.id = int(reply.strip())
+    for cmd in network_cmds(params.id, params, derive_psk=derive_psk):
+        yield cmd, False
+
+    return params
+
+
+def update_network_key(params: Profile, *, derive_psk: bool = False) -> Request[None]:
+    """Set the PSK of the saved network ``params.id`` to ``params.key``."""
+    if params.key and params.akm and params.akm[-1] in _PSK_AKMS:
+        yield psk_cmd(params.id, params, derive_psk=derive_psk), False
+
+
+def network_profiles(ssid: str | None = None) -> Request[list[Profile]]:
+    """Get the saved networks as profiles, or only the ones of ``ssid``.
+
+    The other networks are skipped by their SSID in the network list, so
+    only the matching ones are read.
+    """
+    networks = []
+    reply = yield "LIST_NETWORKS", True
+
+    for network_id, listed_ssid in parse_network_list(reply):
+        if ssid is not None and listed_ssid != ssid:
+            continue
+        network = Profile()
+        network.id = network_id
+
+        reply = yield f"GET_NETWORK {network_id} ssid", True
+        if reply.upper().startswith("FAIL"):
+            continue
+        network.ssid = reply[1:-1]
+
+        key_mgmt = yield f"GET_NETWORK {network_id} key_mgmt", True
+        if key_mgmt.upper().startswith("FAIL"):
+            continue
+
+        proto = ""
+        if key_mgmt.upper() in ["WPA-PSK", "WPA-EAP"]:
+            proto = yield f"GET_NETWORK {network_id} proto", True
+        network.akm = akm_of(key_mgmt, proto)
+
+        ciphers = yield f"GET_NETWORK {network_id} pairwise", True
+        if ciphers.upper().startswith("FAIL"):
+            continue
+        cipher = parse_ciphers(ciphers)
+        if cipher is not None:
+            network.cipher = cipher
+
+        networks.append(network)
+
+    return networks
+
+
+def remove_network(params: Profile, pinned: set[int]) -> Request[None]:
+    """Remove the saved network equal to a profile, if any."""
+    network_id = None
+    for profile in (yield from network_profiles()):
+        if profile == params:
+            network_id = profile.id
+
+    if network_id is not None:
+        yield f"REMOVE_NETWORK {network_id}", False
+        pinned.discard(network_id)
+
+
+def apply_profiles(
+    desired: list[Profile],
+    pinned: set[int],
+    *,
+    update_keys: bool = False,
+    derive_psk: bool = False,
+) -> Request[list[Profile]]:
+    """Make the saved networks match the desired profiles, see Interface.apply_profiles()."""
+    matched, to_add, to_remove = diff_profiles((yield from network_profiles()), desired)
+
+    for saved in to_remove:
+        yield f"REMOVE_NETWORK {saved.id}", False
+        pinned.discard(saved.id)
+
+    for profile, saved in matched:
+        profile.process_akm()
+        profile.id = saved.id
+        if update_keys:
+            yield from update_network_key(profile, derive_psk=derive_psk)
+
+    for profile in to_add:
+        yield from add_network(profile, derive_psk=derive_psk)
+
+    return desired
@@ -7,11 +7,14 @@ import os
 import platform
 import socket
 import stat
+import subprocess
 import time
 from typing import Any, Callable
 
+import pytest
+
 import pywifi
-from pywifi import AkmType, AuthAlgorithm, CipherType, IfaceStatus
+from pywifi import AkmType, AuthAlgorithm, CipherType, IfaceStatus, wpactrl
 
 
 class SockMock:
@@ -23,6 +26,20 @@ class SockMock:
         "78:32:1b:63:96:05\t2422\t-91\t[WPA-PSK-CCMP][WPA2-PSK-CCMP][ESS]\tjoyfulness\n"
     )
 
+    # id, bssid, ssid and IEs (SSID, DS Parameter Set, RSN) of the known BSSes.
+    default_bss = (
+        (
+            3,
+            "ac:9e:17:31:85:fc",
+            "Evan",
+            "00044576616e030106" "30140100000fac040100000fac040100000fac020000",
+        ),
+        (7, "0c:80:63:2b:0d:a8", "Kevin_H2", "00084b6576696e5f4832030102"),
+    )
+
+    last_scan_cmd = None
+    status_requests = 0
+
     def __init__(self) -> None:
         self._last_cmd = None
         self._last_state = None
@@ -34,8 +51,13 @@ class SockMock:
     def connect(self, *args: Any, **kwargs: Any) -> None:
         pass
 
+    def close(self) -> None:
+        pass
+
     def recv(self, *args: Any, **kwargs: Any) -> bytes | None:
-        if self._last_cmd == "SCAN":
+        if self._last_cmd == "SCAN" or self._last_cmd.startswith("SCAN "):
+
+            SockMock.last_scan_cmd = self._last_cmd
 
             return b"OK\n"
         if self._last_cmd == "PING":
@@ -54,12 +76,37 @@ class SockMock:
             self._last_state = 1
 
             return b"OK\n"
+        if self._last_cmd == "SIGNAL_POLL":
+
+            return b"RSSI=-52\nLINKSPEED=866\nNOISE=9999\nFREQUENCY=5180\nWIDTH=80 MHz\n"
+        if self._last_cmd == "PKTCNT_POLL":
+
+            return b"TXGOOD=1024\nTXBAD=3\nRXGOOD=4096\n"
+        if self._last_cmd.startswith("BSS "):
+            entries = [
+                f"id={bss_id}\nbssid={bssid}\nfreq=2437\nlevel=-63\nssid={ssid}\nie={ie}\n"
+                for bss_id, bssid, ssid, ie in self.default_bss
+                if self._last_cmd == f"BSS {bssid}"
+                or (
+                    self._last_cmd.startswith("BSS RANGE=")
+                    and bss_id >= int(self._last_cmd[len("BSS RANGE=") :].split("-")[0])
+                )
+            ]
+            if self._last_cmd.startswith("BSS RANGE="):
+                # One entry per reply, to check the paging.
+                return bytearray("".join(entry + "====\n" for entry in entries[:1]), "utf-8")
+            return bytearray("".join(entries), "utf-8")
         if self._last_cmd == "STATUS":
 
+            SockMock.status_requests += 1
             if self._last_state == 0:
                 status = "wpa_state=DISCONNECTED"
             elif self._last_state == 1:
-                status = "wpa_state=COMPLETED"
+                status = (
+                    "bssid=ac:9e:17:31:85:fc\nfreq=2437\nssid=Evan\nid=0\nmode=station\n"
+                    "pairwise_cipher=CCMP\nkey_mgmt=WPA2-PSK\nwpa_state=COMPLETED\n"
+                    "ip_address=192.168.1.20\n"
+                )
 
             return bytearray(status, "utf-8")
         if self._last_cmd == "REMOVE_NETWORK all":
@@ -144,7 +191,7 @@ class Mock:
         # Add default attributes that os.stat should return
         self._dict["st_mode"] = 0o140000  # Socket file mode
 
-    def __getattr__(self, field: str) -> Any:  # noqa: ANN401
+    def __getattr__(self, field: str) -> Any:
         return self._dict.get(field, None)
 
 
@@ -156,7 +203,7 @@ def pywifi_test_patch(test_func: Callable[..., None]) -> Callable[..., None]:
         original_S_ISSOCK = stat.S_ISSOCK
         original_socket = socket.socket
         original_remove = os.remove
-        
+
         # Create mocks that accept both args and kwargs
         os.stat = lambda *_args, **_kwargs: Mock()
         os.listdir = lambda *_args, **_kwargs: ["wlx000c433243ce"]
@@ -200,6 +247,24 @@ def test_scan() -> None:
     assert bsses
 
 
+@pywifi_test_patch
+def test_targeted_scan() -> None:
+    wifi = pywifi.PyWiFi()
+
+    iface = wifi.interfaces()[0]
+    iface.scan(freqs=[5180, 5200], ssids=["my ap"], only_new=True)
+    assert SockMock.last_scan_cmd == "SCAN freq=5180,5200 only_new=1 ssid 6d79206170"
+
+    iface.scan(freqs=[2412], passive=True)
+    assert SockMock.last_scan_cmd == "SCAN freq=2412 passive=1"
+
+    iface.scan()
+    assert SockMock.last_scan_cmd == "SCAN"
+
+    with pytest.raises(ValueError, match="passive"):
+        iface.scan(ssids=["my ap"], passive=True)
+
+
 def test_profile_comparison() -> None:
     profile1 = pywifi.Profile()
     profile1.ssid = "testap"
@@ -226,6 +291,18 @@ def test_profile_comparison() -> None:
 
     assert profile1 == profile3
 
+    open_profile = pywifi.Profile()
+    open_profile.ssid = "testap"
+    open_profile.akm = [AkmType.NONE]
+    unknown = pywifi.Profile()
+    unknown.ssid = "testap"
+    unknown.akm = []
+
+    # An empty akm list is unknown, it matches no network, not an open one.
+    assert open_profile.same_network(open_profile)
+    assert not unknown.same_network(open_profile)
+    assert not open_profile.same_network(unknown)
+
 
 @pywifi_test_patch
 def test_add_network_profile() -> None:
@@ -307,6 +384,58 @@ def test_status() -> None:
     assert iface.status() in [IfaceStatus.DISCONNECTED, IfaceStatus.INACTIVE]
 
 
+@pywifi_test_patch
+def test_link_info() -> None:
+    wifi = pywifi.PyWiFi()
+
+    iface = wifi.interfaces()[0]
+    profile = pywifi.Profile()
+    profile.id = 0
+    iface.connect(profile)
+
+    requests = SockMock.status_requests
+    info = iface.link_info()
+    assert iface.status() == IfaceStatus.CONNECTED
+    assert SockMock.status_requests == requests + 1
+
+    assert (info.ssid, info.bssid, info.freq, info.network_id) == (
+        "Evan",
+        "ac:9e:17:31:85:fc",
+        2437,
+        0,
+    )
+    assert (info.key_mgmt, info.pairwise_cipher) == ("WPA2-PSK", "CCMP")
+    assert info.ip_address == "192.168.1.20"
+    assert info.fields["mode"] == "station"
+
+    # Changing the interface drops the cached status.
+    iface.disconnect()
+    assert not iface.link_info().connected
+    assert SockMock.status_requests == requests + 2
+
+    # wpa_states unknown to pywifi are reported as disconnected.
+    info = wpactrl.parse_link_info("wpa_state=FUTURE_STATE\n")
+    assert (info.status, info.wpa_state) == (IfaceStatus.DISCONNECTED, "FUTURE_STATE")
+
+
+@pywifi_test_patch
+def test_bss_details() -> None:
+    wifi = pywifi.PyWiFi()
+
+    iface = wifi.interfaces()[0]
+    details = iface.bss_details("ac:9e:17:31:85:fc")
+    assert (details.id, details.ssid, details.freq, details.level) == (3, "Evan", 2437, -63)
+    assert details.ies.ssid == b"Evan"
+    assert details.ies.channel == 6
+    assert details.ies.rsn.akm_suites == ["PSK"]
+    assert iface.bss_details("00:00:00:00:00:00") is None
+
+    assert [details.bssid for details in iface.bss_details_all()] == [
+        "ac:9e:17:31:85:fc",
+        "0c:80:63:2b:0d:a8",
+    ]
+
+
 @pywifi_test_patch
 def test_connect() -> None:
     wifi = pywifi.PyWiFi()
@@ -336,6 +465,30 @@ def test_connect() -> None:
     assert iface.status() in [IfaceStatus.DISCONNECTED, IfaceStatus.INACTIVE]
 
 
+@pywifi_test_patch
+def test_reassociate() -> None:
+    wifi = pywifi.PyWiFi()
+
+    iface = wifi.interfaces()[0]
+    iface.disconnect()
+
+    profile = pywifi.Profile()
+    profile.ssid = "testap"
+    iface.remove_all_network_profiles()
+    network = iface.add_network_profile(profile)
+
+    iface.reassociate(network.id, "ac:9e:17:31:85:fc", 2437)
+    assert iface.status() == IfaceStatus.CONNECTED
+    assert iface.network_profiles()[-1].bssid is None
+
+    # The BSS hint is reset when the network is selected without it.
+    sock = iface._wifi_ctrl._connections[iface.name()]["sock"]
+    saved = next(n for n in sock._network_profiles if n["id"] == network.id)
+    assert saved["bssid_hint"] == "ac:9e:17:31:85:fc"
+    iface.reassociate(network.id)
+    assert saved["bssid_hint"] == "any"
+
+
 @pywifi_test_patch
 def test_connect_open() -> None:
     wifi = pywifi.PyWiFi()
@@ -371,3 +524,133 @@ def test_disconnect() -> None:
     iface.disconnect()
 
     assert iface.status() in [IfaceStatus.DISCONNECTED, IfaceStatus.INACTIVE]
+
+
+@pywifi_test_patch
+def test_signal_poll() -> None:
+    wifi = pywifi.PyWiFi()
+
+    iface = wifi.interfaces()[0]
+    signal = iface.signal_poll()
+    assert signal == {"RSSI": -52, "LINKSPEED": 866, "NOISE": 9999, "FREQUENCY": 5180}
+
+    counts = iface.packet_counts()
+    assert counts == {"TXGOOD": 1024, "TXBAD": 3, "RXGOOD": 4096}
+
+
+@pywifi_test_patch
+def test_apply_profiles() -> None:
+    wifi = pywifi.PyWiFi()
+
+    iface = wifi.interfaces()[0]
+    iface.remove_all_network_profiles()
+
+    def make_profile(ssid: str, akm: AkmType) -> pywifi.Profile:
+        profile = pywifi.Profile()
+        profile.ssid = ssid
+        profile.akm.append(akm)
+        profile.key = "12345678"
+        return profile
+
+    kept = iface.add_network_profile(make_profile("testap", AkmType.WPA2PSK))
+    iface.add_network_profile(make_profile("testap2", AkmType.WPA2PSK))
+    kept_open = iface.add_network_profile(make_profile("openap", AkmType.NONE))
+    # Same SSID but another key management is another network.
+    iface.add_network_profile(make_profile("testap3", AkmType.WPAPSK))
+
+    desired = [
+        make_profile("testap", AkmType.WPA2PSK),
+        make_profile("openap", AkmType.NONE),
+        make_profile("testap3", AkmType.WPA2PSK),
+    ]
+    applied = iface.apply_profiles(desired)
+
+    assert applied[0].id == kept.id
+    assert applied[1].id == kept_open.id
+    assert applied[2].id not in [kept.id, kept_open.id]
+
+    profiles = iface.network_profiles()
+    assert sorted(profile.ssid for profile in profiles) == ["openap", "testap", "testap3"]
+    assert sorted(profile.id for profile in profiles) == sorted(p.id for p in applied)
+
+    iface.connect(applied[0])
+    assert iface.status() == IfaceStatus.CONNECTED
+
+
+@pywifi_test_patch
+def test_add_network_profile_derive_psk() -> None:
+    wifi = pywifi.PyWiFi()
+
+    iface = wifi.interfaces()[0]
+    iface.remove_all_network_profiles()
+
+    profile = pywifi.Profile()
+    profile.ssid = "IEEE"
+    profile.akm.append(AkmType.WPA2PSK)
+    profile.key = "password"
+    profile = iface.add_network_profile(profile, derive_psk=True)
+
+    sock = iface._wifi_ctrl._connections[iface.name()]["sock"]
+    network = next(n for n in sock._network_profiles if n["id"] == profile.id)
+    assert network["psk"] == "f42c6fc52df0ebef9ebb4b90b38a5f902e83fe1b135a70e23aed762e9710a12e"
+
+    # An invalid passphrase is rejected before a network is added.
+    profile = pywifi.Profile()
+    profile.ssid = "IEEE"
+    profile.akm.append(AkmType.WPA2PSK)
+    profile.key = "short"
+    with pytest.raises(ValueError, match="8 to 63"):
+        iface.add_network_profile(profile, derive_psk=True)
+    assert len(sock._network_profiles) == 1
+
+    # A PSK of 64 hex digits is sent unquoted, as it is.
+    profile.key = "f42c6fc52df0ebef9ebb4b90b38a5f902e83fe1b135a70e23aed762e9710a12e"
+    profile = iface.add_network_profile(profile)
+    network = next(n for n in sock._network_profiles if n["id"] == profile.id)
+    assert network["psk"] == profile.key
+
+
+@pywifi_test_patch
+def test_update_network_key() -> None:
+    wifi = pywifi.PyWiFi()
+
+    iface = wifi.interfaces()[0]
+    iface.remove_all_network_profiles()
+
+    profile = pywifi.Profile()
+    profile.ssid = "testap"
+    profile.akm.append(AkmType.WPA2PSK)
+    profile.key = "12345678"
+    saved = iface.add_network_profile(profile)
+
+    profile.id = saved.id
+    profile.key = "87654321"
+    iface.update_network_key(profile)
+
+    sock = iface._wifi_ctrl._connections[iface.name()]["sock"]
+    network = next(n for n in sock._network_profiles if n["id"] == saved.id)
+    assert network["psk"] == '"87654321"'
+
+
+@pytest.mark.skipif(platform.system().lower() != "linux", reason="Linux control sockets")
+def test_client_sock_files_are_unique(tmp_path: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    from pywifi import _wifiutil_linux
+
+    monkeypatch.setattr(_wifiutil_linux, "CLIENT_SOCK_DIR", str(tmp_path))
+    wifi_ctrl = _wifiutil_linux.WifiUtil()
+
+    first = wifi_ctrl._client_sock_file("wlan0")
+    second = wifi_ctrl._client_sock_file("wlan0", "events")
+    assert first != second
+    assert first.endswith(f".{os.getpid()}")
+    assert second.startswith(f"{tmp_path}/pywifi_wlan0_events_")
+
+    dead = subprocess.Popen(["true"])
+    dead.wait()
+    for pid in (dead.pid, os.getpid()):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(f"{tmp_path}/pywifi_wlan0_0.{pid}")
+        sock.close()
+
+    wifi_ctrl._remove_stale_socks()
+    assert os.listdir(tmp_path) == [f"pywifi_wlan0_0.{os.getpid()}"]
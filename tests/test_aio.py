@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+"""Test cases for the pywifi asyncio API."""
+
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from pywifi import AkmType, IfaceStatus, _wifiutil_linux
+from pywifi.aio import AsyncPyWiFi
+from pywifi.events import EVENT_CONNECTED
+from pywifi.profile import Profile
+
+
+class FakeWpaSupplicant:
+    """A wpa_supplicant control interface answering on a real unix socket."""
+
+    def __init__(self, path: str) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(path)
+        self.networks: dict[int, dict[str, str]] = {}
+        self.state = "DISCONNECTED"
+        self.attached: list[str] = []
+        self.commands: list[str] = []
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        self.sock.shutdown(socket.SHUT_RDWR)
+        self.thread.join()
+        self.sock.close()
+
+    def push_event(self, text: str) -> None:
+        for addr in self.attached:
+            self.sock.sendto(text.encode(), addr)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(4096)
+            except OSError:
+                return
+            if addr is None:
+                return
+            cmd = data.decode()
+            self.commands.append(cmd)
+            self.sock.sendto(self._reply(cmd, addr).encode(), addr)
+
+    def _reply(self, cmd: str, addr: str) -> str:  # noqa: PLR0911
+        words = cmd.split(" ")
+        if cmd == "PING":
+            return "PONG\n"
+        if cmd == "ATTACH":
+            self.attached.append(addr)
+            return "OK\n"
+        if cmd == "DETACH":
+            self.attached.remove(addr)
+            return "OK\n"
+        if cmd == "STATUS":
+            return f"wpa_state={self.state}\nssid=home\n"
+        if cmd == "SCAN_RESULTS":
+            return (
+                "bssid / frequency / signal level / flags / ssid\n"
+                "ac:9e:17:31:85:fc\t5180\t-48\t[WPA2-PSK-CCMP][ESS]\thome\n"
+            )
+        if cmd == "ADD_NETWORK":
+            network_id = len(self.networks)
+            self.networks[network_id] = {}
+            return f"{network_id}\n"
+        if cmd == "LIST_NETWORKS":
+            lines = ["network id / ssid / bssid / flags"]
+            lines += [f"{i}\t{n['ssid'][1:-1]}\tany\t" for i, n in self.networks.items()]
+            return "\n".join(lines) + "\n"
+        if words[0] == "SET_NETWORK":
+            self.networks[int(words[1])][words[2]] = " ".join(words[3:])
+            return "OK\n"
+        if words[0] == "GET_NETWORK":
+            defaults = {"pairwise": "CCMP TKIP"}
+            return self.networks[int(words[1])].get(words[2], defaults.get(words[2], "FAIL"))
+        if words[0] == "SELECT_NETWORK":
+            self.state = "COMPLETED"
+        return "OK\n"
+
+
+@pytest.fixture
+def ctrl_dir(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    path = tempfile.mkdtemp(prefix="pywifi", dir="/tmp")
+    monkeypatch.setattr(_wifiutil_linux, "CTRL_IFACE_DIR", path)
+    yield path
+    for f in os.listdir(path):
+        os.remove(os.path.join(path, f))
+    os.rmdir(path)
+
+
+def test_async_interfaces_run_concurrently(ctrl_dir: str) -> None:
+    """Test one event loop drives several interfaces."""
+    fakes = [FakeWpaSupplicant(f"{ctrl_dir}/aio{i}") for i in range(3)]
+
+    async def main() -> tuple[list[str], list[int], list[list[Profile]]]:
+        async with AsyncPyWiFi() as wifi:
+            ifaces = await wifi.interfaces()
+            await asyncio.gather(*(iface.scan(freqs=[5180]) for iface in ifaces))
+            results = await asyncio.gather(*(iface.scan_results() for iface in ifaces))
+            status = await asyncio.gather(*(iface.status() for iface in ifaces))
+            return [iface.name() for iface in ifaces], status, results
+
+    names, status, results = asyncio.run(main())
+    for fake in fakes:
+        fake.close()
+
+    assert names == ["aio0", "aio1", "aio2"]
+    assert status == [IfaceStatus.DISCONNECTED] * 3
+    assert all(bsses[0].ssid == "home" and bsses[0].freq == 5180 for bsses in results)
+    assert all("SCAN freq=5180" in fake.commands for fake in fakes)
+
+
+def test_async_profiles_and_connect(ctrl_dir: str) -> None:
+    """Test adding, listing and connecting to a profile."""
+    fake = FakeWpaSupplicant(f"{ctrl_dir}/aio5")
+
+    async def main() -> tuple[list[Profile], int]:
+        async with AsyncPyWiFi() as wifi:
+            (iface,) = await wifi.interfaces(["aio5"])
+            profile = Profile()
+            profile.ssid = "home"
+            profile.akm.append(AkmType.WPA2PSK)
+            profile.key = "password"
+            await iface.add_network_profile(profile)
+            await iface.connect(profile)
+            return await iface.network_profiles(), await iface.status()
+
+    profiles, status = asyncio.run(main())
+    fake.close()
+
+    assert [(p.id, p.ssid, p.akm) for p in profiles] == [(0, "home", [AkmType.WPA2PSK])]
+    assert fake.networks[0]["psk"] == '"password"'
+    assert "SELECT_NETWORK 0" in fake.commands
+    assert status == IfaceStatus.CONNECTED
+
+
+def test_async_events(ctrl_dir: str) -> None:
+    """Test iterating over the events of an interface."""
+    fake = FakeWpaSupplicant(f"{ctrl_dir}/aio6")
+
+    async def main() -> list[str]:
+        async with AsyncPyWiFi() as wifi:
+            (iface,) = await wifi.interfaces()
+            events = iface.events()
+            received = asyncio.ensure_future(anext(events))
+            while not fake.attached:
+                await asyncio.sleep(0.01)
+            fake.push_event(f"<3>{EVENT_CONNECTED} - Connection to ac:9e:17:31:85:fc completed")
+            event = await asyncio.wait_for(received, 5)
+            await events.aclose()
+            return [event.name, event.bssid]
+
+    assert asyncio.run(main()) == [EVENT_CONNECTED, "ac:9e:17:31:85:fc"]
+    for _ in range(100):
+        if not fake.attached:
+            break
+        time.sleep(0.01)
+    assert fake.attached == []
+    fake.close()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""Test cases for the auto-join engine."""
+
+from pywifi import AkmType, IfaceStatus
+from pywifi.autojoin import AutoJoin, security_of
+from pywifi.link import LinkInfo
+from pywifi.profile import Profile
+
+
+def _profile(network_id: int, ssid: str, akm: int, priority: int = 0) -> Profile:
+    profile = Profile()
+    profile.id = network_id
+    profile.ssid = ssid
+    profile.akm = [akm]
+    profile.priority = priority
+    return profile
+
+
+def _bss(bssid: str, ssid: str, freq: int, signal: int, akm: list[int]) -> Profile:
+    bss = Profile()
+    bss.bssid = bssid
+    bss.ssid = ssid
+    bss.freq = freq
+    bss.signal = signal
+    bss.akm = akm
+    return bss
+
+
+class IfaceMock:
+    def __init__(self) -> None:
+        self.profiles = [
+            _profile(0, "home", AkmType.WPA2PSK),
+            _profile(1, "cafe", AkmType.NONE),
+            _profile(2, "corp", AkmType.WPA2, priority=1),
+        ]
+        self.bsses = [
+            _bss("aa:aa:aa:aa:aa:01", "home", 2412, -60, [AkmType.WPAPSK, AkmType.WPA2PSK]),
+            _bss("aa:aa:aa:aa:aa:02", "home", 5180, -62, [AkmType.WPA2PSK]),
+            _bss("bb:bb:bb:bb:bb:01", "cafe", 2437, -40, []),
+            # Same SSID, other security: not the saved network.
+            _bss("cc:cc:cc:cc:cc:01", "corp", 5180, -40, [AkmType.WPA2PSK]),
+            _bss("dd:dd:dd:dd:dd:01", "far", 2412, -90, []),
+        ]
+        self.connected_to: int | None = None
+        self.failing: set[int] = set()
+        self.connects: list[int] = []
+
+    def network_profiles(self) -> list[Profile]:
+        return self.profiles
+
+    def scan_results(self) -> list[Profile]:
+        return self.bsses
+
+    def connect(self, profile: Profile) -> None:
+        self.connects.append(profile.id)
+        self.connected_to = None if profile.id in self.failing else profile.id
+
+    def invalidate_status(self) -> None:
+        pass
+
+    def status(self) -> int:
+        return IfaceStatus.DISCONNECTED if self.connected_to is None else IfaceStatus.CONNECTED
+
+    def link_info(self) -> LinkInfo:
+        return LinkInfo(status=self.status(), network_id=self.connected_to)
+
+
+def test_security_of() -> None:
+    assert security_of([]) == {"open"}
+    assert security_of([AkmType.NONE]) == {"open"}
+    assert security_of([AkmType.WPAPSK, AkmType.WPA2]) == {"psk", "eap"}
+
+
+def test_candidates() -> None:
+    """Test the saved networks are matched on SSID and security and ranked."""
+    iface = IfaceMock()
+    autojoin = AutoJoin(iface)
+    candidates = autojoin.candidates()
+
+    assert [(c.profile.ssid, c.bss.bssid) for c in candidates] == [
+        ("cafe", "bb:bb:bb:bb:bb:01"),
+        ("home", "aa:aa:aa:aa:aa:02"),
+    ]
+    # The 5 GHz BSS of "home" wins on the band bonus despite the weaker signal.
+    assert candidates[1].score == -62 + 5 + 20 * 0.5
+
+    iface.profiles[0].priority = 10
+    autojoin.refresh_profiles()
+    assert autojoin.candidates()[0].profile.ssid == "home"
+
+
+def test_join_falls_back_and_learns() -> None:
+    """Test a failing network is skipped and scores lower afterwards."""
+    iface = IfaceMock()
+    iface.failing = {1}
+    autojoin = AutoJoin(iface, connect_timeout=0, poll_interval=0)
+
+    joined = autojoin.join()
+    assert joined.profile.ssid == "home"
+    assert iface.connects == [1, 0]
+    assert autojoin.success_rate(iface.profiles[1]) == 1 / 3
+    assert autojoin.success_rate(iface.profiles[0]) == 2 / 3
+
+    # Already on the best network: nothing to do.
+    iface.bsses = iface.bsses[:2]
+    assert autojoin.join().profile.ssid == "home"
+    assert iface.connects == [1, 0]
+
+    iface.bsses = []
+    assert autojoin.join() is None
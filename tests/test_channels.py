@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""Test cases for the pywifi channel congestion analysis."""
+
+import pytest
+
+from pywifi.channels import (
+    BAND_2GHZ,
+    BAND_5GHZ,
+    BAND_6GHZ,
+    ChannelAnalyzer,
+    band_of,
+    channel_to_freq,
+    freq_to_channel,
+)
+from pywifi.profile import Profile
+
+
+def _bss(freq: int, signal: int) -> Profile:
+    bss = Profile()
+    bss.freq = freq
+    bss.signal = signal
+    return bss
+
+
+def test_channel_lookup() -> None:
+    assert freq_to_channel(2412) == 1
+    assert freq_to_channel(2484) == 14
+    assert freq_to_channel(5180) == 36
+    assert freq_to_channel(5955) == 1
+    assert freq_to_channel(1234) is None
+    assert band_of(2437) == BAND_2GHZ
+    assert band_of(5745) == BAND_5GHZ
+    assert band_of(6115) == BAND_6GHZ
+    assert channel_to_freq(BAND_5GHZ, 149) == 5745
+
+
+def test_adjacent_channel_overlap() -> None:
+    analyzer = ChannelAnalyzer()
+    # Strong BSSes on channels 2 and 3 leak into channel 1 but not into 11.
+    analyzer.add_scan([_bss(2417, -40), _bss(2422, -45), _bss(2462, -80), _bss(9999, -50)])
+
+    usage = {u.channel: u for u in analyzer.usage(BAND_2GHZ)}
+    assert usage[1].bss_count == 0
+    assert usage[1].strongest is None
+    assert usage[1].overlap_count > 1
+    assert usage[11].overlap_count == 1
+    assert usage[11].strongest == -80
+    assert usage[6].overlap_dbm > usage[11].overlap_dbm
+    assert analyzer.skipped == 1
+    assert analyzer.recommend(BAND_2GHZ).channel == 11
+
+
+def test_window_of_scans() -> None:
+    analyzer = ChannelAnalyzer()
+    analyzer.add_scans([[_bss(5180, -60), _bss(5180, -70)], [_bss(5180, -60)], []])
+
+    usage = {u.channel: u for u in analyzer.usage(BAND_5GHZ)}
+    assert usage[36].bss_count == 1
+    assert usage[36].strongest == -60
+    assert usage[40].overlap_count == 0
+
+    best = analyzer.recommend_all()
+    assert best[BAND_5GHZ].channel == 40
+    assert best[BAND_6GHZ].channel == 5
+    assert analyzer.recommend(BAND_5GHZ, candidates=[36, 149]).channel == 149
+
+    with pytest.raises(ValueError, match="No candidate"):
+        analyzer.recommend(BAND_5GHZ, candidates=[1])
+
+    analyzer.reset()
+    assert analyzer.scans == 0
@@ -2,10 +2,15 @@
 
 """Test cases for pywifi CLI."""
 
+import json
 
+import pytest
 from typer.testing import CliRunner
 
+from pywifi import AkmType, IfaceStatus, batch, cli
 from pywifi.cli import app
+from pywifi.link import LinkInfo
+from pywifi.profile import Profile
 
 
 def test_cli_help() -> None:
@@ -70,3 +75,216 @@ def test_cli_list_interfaces_help() -> None:
     assert result.exit_code == 0
     assert "interface" in result.stdout.lower()
 
+
+
+class FakeInterface:
+    """Minimal interface double recording the calls made by batch steps."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._status = IfaceStatus.DISCONNECTED
+        self.calls: list[str] = []
+        self.saved: list[Profile] = []
+
+    def name(self) -> str:
+        return self._name
+
+    def scan(
+        self,
+        freqs: list[int] | None = None,
+        ssids: list[str] | None = None,
+        *,
+        passive: bool = False,
+    ) -> None:
+        self.calls.append("scan")
+        self.scanned = (freqs, ssids, passive)
+
+    def scan_results(self) -> list[Profile]:
+        bss = Profile()
+        bss.ssid = "testap"
+        bss.bssid = "00:11:22:33:44:55"
+        bss.freq = 2412
+        bss.signal = -40
+        bss.akm = [AkmType.WPA2PSK]
+        return [bss]
+
+    def disconnect(self) -> None:
+        self.calls.append("disconnect")
+        self._status = IfaceStatus.DISCONNECTED
+
+    def remove_all_network_profiles(self) -> None:
+        self.calls.append("remove_all_network_profiles")
+        self.saved.clear()
+
+    def network_profiles(self, ssid: str | None = None) -> list[Profile]:
+        self.calls.append(f"network_profiles {ssid}")
+        return [p for p in self.saved if ssid is None or p.ssid == ssid]
+
+    def add_network_profile(self, profile: Profile) -> Profile:
+        self.calls.append(f"add_network_profile {profile.ssid}")
+        self.saved.append(profile)
+        return profile
+
+    def update_network_key(self, profile: Profile) -> None:
+        self.calls.append(f"update_network_key {profile.ssid} {profile.key}")
+
+    def connect(self, profile: Profile) -> None:
+        self.calls.append(f"connect {profile.ssid}")
+        self._status = IfaceStatus.CONNECTED
+
+    def status(self) -> IfaceStatus:
+        return self._status
+
+
+def test_parse_step() -> None:
+    """Test both batch line formats."""
+    assert batch.parse_step("  # comment") is None
+    assert batch.parse_step("connect 'My AP' password=secret interface=1") == {
+        "op": "connect",
+        "ssid": "My AP",
+        "password": "secret",
+        "interface": 1,
+    }
+    assert batch.parse_step('{"op": "status", "interface": 0}') == {
+        "op": "status",
+        "interface": 0,
+    }
+    assert batch.parse_step("sleep 0.5") == {"op": "sleep", "seconds": 0.5}
+    assert batch.parse_step("scan freqs=2412,2437 ssids=home,cafe passive=false") == {
+        "op": "scan",
+        "freqs": [2412, 2437],
+        "ssids": ["home", "cafe"],
+        "passive": False,
+    }
+
+
+def test_run_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that batch steps share interfaces and report per-step results."""
+    monkeypatch.setattr(batch.time, "sleep", lambda _seconds: None)
+    ifaces = [FakeInterface("wlan0"), FakeInterface("wlan1")]
+    lines = [
+        "connect testap password=12345678",
+        '{"op": "status", "interface": 1}',
+        "scan wait=0",
+        "disconnect interface=5",
+        "bogus",
+    ]
+
+    results = list(batch.run_batch(lines, ifaces))
+
+    assert [result["ok"] for result in results] == [True, True, True, False, False]
+    assert results[0]["interface"] == "wlan0"
+    assert results[1]["result"] == {"status": "DISCONNECTED"}
+    assert results[2]["result"]["networks"][0]["akm"] == ["WPA2-PSK"]
+    assert "not found" in results[3]["error"]
+    assert "Unknown operation" in results[4]["error"]
+    assert all(result["elapsed"] >= 0 for result in results)
+    assert ifaces[0].calls[-1] == "scan"
+    assert ifaces[0].scanned == (None, None, False)
+
+    assert next(batch.run_batch(["scan wait=0 freqs=2412,5180 passive=yes"], ifaces))["ok"]
+    assert ifaces[0].scanned == ([2412, 5180], None, True)
+    assert "connect testap" in ifaces[0].calls
+
+    # A known network is reused instead of being added again, and its key is
+    # only sent again on request.
+    ifaces[0].calls.clear()
+    assert next(batch.run_batch(["connect testap password=other"], ifaces))["ok"]
+    assert ifaces[0].calls == ["network_profiles testap", "connect testap"]
+    ifaces[0].calls.clear()
+    assert next(batch.run_batch(["connect testap password=other update_key=1"], ifaces))["ok"]
+    assert ifaces[0].calls[1:] == ["update_network_key testap other", "connect testap"]
+    ifaces[0].calls.clear()
+    assert next(batch.run_batch(["connect testap password=other fresh=1"], ifaces))["ok"]
+    assert ifaces[0].calls == [
+        "remove_all_network_profiles",
+        "add_network_profile testap",
+        "connect testap",
+    ]
+
+    results = list(batch.run_batch(["bogus", "status"], ifaces, stop_on_error=True))
+    assert len(results) == 1
+
+
+def test_run_batch_errors() -> None:
+    """Test wrongly typed fields and socket errors fail their step only."""
+
+    class BrokenInterface(FakeInterface):
+        def status(self) -> IfaceStatus:
+            raise ConnectionRefusedError("wpa_supplicant is gone")
+
+    ifaces = [FakeInterface("wlan0"), BrokenInterface("wlan1")]
+    lines = [
+        '{"op": "status", "interface": "0"}',
+        '{"op": "status", "interface": [0]}',
+        '{"op": "connect", "ssid": 5}',
+        '{"op": "status", "interface": 1}',
+        "status",
+    ]
+
+    results = list(batch.run_batch(lines, ifaces))
+
+    assert [result["ok"] for result in results] == [True, False, False, False, True]
+    assert results[1]["error"] == "Invalid value for 'interface': [0]"
+    assert results[2]["error"] == "Invalid value for 'ssid': 5"
+    assert results[3]["error"] == "wpa_supplicant is gone"
+
+
+def test_cli_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the batch command reading steps from stdin."""
+    ifaces = [FakeInterface("wlan0")]
+
+    class FakePyWiFi:
+        def interfaces(self) -> list[FakeInterface]:
+            return ifaces
+
+    monkeypatch.setattr(cli, "PyWiFi", FakePyWiFi)
+    runner = CliRunner()
+    result = runner.invoke(app, ["batch", "-"], input="status\nstatus\n")
+
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [line.get("op") for line in lines[:2]] == ["status", "status"]
+    assert lines[-1]["summary"]["steps"] == 2
+    assert lines[-1]["summary"]["failed"] == 0
+
+    # A missing file fails before the interfaces are looked for.
+    monkeypatch.setattr(cli, "PyWiFi", None)
+    result = runner.invoke(app, ["batch", "missing.txt"])
+    assert result.exit_code == 1
+    assert "Error: Cannot read missing.txt" in result.stderr
+
+
+def test_cli_connect_trace_when_connected(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test tracing a connect to the network the interface is already on."""
+
+    class NoEvents:
+        def is_running(self) -> bool:
+            return False
+
+        def start(self) -> None:
+            raise NotImplementedError("Event monitoring is not supported")
+
+    class TracedInterface(FakeInterface):
+        def event_monitor(self) -> NoEvents:
+            return NoEvents()
+
+        def invalidate_status(self) -> None:
+            pass
+
+        def link_info(self) -> LinkInfo:
+            connected = self._status == IfaceStatus.CONNECTED
+            return LinkInfo(status=self._status, wpa_state="COMPLETED" if connected else "")
+
+    iface = TracedInterface("wlan0")
+    iface.add_network_profile(Profile())
+    iface.saved[0].ssid = "testap"
+    iface.connect(iface.saved[0])
+    iface.calls.clear()
+    monkeypatch.setattr(cli, "_get_interface", lambda _index: iface)
+
+    result = CliRunner().invoke(app, ["connect", "testap", "--trace", "--timeout", "1"])
+
+    assert result.exit_code == 0
+    assert "Successfully connected to 'testap'" in result.stdout
+    assert iface.calls == ["disconnect", "network_profiles testap", "connect testap"]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+"""Test cases for the pywifid daemon and the forwarding of the CLI."""
+
+import os
+import socket
+import tempfile
+import time
+from collections.abc import Iterator
+
+import pytest
+from typer.testing import CliRunner
+
+from pywifi import IfaceStatus, rpc
+from pywifi.cli import app
+from pywifi.daemon import Daemon
+from pywifi.events import EVENT_CONNECTED
+from pywifi.iface import Interface
+from pywifi.link import LinkInfo
+from pywifi.profile import Profile
+
+
+class FakeWifiUtil:
+    """Backend double whose events are written to a socket pair."""
+
+    def __init__(self) -> None:
+        self.state = IfaceStatus.DISCONNECTED
+        self.status_calls = 0
+        self.events, self._attached = socket.socketpair()
+
+    def link_info(self, obj: dict[str, str]) -> LinkInfo:
+        self.status_calls += 1
+        return LinkInfo(status=self.state)
+
+    def scan(
+        self,
+        obj: dict[str, str],
+        freqs: list[int] | None,
+        *_args: object,
+        **_kw: object,
+    ) -> None:
+        self.scanned = freqs
+
+    def scan_results(self, obj: dict[str, str]) -> list[Profile]:
+        bss = Profile()
+        bss.ssid = "testap"
+        bss.bssid = "00:11:22:33:44:55"
+        bss.freq = 2412
+        bss.signal = -40
+        return [bss]
+
+    def attach(self, obj: dict[str, str]) -> socket.socket:
+        return self._attached
+
+    def detach(self, obj: dict[str, str], sock: socket.socket) -> None:
+        sock.close()
+        self.events.close()
+
+
+@pytest.fixture
+def served(monkeypatch: pytest.MonkeyPatch) -> Iterator[tuple[Daemon, FakeWifiUtil]]:
+    path = os.path.join(tempfile.mkdtemp(prefix="pywifid", dir="/tmp"), "pywifid.sock")
+    monkeypatch.setattr(rpc, "SOCKET_PATH", path)
+    wifi_ctrl = FakeWifiUtil()
+    daemon = Daemon(path, interfaces=[Interface({"name": "wlan0"}, wifi_ctrl)], status_ttl=60)
+    daemon.start()
+    yield daemon, wifi_ctrl
+    daemon.close()
+    os.rmdir(os.path.dirname(path))
+
+
+def test_daemon_caches_status_until_event(served: tuple[Daemon, FakeWifiUtil]) -> None:
+    """Test the status is served from the cache until an event arrives."""
+    daemon, wifi_ctrl = served
+    with rpc.DaemonClient() as client:
+        assert client.request({"op": "status"})["result"] == {"status": "DISCONNECTED"}
+        assert client.request({"op": "status"})["ok"]
+        assert wifi_ctrl.status_calls == 1
+
+        wifi_ctrl.state = IfaceStatus.CONNECTED
+        wifi_ctrl.events.send(f"<3>{EVENT_CONNECTED} - Connection completed".encode())
+        for _ in range(100):
+            if client.request({"op": "status"})["result"]["status"] == "CONNECTED":
+                break
+            time.sleep(0.01)
+        assert wifi_ctrl.status_calls == 2
+
+        assert client.request({"op": "bogus"})["error"] == "Unknown operation 'bogus'"
+        assert client.request({"op": "status", "interface": 3})["ok"] is False
+        assert client.request({"op": "interfaces"})["result"] == {
+            "interfaces": [{"name": "wlan0", "status": "CONNECTED"}],
+        }
+
+    with pytest.raises(RuntimeError, match="already running"):
+        Daemon(daemon.path, interfaces=[]).bind()
+
+
+def test_daemon_reports_errors(served: tuple[Daemon, FakeWifiUtil]) -> None:
+    """Test an error of a step is sent back and the connection stays open."""
+    with rpc.DaemonClient() as client:
+        # The backend double cannot disconnect.
+        result = client.request({"op": "disconnect"})
+        assert result["ok"] is False
+        assert result["error"].startswith("AttributeError")
+        assert client.request({"op": "status"})["ok"]
+
+
+def test_cli_forwards_to_daemon(served: tuple[Daemon, FakeWifiUtil]) -> None:
+    """Test the CLI commands are run by the daemon while it runs."""
+    daemon, wifi_ctrl = served
+    runner = CliRunner()
+
+    result = runner.invoke(app, ["status"])
+    assert result.exit_code == 0
+    assert result.stdout == "Interface: wlan0\nStatus: DISCONNECTED\n"
+
+    result = runner.invoke(app, ["scan", "--wait", "0", "--freq", "2412"])
+    assert result.exit_code == 0
+    assert "testap" in result.stdout
+    assert wifi_ctrl.scanned == [2412]
+
+    result = runner.invoke(app, ["status", "--interface", "1"])
+    assert result.exit_code == 1
+    assert "Interface index 1 not found" in result.stderr
+
+    daemon.close()
+    assert not os.path.exists(daemon.path)
+    assert rpc.connect_daemon() is None
+
+
+def test_client_refuses_other_users(
+    served: tuple[Daemon, FakeWifiUtil],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the client only talks to a daemon of the same user."""
+    daemon, _ = served
+    with rpc.DaemonClient() as client:
+        assert rpc.peer_uid(client._sock) == os.getuid()  # noqa: SLF001
+
+    monkeypatch.setattr(rpc, "peer_uid", lambda _sock: os.getuid() + 1)
+    with pytest.raises(PermissionError, match="another user"):
+        rpc.DaemonClient(daemon.path)
+    assert rpc.connect_daemon() is None
+
+
+def test_runtime_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: str) -> None:
+    """Test the socket directory is private to the user."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert rpc.runtime_dir() == str(tmp_path)
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert rpc.runtime_dir().endswith(f"pywifi-{os.getuid()}")
+
+    private = tmp_path / "private"
+    rpc.ensure_runtime_dir(str(private))
+    assert os.stat(private).st_mode & 0o777 == 0o700
+
+    os.chmod(private, 0o755)
+    with pytest.raises(PermissionError, match="not a private directory"):
+        rpc.ensure_runtime_dir(str(private))
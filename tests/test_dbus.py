@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+"""Test cases for the D-Bus backend against a mock wpa_supplicant on a private bus."""
+
+import queue
+import shutil
+import subprocess
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+pytest.importorskip("jeepney")
+
+from jeepney import (
+    DBusAddress,
+    HeaderFields,
+    MessageType,
+    message_bus,
+    new_error,
+    new_method_return,
+    new_signal,
+)
+from jeepney.io.blocking import open_dbus_connection
+
+from pywifi import AkmType, IfaceStatus, PyWiFi
+from pywifi import _wifiutil_dbus as wifiutil
+from pywifi.profile import Profile
+
+IFACE_PATH = "/fi/w1/wpa_supplicant1/Interfaces/0"
+
+
+class MockWpaSupplicant:
+    """A fi.w1.wpa_supplicant1 service with one interface and two BSSes."""
+
+    def __init__(self, address: str) -> None:
+        self.conn = open_dbus_connection(address)
+        self.conn.send_and_get_reply(message_bus.RequestName(wifiutil.WPAS_SERVICE))
+        self.calls: list[tuple[str, str, tuple]] = []
+        bss0 = f"{IFACE_PATH}/BSSs/0"
+        bss1 = f"{IFACE_PATH}/BSSs/1"
+        self.objects = {
+            wifiutil.WPAS_PATH: {"Interfaces": ("ao", [IFACE_PATH])},
+            IFACE_PATH: {
+                "Ifname": ("s", "wlan0"),
+                "State": ("s", "disconnected"),
+                "BSSs": ("ao", [bss0, bss1]),
+                "Networks": ("ao", []),
+                "CurrentBSS": ("o", "/"),
+                "CurrentNetwork": ("o", "/"),
+            },
+            bss0: self._bss(b"home", b"\xac\x9e\x17\x31\x85\xfc", 5180, -48, rsn=["wpa-psk"]),
+            bss1: self._bss(b"corp", b"\x0c\x80\x63\x2b\x0d\xa8", 2412, -70, wpa=["wpa-eap"]),
+        }
+        self.next_network = 0
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def _bss(ssid: bytes, bssid: bytes, freq: int, signal: int, **ies: list[str]) -> dict:
+        return {
+            "SSID": ("ay", ssid),
+            "BSSID": ("ay", bssid),
+            "Frequency": ("q", freq),
+            "Signal": ("n", signal),
+            "WPA": ("a{sv}", {"KeyMgmt": ("as", ies.get("wpa", []))}),
+            "RSN": ("a{sv}", {"KeyMgmt": ("as", ies.get("rsn", []))}),
+        }
+
+    def close(self) -> None:
+        self._stop.set()
+        self.thread.join()
+        self.conn.close()
+
+    def set_props(self, path: str, **props: tuple[str, object]) -> None:
+        """Change properties of an interface and signal the change."""
+        self.objects[path].update(props)
+        addr = DBusAddress(path, interface=wifiutil.PROPERTIES_INTERFACE)
+        body = (wifiutil.IFACE_INTERFACE, props, [])
+        self.conn.send(new_signal(addr, "PropertiesChanged", "sa{sv}as", body))
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                msg = self.conn.receive(timeout=0.1)
+            except TimeoutError:
+                continue
+            if msg.header.message_type != MessageType.method_call:
+                continue
+            path = msg.header.fields[HeaderFields.path]
+            member = msg.header.fields[HeaderFields.member]
+            self.calls.append((path, member, msg.body))
+            try:
+                signature, body = self._reply(path, member, msg.body)
+            except KeyError as err:
+                error = "fi.w1.wpa_supplicant1.UnknownError"
+                self.conn.send(new_error(msg, error, "s", (str(err),)))
+            else:
+                self.conn.send(new_method_return(msg, signature, body))
+
+    def _reply(self, path: str, member: str, args: tuple) -> tuple[str, tuple]:  # noqa: PLR0911
+        if member == "Get":
+            return "v", (self.objects[path][args[1]],)
+        if member == "GetAll":
+            return "a{sv}", (self.objects[path],)
+        if member == "Set":
+            self.objects[path][args[1]] = args[2]
+            return "", ()
+        if member == "AddNetwork":
+            network = f"{IFACE_PATH}/Networks/{self.next_network}"
+            self.next_network += 1
+            props = {
+                name: ("s", f'"{value}"' if name == "ssid" else value)
+                for name, (_, value) in args[0].items()
+                if name != "psk"
+            }
+            props.setdefault("pairwise", ("s", "CCMP TKIP"))
+            self.objects[network] = {"Properties": ("a{sv}", props), "psk": args[0].get("psk")}
+            self.objects[IFACE_PATH]["Networks"][1].append(network)
+            return "o", (network,)
+        if member == "RemoveNetwork":
+            self.objects[IFACE_PATH]["Networks"][1].remove(args[0])
+            return "", ()
+        if member == "SelectNetwork":
+            self.set_props(IFACE_PATH, State=("s", "completed"), CurrentNetwork=("o", args[0]))
+            return "", ()
+        if member == "SignalPoll":
+            signal = {"rssi": ("i", -48), "linkspeed": ("i", 866), "width": ("s", "80 MHz")}
+            return "a{sv}", (signal,)
+        return "", ()
+
+
+@pytest.fixture
+def session_bus() -> Iterator[str]:
+    if shutil.which("dbus-daemon") is None:
+        pytest.skip("dbus-daemon is not installed")
+    daemon = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address=1"],  # noqa: S607
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    yield daemon.stdout.readline().strip()
+    daemon.terminate()
+    daemon.wait()
+    daemon.stdout.close()
+
+
+@pytest.fixture
+def mock_wpas(session_bus: str, monkeypatch: pytest.MonkeyPatch) -> Iterator[MockWpaSupplicant]:
+    connections = {}
+    monkeypatch.setattr(wifiutil.WifiUtil, "_connections", connections)
+    monkeypatch.setattr(wifiutil.WifiUtil, "_watchers", {})
+    mock = MockWpaSupplicant(session_bus)
+    yield mock
+    for conn in connections.values():
+        conn["conn"].close()
+    mock.close()
+
+
+def test_dbus_scan_results(mock_wpas: MockWpaSupplicant, session_bus: str) -> None:
+    """Test the interfaces and the BSSes read with GetAll."""
+    (iface,) = PyWiFi(backend="dbus", bus=session_bus).interfaces()
+    iface.scan(freqs=[5180], ssids=["hidden"])
+    bsses = iface.scan_results()
+
+    assert iface.name() == "wlan0"
+    assert [(b.ssid, b.bssid, b.freq, b.signal, b.akm) for b in bsses] == [
+        ("home", "ac:9e:17:31:85:fc", 5180, -48, [AkmType.WPA2PSK]),
+        ("corp", "0c:80:63:2b:0d:a8", 2412, -70, [AkmType.WPA]),
+    ]
+    (scan,) = [body for _, member, body in mock_wpas.calls if member == "Scan"]
+    assert scan == (
+        {
+            "Type": ("s", "active"),
+            "SSIDs": ("aay", [b"hidden"]),
+            "Channels": ("a(uu)", [(5180, 20)]),
+        },
+    )
+    assert [member for _, member, _ in mock_wpas.calls].count("GetAll") == 2
+
+    # Only the matching BSS is fetched with GetAll.
+    calls = len(mock_wpas.calls)
+    details = iface.bss_details("0C:80:63:2B:0D:A8")
+    assert (details.ssid, details.freq) == ("corp", 2412)
+    assert [member for _, member, _ in mock_wpas.calls[calls:]].count("GetAll") == 1
+    assert iface.bss_details("00:00:00:00:00:00") is None
+
+
+def test_dbus_profiles_and_signals(mock_wpas: MockWpaSupplicant, session_bus: str) -> None:
+    """Test adding and connecting to a profile while following the state signals."""
+    (iface,) = PyWiFi(backend="dbus", bus=session_bus).interfaces(["wlan0"])
+    changes = []
+    states = queue.Queue()
+
+    def on_change(props: dict[str, object]) -> None:
+        changes.append(props)
+        states.put(props.get("State"))
+
+    iface.subscribe_properties(on_change)
+    assert iface.status() == IfaceStatus.DISCONNECTED
+
+    profile = Profile()
+    profile.ssid = "home"
+    profile.akm.append(AkmType.WPA2PSK)
+    profile.key = "password"
+    iface.add_network_profile(profile)
+    iface.connect(profile)
+    assert states.get(timeout=5) == "completed"
+
+    calls = len(mock_wpas.calls)
+    assert iface.status() == IfaceStatus.CONNECTED
+    # The state comes from the signals, not from a request.
+    assert len(mock_wpas.calls) == calls
+    assert changes[-1]["CurrentNetwork"] == f"{IFACE_PATH}/Networks/0"
+
+    assert [(p.id, p.ssid, p.akm) for p in iface.network_profiles()] == [
+        (0, "home", [AkmType.WPA2PSK]),
+    ]
+    assert mock_wpas.objects[f"{IFACE_PATH}/Networks/0"]["psk"] == ("s", "password")
+    assert iface.status_fields() == {"wpa_state": "COMPLETED", "id": "0"}
+    assert iface.signal_poll() == {"RSSI": -48, "LINKSPEED": 866}
+
+    # A state signal drops the status cached by the interface.
+    mock_wpas.set_props(IFACE_PATH, State=("s", "disconnected"))
+    assert states.get(timeout=5) == "disconnected"
+    calls = len(mock_wpas.calls)
+    assert iface.status() == IfaceStatus.DISCONNECTED
+    assert len(mock_wpas.calls) == calls
+
+    iface.unsubscribe_properties(on_change)
+    assert wifiutil.WifiUtil._watchers == {}  # noqa: SLF001
+
+    iface.remove_network_profile(profile)
+    assert iface.network_profiles() == []
+
+
+def test_dbus_backend_selection() -> None:
+    """Test an unknown backend is rejected."""
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        PyWiFi(backend="nl80211")
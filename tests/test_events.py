@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+"""Test cases for the pywifi event monitor."""
+
+import threading
+from typing import Any
+
+from pywifi.events import EVENT_CONNECTED, Event, EventMonitor, parse_event
+
+
+class EventSockMock:
+    """Socket double delivering a fixed list of events, then timing out."""
+
+    def __init__(self, events: list[bytes]) -> None:
+        self._events = list(events)
+        self.timeout = None
+
+    def settimeout(self, timeout: float) -> None:
+        self.timeout = timeout
+
+    def recv(self, *_args: Any) -> bytes:
+        if self._events:
+            return self._events.pop(0)
+        raise TimeoutError
+
+
+class IfaceMock:
+    def __init__(self, sock: EventSockMock) -> None:
+        self.sock = sock
+        self.detached = False
+
+    def name(self) -> str:
+        return "wlan0"
+
+    def attach(self) -> EventSockMock:
+        return self.sock
+
+    def detach(self, sock: EventSockMock) -> None:
+        assert sock is self.sock
+        self.detached = True
+
+
+def test_parse_event() -> None:
+    event = parse_event(
+        "<3>CTRL-EVENT-CONNECTED - Connection to 00:11:22:AA:BB:CC completed [id=1 id_str=]"
+    )
+
+    assert event.name == EVENT_CONNECTED
+    assert event.level == 3
+    assert event.bssid == "00:11:22:aa:bb:cc"
+    assert event.params == {"id": "1", "id_str": ""}
+
+    event = parse_event("<2>CTRL-EVENT-STATE-CHANGE id=0 state=9 BSSID=00:11:22:33:44:55")
+    assert event.params["state"] == "9"
+    assert parse_event("garbage").name == "garbage"
+
+
+def test_event_monitor() -> None:
+    sock = EventSockMock([b"<3>CTRL-EVENT-SCAN-RESULTS ", b"<3>CTRL-EVENT-CONNECTED - x"])
+    iface = IfaceMock(sock)
+    monitor = EventMonitor(iface)
+    received: list[Event] = []
+    done = threading.Event()
+
+    def on_event(event: Event) -> None:
+        received.append(event)
+        if len(received) == 2:
+            done.set()
+
+    def broken(_event: Event) -> None:
+        raise RuntimeError
+
+    monitor.subscribe(broken)
+    monitor.subscribe(on_event)
+    monitor.start()
+    assert done.wait(5)
+    monitor.stop()
+
+    assert [event.name for event in received] == [
+        "CTRL-EVENT-SCAN-RESULTS",
+        "CTRL-EVENT-CONNECTED",
+    ]
+    assert iface.detached
+    assert not monitor.is_running()
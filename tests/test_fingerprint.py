@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""Test cases for the fingerprint positioning database."""
+
+import time
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pywifi import fingerprint  # noqa: E402
+from pywifi.fingerprint import FingerprintDB  # noqa: E402
+from pywifi.profile import Profile  # noqa: E402
+
+
+def _scan(signals: dict[str, int]) -> list[Profile]:
+    bsses = []
+    for bssid, signal in signals.items():
+        bss = Profile()
+        bss.bssid = bssid
+        bss.signal = signal
+        bsses.append(bss)
+    return bsses
+
+
+REFERENCES = [
+    ({"aa:00": -40, "bb:00": -70}, (0.0, 0.0)),
+    ({"aa:00": -70, "bb:00": -40}, (10.0, 0.0)),
+    ({"aa:00": -60, "bb:00": -60, "cc:00": -50}, (5.0, 5.0)),
+]
+
+
+def test_locate_nearest() -> None:
+    """Test a scan is matched to the nearest reference points."""
+    db = FingerprintDB()
+    assert db.locate(_scan({"aa:00": -40})) is None
+    for signals, position in REFERENCES:
+        db.add(_scan(signals), position)
+
+    location = db.locate(_scan({"AA:00": -42, "bb:00": -69, "dd:00": -80}), k=1)
+    assert location.indices == [0]
+    assert location.position == (0.0, 0.0)
+
+    # The distances match a brute force over the dense vectors.
+    query = {"aa:00": -65, "cc:00": -55, "ee:00": -90}
+    expected = [
+        sum(
+            (query.get(bssid, -100) - signals.get(bssid, -100)) ** 2 for bssid in {*query, *signals}
+        )
+        for signals, _ in REFERENCES
+    ]
+    assert db.distances2(_scan(query)).tolist() == pytest.approx(expected)
+
+    location = db.locate(_scan(query), k=3)
+    assert location.indices[0] == 2
+    assert location.distances == sorted(location.distances)
+    with pytest.raises(ValueError, match="k must be positive"):
+        db.locate(_scan(query), k=0)
+    with pytest.raises(ValueError, match="coordinates"):
+        db.add(_scan(query), (1.0,))
+
+
+def test_grow_and_persist(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a database grows past its capacity and is reopened from its files."""
+    monkeypatch.setattr(fingerprint, "INITIAL_POINTS", 2)
+    monkeypatch.setattr(fingerprint, "INITIAL_BSSIDS", 2)
+    path = str(tmp_path / "fingerprints")
+    with FingerprintDB(path) as db:
+        for signals, position in REFERENCES:
+            db.add(_scan(signals), position)
+        # The grown arrays are mapped from their renamed files.
+        assert Path(db._rssi.filename).name == "rssi.npy"  # noqa: SLF001
+        assert not list(Path(path).glob("*.tmp"))
+
+    db = FingerprintDB(path)
+    assert (len(db), db.bssids) == (3, ["aa:00", "bb:00", "cc:00"])
+    assert isinstance(db._rssi, np.memmap)  # noqa: SLF001
+    assert db.position(2) == (5.0, 5.0)
+    assert db.locate(_scan({"aa:00": -70, "bb:00": -40}), k=1).indices == [1]
+
+    db.add(_scan({"ff:00": -30}), (20.0, 20.0))
+    db.flush()
+    assert FingerprintDB(path).locate(_scan({"ff:00": -31}), k=1).position == (20.0, 20.0)
+
+
+def test_lookup_speed() -> None:
+    """Test a lookup among 100k reference points takes milliseconds."""
+    bssids = [f"00:00:00:00:{i // 256:02x}:{i % 256:02x}" for i in range(400)]
+    db = FingerprintDB()
+    for i in range(100_000):
+        db.add(_scan({bssids[(i * 7 + j * 31) % 400]: -40 - j for j in range(12)}), (i, 0.0))
+
+    scan = _scan({bssids[j]: -60 for j in range(0, 400, 20)})
+    db.locate(scan)
+    start = time.perf_counter()
+    for _ in range(10):
+        db.locate(scan)
+    assert (time.perf_counter() - start) / 10 < 0.05
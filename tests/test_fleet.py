@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""Test cases for the pywifi fleet controller."""
+
+import os
+
+import pytest
+
+from pywifi import AkmType, IfaceStatus
+from pywifi.fleet import FleetController, assign_round_robin
+from pywifi.profile import Profile
+
+
+class FakeInterface:
+    """Interface stand-in living in a worker process."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self.saved: list[Profile] = []
+        self.connected = None
+
+    def name(self) -> str:
+        return self._name
+
+    def scan(self) -> None:
+        if self._name == "crash0":
+            os._exit(1)
+
+    def scan_results(self) -> list[Profile]:
+        bss = Profile()
+        bss.ssid = f"seen-by-{self._name}"
+        bss.pid = os.getpid()
+        return [bss]
+
+    def status(self) -> int:
+        return IfaceStatus.CONNECTED if self.connected else IfaceStatus.DISCONNECTED
+
+    def network_profiles(self, ssid: str | None = None) -> list[Profile]:
+        return [p for p in self.saved if ssid is None or p.ssid == ssid]
+
+    def add_network_profile(self, params: Profile) -> Profile:
+        params.id = len(self.saved)
+        self.saved.append(params)
+        return params
+
+    def connect(self, params: Profile) -> None:
+        self.connected = params.ssid
+
+    def disconnect(self) -> None:
+        raise RuntimeError("busy")
+
+
+def fake_interfaces(names: list[str]) -> dict[str, FakeInterface]:
+    """Open fake interfaces in a worker."""
+    return {name: FakeInterface(name) for name in names}
+
+
+def _profile(ssid: str) -> Profile:
+    profile = Profile()
+    profile.ssid = ssid
+    profile.akm.append(AkmType.WPA2PSK)
+    profile.key = "password"
+    return profile
+
+
+def test_fleet_shards_interfaces() -> None:
+    """Test the interfaces are spread over the workers."""
+    names = [f"wlan{i}" for i in range(5)]
+    with FleetController(names, workers=2, interface_factory=fake_interfaces) as fleet:
+        results = fleet.scan_results_all()
+
+    assert set(results) == set(names)
+    assert all(result.ok for result in results.values())
+    assert results["wlan3"].value[0].ssid == "seen-by-wlan3"
+    assert len({result.value[0].pid for result in results.values()}) == 2
+    assert os.getpid() not in {result.value[0].pid for result in results.values()}
+
+
+def test_fleet_errors_are_per_interface() -> None:
+    """Test a failing operation is reported for its interface only."""
+    with FleetController(["wlan0", "wlan1"], interface_factory=fake_interfaces) as fleet:
+        results = fleet.call("disconnect")
+        unknown = fleet.status_all(["wlan0", "wlan9"])
+
+        with pytest.raises(ValueError, match="Unsupported"):
+            fleet.call("remove_network_profile")
+
+    assert not results["wlan0"].ok
+    assert "RuntimeError: busy" in results["wlan0"].error
+    assert unknown["wlan0"].ok
+    assert unknown["wlan0"].value == IfaceStatus.DISCONNECTED
+    assert unknown["wlan9"].error == "Unknown interface"
+
+
+def test_fleet_connect_many_reuses_saved() -> None:
+    """Test connecting reuses the saved network of a worker."""
+    names = ["wlan0", "wlan1", "wlan2"]
+    assignments = assign_round_robin(names, [_profile("a"), _profile("b")])
+    assert [p.ssid for p in assignments.values()] == ["a", "b", "a"]
+
+    with FleetController(names, workers=3, interface_factory=fake_interfaces) as fleet:
+        assert all(result.ok for result in fleet.connect_many(assignments).values())
+        rejoined = fleet.connect_many(assignments)
+        saved = fleet.call("network_profiles")
+        status = fleet.status_all()
+
+    assert [len(result.value) for result in saved.values()] == [1, 1, 1]
+    assert [result.value.id for result in rejoined.values()] == [0, 0, 0]
+    assert all(result.value == IfaceStatus.CONNECTED for result in status.values())
+
+
+def test_fleet_restarts_dead_worker() -> None:
+    """Test a crashed worker only fails its shard and is restarted."""
+    names = ["crash0", "wlan1"]
+    with FleetController(names, workers=2, interface_factory=fake_interfaces) as fleet:
+        results = fleet.scan_all()
+        assert not results["crash0"].ok
+        assert results["crash0"].error == "Worker died"
+        assert results["wlan1"].ok
+        assert fleet.restarts() == {0: 1, 1: 0}
+
+        assert fleet.status_all()["crash0"].ok
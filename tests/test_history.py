@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""Test cases for the scan history log."""
+
+import os
+
+import pytest
+
+from pywifi import AkmType
+from pywifi.history import RECORD_SIZE, HistoryReader, HistoryWriter, ScanRecord
+from pywifi.profile import Profile
+
+
+def _bss(bssid: str, ssid: str, freq: int, signal: int, akm: list[int]) -> Profile:
+    bss = Profile()
+    bss.bssid = bssid
+    bss.ssid = ssid
+    bss.freq = freq
+    bss.signal = signal
+    bss.akm = akm
+    return bss
+
+
+SCAN = [
+    _bss("AA:AA:AA:AA:AA:01", "home", 2412, -60, [AkmType.WPAPSK, AkmType.WPA2PSK]),
+    _bss("aa:aa:aa:aa:aa:02", "home", 5180, -72, [AkmType.WPA2PSK]),
+    _bss("bb:bb:bb:bb:bb:01", "cafe", 2437, -48, []),
+]
+
+
+def test_append_and_search(tmp_path: str) -> None:
+    with HistoryWriter(str(tmp_path), buffer_records=4) as writer:
+        for now in range(10):
+            writer.append(SCAN, "wlan0" if now % 2 else "wlan1", now=100.0 + now)
+
+        # Buffered until enough records are pending.
+        writer.append(SCAN, "wlan0", now=110.0)
+        with HistoryReader(str(tmp_path)) as reader:
+            assert len(reader) < 33
+
+    with HistoryReader(str(tmp_path)) as reader:
+        assert len(reader) == 33
+        records = list(reader.records(103.0, 105.0))
+        assert [record.timestamp for record in records] == [103.0] * 3 + [104.0] * 3
+        assert records[0] == ScanRecord(
+            timestamp=103.0,
+            iface="wlan0",
+            ssid="home",
+            bssid="aa:aa:aa:aa:aa:01",
+            freq=2412,
+            signal=-60,
+            akm=[AkmType.WPAPSK, AkmType.WPA2PSK],
+        )
+
+        found = list(reader.records(bssid="AA:AA:AA:AA:AA:02", iface="wlan1"))
+        assert [record.timestamp for record in found] == [100.0, 102.0, 104.0, 106.0, 108.0]
+        assert {record.ssid for record in reader.records(ssid="cafe")} == {"cafe"}
+        assert len(list(reader.records(ssid="cafe", start=109.0))) == 2
+        assert len(list(reader.records(min_signal=-50))) == 11
+        assert len(list(reader.records(freq=5180, end=102.0))) == 2
+        assert not list(reader.records(ssid="unknown"))
+
+
+def test_rotation(tmp_path: str) -> None:
+    segment_size = 8 + 10 * RECORD_SIZE
+    with HistoryWriter(
+        str(tmp_path),
+        segment_size=segment_size,
+        max_segments=3,
+        buffer_records=1,
+    ) as writer:
+        for now in range(20):
+            writer.append(SCAN, "wlan0", now=float(now))
+
+    segments = sorted(os.listdir(tmp_path))
+    assert segments == [
+        "scans-00000003.log",
+        "scans-00000004.log",
+        "scans-00000005.log",
+        "strings.txt",
+    ]
+    assert all(os.path.getsize(tmp_path / name) <= segment_size for name in segments[:-1])
+    with HistoryReader(str(tmp_path)) as reader:
+        records = list(reader.records())
+        assert len(records) == len(reader) == 60 - 30
+        assert records[-1].timestamp == 19.0
+        assert [record.timestamp for record in records] == sorted(
+            record.timestamp for record in records
+        )
+
+
+def test_reopen(tmp_path: str) -> None:
+    with HistoryWriter(str(tmp_path)) as writer:
+        writer.append(SCAN, "wlan0", now=50.0)
+
+    # A record torn by a crash is dropped on reopening.
+    segment = tmp_path / "scans-00000000.log"
+    with open(segment, "ab") as f:
+        f.write(b"\x00" * 5)
+    with HistoryWriter(str(tmp_path)) as writer:
+        # An earlier clock is clamped to keep the records in time order.
+        writer.append(SCAN[:1], "wlan1", now=40.0)
+
+    with HistoryReader(str(tmp_path)) as reader:
+        records = list(reader.records())
+    assert len(records) == 4
+    assert (records[-1].iface, records[-1].timestamp) == ("wlan1", 50.0)
+
+    with open(segment, "r+b") as f:
+        f.write(b"XXXX")
+    with pytest.raises(ValueError, match="Unsupported"):
+        HistoryReader(str(tmp_path))
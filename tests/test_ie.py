@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+"""Test cases for the decoding of information elements."""
+
+from pywifi import ie
+from pywifi.ie import BssDetails, InformationElements, iter_ies, parse_ies
+
+
+def _element(eid: int, data: bytes) -> bytes:
+    return bytes((eid, len(data))) + data
+
+
+def _suites(suites: list[int]) -> bytes:
+    count = len(suites).to_bytes(2, "little")
+    return count + b"".join(b"\x00\x0f\xac" + bytes((s,)) for s in suites)
+
+
+def _rsn(pairwise: list[int], akms: list[int], capabilities: int) -> bytes:
+    data = (1).to_bytes(2, "little") + b"\x00\x0f\xac\x04"
+    return data + _suites(pairwise) + _suites(akms) + capabilities.to_bytes(2, "little")
+
+
+AP_IES = b"".join(
+    (
+        _element(ie.EID_SSID, b"office"),
+        _element(ie.EID_DS_PARAMS, b"\x24"),
+        _element(ie.EID_COUNTRY, b"DE\x20"),
+        _element(ie.EID_BSS_LOAD, b"\x0c\x00\x80\x00\x00"),
+        _element(ie.EID_HT_CAPABILITIES, bytes(26)),
+        _element(ie.EID_RSN, _rsn([4], [2, 8], 0x80)),
+        _element(ie.EID_MOBILITY_DOMAIN, b"\x34\x12\x01"),
+        _element(ie.EID_HT_OPERATION, b"\x24\x05" + bytes(20)),
+        _element(ie.EID_RM_ENABLED_CAPABILITIES, bytes(5)),
+        _element(ie.EID_EXT_CAPABILITIES, b"\x00\x00\x08"),
+        _element(ie.EID_VHT_CAPABILITIES, bytes(12)),
+        _element(ie.EID_VHT_OPERATION, b"\x01\x2a\x00\x00\x00"),
+        _element(ie.EID_EXTENSION, bytes((ie.EXT_HE_CAPABILITIES,)) + bytes(21)),
+    )
+)
+
+
+def test_iter_ies() -> None:
+    """Test the elements are sliced out of the blob, up to a truncated one."""
+    elements = [(eid, bytes(data)) for eid, data in iter_ies(AP_IES[:11] + b"\xdd\x09\x00")]
+    assert elements == [(ie.EID_SSID, b"office"), (ie.EID_DS_PARAMS, b"\x24")]
+    assert list(iter_ies(b"")) == []
+
+
+def test_information_elements() -> None:
+    """Test the decoding of the elements describing an AP."""
+    ies = InformationElements(AP_IES)
+    assert ies.ssid == b"office"
+    assert ies.channel == 36
+    assert ies.country == "DE"
+    assert (ies.bss_load.station_count, ies.bss_load.channel_utilization) == (12, 128)
+    assert (ies.ht, ies.vht, ies.he) == (True, True, True)
+    assert ies.channel_width == 80
+    assert ies.rsn.group_cipher == "CCMP"
+    assert ies.rsn.pairwise_ciphers == ["CCMP"]
+    assert ies.rsn.akm_suites == ["PSK", "SAE"]
+    assert (ies.rsn.mfp_capable, ies.rsn.mfp_required) == (True, False)
+    assert (ies.rrm, ies.bss_transition, ies.mobility_domain) == (True, True, 0x1234)
+    assert bytes(ies.get(ie.EID_EXTENSION, ie.EXT_HE_CAPABILITIES)) == bytes(21)
+
+    legacy = InformationElements(_element(ie.EID_SSID, b"") + _element(ie.EID_RSN, b"\x01"))
+    assert legacy.channel is None
+    assert legacy.rsn is None
+    assert legacy.channel_width == 20
+    assert (legacy.ht, legacy.rrm, legacy.bss_transition, legacy.fast_transition) == (False,) * 4
+
+
+def test_bss_details_share_decoded_ies() -> None:
+    """Test the IEs of a BSS are decoded once for the same bytes."""
+    fields = {"id": "2", "bssid": "00:11:22:33:44:55", "freq": "5180", "ie": AP_IES.hex()}
+    details = BssDetails(fields)
+    assert (details.id, details.freq, details.level) == (2, 5180, None)
+    assert details.ies is BssDetails(dict(fields)).ies
+    assert details.ies is parse_ies(AP_IES)
+    assert BssDetails({"bssid": "00:11:22:33:44:55", "ie": "zz"}).ies.ssid is None
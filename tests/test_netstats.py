@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""Test cases for reading the kernel link statistics from fake proc and sys trees."""
+
+from pathlib import Path
+
+import pytest
+
+from pywifi import netstats
+from pywifi.iface import Interface
+from pywifi.netstats import LinkStatsReader, parse_wireless
+from pywifi.telemetry import KERNEL_FIELDS, LinkSampler
+
+WIRELESS = (
+    "Inter-| sta-|   Quality        |   Discarded packets               | Missed | WE\n"
+    " face | tus | link level noise |  nwid  crypt   frag  retry   misc | beacon | 22\n"
+    "wlp2s0: 0000   70.  -40.  -256        0      0      0      0      0        0\n"
+    " wlan1: 0000   {link}.  {level}.  -92.        0      0      0     12      0        3\n"
+)
+
+
+def make_tree(root: Path, link: int = 45, level: int = -65, rx_bytes: int = 1000) -> None:
+    (root / "proc" / "net").mkdir(parents=True, exist_ok=True)
+    (root / "proc" / "net" / "wireless").write_text(WIRELESS.format(link=link, level=level))
+    stats = root / "sys" / "class" / "net" / "wlan1" / "statistics"
+    stats.mkdir(parents=True, exist_ok=True)
+    for counter in netstats.COUNTERS:
+        value = rx_bytes if counter == "rx_bytes" else 7
+        (stats / counter).write_text(f"{value}\n")
+
+
+def test_parse_wireless() -> None:
+    """Test the quality, level and noise of one interface are parsed."""
+    text = WIRELESS.format(link=45, level=-65)
+    assert parse_wireless(text, "wlan1") == (45.0, -65.0, -92.0)
+    # An unknown noise level is reported as None.
+    assert parse_wireless(text, "wlp2s0") == (70.0, -40.0, None)
+    assert parse_wireless(text, "wlan9") == (None, None, None)
+
+
+def test_reader_reuses_files(tmp_path: Path) -> None:
+    """Test the files are opened once and re-read at each sample."""
+    make_tree(tmp_path)
+    with LinkStatsReader(
+        "wlan1",
+        proc_root=str(tmp_path / "proc"),
+        sys_root=str(tmp_path / "sys"),
+    ) as reader:
+        stats = reader.read()
+        assert (stats.quality, stats.level, stats.noise) == (45.0, -65.0, -92.0)
+        assert (stats.rx_bytes, stats.tx_bytes, stats.tx_dropped) == (1000, 7, 7)
+        fds = dict(reader._fds)  # noqa: SLF001
+
+        make_tree(tmp_path, link=50, level=-60, rx_bytes=5000)
+        stats = reader.read()
+        assert (stats.quality, stats.level, stats.rx_bytes) == (50.0, -60.0, 5000)
+        assert reader._fds == fds  # noqa: SLF001
+
+    assert reader._fds == {}  # noqa: SLF001
+
+    # Missing files are reported as unknown values.
+    stats = LinkStatsReader("wlan1", proc_root=str(tmp_path / "none"), sys_root="/none").read()
+    assert stats.level is None
+    assert stats.rx_bytes is None
+
+
+def test_interface_link_stats(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the kernel statistics of an interface feed the link sampler."""
+    make_tree(tmp_path)
+    monkeypatch.setattr(netstats, "PROC_ROOT", str(tmp_path / "proc"))
+    monkeypatch.setattr(netstats, "SYS_ROOT", str(tmp_path / "sys"))
+    iface = Interface({"name": "wlan1"}, wifi_ctrl=object())
+
+    assert iface.link_stats().level == -65.0
+
+    sampler = LinkSampler(iface, kernel_stats=True)
+    sampler.sample()
+    make_tree(tmp_path, level=-61, rx_bytes=3000)
+    sampler.sample()
+    assert list(sampler.buffers) == list(KERNEL_FIELDS)
+    assert sampler.buffers["level"].values() == [-65.0, -61.0]
+    assert sampler.latest()["rx_bytes"] == 3000
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""Test cases for the pywifi PSK derivation."""
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from pywifi.psk import PskCache, derive_psk, derive_psks
+
+# Test vector of IEEE 802.11i-2004, annex H.4.
+IEEE_PSK = "f42c6fc52df0ebef9ebb4b90b38a5f902e83fe1b135a70e23aed762e9710a12e"
+
+
+def test_derive_psk() -> None:
+    assert derive_psk("IEEE", "password") == IEEE_PSK
+
+    with pytest.raises(ValueError, match="8 to 63"):
+        derive_psk("IEEE", "short")
+    with pytest.raises(ValueError, match="SSID"):
+        derive_psk("", "password")
+    with pytest.raises(ValueError, match="ASCII"):
+        derive_psk("IEEE", "pässwörd")
+
+    # 64 hex digits are a PSK already.
+    assert derive_psk("IEEE", IEEE_PSK.upper()) == IEEE_PSK
+    assert PskCache().get("IEEE", IEEE_PSK) == IEEE_PSK
+
+
+def test_derive_psks() -> None:
+    pairs = [("IEEE", "password"), ("ThisIsASSID", "ThisIsAPassword")]
+    expected = [derive_psk(*pair) for pair in pairs]
+
+    assert derive_psks(pairs, processes=2) == expected
+    assert derive_psks(pairs, processes=1) == expected
+
+
+def test_psk_cache_lru() -> None:
+    cache = PskCache(maxsize=2)
+
+    assert cache.get("IEEE", "password") == IEEE_PSK
+    cache.get("ap2", "password")
+    cache.get("IEEE", "password")
+    cache.get("ap3", "password")
+
+    # ap2 was the least recently used entry.
+    assert [ssid for ssid, _ in cache._entries] == ["IEEE", "ap3"]
+
+
+def test_psk_cache_file(tmp_path: Path) -> None:
+    path = str(tmp_path / "psk.json")
+    cache = PskCache(path=path)
+    psks = cache.derive_many([("IEEE", "password"), ("ap2", "password"), ("IEEE", "password")])
+
+    assert psks[0] == psks[2] == IEEE_PSK
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert "password" not in Path(path).read_text()
+
+    reloaded = PskCache(path=path)
+    assert len(reloaded) == 2
+    assert reloaded.derive_many([("IEEE", "password")], processes=1) == [IEEE_PSK]
+
+    reloaded.clear()
+    assert len(PskCache(path=path)) == 0
+    assert os.listdir(tmp_path) == ["psk.json"]
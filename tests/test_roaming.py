@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""Test cases for the pywifi roaming engine."""
+
+from pywifi.events import Event
+from pywifi.profile import Profile
+from pywifi.roaming import RoamingEngine
+
+
+def _bss(bssid: str, freq: int, signal: int, ssid: str = "corp") -> Profile:
+    bss = Profile()
+    bss.ssid = ssid
+    bss.bssid = bssid
+    bss.freq = freq
+    bss.signal = signal
+    return bss
+
+
+class IfaceMock:
+    def __init__(self) -> None:
+        self.bssid = "aa:aa:aa:aa:aa:01"
+        self.roams: list[str] = []
+        self.bsses: list[Profile] = []
+
+    def name(self) -> str:
+        return "wlan0"
+
+    def status_fields(self) -> dict[str, str]:
+        return {"wpa_state": "COMPLETED", "ssid": "corp", "bssid": self.bssid}
+
+    def scan_results(self) -> list[Profile]:
+        return self.bsses
+
+    def roam(self, bssid: str) -> None:
+        self.roams.append(bssid)
+        self.bssid = bssid
+
+
+def test_roam_after_hysteresis_and_dwell() -> None:
+    iface = IfaceMock()
+    engine = RoamingEngine(iface, hysteresis=8, dwell=5, min_interval=30)
+    engine.refresh_link()
+
+    scan = [
+        _bss("aa:aa:aa:aa:aa:01", 2412, -80),
+        _bss("aa:aa:aa:aa:aa:02", 2437, -75),
+        _bss("aa:aa:aa:aa:aa:03", 5180, -70),
+        _bss("bb:bb:bb:bb:bb:01", 5180, -30, ssid="guest"),
+    ]
+    engine.update(scan, now=0)
+    assert len(engine.candidates()) == 3
+
+    # The 5 GHz candidate is better by 15 dB but has to stay better for the dwell time.
+    assert engine.step(now=0) is None
+    engine.update(scan, now=4)
+    assert engine.step(now=4) is None
+    engine.update(scan, now=6)
+    decision = engine.step(now=6)
+
+    assert decision is not None
+    assert decision.to_bssid == "aa:aa:aa:aa:aa:03"
+    assert decision.gain == 15
+    assert iface.roams == ["aa:aa:aa:aa:aa:03"]
+    assert engine.current_bssid == "aa:aa:aa:aa:aa:03"
+
+
+def test_roam_hysteresis_resets_dwell() -> None:
+    engine = RoamingEngine(IfaceMock(), hysteresis=8, dwell=5)
+    engine.refresh_link()
+
+    engine.update([_bss("aa:aa:aa:aa:aa:01", 2412, -80), _bss("aa:aa:aa:aa:aa:02", 2412, -70)], 0)
+    assert engine.step(now=0) is None
+    # Falls back within the hysteresis margin, so the dwell timer restarts.
+    engine.update([_bss("aa:aa:aa:aa:aa:02", 2412, -75)], 3)
+    assert engine.step(now=3) is None
+    engine.update([_bss("aa:aa:aa:aa:aa:01", 2412, -80), _bss("aa:aa:aa:aa:aa:02", 2412, -70)], 4)
+    assert engine.step(now=6) is None
+    assert engine.step(now=9) is None
+    assert engine.step(now=11) is not None
+
+
+def test_roam_rate_limit() -> None:
+    iface = IfaceMock()
+    engine = RoamingEngine(iface, dwell=0, min_interval=10, max_roams=2, window=100)
+    engine.refresh_link()
+
+    def flip(now: float) -> None:
+        weak = iface.bssid
+        strong = "aa:aa:aa:aa:aa:02" if weak == "aa:aa:aa:aa:aa:01" else "aa:aa:aa:aa:aa:01"
+        engine.update([_bss(weak, 2412, -85), _bss(strong, 2412, -50)], now)
+
+    flip(0)
+    assert engine.step(now=0) is not None
+    flip(5)
+    assert engine.step(now=5) is None  # within min_interval
+    flip(20)
+    assert engine.step(now=20) is not None
+    flip(40)
+    assert engine.step(now=40) is None  # max_roams within window
+    flip(110)
+    assert engine.step(now=110) is not None
+    assert len(iface.roams) == 3
+
+
+def test_roam_events() -> None:
+    iface = IfaceMock()
+    engine = RoamingEngine(iface, dwell=0, min_interval=0)
+    engine.handle_event(Event("CTRL-EVENT-CONNECTED", "- Connection to aa:aa:aa:aa:aa:01"))
+    assert engine.current_bssid == "aa:aa:aa:aa:aa:01"
+
+    iface.bsses = [_bss("aa:aa:aa:aa:aa:01", 2412, -80), _bss("aa:aa:aa:aa:aa:02", 5180, -60)]
+    engine.handle_event(Event("CTRL-EVENT-SCAN-RESULTS"))
+    assert iface.roams == ["aa:aa:aa:aa:aa:02"]
+
+    engine.handle_event(Event("CTRL-EVENT-DISCONNECTED", "bssid=aa:aa:aa:aa:aa:02 reason=3"))
+    assert engine.current_bssid is None
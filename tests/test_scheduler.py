@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+"""Test cases for the adaptive scan scheduler."""
+
+import time
+
+import pytest
+
+from pywifi import IfaceStatus
+from pywifi.profile import Profile
+from pywifi.scheduler import ScanScheduler
+
+
+def _bss(bssid: str, freq: int, signal: int) -> Profile:
+    bss = Profile()
+    bss.ssid = "corp"
+    bss.bssid = bssid
+    bss.freq = freq
+    bss.signal = signal
+    return bss
+
+
+class IfaceMock:
+    def __init__(self) -> None:
+        self.state = IfaceStatus.CONNECTED
+        self.scans: list[list[int] | None] = []
+        self.bsses = [_bss("aa:aa:aa:aa:aa:01", 2412, -50), _bss("aa:aa:aa:aa:aa:02", 5180, -60)]
+
+    def name(self) -> str:
+        return "wlan0"
+
+    def status(self) -> int:
+        return self.state
+
+    def scan(self, freqs: list[int] | None = None) -> None:
+        self.scans.append(freqs)
+
+    def scan_results(self) -> list[Profile]:
+        return self.bsses
+
+
+def test_backoff_and_targeted_rescan() -> None:
+    """Test the interval backs off while nothing changes and changed channels are rescanned."""
+    iface = IfaceMock()
+    scheduler = ScanScheduler(iface, min_interval=5, max_interval=30, airtime_budget=1.0)
+    scheduler.observe(iface.bsses)
+
+    intervals = []
+    for _ in range(4):
+        scheduler.observe(iface.bsses)
+        intervals.append(scheduler.decide().interval)
+    assert intervals == [10, 20, 30, 30]
+    assert scheduler.decision.reason == "no change"
+    assert scheduler.decision.freqs is None
+
+    iface.bsses = [*iface.bsses, _bss("aa:aa:aa:aa:aa:03", 5500, -70)]
+    assert scheduler.observe(iface.bsses) == 1
+    decision = scheduler.decide()
+    assert (decision.interval, decision.freqs) == (15, [5500])
+    assert decision.reason == "1 BSSes found or lost, rescan 1 channels"
+
+    # A targeted scan only compares the BSSes of the scanned channels.
+    scheduler.scan(decision.freqs)
+    assert scheduler.observe(iface.bsses[2:], decision.freqs) == 0
+    assert scheduler.decide().freqs is None
+
+
+def test_unstable_signal_and_disconnected() -> None:
+    """Test moving signals and a lost connection bring the interval to the minimum."""
+    iface = IfaceMock()
+    scheduler = ScanScheduler(iface, min_interval=5, max_interval=60, airtime_budget=1.0)
+    scheduler.interval = 60
+    scheduler.observe(iface.bsses)
+    for signal in (-50, -70, -45):
+        iface.bsses = [_bss("aa:aa:aa:aa:aa:01", 2412, signal)]
+        scheduler.observe(iface.bsses)
+    decision = scheduler.decide()
+    assert decision.interval == 5
+    assert decision.reason.startswith("signal unstable")
+    assert decision.rssi_variance >= 25
+
+    iface.state = IfaceStatus.DISCONNECTED
+    assert scheduler.decide().reason == "disconnected"
+
+    with pytest.raises(ValueError, match="min_interval"):
+        ScanScheduler(iface, min_interval=10, max_interval=5)
+
+
+def test_airtime_budget() -> None:
+    """Test the scans stay within the airtime budget while connected."""
+    iface = IfaceMock()
+    scheduler = ScanScheduler(iface, min_interval=1, max_interval=120, airtime_budget=0.02)
+    scheduler.scan(now=0)
+    scheduler.observe(iface.bsses)
+    decision = scheduler.decide(now=0)
+    assert decision.interval == pytest.approx(38 * 0.04 / 0.02)
+    assert "airtime budget" in decision.reason
+    assert decision.airtime == pytest.approx(38 * 0.04 / 60)
+    assert scheduler.airtime(now=100) == 0
+
+
+def test_scheduler_thread() -> None:
+    iface = IfaceMock()
+    scheduler = ScanScheduler(iface, min_interval=0.01, max_interval=0.02, scan_wait=0)
+    scheduler.start()
+    time.sleep(0.2)
+    scheduler.stop()
+
+    assert not scheduler.is_running()
+    assert len(iface.scans) > 2
+    assert scheduler.decision is not None
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+"""Test cases for the per-BSS signal statistics."""
+
+import json
+import math
+import statistics
+
+import pytest
+
+from pywifi.profile import Profile
+from pywifi.survey import BssAggregator, BssStats
+
+
+def _bss(bssid: str, signal: int, ssid: str = "home", freq: int = 2412) -> Profile:
+    bss = Profile()
+    bss.bssid = bssid
+    bss.ssid = ssid
+    bss.freq = freq
+    bss.signal = signal
+    return bss
+
+
+def test_statistics() -> None:
+    signals = [-60, -62, -55, -70, -61, -58, -65, -59, -90, -60]
+    aggregator = BssAggregator()
+    for now, signal in enumerate(signals):
+        aggregator.update([_bss("AA:AA:AA:AA:AA:01", signal)], now=1000.0 + now)
+
+    summary = aggregator.get("aa:aa:aa:aa:aa:01").summary()
+    assert summary.count == len(signals)
+    assert summary.mean == pytest.approx(statistics.mean(signals))
+    assert summary.variance == pytest.approx(statistics.variance(signals))
+    assert (summary.min, summary.max) == (-90, -55)
+    assert summary.p50 == -61
+    assert summary.p95 == -55
+    assert (summary.first_seen, summary.last_seen) == (1000.0, 1009.0)
+
+
+def test_eviction() -> None:
+    aggregator = BssAggregator(2, stale_after=60)
+    aggregator.update([_bss("aa:aa:aa:aa:aa:01", -60)], now=0.0)
+    aggregator.update([_bss("aa:aa:aa:aa:aa:02", -60)], now=10.0)
+    aggregator.update([_bss("aa:aa:aa:aa:aa:01", -60)], now=20.0)
+    aggregator.update([_bss("aa:aa:aa:aa:aa:03", -60)], now=30.0)
+
+    # The least recently seen BSS is evicted beyond the capacity.
+    assert "aa:aa:aa:aa:aa:02" not in aggregator
+    assert len(aggregator) == 2
+
+    aggregator.update([_bss("aa:aa:aa:aa:aa:03", -60)], now=85.0)
+    assert [summary.bssid for summary in aggregator.summaries()] == ["aa:aa:aa:aa:aa:03"]
+    assert aggregator.evicted == 2
+
+    # A late scan does not make a BSS look recently seen.
+    aggregator.update([_bss("aa:aa:aa:aa:aa:04", -60)], now=90.0)
+    aggregator.update([_bss("aa:aa:aa:aa:aa:03", -60)], now=80.0)
+    assert aggregator.get("aa:aa:aa:aa:aa:03").last_seen == 85.0
+    aggregator.expire(now=146.0)
+    assert [summary.bssid for summary in aggregator.summaries()] == ["aa:aa:aa:aa:aa:04"]
+
+
+def test_late_scan_of_a_new_bss() -> None:
+    aggregator = BssAggregator(2, stale_after=300)
+    aggregator.update([_bss("aa:aa:aa:aa:aa:01", -60), _bss("aa:aa:aa:aa:aa:02", -60)], now=1000.0)
+
+    # A new BSS of a late scan is the least recently seen, so it is evicted.
+    aggregator.update([_bss("aa:aa:aa:aa:aa:03", -60)], now=500.0)
+    assert "aa:aa:aa:aa:aa:03" not in aggregator
+    assert len(aggregator) == 2
+
+    # Within the capacity, it is kept in order and expires first.
+    aggregator.capacity = 3
+    aggregator.update([_bss("aa:aa:aa:aa:aa:03", -60)], now=900.0)
+    assert [summary.bssid for summary in aggregator.summaries()] == [
+        "aa:aa:aa:aa:aa:03",
+        "aa:aa:aa:aa:aa:01",
+        "aa:aa:aa:aa:aa:02",
+    ]
+    assert aggregator.expire(now=1250.0) == 1
+    assert len(aggregator) == 2
+
+
+def test_merge_and_snapshot() -> None:
+    first = [-60, -65, -70, -52]
+    second = [-80, -75, -78]
+    one = BssAggregator()
+    other = BssAggregator()
+    for now, signal in enumerate(first):
+        one.update([_bss("aa:aa:aa:aa:aa:01", signal)], now=float(now))
+    for now, signal in enumerate(second):
+        other.update(
+            [_bss("aa:aa:aa:aa:aa:01", signal, freq=5180), _bss("bb:bb:bb:bb:bb:01", -40)],
+            now=10.0 + now,
+        )
+
+    one.merge(other)
+    merged = one.get("aa:aa:aa:aa:aa:01").summary()
+    assert merged.count == len(first) + len(second)
+    assert merged.mean == pytest.approx(statistics.mean(first + second))
+    assert merged.variance == pytest.approx(statistics.variance(first + second))
+    assert (merged.min, merged.max, merged.freq) == (-80, -52, 5180)
+    assert merged.p50 == -70
+    assert (merged.first_seen, merged.last_seen) == (0.0, 12.0)
+    assert len(one) == 2
+
+    restored = BssAggregator.from_snapshot(json.loads(json.dumps(one.snapshot())))
+    assert restored.summaries() == one.summaries()
+
+    # Statistics without samples are strict JSON too.
+    empty = BssStats("cc:cc:cc:cc:cc:01").to_dict()
+    assert empty["min"] is None
+    restored = BssStats.from_dict(json.loads(json.dumps(empty, allow_nan=False)))
+    assert (restored.min, restored.last_seen) == (math.inf, -math.inf)
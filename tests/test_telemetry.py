@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""Test cases for the pywifi link telemetry sampler."""
+
+import math
+import time
+
+import pytest
+
+from pywifi.telemetry import LinkSampler, RingBuffer
+
+
+class IfaceMock:
+    def __init__(self) -> None:
+        self.polls = 0
+
+    def name(self) -> str:
+        return "wlan0"
+
+    def signal_poll(self) -> dict[str, int]:
+        self.polls += 1
+        return {"RSSI": -40 - self.polls, "LINKSPEED": 144, "NOISE": 9999, "FREQUENCY": 5180}
+
+    def packet_counts(self) -> dict[str, int]:
+        return {"TXGOOD": self.polls * 10, "TXBAD": 0, "RXGOOD": self.polls * 20}
+
+
+def test_ring_buffer_wraps() -> None:
+    buffer = RingBuffer(4, alpha=0.5)
+    assert buffer.stats() is None
+    assert math.isnan(buffer.last())
+
+    for value in range(1, 7):
+        buffer.append(value)
+
+    assert len(buffer) == 4
+    assert buffer.values() == [3, 4, 5, 6]
+    assert buffer.last() == 6
+
+    stats = buffer.stats()
+    assert stats.count == 4
+    assert stats.min == 3
+    assert stats.max == 6
+    assert stats.mean == 4.5
+    assert stats.p50 == 4.5
+    assert stats.ewma == pytest.approx(5.03125)
+
+    with pytest.raises(ValueError, match="capacity"):
+        RingBuffer(0)
+
+
+def test_ring_buffer_skips_missing() -> None:
+    buffer = RingBuffer(3)
+    buffer.append(math.nan)
+    assert buffer.stats() is None
+    buffer.append(1.0)
+    assert buffer.stats().count == 1
+    assert buffer.ewma == 1.0
+
+
+def test_sampler_sample() -> None:
+    iface = IfaceMock()
+    sampler = LinkSampler(iface, capacity=3)
+
+    for now in range(5):
+        sampler.sample(now=now)
+
+    assert sampler.buffers["rssi"].values() == [-43, -44, -45]
+    assert sampler.timestamps.values() == [2, 3, 4]
+    assert sampler.stats("noise") is None
+    assert sampler.stats("link_speed").max == 144
+    assert sampler.latest()["rx_good"] == 100
+
+
+def test_sampler_thread() -> None:
+    iface = IfaceMock()
+    sampler = LinkSampler(iface, rate=200, capacity=1000, packet_counts=False)
+
+    sampler.start()
+    time.sleep(0.2)
+    sampler.stop()
+
+    assert not sampler.is_running()
+    assert iface.polls > 5
+    assert "tx_good" not in sampler.buffers
+    assert sampler.errors == 0
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+"""Test cases for the connection timeline profiler."""
+
+import socket
+
+import pytest
+
+from pywifi import IfaceStatus
+from pywifi.events import EVENT_STATE_CHANGE, EventMonitor
+from pywifi.link import LinkInfo
+from pywifi.tracing import ConnectTrace, ConnectTracer, Transition
+
+
+class IfaceMock:
+    """Interface double sending state changes, or reporting them by status."""
+
+    def __init__(self, *, events: bool = True) -> None:
+        self.events = events
+        self.states = ["DISCONNECTED", "SCANNING", "ASSOCIATING", "4WAY_HANDSHAKE", "COMPLETED"]
+        self.monitor = EventMonitor(self)
+        self.peer, self.sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    def name(self) -> str:
+        return "wlan0"
+
+    def event_monitor(self) -> EventMonitor:
+        return self.monitor
+
+    def attach(self) -> socket.socket:
+        if not self.events:
+            raise NotImplementedError("Event monitoring is not supported")
+        return self.sock
+
+    def detach(self, sock: socket.socket) -> None:
+        sock.close()
+        self.peer.close()
+
+    def connect(self) -> None:
+        if self.events:
+            for state in (3, 5, 7, 8, 9):
+                self.peer.send(f"<3>{EVENT_STATE_CHANGE} id=0 state={state}".encode())
+
+    def invalidate_status(self) -> None:
+        pass
+
+    def link_info(self) -> LinkInfo:
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        status = IfaceStatus.CONNECTED if state == "COMPLETED" else IfaceStatus.CONNECTING
+        return LinkInfo(status=status, wpa_state=state)
+
+
+def test_trace_phases() -> None:
+    """Test the time between transitions is attributed to the state left."""
+    trace = ConnectTrace(start=10.0, end=10.9)
+    trace.transitions = [
+        Transition("scanning", 10.1),
+        Transition("associating", 10.5),
+        Transition("scanning", 10.6),
+        Transition("completed", 10.9),
+    ]
+    phases = trace.phases()
+    assert list(phases) == ["request", "scanning", "associating"]
+    assert phases["scanning"] == pytest.approx(0.7)
+    assert trace.duration == pytest.approx(0.9)
+    assert ConnectTrace(start=0.0).duration is None
+
+
+def test_trace_events() -> None:
+    """Test a connection is traced from the state change events."""
+    iface = IfaceMock()
+    tracer = ConnectTracer(iface)
+    trace = tracer.trace(iface.connect, timeout=5)
+
+    assert trace.connected
+    assert trace.source == "events"
+    assert [transition.state for transition in trace.transitions] == [
+        "scanning",
+        "associating",
+        "4way_handshake",
+        "group_handshake",
+        "completed",
+    ]
+    assert not iface.monitor.is_running()
+    assert tracer.stats("total").count == 1
+    assert tracer.stats("authenticating").max == 0.0
+    assert set(tracer.summary()) == {*trace.phases(), "authenticating", "associated", "total"}
+
+
+def test_trace_sampled() -> None:
+    """Test the status is sampled without events, and failures are counted."""
+    iface = IfaceMock(events=False)
+    tracer = ConnectTracer(iface, sample_interval=0)
+    trace = tracer.trace(iface.connect, timeout=5)
+
+    assert (trace.connected, trace.source) == (True, "status")
+    states = [transition.state for transition in trace.transitions]
+    assert states[-2:] == ["4way_handshake", "completed"]
+
+    iface.states = ["SCANNING"]
+    assert not tracer.trace(iface.connect, timeout=0.05).connected
+    assert (tracer.attempts, tracer.failures) == (2, 1)
+    assert tracer.stats("total").count == 1
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""Test cases for the reconnect watchdog."""
+
+import time
+
+import pytest
+
+from pywifi import IfaceStatus
+from pywifi.events import EVENT_DISCONNECTED, Event
+from pywifi.link import LinkInfo
+from pywifi.watchdog import ReconnectWatchdog
+
+
+class MonitorMock:
+    def __init__(self) -> None:
+        self.subscribers = []
+
+    def is_running(self) -> bool:
+        return False
+
+    def start(self) -> None:
+        raise NotImplementedError("Event monitoring is not supported")
+
+    def subscribe(self, callback: object) -> None:
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: object) -> None:
+        self.subscribers.remove(callback)
+
+
+class IfaceMock:
+    def __init__(self) -> None:
+        self.status = IfaceStatus.CONNECTED
+        self.reassociations: list[tuple] = []
+        self.monitor = MonitorMock()
+
+    def name(self) -> str:
+        return "wlan0"
+
+    def event_monitor(self) -> MonitorMock:
+        return self.monitor
+
+    def invalidate_status(self) -> None:
+        pass
+
+    def link_info(self) -> LinkInfo:
+        if self.status != IfaceStatus.CONNECTED:
+            return LinkInfo(status=self.status, wpa_state="SCANNING")
+        return LinkInfo(
+            status=self.status,
+            wpa_state="COMPLETED",
+            bssid="aa:aa:aa:aa:aa:01",
+            freq=5180,
+            network_id=2,
+        )
+
+    def reassociate(
+        self,
+        network_id: int,
+        bssid: str | None = None,
+        freq: int | None = None,
+    ) -> None:
+        self.reassociations.append((network_id, bssid, freq))
+
+
+def test_fast_reassociation() -> None:
+    """Test a drop is answered at once with the last BSS and frequency."""
+    iface = IfaceMock()
+    watchdog = ReconnectWatchdog(iface)
+    watchdog.step(now=0)
+    assert watchdog.last_link.bssid == "aa:aa:aa:aa:aa:01"
+
+    iface.status = IfaceStatus.DISCONNECTED
+    watchdog.step(now=10)
+    assert watchdog.down
+    assert iface.reassociations == [(2, "aa:aa:aa:aa:aa:01", 5180)]
+
+    iface.status = IfaceStatus.CONNECTED
+    watchdog.step(now=10.3)
+    assert not watchdog.down
+    assert (watchdog.stats.disconnects, watchdog.stats.reconnects) == (1, 1)
+    assert watchdog.stats.fast_reconnects == 1
+    assert watchdog.stats.last_outage == pytest.approx(0.3)
+    assert watchdog.outage_stats().count == 1
+
+
+def test_backoff_fallback() -> None:
+    """Test the later attempts select the network on all channels with a backoff."""
+    iface = IfaceMock()
+    watchdog = ReconnectWatchdog(iface, backoff_initial=1, backoff_max=4, jitter=0)
+    watchdog.connect_timeout = 0
+    assert [watchdog.backoff(attempt) for attempt in range(1, 6)] == [0, 1, 2, 4, 4]
+
+    watchdog.step(now=0)
+    iface.status = IfaceStatus.DISCONNECTED
+    for now in (0, 0.5, 1, 2, 3, 5):
+        watchdog.step(now=now)
+    assert iface.reassociations == [
+        (2, "aa:aa:aa:aa:aa:01", 5180),
+        (2, None, None),
+        (2, None, None),
+    ]
+
+    # An attempt still scanning is not interrupted before connect_timeout.
+    watchdog.connect_timeout = 10
+    iface.status = IfaceStatus.SCANNING
+    watchdog.step(now=8)
+    assert watchdog.stats.attempts == 3
+    watchdog.step(now=13)
+    assert watchdog.stats.attempts == 4
+
+    iface.status = IfaceStatus.CONNECTED
+    watchdog.step(now=21)
+    assert (watchdog.stats.reconnects, watchdog.stats.fast_reconnects) == (1, 0)
+
+
+def test_no_link_to_restore() -> None:
+    """Test nothing is done before a link was seen."""
+    iface = IfaceMock()
+    iface.status = IfaceStatus.DISCONNECTED
+    watchdog = ReconnectWatchdog(iface)
+    watchdog.step(now=0)
+    assert not watchdog.down
+    assert iface.reassociations == []
+
+
+def test_pause() -> None:
+    """Test a disconnect while paused is not undone, even after resume()."""
+    iface = IfaceMock()
+    watchdog = ReconnectWatchdog(iface)
+    watchdog.step(now=0)
+
+    watchdog.pause()
+    iface.status = IfaceStatus.DISCONNECTED
+    watchdog.step(now=1)
+    watchdog.resume()
+    watchdog.step(now=2)
+    assert not watchdog.down
+    assert iface.reassociations == []
+
+    iface.status = IfaceStatus.CONNECTED
+    watchdog.step(now=3)
+    iface.status = IfaceStatus.DISCONNECTED
+    watchdog.step(now=4)
+    assert iface.reassociations == [(2, "aa:aa:aa:aa:aa:01", 5180)]
+
+
+def test_watchdog_thread() -> None:
+    iface = IfaceMock()
+    watchdog = ReconnectWatchdog(iface, check_interval=10)
+    watchdog.start()
+    assert iface.monitor.subscribers == [watchdog.handle_event]
+
+    iface.status = IfaceStatus.DISCONNECTED
+    watchdog.handle_event(Event(EVENT_DISCONNECTED))
+    for _ in range(100):
+        if iface.reassociations:
+            break
+        time.sleep(0.01)
+    watchdog.stop()
+
+    assert not watchdog.is_running()
+    assert iface.reassociations[0] == (2, "aa:aa:aa:aa:aa:01", 5180)
+    assert iface.monitor.subscribers == []
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+"""Test cases for the Windows backend on synthetic wlanapi buffers."""
+
+import ctypes
+import re
+from pathlib import Path
+
+import pytest
+
+from pywifi import AkmType, AuthAlgorithm, CipherType, IfaceStatus, KeyType, Profile
+from pywifi import _wifiutil_win as wifiutil
+from pywifi._wlanapi import (
+    GUID,
+    WLAN_AVAILABLE_NETWORK_LIST,
+    WLAN_BSS_LIST,
+    WLAN_INTERFACE_INFO_LIST,
+    WLAN_PROFILE_INFO_LIST,
+    WlanApiError,
+    entries_of,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "wlan_profiles"
+
+
+def make_list(list_type: type, field: str, count: int) -> tuple[ctypes.Array, object]:
+    """Allocate a wlanapi list structure holding ``count`` entries."""
+    entry_type = dict(list_type._fields_)[field]._type_
+    size = ctypes.sizeof(list_type) + max(count - 1, 0) * ctypes.sizeof(entry_type)
+    buf = ctypes.create_string_buffer(size)
+    lst = ctypes.cast(buf, ctypes.POINTER(list_type))
+    return buf, lst
+
+
+def set_ssid(dot11_ssid: object, ssid: bytes) -> None:
+    dot11_ssid.uSSIDLength = len(ssid)
+    ctypes.memmove(
+        ctypes.addressof(dot11_ssid) + type(dot11_ssid).ucSSID.offset,
+        ssid,
+        len(ssid),
+    )
+
+
+class FakeWlanApi:
+    """WlanApi serving synthetic buffers and tracking the freed ones."""
+
+    def __init__(self, networks: list[tuple], bsses: list[tuple]) -> None:
+        self.networks = networks
+        self.bsses = bsses
+        self.buffers: dict[int, ctypes.Array] = {}
+        self.freed: list[int] = []
+        self.bss_list_calls = 0
+        self.profiles = {
+            "home": (FIXTURES / "home.xml").read_text(),
+            "Office Wi-Fi": (FIXTURES / "office.xml").read_text(),
+            "cafe": (FIXTURES / "cafe.xml").read_text(),
+        }
+        self.get_profile_calls: list[str] = []
+        self.deleted: list[str] = []
+
+    def _keep(self, buf: ctypes.Array, lst: object) -> object:
+        self.buffers[ctypes.addressof(buf)] = buf
+        return lst
+
+    def open_handle(self, client_version: int) -> int:
+        return 1
+
+    def enum_interfaces(self, handle: int) -> object:
+        buf, lst = make_list(WLAN_INTERFACE_INFO_LIST, "InterfaceInfo", 2)
+        lst.contents.dwNumberOfItems = 2
+        for idx, info in enumerate(entries_of(lst.contents.InterfaceInfo, 2)):
+            info.strInterfaceDescription = f"Wireless Adapter {idx}"
+            info.InterfaceGuid.Data1 = idx + 1
+        return self._keep(buf, lst)
+
+    def get_available_network_list(self, handle: int, guid: GUID) -> object:
+        count = len(self.networks)
+        buf, lst = make_list(WLAN_AVAILABLE_NETWORK_LIST, "Network", count)
+        lst.contents.dwNumberOfItems = count
+        for network, (ssid, connectable, secure) in zip(
+            entries_of(lst.contents.Network, count),
+            self.networks,
+            strict=True,
+        ):
+            set_ssid(network.dot11Ssid, ssid)
+            network.dot11BssType = 1
+            network.bNetworkConnectable = connectable
+            network.bSecurityEnabled = secure
+            network.dot11DefaultAuthAlgorithm = 7
+            network.dot11DefaultCipherAlgorithm = AkmType.WPA2PSK
+        return self._keep(buf, lst)
+
+    def get_network_bss_list(
+        self,
+        handle: int,
+        guid: GUID,
+        ssid: object = None,
+        bss_type: int = 3,
+        *,
+        security: bool = False,
+    ) -> object:
+        self.bss_list_calls += 1
+        assert ssid is None
+        count = len(self.bsses)
+        buf, lst = make_list(WLAN_BSS_LIST, "wlanBssEntries", count)
+        lst.contents.dwNumberOfItems = count
+        for entry, (ssid_raw, bssid, rssi, freq_khz) in zip(
+            entries_of(lst.contents.wlanBssEntries, count),
+            self.bsses,
+            strict=True,
+        ):
+            set_ssid(entry.dot11Ssid, ssid_raw)
+            entry.dot11Bssid[:] = list(bssid)
+            entry.lRssi = rssi
+            entry.ulChCenterFrequency = freq_khz
+        return self._keep(buf, lst)
+
+    def query_interface_state(self, handle: int, guid: GUID) -> int:
+        return 1
+
+    def get_profile_list(self, handle: int, guid: GUID) -> object:
+        count = len(self.profiles)
+        buf, lst = make_list(WLAN_PROFILE_INFO_LIST, "ProfileInfo", count)
+        lst.contents.dwNumberOfItems = count
+        for info, name in zip(
+            entries_of(lst.contents.ProfileInfo, count),
+            self.profiles,
+            strict=True,
+        ):
+            info.strProfileName = name
+        return self._keep(buf, lst)
+
+    def get_profile(self, handle: int, guid: GUID, name: str) -> str:
+        self.get_profile_calls.append(name)
+        if name not in self.profiles:
+            raise WlanApiError("WlanGetProfile", 1168)
+        return self.profiles[name]
+
+    def set_profile(self, handle: int, guid: GUID, xml: str) -> tuple[int, int]:
+        self.profiles[re.search(r"<name>(.*)</name>", xml).group(1)] = xml
+        return 0, 0
+
+    def delete_profile(self, handle: int, guid: GUID, name: str) -> int:
+        self.deleted.append(name)
+        del self.profiles[name]
+        return 0
+
+    def free_memory(self, memory: object) -> None:
+        self.freed.append(ctypes.cast(memory, ctypes.c_void_p).value)
+
+
+@pytest.fixture
+def fake_api(monkeypatch: pytest.MonkeyPatch) -> FakeWlanApi:
+    api = FakeWlanApi(
+        networks=[
+            (b"home", True, True),
+            (b"home", True, True),
+            (b"cafe\x00free", True, False),
+            (b"faraway", False, True),
+        ],
+        bsses=[
+            (b"home", b"\xac\x9e\x17\x31\x85\xfc", -48, 5180000),
+            (b"home", b"\xac\x9e\x17\x31\x85\xfd", -67, 2412000),
+            (b"cafe\x00free", b"\x0c\x80\x63\x2b\x0d\xa8", -70, 2437000),
+            (b"faraway", b"\x78\x32\x1b\x63\x96\x05", -91, 2462000),
+        ],
+    )
+    monkeypatch.setattr(wifiutil.WifiUtil, "_api", api)
+    monkeypatch.setattr(wifiutil.WifiUtil, "_handle", None)
+    monkeypatch.setattr(wifiutil.WifiUtil, "_profile_stores", {})
+    return api
+
+
+def test_interfaces(fake_api: FakeWlanApi) -> None:
+    """Test the interfaces are listed and their list freed."""
+    ifaces = wifiutil.WifiUtil().interfaces()
+
+    assert [iface["name"] for iface in ifaces] == ["Wireless Adapter 0", "Wireless Adapter 1"]
+    assert [iface["guid"].Data1 for iface in ifaces] == [1, 2]
+    assert sorted(fake_api.freed) == sorted(fake_api.buffers)
+
+    assert wifiutil.WifiUtil().interfaces(["Wireless Adapter 1"])[0]["guid"].Data1 == 2
+
+
+def test_scan_results_single_bss_query(fake_api: FakeWlanApi) -> None:
+    """Test the BSSes of all networks come from one query and the buffers are freed."""
+    wifi_ctrl = wifiutil.WifiUtil()
+    bsses = wifi_ctrl.scan_results({"guid": GUID(), "name": "wlan"})
+
+    assert fake_api.bss_list_calls == 1
+    assert sorted(fake_api.freed) == sorted(fake_api.buffers)
+
+    assert [(bss.ssid, bss.bssid, bss.signal, bss.freq) for bss in bsses] == [
+        ("home", "ac:9e:17:31:85:fc", -48, 5180),
+        ("home", "ac:9e:17:31:85:fd", -67, 2412),
+        ("cafe\x00free", "0c:80:63:2b:0d:a8", -70, 2437),
+    ]
+    assert bsses[0].akm == [AkmType.WPA2PSK]
+    assert bsses[2].akm == [AkmType.NONE]
+    assert bsses[2].auth == [AuthAlgorithm.OPEN]
+    assert bsses[0].akm is not bsses[1].akm
+
+
+def test_status(fake_api: FakeWlanApi) -> None:
+    """Test the interface state is mapped to a status."""
+    assert wifiutil.WifiUtil().status({"guid": GUID()}) == IfaceStatus.CONNECTED
+
+
+def test_interfaces_open_failure(fake_api: FakeWlanApi, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a failing wlanapi call is logged and yields no interface."""
+
+    def fail(client_version: int) -> int:
+        raise WlanApiError("WlanOpenHandle", 5)
+
+    monkeypatch.setattr(fake_api, "open_handle", fail)
+    assert wifiutil.WifiUtil().interfaces() == []
+
+
+def test_parse_profile_xml() -> None:
+    """Test the fields parsed from recorded profile XML."""
+    home = wifiutil.parse_profile_xml((FIXTURES / "home.xml").read_text())
+    office = wifiutil.parse_profile_xml((FIXTURES / "office.xml").read_text())
+    cafe = wifiutil.parse_profile_xml((FIXTURES / "cafe.xml").read_text())
+
+    assert (home.ssid, home.akm, home.cipher) == ("home", [AkmType.WPA2PSK], CipherType.CCMP)
+    assert (home.key_type, home.key) == (KeyType.PASSPHRASE, "correct horse")
+    # The SSID only given in hex, and a key protected for the machine.
+    assert (office.ssid, office.akm, office.cipher) == ("Corp", [AkmType.WPA], CipherType.TKIP)
+    assert (office.key_type, office.key) == (KeyType.NETWORKKEY, None)
+    assert (cafe.ssid, cafe.akm, cafe.auth) == ("cafe", [AkmType.NONE], AuthAlgorithm.OPEN)
+    assert (cafe.cipher, cafe.key_type) == (CipherType.NONE, None)
+
+
+def test_profile_store_is_cached(fake_api: FakeWlanApi) -> None:
+    """Test the profiles are read once and the store follows adds and deletes."""
+    obj = {"guid": GUID(), "name": "wlan"}
+    wifi_ctrl = wifiutil.WifiUtil()
+
+    assert wifi_ctrl.network_profile_name_list(obj) == ["home", "Office Wi-Fi", "cafe"]
+    profiles = wifi_ctrl.network_profiles(obj)
+    assert [p.ssid for p in profiles] == ["home", "Corp", "cafe"]
+    assert len(fake_api.get_profile_calls) == 3
+    assert sorted(fake_api.freed) == sorted(fake_api.buffers)
+
+    # Callers may modify the returned profiles without touching the cache.
+    profiles[0].akm.append(AkmType.WPA)
+    assert wifi_ctrl.network_profiles(obj)[0].akm == [AkmType.WPA2PSK]
+    assert len(fake_api.get_profile_calls) == 3
+
+    new = Profile()
+    new.ssid = "guest"
+    new.akm.append(AkmType.WPA2PSK)
+    new.cipher = CipherType.CCMP
+    new.key = "guestpass"
+    wifi_ctrl.add_network_profile(obj, new)
+    wifi_ctrl.remove_network_profile(obj, profiles[2])
+    assert [p.ssid for p in wifi_ctrl.network_profiles(obj)] == ["home", "Corp", "guest"]
+    assert fake_api.get_profile_calls[3:] == ["guest"]
+
+    wifi_ctrl.remove_all_network_profiles(obj)
+    assert fake_api.deleted == ["cafe", "home", "Office Wi-Fi", "guest"]
+    assert wifi_ctrl.network_profiles(obj) == []
+
+    fake_api.profiles["home"] = (FIXTURES / "home.xml").read_text()
+    wifi_ctrl.invalidate_profiles(obj)
+    assert wifi_ctrl.network_profile_name_list(obj) == ["home"]
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""Test cases for the wpa_supplicant.conf parser and writer."""
+
+import io
+import logging
+from pathlib import Path
+
+import pytest
+
+from pywifi import AkmType, CipherType
+from pywifi.profile import Profile
+from pywifi.wpaconf import format_profile, iter_profiles, read_profiles, write_profiles
+
+CONF = """\
+ctrl_interface=DIR=/var/run/wpa_supplicant GROUP=netdev
+update_config=1
+
+# home network
+network={
+    ssid="home net"
+    psk="12345678"
+    key_mgmt=WPA-PSK
+    proto=RSN
+    pairwise=CCMP TKIP
+    priority=5
+}
+
+network={
+\tssid=6f6666696365
+\tbssid=00:11:22:AA:BB:CC
+\tkey_mgmt=WPA-EAP
+\tproto=WPA
+\tpairwise=TKIP
+\teap=PEAP
+}
+
+network={
+    ssid="cafe"
+    key_mgmt=NONE
+}
+
+network={
+    ssid="legacy"
+    psk=f42c6fc52df0ebef9ebb4b90b38a5f902e83fe1b135a70e23aed762e9710a12e
+}
+"""
+
+
+def test_iter_profiles() -> None:
+    profiles = list(iter_profiles(CONF.splitlines()))
+
+    assert [profile.ssid for profile in profiles] == ["home net", "office", "cafe", "legacy"]
+
+    home, office, cafe, legacy = profiles
+    assert home.akm == [AkmType.WPA2PSK]
+    assert home.cipher == CipherType.CCMP
+    assert home.key == "12345678"
+    assert home.priority == 5
+
+    assert office.akm == [AkmType.WPA]
+    assert office.cipher == CipherType.TKIP
+    assert office.bssid == "00:11:22:aa:bb:cc"
+    assert office.priority == 0
+
+    assert cafe.akm == [AkmType.NONE]
+    assert cafe.key is None
+
+    # Without key_mgmt and proto, a PSK network allows both WPA and WPA2.
+    assert legacy.akm == [AkmType.WPAPSK, AkmType.WPA2PSK]
+    assert legacy.key.startswith("f42c6f")
+
+
+def test_iter_profiles_malformed(caplog: pytest.LogCaptureFixture) -> None:
+    lines = ["network={", 'ssid="bad"', "priority=high", "}"]
+    lines += ["network={", 'ssid="good"', "priority=2", "}"]
+    with caplog.at_level(logging.WARNING, logger="pywifi"):
+        profiles = list(iter_profiles(lines))
+
+    assert [(profile.ssid, profile.priority) for profile in profiles] == [("good", 2)]
+    assert "line 1: Invalid priority 'high'" in caplog.text
+
+    with pytest.raises(ValueError, match="SSID"):
+        format_profile(Profile())
+
+
+def test_write_profiles_round_trip(tmp_path: Path) -> None:
+    profiles = list(iter_profiles(CONF.splitlines()))
+    quoted = Profile()
+    quoted.ssid = 'say "hi"'
+    profiles.append(quoted)
+
+    path = tmp_path / "wpa_supplicant.conf"
+    with path.open("w") as f:
+        write_profiles(profiles, f, header="ctrl_interface=/var/run/wpa_supplicant")
+
+    text = path.read_text()
+    assert text.startswith("ctrl_interface=/var/run/wpa_supplicant\n\nnetwork={")
+    assert 'psk="12345678"' in text
+    assert "psk=f42c6f" in text
+
+    reread = list(read_profiles(path))
+    assert [p.ssid for p in reread] == [p.ssid for p in profiles]
+    for original, copy in zip(profiles, reread, strict=True):
+        assert copy.akm[-1:] == original.akm[-1:]
+        assert copy.cipher == original.cipher
+        assert copy.key == original.key
+        assert copy.priority == original.priority
+        assert copy.bssid == original.bssid
+
+
+@pytest.mark.parametrize("key_mgmt", ["SAE", "FT-PSK", "WPA-PSK-SHA256"])
+def test_unknown_key_mgmt_round_trip(key_mgmt: str) -> None:
+    lines = ["network={", 'ssid="new"', f"key_mgmt={key_mgmt}", 'psk="secret12"', "}"]
+    (profile,) = iter_profiles(lines)
+    assert profile.akm == []
+
+    block = format_profile(profile)
+    assert f"\tkey_mgmt={key_mgmt}\n" in block
+    assert '\tpsk="secret12"\n' in block
+    (copy,) = iter_profiles(block.splitlines())
+    assert (copy.akm, copy.key_mgmt, copy.key) == ([], key_mgmt, "secret12")
+
+    # Without the key_mgmt it was read with, an unknown one is not written open.
+    unknown = Profile()
+    unknown.ssid = "new"
+    unknown.akm = []
+    with pytest.raises(ValueError, match="Unknown key management"):
+        format_profile(unknown)
+
+
+def test_write_profiles_without_header() -> None:
+    profile = Profile()
+    profile.ssid = "ap"
+    profile.akm = [AkmType.WPAPSK]
+    profile.key = "12345678"
+
+    out = io.StringIO()
+    write_profiles([profile], out)
+
+    assert out.getvalue() == (
+        'network={\n\tssid="ap"\n\tkey_mgmt=WPA-PSK\n\tproto=WPA\n\tpsk="12345678"\n}\n\n'
+    )
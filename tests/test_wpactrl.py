@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+"""Test cases for the commands and requests of the control interface."""
+
+import asyncio
+
+from pywifi import AkmType, CipherType, wpactrl
+from pywifi.profile import Profile
+
+NETWORKS = {
+    "LIST_NETWORKS": "network id / ssid / bssid / flags\n0\thome\tany\t\n1\tcafe\tany\t\n2\t\n",
+    "GET_NETWORK 0 ssid": '"home"',
+    "GET_NETWORK 0 key_mgmt": "WPA-PSK",
+    "GET_NETWORK 0 proto": "RSN",
+    "GET_NETWORK 0 pairwise": "CCMP",
+    "GET_NETWORK 1 ssid": '"cafe"',
+    "GET_NETWORK 1 key_mgmt": "NONE",
+    "GET_NETWORK 1 pairwise": "NONE",
+    # A network removed meanwhile is skipped.
+    "GET_NETWORK 2 ssid": "FAIL",
+    "ADD_NETWORK": "3\n",
+}
+
+
+class Control:
+    """Control interface double answering from NETWORKS."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+
+    def send(self, cmd: str, *, get_reply: bool = False) -> str | None:
+        self.sent.append(cmd)
+        return NETWORKS.get(cmd, "OK\n") if get_reply else None
+
+    async def send_async(self, cmd: str, *, get_reply: bool = False) -> str | None:
+        return self.send(cmd, get_reply=get_reply)
+
+
+def test_network_profiles() -> None:
+    """Test the saved networks are read over both drivers alike."""
+    ctrl = Control()
+    networks = wpactrl.run(wpactrl.network_profiles(), ctrl.send)
+    assert [(n.id, n.ssid, n.akm, n.cipher) for n in networks] == [
+        (0, "home", [AkmType.WPA2PSK], CipherType.CCMP),
+        (1, "cafe", [AkmType.NONE], CipherType.NONE),
+    ]
+
+    sent = ctrl.sent
+    ctrl.sent = []
+    assert asyncio.run(wpactrl.run_async(wpactrl.network_profiles(), ctrl.send_async)) == networks
+    assert ctrl.sent == sent
+
+    # Only the saved networks of an SSID are read.
+    ctrl.sent = []
+    assert wpactrl.run(wpactrl.network_profiles("cafe"), ctrl.send) == networks[1:]
+    assert ctrl.sent == [
+        "LIST_NETWORKS",
+        "GET_NETWORK 1 ssid",
+        "GET_NETWORK 1 key_mgmt",
+        "GET_NETWORK 1 pairwise",
+    ]
+
+
+def test_apply_profiles() -> None:
+    """Test the commands of a sync of the saved networks."""
+    home = Profile()
+    home.ssid = "home"
+    home.akm = [AkmType.WPA2PSK]
+    home.key = "newpassword"
+    office = Profile()
+    office.ssid = "office"
+
+    ctrl = Control()
+    pinned = {0, 1}
+    request = wpactrl.apply_profiles([home, office], pinned, update_keys=True)
+    assert wpactrl.run(request, ctrl.send) == [home, office]
+    assert (home.id, office.id) == (0, 3)
+    assert pinned == {0}
+    assert ctrl.sent[-5:] == [
+        "REMOVE_NETWORK 1",
+        'SET_NETWORK 0 psk "newpassword"',
+        "ADD_NETWORK",
+        'SET_NETWORK 3 ssid "office"',
+        "SET_NETWORK 3 key_mgmt NONE",
+    ]
+
+    ctrl.sent = []
+    wpactrl.run(wpactrl.select_network(home, pinned), ctrl.send)
+    assert ctrl.sent == ["SET_NETWORK 0 bssid_hint any", "SELECT_NETWORK 0"]
+    assert pinned == set()